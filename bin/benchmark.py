@@ -0,0 +1,362 @@
+#!/usr/bin/env python
+
+"""Benchmark the SAM translator.
+
+Times transform() over the templates of the translator test corpus, per template and in aggregate, and over synthetic
+templates of increasing sizes, to get scaling curves. The report has the throughput, p50/p99 latencies and peak memory
+usage. When a baseline report is given, latencies and memory usage above it by more than the threshold are flagged as
+regressions, and the exit code is non-zero.
+
+Templates are transformed offline: calls to the Serverless Application Repository are answered locally.
+
+Usage:
+  benchmark.py [--corpus=<c>] [--sizes=<s>] [--dimensions=<d>] [--repeat=<n>] [--output=<o>] [--baseline=<b>] [--threshold=<t>] [--no-corpus] [--no-synthetic] [--no-memory]
+
+Options:
+  --corpus=<c>              Directory or glob of SAM templates to benchmark [default: tests/translator/input].
+  --sizes=<s>               Comma separated sizes of the synthetic templates [default: 1,10,50,100].
+  --dimensions=<d>          Comma separated dimensions the synthetic templates are scaled in, defaults to all of them:
+                            functions, api_events, connectors, nested_subs, policy_templates
+  --repeat=<n>              Number of times each template is transformed [default: 5].
+  --output=<o>              Location to store the JSON report [default: benchmark-report.json].
+  --baseline=<b>            JSON report of an earlier run to compare with
+  --threshold=<t>           Percentage above the baseline that is flagged as a regression [default: 10].
+  --no-corpus               Do not benchmark the test corpus
+  --no-synthetic            Do not benchmark the synthetic templates
+  --no-memory               Do not measure the peak memory usage, which needs an extra traced run of each template
+
+"""
+
+import copy
+import glob
+import json
+import logging
+import math
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from unittest.mock import patch
+
+from docopt import docopt  # type: ignore[import]
+
+my_path = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, my_path + "/..")
+
+from samtranslator.model.exceptions import InvalidDocumentException
+from samtranslator.plugins.application.serverless_app_plugin import ServerlessAppPlugin
+from samtranslator.translator.transform import transform
+from samtranslator.yaml_helper import yaml_parse
+
+LOG = logging.getLogger(__name__)
+
+PARAMETER_VALUES = {"param1": "value1", "param2": "value2"}
+
+MANAGED_POLICY_MAP = {
+    "AmazonDynamoDBFullAccess": "arn:aws:iam::aws:policy/AmazonDynamoDBFullAccess",
+    "AmazonDynamoDBReadOnlyAccess": "arn:aws:iam::aws:policy/AmazonDynamoDBReadOnlyAccess",
+    "AWSLambdaRole": "arn:aws:iam::aws:policy/service-role/AWSLambdaRole",
+}
+
+SYNTHETIC_DIMENSIONS = ["functions", "api_events", "connectors", "nested_subs", "policy_templates"]
+
+
+class StaticManagedPolicyLoader:
+    """
+    Managed policy loader serving a fixed map, so that the benchmark doesn't call IAM
+    """
+
+    def load(self) -> Dict[str, str]:
+        return MANAGED_POLICY_MAP
+
+
+def offline_sar_service_call(
+    plugin: ServerlessAppPlugin, service_call_function: Any, logical_id: str, *args: Any
+) -> Dict[str, Any]:
+    """
+    Answers the calls of the ServerlessAppPlugin to the Serverless Application Repository with an ACTIVE template
+    """
+    return {
+        "ApplicationId": args[0],
+        "TemplateId": "template-id",
+        "Status": "ACTIVE",
+        "TemplateUrl": "https://awsserverlessrepo-changesets-xxx.s3.amazonaws.com/signed-url",
+    }
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """
+    Returns the percentile of the values, with the nearest-rank method
+    """
+    ordered = sorted(values)
+    rank = max(int(math.ceil(percent / 100.0 * len(ordered))), 1)
+    return ordered[rank - 1]
+
+
+def transform_once(sam_template: Dict[str, Any]) -> Tuple[float, bool]:
+    """
+    Transforms a copy of the template
+
+    :return: Duration in milliseconds, and whether the template is valid
+    """
+    input_fragment = copy.deepcopy(sam_template)
+    start = time.perf_counter()
+    try:
+        transform(input_fragment, dict(PARAMETER_VALUES), StaticManagedPolicyLoader())  # type: ignore[no-untyped-call]
+        valid = True
+    except InvalidDocumentException:
+        valid = False
+    return (time.perf_counter() - start) * 1000, valid
+
+
+def measure_peak_memory(sam_template: Dict[str, Any]) -> float:
+    """
+    Returns the peak memory allocated by a transform of the template, in kilobytes
+    """
+    input_fragment = copy.deepcopy(sam_template)
+    tracemalloc.start()
+    try:
+        transform(input_fragment, dict(PARAMETER_VALUES), StaticManagedPolicyLoader())  # type: ignore[no-untyped-call]
+    except InvalidDocumentException:
+        pass
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return peak / 1024.0
+
+
+def benchmark_template(sam_template: Dict[str, Any], repeat: int, measure_memory: bool) -> Dict[str, Any]:
+    # The first transform warms up the caches of the translator and is not counted
+    _, valid = transform_once(sam_template)
+    durations = [transform_once(sam_template)[0] for _ in range(repeat)]
+    result: Dict[str, Any] = {
+        "valid": valid,
+        "samples_ms": durations,
+        "p50_ms": percentile(durations, 50),
+        "p99_ms": percentile(durations, 99),
+        "mean_ms": sum(durations) / len(durations),
+    }
+    if measure_memory:
+        result["peak_memory_kb"] = measure_peak_memory(sam_template)
+    return result
+
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    samples = [sample for result in results for sample in result["samples_ms"]]
+    total_seconds = sum(result["p50_ms"] for result in results) / 1000
+    summary: Dict[str, Any] = {
+        "templates": len(results),
+        "throughput_per_second": len(results) / total_seconds if total_seconds else None,
+        "p50_ms": percentile(samples, 50),
+        "p99_ms": percentile(samples, 99),
+        "total_p50_ms": total_seconds * 1000,
+    }
+    peaks = [result["peak_memory_kb"] for result in results if "peak_memory_kb" in result]
+    if peaks:
+        summary["peak_memory_kb"] = max(peaks)
+    return summary
+
+
+def find_templates(corpus_option: str) -> List[str]:
+    if os.path.isdir(corpus_option):
+        paths = [
+            os.path.join(corpus_option, name)
+            for name in os.listdir(corpus_option)
+            if os.path.splitext(name)[1] in (".yaml", ".yml", ".json")
+        ]
+    else:
+        paths = glob.glob(corpus_option, recursive=True)
+    return sorted(path for path in paths if os.path.isfile(path))
+
+
+def benchmark_corpus(corpus_option: str, repeat: int, measure_memory: bool) -> Dict[str, Any]:
+    templates: Dict[str, Any] = {}
+    for path in find_templates(corpus_option):
+        with open(path, "r") as f:
+            sam_template = yaml_parse(f)
+        templates[os.path.basename(path)] = benchmark_template(sam_template, repeat, measure_memory)
+        LOG.info("%s: %.2fms", path, templates[os.path.basename(path)]["p50_ms"])
+
+    return {"summary": summarize(list(templates.values())) if templates else None, "templates": templates}
+
+
+def make_function(properties: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    function_properties = {"CodeUri": "s3://bucket/key", "Handler": "index.handler", "Runtime": "python3.9"}
+    function_properties.update(properties or {})
+    return {"Type": "AWS::Serverless::Function", "Properties": function_properties}
+
+
+def make_synthetic_template(dimension: str, size: int) -> Dict[str, Any]:
+    """
+    Returns a SAM template that grows linearly with the size in the given dimension
+
+    :param dimension: One of SYNTHETIC_DIMENSIONS
+    :param size: Number of functions, API events, connectors, nested Fn::Sub or policy templates
+    """
+    resources: Dict[str, Any] = {}
+    if dimension == "functions":
+        for i in range(size):
+            resources["Function{}".format(i)] = make_function(
+                {"Events": {"Schedule": {"Type": "Schedule", "Properties": {"Schedule": "rate(1 minute)"}}}}
+            )
+    elif dimension == "api_events":
+        resources["Api"] = {"Type": "AWS::Serverless::Api", "Properties": {"StageName": "prod"}}
+        events = {
+            "Api{}".format(i): {
+                "Type": "Api",
+                "Properties": {"RestApiId": {"Ref": "Api"}, "Path": "/path{}".format(i), "Method": "get"},
+            }
+            for i in range(size)
+        }
+        resources["Function"] = make_function({"Events": events})
+    elif dimension == "connectors":
+        resources["Function"] = make_function()
+        for i in range(size):
+            resources["Table{}".format(i)] = {"Type": "AWS::Serverless::SimpleTable"}
+            resources["Connector{}".format(i)] = {
+                "Type": "AWS::Serverless::Connector",
+                "Properties": {
+                    "Source": {"Id": "Function"},
+                    "Destination": {"Id": "Table{}".format(i)},
+                    "Permissions": ["Read", "Write"],
+                },
+            }
+    elif dimension == "nested_subs":
+        variables = {
+            "Variable{}".format(i): {
+                "Fn::Sub": [
+                    "${Outer}-${AWS::Region}-" + str(i),
+                    {"Outer": {"Fn::Sub": ["${Inner}-${AWS::AccountId}", {"Inner": {"Fn::Sub": "${AWS::StackName}"}}]}},
+                ]
+            }
+            for i in range(size)
+        }
+        resources["Function"] = make_function({"AutoPublishAlias": "live", "Environment": {"Variables": variables}})
+    elif dimension == "policy_templates":
+        policy_templates = [
+            ("DynamoDBCrudPolicy", "TableName", "table"),
+            ("S3ReadPolicy", "BucketName", "bucket"),
+            ("SQSPollerPolicy", "QueueName", "queue"),
+        ]
+        policies = []
+        for i in range(size):
+            template_name, parameter_name, prefix = policy_templates[i % len(policy_templates)]
+            policies.append({template_name: {parameter_name: prefix + str(i)}})
+        resources["Function"] = make_function({"Policies": policies})
+    else:
+        raise ValueError("Unknown synthetic dimension: {}".format(dimension))
+
+    return {"Transform": "AWS::Serverless-2016-10-31", "Resources": resources}
+
+
+def benchmark_synthetic(
+    dimensions: List[str], sizes: List[int], repeat: int, measure_memory: bool
+) -> Dict[str, List[Dict[str, Any]]]:
+    curves: Dict[str, List[Dict[str, Any]]] = {}
+    for dimension in dimensions:
+        curve = []
+        for size in sizes:
+            result = benchmark_template(make_synthetic_template(dimension, size), repeat, measure_memory)
+            if not result["valid"]:
+                raise ValueError("Synthetic template {} of size {} is invalid".format(dimension, size))
+            point = {"size": size, "ms_per_unit": result["p50_ms"] / size}
+            point.update({key: value for key, value in result.items() if key not in ("valid", "samples_ms")})
+            curve.append(point)
+            LOG.info("%s x %d: %.2fms", dimension, size, result["p50_ms"])
+        curves[dimension] = curve
+    return curves
+
+
+def get_compared_metrics(report: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Returns the metrics of a report that are compared with the baseline, by name
+    """
+    metrics: Dict[str, float] = {}
+    corpus_summary = (report.get("corpus") or {}).get("summary") or {}
+    for key in ("p50_ms", "p99_ms", "peak_memory_kb"):
+        if key in corpus_summary:
+            metrics["corpus.{}".format(key)] = corpus_summary[key]
+    for dimension, curve in (report.get("synthetic") or {}).items():
+        for point in curve:
+            for key in ("p50_ms", "peak_memory_kb"):
+                if key in point:
+                    metrics["synthetic.{}.{}.{}".format(dimension, point["size"], key)] = point[key]
+    return metrics
+
+
+def find_regressions(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """
+    Returns the metrics of the report that are above the ones of the baseline by more than the threshold
+
+    :param threshold: Percentage above the baseline that is a regression
+    """
+    current_metrics = get_compared_metrics(report)
+    regressions = []
+    for name, baseline_value in sorted(get_compared_metrics(baseline).items()):
+        value = current_metrics.get(name)
+        if value is None or not baseline_value:
+            continue
+        change = (value - baseline_value) / baseline_value * 100
+        if change > threshold:
+            regressions.append({"metric": name, "baseline": baseline_value, "current": value, "change_percent": change})
+    return regressions
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    corpus_summary = (report.get("corpus") or {}).get("summary")
+    if corpus_summary:
+        print(
+            "Corpus: {templates} templates, {throughput_per_second:.1f} templates/s, p50 {p50_ms:.2f}ms, "
+            "p99 {p99_ms:.2f}ms".format(**corpus_summary)
+            + (", peak {:.0f}KB".format(corpus_summary["peak_memory_kb"]) if "peak_memory_kb" in corpus_summary else "")
+        )
+        slowest = sorted(report["corpus"]["templates"].items(), key=lambda item: float(item[1]["p50_ms"]), reverse=True)
+        for name, result in slowest[:10]:
+            print("  {:>9.2f}ms  {}".format(result["p50_ms"], name))
+
+    for dimension, curve in (report.get("synthetic") or {}).items():
+        print("Synthetic {}:".format(dimension))
+        for point in curve:
+            print(
+                "  size {:>5}: p50 {:>9.2f}ms, {:.3f}ms per unit".format(
+                    point["size"], point["p50_ms"], point["ms_per_unit"]
+                )
+                + (", peak {:.0f}KB".format(point["peak_memory_kb"]) if "peak_memory_kb" in point else "")
+            )
+
+    for regression in report.get("regressions", []):
+        print("REGRESSION {metric}: {baseline:.2f} -> {current:.2f} (+{change_percent:.1f}%)".format(**regression))
+
+
+def run(cli_options: Dict[str, Any]) -> int:
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    repeat = int(cli_options["--repeat"])
+    measure_memory = not cli_options["--no-memory"]
+    dimensions = cli_options["--dimensions"].split(",") if cli_options["--dimensions"] else SYNTHETIC_DIMENSIONS
+
+    report: Dict[str, Any] = {"python": sys.version.split()[0], "repeat": repeat}
+    with patch.object(ServerlessAppPlugin, "_sar_service_call", offline_sar_service_call):
+        if not cli_options["--no-corpus"]:
+            report["corpus"] = benchmark_corpus(cli_options["--corpus"], repeat, measure_memory)
+        if not cli_options["--no-synthetic"]:
+            sizes = [int(size) for size in cli_options["--sizes"].split(",")]
+            report["synthetic"] = benchmark_synthetic(dimensions, sizes, repeat, measure_memory)
+
+    if cli_options["--baseline"]:
+        with open(cli_options["--baseline"], "r") as f:
+            baseline = json.load(f)
+        report["regressions"] = find_regressions(report, baseline, float(cli_options["--threshold"]))
+
+    with open(cli_options["--output"], "w") as f:
+        f.write(json.dumps(report, indent=1))
+
+    print_report(report)
+    print("Wrote benchmark report to: " + cli_options["--output"])
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    # The translator warns about the metrics that are not published, which the benchmark doesn't need
+    logging.basicConfig(level=logging.ERROR)
+    sys.exit(run(docopt(__doc__)))
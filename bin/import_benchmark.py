@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+
+"""Check the import time of the SAM translator against a budget.
+
+Each module of the budget is imported in fresh interpreters with `-X importtime`. The median cumulative import time
+must stay under the module's `max_ms`, and none of its `forbidden` packages may be imported along with it: these are
+slow to import and must only be imported when first needed. The exit code is non-zero when the budget is exceeded.
+
+A module can also budget its `first_transform`: the time to import it and transform the `template` in fresh
+interpreters, and the packages that this first transform must not import. Cold starts pay for both. The region is
+taken from AWS_DEFAULT_REGION, us-east-1 if it is not set, so that the first transform never needs boto3 to find it.
+
+Usage:
+  import_benchmark.py [--budget=<b>] [--repeat=<n>] [--top=<t>] [--output=<o>]
+
+Options:
+  --budget=<b>              JSON file with the import budget [default: bin/import-budget.json].
+  --repeat=<n>              Number of fresh interpreters each module is imported in [default: 5].
+  --top=<t>                 Number of slowest imports to list for each module [default: 10].
+  --output=<o>              Location to store the JSON report
+
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, Tuple
+
+from docopt import docopt  # type: ignore[import]
+
+my_path = os.path.dirname(os.path.abspath(__file__))
+repo_path = os.path.join(my_path, "..")
+sys.path.insert(0, repo_path)
+
+# Line of the -X importtime output: "import time: <self us> | <cumulative us> | <indented module name>"
+ImportTime = Tuple[str, int, int]
+
+
+def parse_import_times(output: str) -> List[ImportTime]:
+    """
+    Parses the `-X importtime` output into (module, self microseconds, cumulative microseconds) tuples, in the order
+    the imports finished
+    """
+    import_times = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            # Header line
+            continue
+        import_times.append((name.strip(), int(self_us), int(cumulative_us)))
+    return import_times
+
+
+def import_module(module: str) -> List[ImportTime]:
+    """
+    Imports the module in a fresh interpreter and returns the times of all the imports it triggered
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        cwd=repo_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_import_times(result.stderr)
+
+
+# Imports the module, transforms the template read from the standard input, and writes the time this took and the
+# imported modules to the standard output
+FIRST_TRANSFORM_CODE = """
+import json
+import sys
+import time
+
+template = json.load(sys.stdin)
+start = time.perf_counter()
+import {module}
+from samtranslator.translator.transform import transform
+
+
+class PolicyLoader:
+    def load(self):
+        return {{"AWSLambdaRole": "arn:aws:iam::aws:policy/service-role/AWSLambdaRole"}}
+
+
+transform(template, {{}}, PolicyLoader())
+print(json.dumps({{"ms": (time.perf_counter() - start) * 1000.0, "modules": sorted(sys.modules)}}))
+"""
+
+
+def first_transform(module: str, template: Dict[str, Any]) -> Tuple[float, List[str]]:
+    """
+    Imports the module and transforms the template in a fresh interpreter, and returns the time this took in
+    milliseconds and the modules imported by then
+    """
+    env = dict(os.environ)
+    env.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_TRANSFORM_CODE.format(module=module)],
+        cwd=repo_path,
+        env=env,
+        input=json.dumps(template),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    output = json.loads(result.stdout.splitlines()[-1])
+    return output["ms"], output["modules"]
+
+
+def is_forbidden(imported: str, forbidden: List[str]) -> bool:
+    return any(imported == package or imported.startswith(package + ".") for package in forbidden)
+
+
+def measure_module(module: str, repeat: int, forbidden: List[str], top: int) -> Dict[str, Any]:
+    cumulative_ms = []
+    import_times: List[ImportTime] = []
+    for _ in range(repeat):
+        import_times = import_module(module)
+        cumulative_ms.append(next(cumulative for name, _, cumulative in import_times if name == module) / 1000.0)
+
+    # Imports of the last run, the slowest first
+    slowest = sorted(import_times, key=lambda import_time: import_time[1], reverse=True)[:top]
+    return {
+        "module": module,
+        "median_ms": round(statistics.median(cumulative_ms), 1),
+        "min_ms": round(min(cumulative_ms), 1),
+        "forbidden_imports": sorted({name for name, _, _ in import_times if is_forbidden(name, forbidden)}),
+        "slowest_imports": [{"module": name, "self_ms": round(self_us / 1000.0, 1)} for name, self_us, _ in slowest],
+    }
+
+
+def measure_first_transform(module: str, repeat: int, budget: Dict[str, Any]) -> Dict[str, Any]:
+    # Loaded here, so that the interpreters measured don't parse YAML
+    from samtranslator.yaml_helper import yaml_parse
+
+    with open(os.path.join(repo_path, budget["template"])) as f:
+        template = yaml_parse(f.read())
+
+    total_ms = []
+    modules: List[str] = []
+    for _ in range(repeat):
+        ms, modules = first_transform(module, template)
+        total_ms.append(ms)
+
+    return {
+        "module": module,
+        "template": budget["template"],
+        "median_ms": round(statistics.median(total_ms), 1),
+        "min_ms": round(min(total_ms), 1),
+        "max_ms": budget["max_ms"],
+        "forbidden_imports": sorted({name for name in modules if is_forbidden(name, budget.get("forbidden", []))}),
+    }
+
+
+def check_budget(result: Dict[str, Any], budget: Dict[str, Any], measured: str = "to import") -> List[str]:
+    """
+    Returns the violations of the budget of the module, if any
+
+    :param measured: what the time was measured for, e.g. "to import"
+    """
+    violations = []
+    if result["median_ms"] > budget["max_ms"]:
+        violations.append(
+            "{} takes {}ms {}, over its budget of {}ms".format(
+                result["module"], result["median_ms"], measured, budget["max_ms"]
+            )
+        )
+    if result["forbidden_imports"]:
+        violations.append("{} imports {} {}".format(result["module"], ", ".join(result["forbidden_imports"]), measured))
+    return violations
+
+
+def run(cli_options: Dict[str, Any]) -> int:
+    # Relative to the root of the repository, like the default
+    with open(os.path.join(repo_path, cli_options["--budget"])) as f:
+        budgets = json.load(f)
+
+    results = []
+    violations = []
+    for module, budget in budgets.items():
+        result = measure_module(
+            module, int(cli_options["--repeat"]), budget.get("forbidden", []), int(cli_options["--top"])
+        )
+        result["max_ms"] = budget["max_ms"]
+        results.append(result)
+        violations.extend(check_budget(result, budget))
+
+        print("{}: {}ms (budget {}ms)".format(module, result["median_ms"], budget["max_ms"]))
+        for slow_import in result["slowest_imports"]:
+            print("  {:>8.1f}ms  {}".format(slow_import["self_ms"], slow_import["module"]))
+
+        if "first_transform" in budget:
+            first_transform_budget = budget["first_transform"]
+            transform_result = measure_first_transform(module, int(cli_options["--repeat"]), first_transform_budget)
+            result["first_transform"] = transform_result
+            measured = "to import and transform " + first_transform_budget["template"]
+            violations.extend(check_budget(transform_result, first_transform_budget, measured))
+            print(
+                "{} {}: {}ms (budget {}ms)".format(
+                    module, measured, transform_result["median_ms"], first_transform_budget["max_ms"]
+                )
+            )
+
+    if cli_options.get("--output"):
+        with open(cli_options["--output"], "w") as f:
+            f.write(json.dumps({"modules": results, "violations": violations}, indent=1))
+
+    for violation in violations:
+        print("Over budget: " + violation)
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run(docopt(__doc__)))
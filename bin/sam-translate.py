@@ -8,6 +8,7 @@ Usage:
   sam-translate.py --template-file=sam-template.yaml [--verbose] [--output-template=<o>]
   sam-translate.py package --template-file=sam-template.yaml --s3-bucket=my-bucket [--verbose] [--output-template=<o>]
   sam-translate.py deploy --template-file=sam-template.yaml --s3-bucket=my-bucket --capabilities=CAPABILITY_NAMED_IAM --stack-name=my-stack [--verbose] [--output-template=<o>]
+  sam-translate.py batch --templates=<t> [--output-dir=<d>] [--report=<r>] [--jobs=<j>] [--verbose]
 
 Options:
   --template-file=<i>       Location of SAM template to transform [default: template.yaml].
@@ -15,32 +16,39 @@ Options:
   --s3-bucket=<s>           S3 bucket to use for SAM artifacts when using the `package` command
   --capabilities=<c>        Capabilities
   --stack-name=<n>          Unique name for your CloudFormation Stack
+  --templates=<t>           Directory or glob of SAM templates to transform with the `batch` command
+  --output-dir=<d>          Directory to store the resulting CloudFormation templates [default: transformed-templates].
+  --report=<r>              Location to store the JSON report of the `batch` command [default: transform-report.json].
+  --jobs=<j>                Number of worker processes for the `batch` command, defaults to the number of CPUs
   --verbose                 Enables verbose logging
 
 """
+import glob
 import json
 import logging
 import os
 import platform
 import subprocess
 import sys
+import tempfile
 
-import boto3
-
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from docopt import docopt  # type: ignore[import]
 from functools import reduce
+from typing import Any, Dict, List, Optional
 
 my_path = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, my_path + "/..")
 
 from samtranslator.public.translator import ManagedPolicyLoader
-from samtranslator.translator.transform import transform
+from samtranslator.translator.managed_policy_translator import FileManagedPolicyCache
+from samtranslator.translator.transform import transform, TransformSession
 from samtranslator.yaml_helper import yaml_parse
 from samtranslator.model.exceptions import InvalidDocumentException
 
 LOG = logging.getLogger(__name__)
 cli_options = docopt(__doc__)
-iam_client = boto3.client("iam")
 cwd = os.getcwd()
 
 if cli_options.get("--verbose"):
@@ -49,6 +57,15 @@ else:
     logging.basicConfig()
 
 
+def get_iam_client() -> Any:
+    """
+    Creates the IAM client used to load the managed policies. boto3 is only imported when it is called.
+    """
+    import boto3
+
+    return boto3.client("iam")
+
+
 def execute_command(command, args):  # type: ignore[no-untyped-def]
     try:
         aws_cmd = "aws" if platform.system().lower() != "windows" else "aws.cmd"
@@ -94,10 +111,10 @@ def package(input_file_path, output_file_path):  # type: ignore[no-untyped-def]
 
 def transform_template(input_file_path, output_file_path):  # type: ignore[no-untyped-def]
     with open(input_file_path, "r") as f:
-        sam_template = yaml_parse(f)  # type: ignore[no-untyped-call]
+        sam_template = yaml_parse(f)
 
     try:
-        cloud_formation_template = transform(sam_template, {}, ManagedPolicyLoader(iam_client))  # type: ignore[no-untyped-call]
+        cloud_formation_template = transform(sam_template, {}, ManagedPolicyLoader(get_iam_client()))  # type: ignore[no-untyped-call]
         cloud_formation_template_prettified = json.dumps(cloud_formation_template, indent=1)
 
         with open(output_file_path, "w") as f:
@@ -111,6 +128,109 @@ def transform_template(input_file_path, output_file_path):  # type: ignore[no-un
         LOG.error(errors)
 
 
+# Transform session of a batch worker process, created once by init_batch_worker
+worker_session: Optional[TransformSession] = None
+
+
+def init_batch_worker(policy_cache_directory: str) -> None:
+    """
+    Creates the transform session of a worker process. Managed policies are only looked up in IAM when a template
+    names them, and the policy map, once loaded by a worker, is shared with the others through the cache directory.
+    """
+    global worker_session
+    policy_cache = FileManagedPolicyCache(policy_cache_directory)
+    worker_session = TransformSession(ManagedPolicyLoader(get_iam_client(), cache=policy_cache))
+
+
+def find_templates(templates_option: str) -> List[str]:
+    if os.path.isdir(templates_option):
+        paths = [
+            os.path.join(templates_option, name)
+            for name in os.listdir(templates_option)
+            if os.path.splitext(name)[1] in (".yaml", ".yml", ".json")
+        ]
+    else:
+        paths = glob.glob(templates_option, recursive=True)
+
+    # Sorted so the outputs and the report are deterministic
+    return sorted(os.path.abspath(path) for path in paths if os.path.isfile(path))
+
+
+def transform_batch_template(input_file_path: str, output_file_path: str) -> Dict[str, Any]:
+    """
+    Transforms one template of the batch. Never raises: the errors of the template, including YAML errors and
+    translator crashes, are recorded in the returned result so the other templates of the batch still run.
+    """
+    assert worker_session is not None, "Batch worker was not initialized"
+    result: Dict[str, Any] = {"template": input_file_path, "output": None, "errors": []}
+    try:
+        with open(input_file_path, "r") as f:
+            sam_template = yaml_parse(f)
+
+        os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
+        # The transformed template is written as it is serialized
+        with open(output_file_path, "w") as f:
+            worker_session.transform_to_json(sam_template, {}, f, indent=1)
+    except Exception as e:
+        # Don't leave the partial output of a template that failed to transform
+        if os.path.exists(output_file_path):
+            os.remove(output_file_path)
+        if isinstance(e, InvalidDocumentException):
+            result["errors"] = [cause.message for cause in e.causes]
+        else:
+            LOG.debug("Failed to transform %s", input_file_path, exc_info=True)
+            result["errors"] = ["{}: {}".format(type(e).__name__, e)]
+        return result
+
+    result["output"] = output_file_path
+    return result
+
+
+def get_batch_output_file_paths(input_file_paths: List[str], output_dir: str) -> List[str]:
+    """
+    Returns the output path of each template: its path relative to the common directory of the templates, with a
+    .json extension. Templates which would get the same output, like a.yaml and a.json, keep their extension
+    (a.yaml.json and a.json.json) so that no output overwrites another.
+    """
+    common_dir = os.path.commonpath([os.path.dirname(path) for path in input_file_paths])
+    relative_paths = [os.path.relpath(path, common_dir) for path in input_file_paths]
+    stems = [os.path.splitext(path)[0] for path in relative_paths]
+    stem_counts = Counter(stems)
+    return [
+        os.path.join(output_dir, (relative_path if stem_counts[stem] > 1 else stem) + ".json")
+        for relative_path, stem in zip(relative_paths, stems)
+    ]
+
+
+def transform_batch(templates_option: str, output_dir: str, report_file_path: str, jobs: Optional[int]) -> int:
+    input_file_paths = find_templates(templates_option)
+    if not input_file_paths:
+        LOG.error("No templates found for: %s", templates_option)
+        return 1
+
+    output_file_paths = get_batch_output_file_paths(input_file_paths, output_dir)
+
+    with tempfile.TemporaryDirectory() as policy_cache_directory, ProcessPoolExecutor(
+        max_workers=jobs, initializer=init_batch_worker, initargs=(policy_cache_directory,)
+    ) as executor:
+        # executor.map returns the results in the order of the inputs
+        results = list(executor.map(transform_batch_template, input_file_paths, output_file_paths))
+
+    failed = [result for result in results if result["errors"]]
+    report = {
+        "total": len(results),
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "templates": results,
+    }
+    with open(report_file_path, "w") as f:
+        f.write(json.dumps(report, indent=1))
+
+    print("Transformed {} of {} templates into: {}".format(report["succeeded"], report["total"], output_dir))
+    print("Wrote transform report to: " + report_file_path)
+    return 1 if failed else 0
+
+
 def deploy(template_file):  # type: ignore[no-untyped-def]
     capabilities = cli_options.get("--capabilities")
     stack_name = cli_options.get("--stack-name")
@@ -124,7 +244,17 @@ def deploy(template_file):  # type: ignore[no-untyped-def]
 if __name__ == "__main__":
     input_file_path, output_file_path = get_input_output_file_paths()  # type: ignore[no-untyped-call]
 
-    if cli_options.get("package"):
+    if cli_options.get("batch"):
+        jobs_option = cli_options.get("--jobs")
+        sys.exit(
+            transform_batch(
+                cli_options["--templates"],
+                os.path.join(cwd, cli_options["--output-dir"]),
+                os.path.join(cwd, cli_options["--report"]),
+                int(jobs_option) if jobs_option else None,
+            )
+        )
+    elif cli_options.get("package"):
         package_output_template_file = package(input_file_path, output_file_path)  # type: ignore[no-untyped-call]
         transform_template(package_output_template_file, output_file_path)  # type: ignore[no-untyped-call]
     elif cli_options.get("deploy"):
@@ -1,8 +1,6 @@
 import json
-import boto3
 import logging
 
-from botocore.config import Config
 from samtranslator.feature_toggle.dialup import (
     DisabledDialup,
     ToggleDialup,
@@ -129,6 +127,9 @@ class FeatureToggleAppConfigConfigProvider(FeatureToggleConfigProvider):
     @cw_timer(prefix="External", name="AppConfig")  # type: ignore[misc]
     def __init__(self, application_id, environment_id, configuration_profile_id, app_config_client=None):  # type: ignore[no-untyped-def]
         FeatureToggleConfigProvider.__init__(self)
+        import boto3
+        from botocore.config import Config
+
         try:
             LOG.info("Loading feature toggle config from AppConfig...")
             # Lambda function has 120 seconds limit
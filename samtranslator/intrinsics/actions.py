@@ -1,5 +1,6 @@
 import re
 from abc import ABC
+from functools import lru_cache
 from typing import Any, Dict, Optional, Tuple
 
 from samtranslator.model.exceptions import InvalidTemplateException, InvalidDocumentException
@@ -174,6 +175,10 @@ class RefAction(Action):
 class SubAction(Action):
     intrinsic_name = "Fn::Sub"
 
+    # RegExp to find pattern "${logicalId.property}" and return the word inside bracket
+    _LOGICAL_ID_REGEX = r"[A-Za-z0-9\.]+|AWS::[A-Z][A-Za-z]*"
+    _REF_PATTERN = re.compile(r"\$\{(" + _LOGICAL_ID_REGEX + r")\}")
+
     def resolve_parameter_refs(self, input_dict: Optional[Any], parameters: Dict[str, Any]) -> Optional[Any]:
         """
         Substitute references found within the string of `Fn::Sub` intrinsic function
@@ -380,17 +385,16 @@ class SubAction(Action):
         :return string: Text with all reference structures replaced as necessary
         """
 
-        # RegExp to find pattern "${logicalId.property}" and return the word inside bracket
-        logical_id_regex = r"[A-Za-z0-9\.]+|AWS::[A-Z][A-Za-z]*"
-        ref_pattern = re.compile(r"\$\{(" + logical_id_regex + r")\}")
+        literals, variables = SubAction._parse_sub_string(text)
+        if not variables:
+            return text
 
-        # Find all the pattern, and call the handler to decide how to substitute them.
-        # Do the substitution and return the final text
-        # NOTE: in order to make sure Py27UniStr strings won't be converted to plain string,
-        # we need to iterate through each match and do the replacement
-        substituted = text
-        for match in re.finditer(ref_pattern, text):
-            sub_value = handler_method(match.group(0), match.group(1))
+        # Substitute by joining the literal parts and the handled variables, which is linear in the length of the
+        # text, instead of replacing each reference in the whole text one after the other
+        parts = [literals[0]]
+        substituted = False
+        for (full_ref, ref_value), literal in zip(variables, literals[1:]):
+            sub_value = handler_method(full_ref, ref_value)
             if not isinstance(sub_value, str):
                 raise InvalidDocumentException(
                     [
@@ -399,8 +403,51 @@ class SubAction(Action):
                         )
                     ]
                 )
-            substituted = substituted.replace(match.group(0), sub_value, 1)
-        return substituted
+            substituted = substituted or sub_value != full_ref
+            parts.append(sub_value)
+            parts.append(literal)
+
+        if not substituted:
+            return text
+        # NOTE: in order to make sure Py27UniStr strings won't be converted to plain string,
+        # the result is created with the same type as the input text
+        result = "".join(parts)
+        return result if type(text) is str else type(text)(result)
+
+    @classmethod
+    def get_variables(cls, text: str) -> Tuple[str, ...]:
+        """
+        Returns the values of the references within a string using ${key} syntax, in order.
+
+        Ex: "${key1}-hello-${key2.Arn}" => ("key1", "key2.Arn")
+
+        :param string text: Input text
+        :return: Values of the references, such as "LogicalId.Property"
+        """
+        return tuple(ref_value for _, ref_value in cls._parse_sub_string(text)[1])
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _parse_sub_string(text: str) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, str], ...]]:
+        """
+        Parses a string using ${key} syntax into its literal parts and its references. There is always one more literal
+        part than references, literal parts being around and between the references.
+        Results are cached since the same Fn::Sub strings are substituted once per resolution phase.
+
+        Ex: "${key1}-hello-${key2}" => (("", "-hello-", ""), (("${key1}", "key1"), ("${key2}", "key2")))
+
+        :param string text: Input text
+        :return: Tuple of the literal parts and tuple of the (full reference, reference value) pairs
+        """
+        literals = []
+        variables = []
+        position = 0
+        for match in SubAction._REF_PATTERN.finditer(text):
+            literals.append(text[position : match.start()])
+            variables.append((match.group(0), match.group(1)))
+            position = match.end()
+        literals.append(text[position:])
+        return tuple(literals), tuple(variables)
 
 
 class GetAttAction(Action):
@@ -0,0 +1,95 @@
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from samtranslator.intrinsics.actions import SubAction
+
+# Location of an intrinsic function in the template: the container (dict or list) and the key/index inside it
+Location = Tuple[Any, Any]
+
+
+class IntrinsicReferenceIndex(object):
+    """
+    Index of the `Ref`, `Fn::GetAtt` and `Fn::Sub` intrinsic functions of a template, by the logical IDs they
+    reference. It is built with a single scan of the template and lets reference rewrites visit only the intrinsics
+    that reference the logical IDs being rewritten, instead of applying every rewrite to every node of the template.
+
+    The index is not updated when the template changes, so it must be built once the template is final.
+    """
+
+    INTRINSICS = {"Ref", "Fn::GetAtt", "Fn::Sub"}
+
+    def __init__(self, template: Dict[str, Any]) -> None:
+        """
+        :param dict template: Template to index. The index keeps references to its dictionaries and lists.
+        """
+        # Locations of the intrinsics, in pre-order of the template, with the logical IDs each one references
+        self._locations: List[Tuple[Any, Any, Set[str]]] = []
+        # Referenced logical IDs, in the order they are first referenced
+        self._logical_ids: Dict[str, None] = {}
+
+        for key in template:
+            self._index(template, key)
+
+    def get_logical_ids(self) -> List[str]:
+        """
+        Returns all the logical IDs referenced by the indexed intrinsics
+        """
+        return list(self._logical_ids)
+
+    def get_locations(self, logical_ids: Iterable[str]) -> List[Location]:
+        """
+        Returns the locations of the intrinsics referencing any of the given logical IDs, in pre-order of the template,
+        ie. an intrinsic always comes before the intrinsics nested in it.
+
+        :param logical_ids: Logical IDs to find the references of
+        :return: List of (container, key) locations
+        """
+        logical_ids = {logical_id for logical_id in logical_ids if logical_id in self._logical_ids}
+        if not logical_ids:
+            return []
+
+        return [
+            (container, key)
+            for container, key, referenced_logical_ids in self._locations
+            if not referenced_logical_ids.isdisjoint(logical_ids)
+        ]
+
+    def _index(self, container: Any, key: Any) -> None:
+        """
+        Scans `container[key]` and records the locations of the intrinsics in it, in pre-order
+        """
+        stack = [(container, key)]
+        while stack:
+            node_container, node_key = stack.pop()
+            value = node_container[node_key]
+            if isinstance(value, dict):
+                if len(value) == 1:
+                    intrinsic_name = next(iter(value))
+                    if intrinsic_name in self.INTRINSICS:
+                        logical_ids = self._get_referenced_logical_ids(intrinsic_name, value[intrinsic_name])
+                        if logical_ids:
+                            self._locations.append((node_container, node_key, logical_ids))
+                            self._logical_ids.update(dict.fromkeys(logical_ids))
+                # Pushed in reverse to pop, and so visit, the children in order
+                stack.extend((value, child_key) for child_key in reversed(list(value)))
+            elif isinstance(value, list):
+                stack.extend((value, index) for index in reversed(range(len(value))))
+
+    @staticmethod
+    def _get_referenced_logical_ids(intrinsic_name: str, value: Any) -> Set[str]:
+        """
+        Returns the logical IDs referenced by an intrinsic function, the part before the first "." of each reference
+        """
+        if intrinsic_name == "Ref":
+            return {value.split(".", 1)[0]} if isinstance(value, str) else set()
+
+        if intrinsic_name == "Fn::GetAtt":
+            if isinstance(value, list) and len(value) >= 2 and all(isinstance(item, str) for item in value):
+                return {value[0].split(".", 1)[0]}
+            return set()
+
+        # Fn::Sub
+        if isinstance(value, list) and value:
+            value = value[0]
+        if not isinstance(value, str):
+            return set()
+        return {variable.split(".", 1)[0] for variable in SubAction.get_variables(value)}
@@ -1,9 +1,11 @@
 # Help resolve intrinsic functions
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from samtranslator.intrinsics.actions import Action, SubAction, RefAction, GetAttAction
 from samtranslator.model.exceptions import InvalidTemplateException, InvalidDocumentException
 from samtranslator.intrinsics.resource_refs import SupportedResourceReferences
+from samtranslator.intrinsics.reference_index import IntrinsicReferenceIndex
+from samtranslator.metrics.profiler import profile_span
 
 # All intrinsics are supported by default
 DEFAULT_SUPPORTED_INTRINSICS = {action.intrinsic_name: action() for action in [RefAction, SubAction, GetAttAction]}
@@ -45,7 +47,8 @@ class IntrinsicsResolver(object):
         :param _input: Any primitive type (dict, array, string etc) whose values might contain intrinsic functions
         :return: A copy of a dictionary with parameter references replaced by actual value.
         """
-        return self._traverse(_input, self.parameters, self._try_resolve_parameter_refs)  # type: ignore[no-untyped-call]
+        with profile_span("resolve_parameter_refs", "Intrinsics"):
+            return self._traverse(_input, self.parameters, self._try_resolve_parameter_refs)  # type: ignore[no-untyped-call]
 
     def resolve_sam_resource_refs(
         self, input: Dict[str, Any], supported_resource_refs: SupportedResourceReferences
@@ -71,7 +74,8 @@ class IntrinsicsResolver(object):
             references supported in this SAM template, along with the value they should resolve to.
         :return list errors: List of dictionary containing information about invalid reference. Empty list otherwise
         """
-        return self._traverse(input, supported_resource_refs, self._try_resolve_sam_resource_refs)  # type: ignore[no-untyped-call]
+        with profile_span("resolve_sam_resource_refs", "Intrinsics"):
+            return self._traverse(input, supported_resource_refs, self._try_resolve_sam_resource_refs)  # type: ignore[no-untyped-call]
 
     def resolve_sam_resource_id_refs(self, input: Dict[str, Any], supported_resource_id_refs: Dict[str, str]) -> Any:
         """
@@ -94,7 +98,64 @@ class IntrinsicsResolver(object):
         :param dict supported_resource_id_refs: Dictionary that maps old logical ids to new ones.
         :return list errors: List of dictionary containing information about invalid reference. Empty list otherwise
         """
-        return self._traverse(input, supported_resource_id_refs, self._try_resolve_sam_resource_id_refs)  # type: ignore[no-untyped-call]
+        with profile_span("resolve_sam_resource_id_refs", "Intrinsics"):
+            return self._traverse(input, supported_resource_id_refs, self._try_resolve_sam_resource_id_refs)  # type: ignore[no-untyped-call]
+
+    def resolve_sam_references(
+        self,
+        input: Dict[str, Any],
+        supported_resource_id_refs: Dict[str, str],
+        supported_resource_refs: SupportedResourceReferences,
+        reference_index: Optional[IntrinsicReferenceIndex] = None,
+    ) -> Any:
+        """
+        Resolves both the SAM resource id references and the SAM resource references in a single walk of the input.
+        This gives the same result as calling `resolve_sam_resource_id_refs` followed by `resolve_sam_resource_refs`,
+        because both only look at the strings directly under an intrinsic function, which the other one never changes
+        into something else.
+
+        When an index of the intrinsics of the input is given, only the intrinsics referencing one of the logical ids
+        to resolve are visited, instead of walking the whole input.
+
+        :param dict input: CFN template that needs resolution. This method will modify the input directly.
+        :param dict supported_resource_id_refs: Dictionary that maps old logical ids to new ones.
+        :param SupportedResourceReferences supported_resource_refs: Object that contains information about the resource
+            references supported in this SAM template, along with the value they should resolve to.
+        :param IntrinsicReferenceIndex reference_index: Optional, up to date index of the intrinsics of the input
+        :return: Modified `input` with references resolved
+        """
+        with profile_span("resolve_sam_references", "Intrinsics"):
+            return self._resolve_sam_references(
+                input, supported_resource_id_refs, supported_resource_refs, reference_index
+            )
+
+    def _resolve_sam_references(
+        self,
+        input: Dict[str, Any],
+        supported_resource_id_refs: Dict[str, str],
+        supported_resource_refs: SupportedResourceReferences,
+        reference_index: Optional[IntrinsicReferenceIndex],
+    ) -> Any:
+        resolutions: List[Tuple[Any, Callable[[Any, Any], Any]]] = [
+            (supported_resource_id_refs, self._try_resolve_sam_resource_id_refs),
+            (supported_resource_refs, self._try_resolve_sam_resource_refs),
+        ]
+        if reference_index is None:
+            return self._traverse_all(input, resolutions)
+
+        resolutions = [(data, method) for data, method in resolutions if len(data) > 0]
+        logical_ids = [
+            logical_id
+            for logical_id in reference_index.get_logical_ids()
+            if logical_id in supported_resource_id_refs or supported_resource_refs.get_all(logical_id)  # type: ignore[no-untyped-call]
+        ]
+        # Locations are in pre-order, and rewriting an intrinsic never replaces the containers of the ones nested in it
+        for container, key in reference_index.get_locations(logical_ids):
+            value = container[key]
+            for resolution_data, resolver_method in resolutions:
+                value = resolver_method(value, resolution_data)
+            container[key] = value
+        return input
 
     def _traverse(self, input_value, resolution_data, resolver_method):  # type: ignore[no-untyped-def]
         """
@@ -108,11 +169,29 @@ class IntrinsicsResolver(object):
             is called with the parameters `(input, resolution_data)`.
         :return: Modified `input` with intrinsics resolved
         """
+        return self._traverse_all(input_value, [(resolution_data, resolver_method)])
+
+    def _traverse_all(self, input_value: Any, resolutions: List[Tuple[Any, Callable[[Any, Any], Any]]]) -> Any:
+        """
+        Walks the input once and applies every (resolution_data, resolver_method) pair, in order, on each node.
+
+        :param input_value: Any primitive type  (dict, array, string etc) whose value might contain an intrinsic function
+        :param resolutions: List of (resolution_data, resolver_method) pairs. Pairs without resolution data are skipped.
+        :return: Modified `input` with intrinsics resolved
+        """
 
-        # There is data to help with resolution. Skip the traversal altogether
-        if len(resolution_data) == 0:
+        # Skip the resolutions that have no data to help with resolution, and the traversal altogether if none is left
+        resolutions = [(data, method) for data, method in resolutions if len(data) > 0]
+        if not resolutions:
             return input_value
 
+        def resolve(value: Any) -> Any:
+            # Only dictionaries can be intrinsic functions, everything else is returned as is by the resolver methods
+            if isinstance(value, dict):
+                for resolution_data, resolver_method in resolutions:
+                    value = resolver_method(value, resolution_data)
+            return value
+
         #
         # Traversal Algorithm:
         #
@@ -129,42 +208,34 @@ class IntrinsicsResolver(object):
         # to handle nested intrinsics. All of these cases lend well towards a Pre-Order traversal where we try and
         # process the intrinsic, which results in a modified sub-tree to traverse.
         #
-        input_value = resolver_method(input_value, resolution_data)
-        if isinstance(input_value, dict):
-            return self._traverse_dict(input_value, resolution_data, resolver_method)  # type: ignore[no-untyped-call]
-        if isinstance(input_value, list):
-            return self._traverse_list(input_value, resolution_data, resolver_method)  # type: ignore[no-untyped-call]
-        # We can iterate only over dict or list types. Primitive types are terminals
+        # The traversal uses an explicit stack of (container, keys) iterators instead of recursion, so deeply nested
+        # templates can't hit the recursion limit.
+        #
+        input_value = resolve(input_value)
+        stack = [self._iterate_children(input_value)]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                continue
+            container, key = child
+            value = resolve(container[key])
+            container[key] = value
+            if isinstance(value, (dict, list)):
+                stack.append(self._iterate_children(value))
 
         return input_value
 
-    def _traverse_dict(self, input_dict, resolution_data, resolver_method):  # type: ignore[no-untyped-def]
+    @staticmethod
+    def _iterate_children(value: Any) -> Iterator[Tuple[Any, Any]]:
         """
-        Traverse a dictionary to resolve intrinsic functions on every value
-
-        :param input_dict: Input dictionary to traverse
-        :param resolution_data: Data that the `resolver_method` needs to operate
-        :param resolver_method: Method that can actually resolve an intrinsic function, if it detects one
-        :return: Modified dictionary with values resolved
+        Returns an iterator of (container, key) for every child of a dict or list. Other types have no children.
         """
-        for key, value in input_dict.items():
-            input_dict[key] = self._traverse(value, resolution_data, resolver_method)  # type: ignore[no-untyped-call]
-
-        return input_dict
-
-    def _traverse_list(self, input_list, resolution_data, resolver_method):  # type: ignore[no-untyped-def]
-        """
-        Traverse a list to resolve intrinsic functions on every element
-
-        :param input_list: List of input
-        :param resolution_data: Data that the `resolver_method` needs to operate
-        :param resolver_method: Method that can actually resolve an intrinsic function, if it detects one
-        :return: Modified list with intrinsic functions resolved
-        """
-        for index, value in enumerate(input_list):
-            input_list[index] = self._traverse(value, resolution_data, resolver_method)  # type: ignore[no-untyped-call]
-
-        return input_list
+        if isinstance(value, dict):
+            return ((value, key) for key in value)
+        if isinstance(value, list):
+            return ((value, index) for index in range(len(value)))
+        return iter(())
 
     def _try_resolve_parameter_refs(self, input, parameters):  # type: ignore[no-untyped-def]
         """
@@ -2,8 +2,9 @@
 Method decorator for execution latency collection
 """
 import functools
-from datetime import datetime
+import time
 from samtranslator.metrics.metrics import DummyMetricsPublisher, Metrics
+from samtranslator.metrics.profiler import get_current_profiler
 from samtranslator.model import Resource
 import logging
 from typing import Any, Callable, Optional, Union
@@ -88,17 +89,24 @@ def cw_timer(
     - If 'name' is not provided and caller is not instance of 'Resource' then it will be the name of the function
 
     If prefix is defined, it will be added in the beginning of what is been generated above
+
+    When the translation is profiled, the execution is also recorded as a span of the profiler, named like the metric.
     """
 
     def cw_timer_decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         @functools.wraps(func)
         def wrapper_cw_timer(*args, **kwargs):  # type: ignore[no-untyped-def]
-            start_time = datetime.now()
+            start_time = time.perf_counter_ns()
 
-            exec_result = func(*args, **kwargs)
+            profiler = get_current_profiler()
+            if profiler is None:
+                exec_result = func(*args, **kwargs)
+            else:
+                span_args = {"LogicalId": args[0].logical_id} if args and isinstance(args[0], Resource) else None
+                with profiler.span(_get_metric_name(prefix, name, func, args), "Timer", span_args):  # type: ignore[no-untyped-call]
+                    exec_result = func(*args, **kwargs)
 
-            execution_time = datetime.now() - start_time
-            execution_time_ms = execution_time.total_seconds() * 1000
+            execution_time_ms = (time.perf_counter_ns() - start_time) / 1e6
             _send_cw_metric(prefix, name, execution_time_ms, func, args)  # type: ignore[no-untyped-call]
 
             return exec_result
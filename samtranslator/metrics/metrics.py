@@ -1,8 +1,14 @@
 """
 Helper classes to publish metrics
 """
+import json
 import logging
-from datetime import datetime
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, IO, List, Optional, Tuple
 
 LOG = logging.getLogger(__name__)
 
@@ -57,6 +63,153 @@ class CWMetricsPublisher(MetricsPublisher):
             LOG.exception("Failed to report {} metrics".format(len(metric_data)), exc_info=e)
 
 
+class AsyncMetricsPublisher(MetricsPublisher):
+    """
+    Publishes metrics with another publisher on a background thread, so that publishing is off the request path.
+
+    Published metrics are queued, up to a maximum number of batches: when the queue is full, because the underlying
+    publisher can't keep up, new metrics are dropped rather than slowing translations down.
+    """
+
+    def __init__(self, metrics_publisher: MetricsPublisher, max_queue_size: int = 100) -> None:
+        """
+        Constructor
+
+        :param metrics_publisher: publisher the metrics are published with on the background thread
+        :param max_queue_size: maximum number of publish calls waiting to be published
+        """
+        MetricsPublisher.__init__(self)
+        self.metrics_publisher = metrics_publisher
+        self._queue: "queue.Queue[Tuple[str, List[Any]]]" = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def publish(self, namespace, metrics):  # type: ignore[no-untyped-def]
+        """
+        Queues the metrics to be published on the background thread.
+
+        :param namespace: namespace applied to all metrics published.
+        :param metrics: list of metrics to be published
+        """
+        if not metrics:
+            return
+        self._start()
+        try:
+            self._queue.put_nowait((namespace, list(metrics)))
+        except queue.Full:
+            LOG.warning("Metrics queue is full, dropping {} metrics".format(len(metrics)))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits for the queued metrics to be published, e.g. before the process exits.
+
+        :param timeout: maximum time to wait in seconds, None to wait until the queue is empty
+        :return: True if all the queued metrics were published
+        """
+        if timeout is None:
+            self._queue.join()
+            return True
+        # Same wait as Queue.join(), which can't time out
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="AsyncMetricsPublisher", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            namespace, metrics = self._queue.get()
+            try:
+                self.metrics_publisher.publish(namespace, metrics)  # type: ignore[no-untyped-call]
+            except Exception as e:
+                LOG.exception("Failed to publish {} metrics".format(len(metrics)), exc_info=e)
+            finally:
+                self._queue.task_done()
+
+
+class EMFMetricsPublisher(MetricsPublisher):
+    """
+    Writes metrics to a stream in the CloudWatch Embedded Metric Format (EMF), one JSON document per line, instead of
+    calling the CloudWatch API. CloudWatch extracts the metrics from the logs the stream ends up in, e.g. the standard
+    output of a Lambda function.
+    """
+
+    # Limits of EMF on the number of metrics in a document and of values of a metric
+    MAX_METRICS = 100
+    MAX_VALUES = 100
+
+    def __init__(self, stream: Optional[IO[str]] = None) -> None:
+        """
+        Constructor
+
+        :param stream: stream the JSON documents are written to, the standard output by default
+        """
+        MetricsPublisher.__init__(self)
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def publish(self, namespace, metrics):  # type: ignore[no-untyped-def]
+        """
+        Writes the metrics to the stream, grouped by their dimensions.
+
+        :param namespace: namespace applied to all metrics published.
+        :param metrics: list of metrics to be published
+        """
+        lines = [json.dumps(document) for document in self._get_documents(namespace, metrics)]
+        if not lines:
+            return
+        stream = self.stream if self.stream else sys.stdout
+        with self._lock:
+            stream.write("".join(line + "\n" for line in lines))
+            stream.flush()
+
+    def _get_documents(self, namespace: str, metrics: List[Any]) -> List[Dict[str, Any]]:
+        # Metrics sharing the same dimensions are written in the same documents
+        groups: Dict[Tuple[Tuple[str, str], ...], Dict[str, Any]] = {}
+        for metric in metrics:
+            dimensions = tuple((dimension["Name"], dimension["Value"]) for dimension in metric.dimensions)
+            group = groups.setdefault(dimensions, {"Timestamp": metric.timestamp, "Metrics": {}})
+            group["Timestamp"] = min(group["Timestamp"], metric.timestamp)
+            unit, values = group["Metrics"].setdefault(metric.name, (metric.unit, []))
+            values.extend(metric.get_values())
+
+        documents = []
+        for dimensions, group in groups.items():
+            timestamp = int(group["Timestamp"].replace(tzinfo=timezone.utc).timestamp() * 1000)
+            names = list(group["Metrics"])
+            for start in range(0, len(names), self.MAX_METRICS):
+                chunk = [(name, group["Metrics"][name]) for name in names[start : start + self.MAX_METRICS]]
+                max_values = max(len(values) for _, (_, values) in chunk)
+                for offset in range(0, max_values, self.MAX_VALUES):
+                    document: Dict[str, Any] = dict(dimensions)
+                    definitions = []
+                    for name, (unit, values) in chunk:
+                        if offset < len(values):
+                            document[name] = values[offset : offset + self.MAX_VALUES]
+                            definitions.append({"Name": name, "Unit": unit})
+                    document["_aws"] = {
+                        "Timestamp": timestamp,
+                        "CloudWatchMetrics": [
+                            {
+                                "Namespace": namespace,
+                                "Dimensions": [[name for name, _ in dimensions]],
+                                "Metrics": definitions,
+                            }
+                        ],
+                    }
+                    documents.append(document)
+        return documents
+
+
 class DummyMetricsPublisher(MetricsPublisher):
     def __init__(self) -> None:
         MetricsPublisher.__init__(self)
@@ -110,18 +263,92 @@ class MetricDatum:
             "Timestamp": self.timestamp,
         }
 
+    def get_values(self) -> List[Any]:
+        """Returns the values of all the samples of the metric"""
+        return [self.value]
+
+
+class AggregatedMetricDatum(MetricDatum):
+    """
+    Class to hold the aggregated samples of a metric: their count, sum, minimum and maximum are published as one
+    statistic set instead of one datum per sample.
+
+    The samples themselves are not kept, only a histogram of their values for the publishers that can't publish
+    statistic sets. The histogram has at most MAX_HISTOGRAM_VALUES distinct values: when it is full, a sample with a
+    new value is counted for the closest value of the histogram instead.
+    """
+
+    MAX_HISTOGRAM_VALUES = 100
+
+    def __init__(self, name, unit, dimensions=None, timestamp=None):  # type: ignore[no-untyped-def]
+        """
+        Constructor
+
+        :param name: metric name
+        :param unit: unit of metric (try using values from Unit class)
+        :param dimensions: array of dimensions applied to the metric
+        :param timestamp: timestamp of metric (datetime.datetime object)
+        """
+        MetricDatum.__init__(self, name, None, unit, dimensions, timestamp)  # type: ignore[no-untyped-call]
+        # Number of samples of each value
+        self.histogram: Dict[Any, int] = {}
+        self.sample_count = 0
+        self.sum = 0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, value: Any) -> None:
+        """
+        Adds a sample to the aggregated ones
+
+        :param value: value of the sample
+        """
+        if value not in self.histogram and len(self.histogram) >= self.MAX_HISTOGRAM_VALUES:
+            histogram_value = min(self.histogram, key=lambda known_value: float(abs(known_value - value)))
+        else:
+            histogram_value = value
+        self.histogram[histogram_value] = self.histogram.get(histogram_value, 0) + 1
+        self.sample_count += 1
+        self.sum += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        # Latest value, like for non aggregated metrics
+        self.value = value
+
+    def get_metric_data(self):  # type: ignore[no-untyped-def]
+        return {
+            "MetricName": self.name,
+            "StatisticValues": {
+                "SampleCount": self.sample_count,
+                "Sum": self.sum,
+                "Minimum": self.minimum,
+                "Maximum": self.maximum,
+            },
+            "Unit": self.unit,
+            "Dimensions": self.dimensions,
+            "Timestamp": self.timestamp,
+        }
+
+    def get_values(self) -> List[Any]:
+        """Returns the values of the histogram, each repeated as many times as it was sampled"""
+        return [value for value, count in sorted(self.histogram.items()) for _ in range(count)]
+
 
 class Metrics:
-    def __init__(self, namespace="ServerlessTransform", metrics_publisher=None):  # type: ignore[no-untyped-def]
+    def __init__(self, namespace="ServerlessTransform", metrics_publisher=None, aggregate=False):  # type: ignore[no-untyped-def]
         """
         Constructor
 
         :param namespace: namespace under which all metrics will be published
         :param metrics_publisher: publisher to publish all metrics
+        :param aggregate: whether to aggregate the samples of a metric with the same unit and dimensions into one
+            AggregatedMetricDatum, instead of keeping one MetricDatum per sample
         """
         self.metrics_publisher = metrics_publisher if metrics_publisher else DummyMetricsPublisher()
         self.metrics_cache = {}
         self.namespace = namespace
+        self.aggregate = aggregate
+        self._aggregated_metrics: Dict[Tuple[Any, ...], AggregatedMetricDatum] = {}
 
     def __del__(self):  # type: ignore[no-untyped-def]
         if len(self.metrics_cache) > 0:
@@ -141,7 +368,17 @@ class Metrics:
         :param dimensions: array of dimensions applied to the metric
         :param timestamp: timestamp of metric (datetime.datetime object)
         """
-        self.metrics_cache.setdefault(name, []).append(MetricDatum(name, value, unit, dimensions, timestamp))  # type: ignore[no-untyped-call]
+        if not self.aggregate:
+            self.metrics_cache.setdefault(name, []).append(MetricDatum(name, value, unit, dimensions, timestamp))  # type: ignore[no-untyped-call]
+            return
+
+        key = (name, unit, json.dumps(dimensions, sort_keys=True, default=str), timestamp)
+        metric = self._aggregated_metrics.get(key)
+        if metric is None:
+            metric = AggregatedMetricDatum(name, unit, dimensions, timestamp)  # type: ignore[no-untyped-call]
+            self._aggregated_metrics[key] = metric
+            self.metrics_cache.setdefault(name, []).append(metric)
+        metric.add(value)
 
     def record_count(self, name, value, dimensions=None, timestamp=None):  # type: ignore[no-untyped-def]
         """
@@ -176,6 +413,7 @@ class Metrics:
             all_metrics.extend(m)
         self.metrics_publisher.publish(self.namespace, all_metrics)
         self.metrics_cache = {}
+        self._aggregated_metrics = {}
 
     def get_metric(self, name):  # type: ignore[no-untyped-def]
         """
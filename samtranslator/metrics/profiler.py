@@ -0,0 +1,206 @@
+"""
+Profiler of the phases of a translation
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+
+class ProfilerSpan(object):
+    """
+    Time spent in one phase of a translation, with the phases nested in it.
+    """
+
+    __slots__ = ("name", "category", "args", "start_ns", "end_ns", "thread_id", "children")
+
+    def __init__(self, name: str, category: str, args: Optional[Dict[str, Any]], start_ns: int, thread_id: int) -> None:
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start_ns = start_ns
+        self.end_ns = start_ns
+        self.thread_id = thread_id
+        self.children: List["ProfilerSpan"] = []
+
+    @property
+    def duration_ns(self) -> int:
+        return self.end_ns - self.start_ns
+
+    @property
+    def self_time_ns(self) -> int:
+        """Time spent in the span itself, outside of its children"""
+        return self.duration_ns - sum(child.duration_ns for child in self.children)
+
+
+class Profiler(object):
+    """
+    Records nested spans of the phases of a translation: schema validation, plugin hooks, resource translations,
+    event sources, deployment preferences and intrinsic resolution passes.
+
+    The profiler is opt-in: pass it to Translator.translate(). Spans are only recorded while a profiler is in use, so
+    the instrumentation costs nothing otherwise. The recorded spans can be written as a JSON report, or as a trace in
+    the Chrome trace event format, which can be opened with chrome://tracing or https://ui.perfetto.dev
+    """
+
+    def __init__(self) -> None:
+        self.spans: List[ProfilerSpan] = []
+        self._start_ns = time.perf_counter_ns()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, category: str, args: Optional[Dict[str, Any]] = None) -> Iterator[ProfilerSpan]:
+        """
+        Records the time spent in the block as a span, nested in the span of the enclosing block of the same thread.
+
+        :param name: Name of the span, e.g. the logical ID of the resource being translated
+        :param category: Category of the span, e.g. "Resource" or "Plugin"
+        :param args: Optional details of the span, included in the report and the trace
+        """
+        stack: List[ProfilerSpan] = self._local.__dict__.setdefault("stack", [])
+        span = ProfilerSpan(name, category, args, time.perf_counter_ns(), threading.get_ident())
+        if stack:
+            stack[-1].children.append(span)
+        else:
+            with self._lock:
+                self.spans.append(span)
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            span.end_ns = time.perf_counter_ns()
+            stack.pop()
+
+    def get_report(self) -> Dict[str, Any]:
+        """
+        Returns the report of the spans: their tree, and a summary of the time spent per category and name, slowest
+        first.
+        """
+        summary: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for span in self._iterate_spans():
+            entry = summary.setdefault(
+                (span.category, span.name),
+                {"Category": span.category, "Name": span.name, "Count": 0, "TotalTimeMs": 0.0, "SelfTimeMs": 0.0},
+            )
+            entry["Count"] += 1
+            entry["TotalTimeMs"] += span.duration_ns / 1e6
+            entry["SelfTimeMs"] += span.self_time_ns / 1e6
+
+        return {
+            "TotalTimeMs": sum(span.duration_ns for span in self.spans) / 1e6,
+            "Spans": [self._span_to_dict(span) for span in self.spans],
+            "Summary": sorted(summary.values(), key=lambda entry: float(entry["TotalTimeMs"]), reverse=True),
+        }
+
+    def get_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Returns the spans in the Chrome trace event format, as complete events
+        """
+        pid = os.getpid()
+        events = []
+        for span in self._iterate_spans():
+            event = {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (span.start_ns - self._start_ns) / 1e3,
+                "dur": span.duration_ns / 1e3,
+                "pid": pid,
+                "tid": span.thread_id,
+            }
+            if span.args:
+                event["args"] = span.args
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_report(self, file_path: str) -> None:
+        """
+        Writes the JSON report of the spans to a file
+
+        :param file_path: Path of the file
+        """
+        with open(file_path, "w", encoding="utf-8") as fp:
+            json.dump(self.get_report(), fp, indent=2, default=str)
+
+    def write_chrome_trace(self, file_path: str) -> None:
+        """
+        Writes the trace of the spans to a file, in the Chrome trace event format
+
+        :param file_path: Path of the file
+        """
+        with open(file_path, "w", encoding="utf-8") as fp:
+            json.dump(self.get_chrome_trace(), fp, default=str)
+
+    def _iterate_spans(self) -> Iterator[ProfilerSpan]:
+        stack = list(reversed(self.spans))
+        while stack:
+            span = stack.pop()
+            yield span
+            stack.extend(reversed(span.children))
+
+    def _span_to_dict(self, span: ProfilerSpan) -> Dict[str, Any]:
+        span_dict: Dict[str, Any] = {
+            "Name": span.name,
+            "Category": span.category,
+            "StartMs": (span.start_ns - self._start_ns) / 1e6,
+            "DurationMs": span.duration_ns / 1e6,
+            "SelfTimeMs": span.self_time_ns / 1e6,
+        }
+        if span.args:
+            span_dict["Args"] = span.args
+        if span.children:
+            span_dict["Children"] = [self._span_to_dict(child) for child in span.children]
+        return span_dict
+
+
+_CURRENT_PROFILER: ContextVar[Optional[Profiler]] = ContextVar("samtranslator_profiler", default=None)
+
+
+@contextmanager
+def use_profiler(profiler: Optional[Profiler]) -> Iterator[None]:
+    """
+    Records the spans of the block in the given profiler, if any
+
+    :param profiler: Profiler to record the spans in, None to not record them
+    """
+    token = _CURRENT_PROFILER.set(profiler)
+    try:
+        yield
+    finally:
+        _CURRENT_PROFILER.reset(token)
+
+
+def get_current_profiler() -> Optional[Profiler]:
+    """
+    Returns the profiler spans are recorded in, None if the translation is not profiled
+    """
+    return _CURRENT_PROFILER.get()
+
+
+class _NoSpan(object):
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *args: Any) -> None:
+        return None
+
+
+_NO_SPAN = _NoSpan()
+
+
+def profile_span(name: str, category: str, args: Optional[Dict[str, Any]] = None) -> ContextManager[Any]:
+    """
+    Records the time spent in the block as a span of the current profiler, does nothing if there isn't one.
+
+    :param name: Name of the span
+    :param category: Category of the span
+    :param args: Optional details of the span
+    """
+    profiler = _CURRENT_PROFILER.get()
+    if profiler is None:
+        return _NO_SPAN
+    return profiler.span(name, category, args)
@@ -25,13 +25,12 @@ from samtranslator.model.exceptions import (
 )
 from samtranslator.model.s3_utils.uri_parser import parse_s3_uri
 from samtranslator.region_configuration import RegionConfiguration
-from samtranslator.schema.common import PassThrough
 from samtranslator.swagger.swagger import SwaggerEditor
 from samtranslator.model.intrinsics import is_intrinsic, fnSub
 from samtranslator.model.lambda_ import LambdaPermission
 from samtranslator.translator.logical_id_generator import LogicalIdGenerator
 from samtranslator.translator.arn_generator import ArnGenerator
-from samtranslator.utils.types import Intrinsicable
+from samtranslator.utils.types import Intrinsicable, PassThrough
 from samtranslator.model.tags.resource_tagging import get_tag_list
 from samtranslator.utils.py27hash_fix import Py27Dict, Py27UniStr
 from samtranslator.utils.utils import InvalidValueType, dict_deep_get
@@ -222,6 +221,9 @@ class ApiGenerator(object):
         self.variables = variables
         self.depends_on = depends_on
         self.definition_body = definition_body
+        # Whether the definition body was returned by an editor of this generator, and so can be handed over to its
+        # next editor. The definition body given to the generator is never modified by its editors.
+        self._owns_definition_body = False
         self.definition_uri = definition_uri
         self.name = name
         self.stage_name = stage_name
@@ -328,9 +330,10 @@ class ApiGenerator(object):
             raise InvalidResourceException(
                 self.logical_id, "DisableExecuteApiEndpoint works only within 'DefinitionBody' property."
             )
-        editor = SwaggerEditor(self.definition_body)
+        editor = SwaggerEditor(self.definition_body, owns_doc=self._owns_definition_body)
         editor.add_disable_execute_api_endpoint_extension(self.disable_execute_api_endpoint)
         self.definition_body = editor.swagger
+        self._owns_definition_body = True
 
     def _construct_body_s3_dict(self) -> Dict[str, Any]:
         """Constructs the RestApi's `BodyS3Location property`_, from the SAM Api's DefinitionUri property.
@@ -679,7 +682,7 @@ class ApiGenerator(object):
                 "'AllowOrigin' is \"'*'\" or not set",
             )
 
-        editor = SwaggerEditor(self.definition_body)
+        editor = SwaggerEditor(self.definition_body, owns_doc=self._owns_definition_body)
         for path in editor.iter_on_path():
             try:
                 editor.add_cors(  # type: ignore[no-untyped-call]
@@ -695,6 +698,7 @@ class ApiGenerator(object):
 
         # Assign the Swagger back to template
         self.definition_body = editor.swagger
+        self._owns_definition_body = True
 
     def _add_binary_media_types(self) -> None:
         """
@@ -708,11 +712,12 @@ class ApiGenerator(object):
         if self.binary_media and not self.definition_body:
             return
 
-        editor = SwaggerEditor(self.definition_body)
+        editor = SwaggerEditor(self.definition_body, owns_doc=self._owns_definition_body)
         editor.add_binary_media_types(self.binary_media)  # type: ignore[no-untyped-call]
 
         # Assign the Swagger back to template
         self.definition_body = editor.swagger
+        self._owns_definition_body = True
 
     def _add_auth(self) -> None:
         """
@@ -737,7 +742,7 @@ class ApiGenerator(object):
                 "Unable to add Auth configuration because "
                 "'DefinitionBody' does not contain a valid Swagger definition.",
             )
-        swagger_editor = SwaggerEditor(self.definition_body)
+        swagger_editor = SwaggerEditor(self.definition_body, owns_doc=self._owns_definition_body)
         auth_properties = AuthProperties(**self.auth)
         authorizers = self._get_authorizers(auth_properties.Authorizers, auth_properties.DefaultAuthorizer)  # type: ignore[no-untyped-call]
 
@@ -764,6 +769,7 @@ class ApiGenerator(object):
                 swagger_editor.add_custom_statements(auth_properties.ResourcePolicy.get("CustomStatements"))  # type: ignore[no-untyped-call]
 
         self.definition_body = self._openapi_postprocess(swagger_editor.swagger)
+        self._owns_definition_body = True
 
     def _construct_usage_plan(self, rest_api_stage: Optional[ApiGatewayStage] = None) -> Any:
         """Constructs and returns the ApiGateway UsagePlan, ApiGateway UsagePlanKey, ApiGateway ApiKey for Auth.
@@ -972,7 +978,7 @@ class ApiGenerator(object):
                 "'DefinitionBody' does not contain a valid Swagger definition.",
             )
 
-        swagger_editor = SwaggerEditor(self.definition_body)
+        swagger_editor = SwaggerEditor(self.definition_body, owns_doc=self._owns_definition_body)
 
         # The dicts below will eventually become part of swagger/openapi definition, thus requires using Py27Dict()
         gateway_responses = Py27Dict()
@@ -996,6 +1002,7 @@ class ApiGenerator(object):
 
         # Assign the Swagger back to template
         self.definition_body = swagger_editor.swagger
+        self._owns_definition_body = True
 
     def _add_models(self) -> None:
         """
@@ -1021,12 +1028,13 @@ class ApiGenerator(object):
         if not all(isinstance(model, dict) for model in self.models.values()):
             raise InvalidResourceException(self.logical_id, "Invalid value for 'Models' property")
 
-        swagger_editor = SwaggerEditor(self.definition_body)
+        swagger_editor = SwaggerEditor(self.definition_body, owns_doc=self._owns_definition_body)
         swagger_editor.add_models(self.models)  # type: ignore[no-untyped-call]
 
         # Assign the Swagger back to template
 
         self.definition_body = self._openapi_postprocess(swagger_editor.swagger)
+        self._owns_definition_body = True
 
     def _openapi_postprocess(self, definition_body: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -75,6 +75,9 @@ class HttpApiGenerator(object):
         self.stage_variables = stage_variables
         self.depends_on = depends_on
         self.definition_body = definition_body
+        # Whether the definition body was returned by an editor of this generator, and so can be handed over to its
+        # next editor. The definition body given to the generator is never modified by its editors.
+        self._owns_definition_body = False
         self.definition_uri = definition_uri
         self.stage_name = stage_name
         self.name = name
@@ -152,7 +155,7 @@ class HttpApiGenerator(object):
             raise InvalidResourceException(
                 self.logical_id, "DisableExecuteApiEndpoint works only within 'DefinitionBody' property."
             )
-        editor = OpenApiEditor(self.definition_body)
+        editor = OpenApiEditor(self.definition_body, owns_doc=self._owns_definition_body)
 
         # if DisableExecuteApiEndpoint is set in both definition_body and as a property,
         # SAM merges and overrides the disableExecuteApiEndpoint in definition_body with headers of
@@ -161,6 +164,7 @@ class HttpApiGenerator(object):
 
         # Assign the OpenApi back to template
         self.definition_body = editor.openapi
+        self._owns_definition_body = True
 
     def _add_cors(self) -> None:
         """
@@ -210,7 +214,7 @@ class HttpApiGenerator(object):
                 "'AllowOrigin' is \"'*'\" or not set.",
             )
 
-        editor = OpenApiEditor(self.definition_body)
+        editor = OpenApiEditor(self.definition_body, owns_doc=self._owns_definition_body)
         # if CORS is set in both definition_body and as a CorsConfiguration property,
         # SAM merges and overrides the cors headers in definition_body with headers of CorsConfiguration
         editor.add_cors(  # type: ignore[no-untyped-call]
@@ -224,6 +228,7 @@ class HttpApiGenerator(object):
 
         # Assign the OpenApi back to template
         self.definition_body = editor.openapi
+        self._owns_definition_body = True
 
     def _update_default_path(self) -> None:
         # Only do the following if FailOnWarnings is enabled for backward compatibility.
@@ -475,7 +480,7 @@ class HttpApiGenerator(object):
                 self.logical_id,
                 "Unable to add Auth configuration because 'DefinitionBody' does not contain a valid OpenApi definition.",
             )
-        open_api_editor = OpenApiEditor(self.definition_body)
+        open_api_editor = OpenApiEditor(self.definition_body, owns_doc=self._owns_definition_body)
         auth_properties = AuthProperties(**self.auth)
         authorizers = self._get_authorizers(auth_properties.Authorizers, auth_properties.EnableIamAuthorizer)
 
@@ -483,6 +488,7 @@ class HttpApiGenerator(object):
         open_api_editor.add_authorizers_security_definitions(authorizers)
         self._set_default_authorizer(open_api_editor, authorizers, auth_properties.DefaultAuthorizer)
         self.definition_body = open_api_editor.openapi
+        self._owns_definition_body = True
 
     def _add_tags(self) -> None:
         """
@@ -508,11 +514,12 @@ class HttpApiGenerator(object):
             self.tags = {}
         self.tags[HttpApiTagName] = "SAM"
 
-        open_api_editor = OpenApiEditor(self.definition_body)
+        open_api_editor = OpenApiEditor(self.definition_body, owns_doc=self._owns_definition_body)
 
         # authorizers is guaranteed to return a value or raise an exception
         open_api_editor.add_tags(self.tags)
         self.definition_body = open_api_editor.openapi
+        self._owns_definition_body = True
 
     def _set_default_authorizer(
         self,
@@ -681,9 +688,10 @@ class HttpApiGenerator(object):
                 "'DefinitionBody' property.",
             )
 
-        open_api_editor = OpenApiEditor(self.definition_body)
+        open_api_editor = OpenApiEditor(self.definition_body, owns_doc=self._owns_definition_body)
         open_api_editor.add_description(self.description)
         self.definition_body = open_api_editor.openapi
+        self._owns_definition_body = True
 
     def _add_title(self) -> None:
         if not self.name:
@@ -709,9 +717,10 @@ class HttpApiGenerator(object):
                 "'DefinitionBody' property.",
             )
 
-        open_api_editor = OpenApiEditor(self.definition_body)
+        open_api_editor = OpenApiEditor(self.definition_body, owns_doc=self._owns_definition_body)
         open_api_editor.add_title(self.name)
         self.definition_body = open_api_editor.openapi
+        self._owns_definition_body = True
 
     @cw_timer(prefix="Generator", name="HttpApi")  # type: ignore[misc]
     def to_cloudformation(
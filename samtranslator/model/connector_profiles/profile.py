@@ -2,16 +2,31 @@ import copy
 import json
 import os
 import re
+from functools import lru_cache
 from typing import Any, Dict
 
 ConnectorProfile = Dict[str, Any]
 
-with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles.json"), encoding="utf-8") as f:
-    PROFILE: ConnectorProfile = json.load(f)
+
+@lru_cache(maxsize=None)
+def _load_profiles() -> ConnectorProfile:
+    """
+    Loads profiles.json on first use instead of at import, as only templates with connectors need it.
+    """
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles.json"), encoding="utf-8") as f:
+        profiles: ConnectorProfile = json.load(f)
+    return profiles
+
+
+def __getattr__(name: str) -> Any:
+    # PROFILE used to be loaded at import; keep it available as a module attribute
+    if name == "PROFILE":
+        return _load_profiles()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_profile(source_type: str, dest_type: str):  # type: ignore[no-untyped-def]
-    profile = PROFILE["Permissions"].get(source_type, {}).get(dest_type)
+    profile = _load_profiles()["Permissions"].get(source_type, {}).get(dest_type)
     # Ensure not passing a mutable shared variable
     return copy.deepcopy(profile)
 
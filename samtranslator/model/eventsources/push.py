@@ -738,7 +738,7 @@ class Api(PushEventSource):
         partition = ArnGenerator.get_partition_name()
         uri = _build_apigw_integration_uri(function, partition)  # type: ignore[no-untyped-call]
 
-        editor = SwaggerEditor(swagger_body)
+        editor = SwaggerEditor(swagger_body, owns_doc=True)
 
         if editor.has_integration(self.Path, self.Method):
             # Cannot add the Lambda Integration, if it is already present
@@ -1266,7 +1266,7 @@ class HttpApi(PushEventSource):
 
         uri = _build_apigw_integration_uri(function, "${AWS::Partition}")  # type: ignore[no-untyped-call]
 
-        editor = OpenApiEditor(open_api_body)
+        editor = OpenApiEditor(open_api_body, owns_doc=True)
 
         if manage_swagger and editor.has_integration(self.Path, self.Method):  # type: ignore[attr-defined]
             # Cannot add the Lambda Integration, if it is already present
@@ -79,8 +79,7 @@ from samtranslator.model.sns import SNSTopic, SNSTopicPolicy
 from samtranslator.model.stepfunctions import StateMachineGenerator
 from samtranslator.model.role_utils import construct_role_for_resource
 from samtranslator.model.xray_utils import get_xray_managed_policy_name
-from samtranslator.utils.types import Intrinsicable
-from samtranslator.schema.common import PassThrough
+from samtranslator.utils.types import Intrinsicable, PassThrough
 from samtranslator.validator.value_validator import sam_expect
 
 
@@ -367,7 +367,7 @@ class Api(EventSource):
 
         integration_uri = fnSub("arn:${AWS::Partition}:apigateway:${AWS::Region}:states:action/StartExecution")
 
-        editor = SwaggerEditor(swagger_body)
+        editor = SwaggerEditor(swagger_body, owns_doc=True)
 
         if editor.has_integration(self.Path, self.Method):
             # Cannot add the integration, if it is already present
@@ -1,12 +1,94 @@
 """Base class for OpenApiEditor and SwaggerEditor."""
+
+import copy
 import re
-from typing import Any, Dict, Iterator, List, Optional, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
 
 from samtranslator.model.apigateway import ApiGatewayAuthorizer
 from samtranslator.model.apigatewayv2 import ApiGatewayV2Authorizer
 from samtranslator.model.exceptions import InvalidDocumentException, InvalidTemplateException
 from samtranslator.model.intrinsics import is_intrinsic_no_value, make_conditional
-from samtranslator.utils.py27hash_fix import Py27Dict
+from samtranslator.utils.py27hash_fix import Py27Dict, is_unchanged_by_deepcopies
+
+
+class CopyOnAccessPaths(Py27Dict):
+    """
+    Paths of an editor document, sharing their path items with the document the editor was handed over until they are
+    accessed. Accessing a path item through this class (`paths[path]`, `get`, `setdefault`, `pop`, `items`, `values`,
+    `copy`) first replaces it with a copy, so the editor can modify it in place without modifying the document it was
+    handed over. `dict(paths)`, `{**paths}` and `json.dumps(paths)` go through these methods too, only calling the
+    `dict` methods directly (ex: `dict.items(paths)`) reads the shared path items.
+
+    A deep copy of the paths (ex: when the editor returns its document) keeps sharing the path items that were not
+    accessed, unless copying them would change their Python 2.7 key order. So an editor on a large document only
+    copies the few paths it works on.
+    """
+
+    def __init__(self, paths: Py27Dict) -> None:
+        """
+        :param paths: Paths of the document the editor was created on
+        """
+        super().__init__()
+        # Same keys as a deep copy of the paths
+        self.keylist = copy.deepcopy(paths.keylist)
+        for key, value in dict.items(paths):
+            dict.__setitem__(self, key, value)
+        self._shared_keys = set(dict.keys(self))
+
+    def _own(self, key: Any) -> None:
+        """Replaces the path item at `key` with a copy, if it is still shared"""
+        if key in self._shared_keys:
+            self._shared_keys.remove(key)
+            dict.__setitem__(self, key, copy.deepcopy(dict.__getitem__(self, key)))
+
+    def __getitem__(self, key: Any) -> Any:
+        self._own(key)
+        return super().__getitem__(key)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def values(self):  # type: ignore[no-untyped-def]
+        return [self[k] for k in self.keys()]  # type: ignore[no-untyped-call]
+
+    def items(self):  # type: ignore[no-untyped-def]
+        return [(k, self[k]) for k in self.keys()]  # type: ignore[no-untyped-call]
+
+    def copy(self):  # type: ignore[no-untyped-def]
+        new = Py27Dict()
+        new.keylist = self.keylist.copy()  # type: ignore[no-untyped-call]
+        for k, v in self.items():  # type: ignore[no-untyped-call]
+            new[k] = v
+        return new
+
+    def __setitem__(self, key, value):  # type: ignore[no-untyped-def]
+        self._shared_keys.discard(key)
+        super().__setitem__(key, value)  # type: ignore[no-untyped-call]
+
+    def __delitem__(self, key):  # type: ignore[no-untyped-def]
+        self._shared_keys.discard(key)
+        super().__delitem__(key)  # type: ignore[no-untyped-call]
+
+    def pop(self, key, default=None):  # type: ignore[no-untyped-def]
+        self._own(key)
+        return super().pop(key, default)  # type: ignore[no-untyped-call]
+
+    def clear(self):  # type: ignore[no-untyped-def]
+        self._shared_keys.clear()
+        super().clear()  # type: ignore[no-untyped-call]
+
+    def __deepcopy__(self, memo):  # type: ignore[no-untyped-def]
+        result = Py27Dict()
+        result.keylist = copy.deepcopy(self.keylist, memo)
+        for key, value in dict.items(self):
+            if key not in self._shared_keys:
+                value = copy.deepcopy(value, memo)
+            # A shared path item stands for its copy in this object, so this copy must be a copy of that copy. Both
+            # copies are skipped when they would not change anything.
+            elif not is_unchanged_by_deepcopies(value, 2):
+                value = copy.deepcopy(copy.deepcopy(value), memo)
+            dict.__setitem__(result, copy.deepcopy(key, memo), value)
+        return result
 
 
 class BaseEditor(object):
@@ -23,6 +105,21 @@ class BaseEditor(object):
     _doc: Dict[str, Any]
     paths: Dict[str, Any]
 
+    @staticmethod
+    def _copy_input_doc(doc: Dict[str, Any], deepcopy: Callable[..., Any], owns_doc: bool) -> Dict[str, Any]:
+        """
+        Returns the copy of the document the editor works on. When the caller hands the document over, its path items
+        are only copied when the editor accesses them (see CopyOnAccessPaths).
+
+        :param doc: Document the editor is created on
+        :param deepcopy: copy.deepcopy function to use
+        :param owns_doc: Whether the caller hands the document over to the editor
+        """
+        paths = doc.get("paths")
+        if owns_doc and isinstance(paths, Py27Dict):
+            return deepcopy(doc, {id(paths): CopyOnAccessPaths(paths)})  # type: ignore[no-any-return]
+        return deepcopy(doc)  # type: ignore[no-any-return]
+
     @staticmethod
     def get_conditional_contents(item: Any) -> List[Any]:
         """
@@ -87,7 +184,8 @@ class BaseEditor(object):
         :yields string: Path name
         """
 
-        for path, _ in self.paths.items():
+        # Iterates on the keys, so the path items are not accessed
+        for path in self.paths.keys():
             yield path
 
     @staticmethod
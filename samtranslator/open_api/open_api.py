@@ -1,6 +1,6 @@
 import copy
 import re
-from typing import Callable, Any, Dict, Optional, TypeVar
+from typing import Callable, Any, Dict, Optional
 
 from samtranslator.metrics.method_decorator import cw_timer
 from samtranslator.model.apigatewayv2 import ApiGatewayV2Authorizer
@@ -12,12 +12,8 @@ from samtranslator.utils.types import Intrinsicable
 from samtranslator.utils.utils import dict_deep_get, InvalidValueType
 import json
 
-
-T = TypeVar("T")
-
-
 # Wrap around copy.deepcopy to isolate time cost to deepcopy the doc.
-_deepcopy: Callable[[T], T] = cw_timer(prefix="OpenApiEditor")(copy.deepcopy)
+_deepcopy: Callable[..., Any] = cw_timer(prefix="OpenApiEditor")(copy.deepcopy)
 
 
 class OpenApiEditor(BaseEditor):
@@ -43,12 +39,15 @@ class OpenApiEditor(BaseEditor):
     # Attributes:
     _doc: Dict[str, Any]
 
-    def __init__(self, doc: Optional[Dict[str, Any]]) -> None:
+    def __init__(self, doc: Optional[Dict[str, Any]], owns_doc: bool = False) -> None:
         """
         Initialize the class with a swagger dictionary. This class creates a copy of the Swagger and performs all
         modifications on this copy.
 
         :param dict doc: OpenApi document as a dictionary
+        :param bool owns_doc: Whether the caller hands the document over to the editor, ie. replaces it with the
+            document the editor returns and never reads or modifies it otherwise. The path items of the document are
+            then only copied when the editor accesses them, and the document it returns shares the other ones.
         :raises InvalidDocumentException: If the input OpenApi document does not meet the basic OpenApi requirements.
         """
         if not doc or not OpenApiEditor.is_valid(doc):
@@ -60,7 +59,7 @@ class OpenApiEditor(BaseEditor):
                 ]
             )
 
-        self._doc = _deepcopy(doc)
+        self._doc = self._copy_input_doc(doc, _deepcopy, owns_doc)
         self.paths = self._doc["paths"]
         try:
             self.security_schemes = dict_deep_get(self._doc, "components.securitySchemes") or Py27Dict()
@@ -521,6 +520,8 @@ class OpenApiEditor(BaseEditor):
     def openapi(self) -> Dict[str, Any]:
         """
         Returns a **copy** of the OpenApi specification as a dictionary.
+        When the editor was handed its document over, the copy shares the path items the editor did not access with
+        that document.
 
         :return dict: Dictionary containing the OpenApi specification
         """
@@ -538,7 +539,7 @@ class OpenApiEditor(BaseEditor):
         if self.info:
             self._doc["info"] = self.info
 
-        return _deepcopy(self._doc)
+        return _deepcopy(self._doc)  # type: ignore[no-any-return]
 
     @staticmethod
     def is_valid(data: Any) -> bool:
@@ -1,7 +1,8 @@
 import logging
 
+from samtranslator.metrics.profiler import profile_span
 from samtranslator.model.exceptions import InvalidDocumentException, InvalidTemplateException, InvalidResourceException
-from samtranslator.validator.validator import SamTemplateValidator
+from samtranslator.validator.validator import SamTemplateValidatorCache
 from samtranslator.plugins import LifeCycleEvents
 from samtranslator.public.sdk.template import SamTemplate
 
@@ -65,8 +66,9 @@ class Parser:
         Parser.validate_datatypes(sam_template)  # type: ignore[no-untyped-call]
 
         try:
-            validator = SamTemplateValidator()  # type: ignore[no-untyped-call]
-            validation_errors = validator.validate(sam_template)  # type: ignore[no-untyped-call]
+            validator = SamTemplateValidatorCache.get_instance().get()
+            with profile_span("SchemaValidation", "Validation"):
+                validation_errors = ", ".join(validator.get_errors(sam_template))  # type: ignore[no-untyped-call]
             if validation_errors:
                 LOG.warning("Template schema validation reported the following errors: %s", validation_errors)
         except Exception as e:
@@ -1,6 +1,7 @@
 import logging
 
 from enum import Enum
+from typing import Collection, Optional
 
 LOG = logging.getLogger(__name__)
 
@@ -31,6 +32,16 @@ class BasePlugin(object):
 
         self.name = name
 
+    def get_resource_types(self, event: LifeCycleEvents) -> Optional[Collection[str]]:
+        """
+        Returns the types of the resources the hook of a resource level life cycle event must be called for. Hooks are
+        not called at all for the other resources, which saves a call per resource in large templates.
+
+        :param event: Resource level life cycle event, ie. `before_transform_resource`
+        :return: Resource types, or None to call the hook for all the resources
+        """
+        return None
+
     def on_before_transform_resource(self, logical_id, resource_type, resource_properties):  # type: ignore[no-untyped-def]
         """
         Hook method to execute on `before_transform_resource` life cycle event. Plugins are free to modify the
@@ -229,7 +229,7 @@ class ImplicitApiPlugin(BasePlugin):
 
         path = event_properties["Path"]
         method = event_properties["Method"]
-        editor = self.editor(swagger)
+        editor = self.editor(swagger, owns_doc=True)
         editor.add_path(path, method)
 
         resource.properties["DefinitionBody"] = self._get_api_definition_from_editor(editor)  # type: ignore[no-untyped-call]
@@ -384,7 +384,7 @@ class ImplicitApiPlugin(BasePlugin):
                 continue
 
             swagger = api.properties.get("DefinitionBody")
-            editor = self.editor(swagger)
+            editor = self.editor(swagger, owns_doc=True)
 
             for path in editor.iter_on_path():
                 all_method_conditions = {condition for _, condition in self.api_conditions[api_id][path].items()}
@@ -0,0 +1,248 @@
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple, Union
+
+from samtranslator.utils.cache import FileStore, LRUStore, TTLCache
+
+
+class SarApplicationCacheEntry(object):
+    """
+    Result of the calls to the Serverless Application Repository (SAR) for an application, cached across
+    translations: either the template created for it, the application being available (when only validating access)
+    or the access to it being denied.
+    """
+
+    TEMPLATE = "Template"
+    AVAILABLE = "Available"
+    ACCESS_DENIED = "AccessDenied"
+
+    def __init__(
+        self,
+        kind: str,
+        expires_at: float,
+        template_url: Optional[str] = None,
+        application_id: Optional[str] = None,
+        template_id: Optional[str] = None,
+        status: Optional[str] = None,
+        message: Optional[str] = None,
+    ) -> None:
+        """
+        :param kind: TEMPLATE, AVAILABLE or ACCESS_DENIED
+        :param expires_at: Time (seconds since the epoch) after which the entry must not be used
+        :param template_url: Pre-signed URL of the template, for TEMPLATE entries
+        :param application_id: ApplicationId returned by SAR, for TEMPLATE entries
+        :param template_id: TemplateId returned by SAR, for TEMPLATE entries
+        :param status: Status of the template, for TEMPLATE entries
+        :param message: Error message of SAR, for ACCESS_DENIED entries
+        """
+        self.kind = kind
+        self.expires_at = expires_at
+        self.template_url = template_url
+        self.application_id = application_id
+        self.template_id = template_id
+        self.status = status
+        self.message = message
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, entry: Dict[str, Any]) -> "SarApplicationCacheEntry":
+        return cls(**entry)
+
+
+class SarApplicationCache(object):
+    """
+    Base class of the caches of the results of the SAR calls made by the ServerlessAppPlugin, so that warm
+    translation workers and batch runs don't call SAR again for the applications they already resolved.
+
+    Entries are keyed by the application, its version, the region and the account (see make_key), and expire:
+
+    * templates with their pre-signed URL, minus a margin so that CloudFormation can still download the template
+    * access denied results after a short time, so that granting access is picked up quickly
+    """
+
+    # Time to live of the entries of applications the account has access to
+    TEMPLATE_TTL_SECONDS = 60 * 60
+    # Time to live of the entries of applications the account doesn't have access to
+    ACCESS_DENIED_TTL_SECONDS = 60
+    # Templates are not reused when their pre-signed URL expires in less than this
+    TEMPLATE_URL_EXPIRATION_MARGIN_SECONDS = 15 * 60
+
+    def __init__(
+        self,
+        store: Union[LRUStore[str], FileStore],
+        template_ttl_seconds: float = TEMPLATE_TTL_SECONDS,
+        access_denied_ttl_seconds: float = ACCESS_DENIED_TTL_SECONDS,
+    ) -> None:
+        """
+        :param store: Store of the entries
+        :param template_ttl_seconds: Time to live of the templates and available applications, in seconds. Templates
+            expire earlier if their pre-signed URL does.
+        :param access_denied_ttl_seconds: Time to live of the access denied results, in seconds
+        """
+        self.template_ttl_seconds = template_ttl_seconds
+        self.access_denied_ttl_seconds = access_denied_ttl_seconds
+        self._store = store
+        # Expired entries are deleted when they are read, so that the store doesn't grow forever
+        self._cache: TTLCache[SarApplicationCacheEntry] = TTLCache(
+            store, _encode_entry, _decode_entry, delete_expired=True
+        )
+
+    @staticmethod
+    def make_key(app_key: Tuple[str, str], region: str, account_id: str) -> str:
+        """
+        Returns the cache key of an application
+
+        :param app_key: Key of the application, as made by ServerlessAppPlugin._make_app_key
+        :param region: Region the application is deployed to
+        :param account_id: Account the application is deployed to
+        """
+        return json.dumps([region, account_id, app_key[0], app_key[1]])
+
+    def get(self, key: str) -> Optional[SarApplicationCacheEntry]:
+        """
+        Returns the cached entry for the given key, None if there isn't one or it expired
+
+        :param key: Cache key of the application
+        """
+        return self._cache.get(key)
+
+    def put_template(self, key: str, response: Dict[str, Any]) -> None:
+        """
+        Stores the template SAR created for an application
+
+        :param key: Cache key of the application
+        :param response: Response of the CreateCloudFormationTemplate or GetCloudFormationTemplate call
+        """
+        expires_at = time.time() + self.template_ttl_seconds
+        url_expires_at = _parse_expiration_time(response.get("ExpirationTime"))
+        if url_expires_at is not None:
+            expires_at = min(expires_at, url_expires_at - self.TEMPLATE_URL_EXPIRATION_MARGIN_SECONDS)
+        self._write(
+            key,
+            SarApplicationCacheEntry(
+                SarApplicationCacheEntry.TEMPLATE,
+                expires_at,
+                template_url=response["TemplateUrl"],
+                application_id=response["ApplicationId"],
+                template_id=response["TemplateId"],
+                status=response["Status"],
+            ),
+        )
+
+    def put_available(self, key: str) -> None:
+        """
+        Stores that the account has access to an application
+
+        :param key: Cache key of the application
+        """
+        self._write(
+            key, SarApplicationCacheEntry(SarApplicationCacheEntry.AVAILABLE, time.time() + self.template_ttl_seconds)
+        )
+
+    def put_access_denied(self, key: str, message: str) -> None:
+        """
+        Stores that the account doesn't have access to an application, or that it doesn't exist
+
+        :param key: Cache key of the application
+        :param message: Error message of SAR
+        """
+        self._write(
+            key,
+            SarApplicationCacheEntry(
+                SarApplicationCacheEntry.ACCESS_DENIED, time.time() + self.access_denied_ttl_seconds, message=message
+            ),
+        )
+
+    def set_template_active(self, key: str) -> None:
+        """
+        Marks the cached template of an application as ACTIVE, so that it isn't waited for again
+
+        :param key: Cache key of the application
+        """
+        entry = self.get(key)
+        if entry is not None and entry.kind == SarApplicationCacheEntry.TEMPLATE:
+            entry.status = "ACTIVE"
+            self._write(key, entry)
+
+    def invalidate(self, key: str) -> None:
+        """
+        Removes the entry of an application, e.g. when its template expired earlier than expected
+
+        :param key: Cache key of the application
+        """
+        self._delete(key)
+
+    def _write(self, key: str, entry: SarApplicationCacheEntry) -> None:
+        self._cache.put(key, entry, expires_at=entry.expires_at)
+
+    def _delete(self, key: str) -> None:
+        self._cache.delete(key)
+
+
+class InMemorySarApplicationCache(SarApplicationCache):
+    """
+    In-memory cache of SAR results, shared by the translations of a process.
+    """
+
+    def __init__(
+        self,
+        template_ttl_seconds: float = SarApplicationCache.TEMPLATE_TTL_SECONDS,
+        access_denied_ttl_seconds: float = SarApplicationCache.ACCESS_DENIED_TTL_SECONDS,
+        max_size: int = 1024,
+    ) -> None:
+        """
+        :param template_ttl_seconds: Time to live of the templates and available applications, in seconds
+        :param access_denied_ttl_seconds: Time to live of the access denied results, in seconds
+        :param max_size: Maximum number of applications cached, the least recently used one is evicted first
+        """
+        super().__init__(LRUStore(max_size), template_ttl_seconds, access_denied_ttl_seconds)
+
+
+class FileSarApplicationCache(SarApplicationCache):
+    """
+    Cache of SAR results persisted in a local directory, so that batch runs in separate processes share them.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        template_ttl_seconds: float = SarApplicationCache.TEMPLATE_TTL_SECONDS,
+        access_denied_ttl_seconds: float = SarApplicationCache.ACCESS_DENIED_TTL_SECONDS,
+    ) -> None:
+        """
+        :param directory: Directory of the cache files, created if it doesn't exist
+        :param template_ttl_seconds: Time to live of the templates and available applications, in seconds
+        :param access_denied_ttl_seconds: Time to live of the access denied results, in seconds
+        """
+        super().__init__(FileStore(directory), template_ttl_seconds, access_denied_ttl_seconds)
+
+
+def _encode_entry(entry: SarApplicationCacheEntry) -> str:
+    return json.dumps(entry.to_dict())
+
+
+def _decode_entry(content: str) -> SarApplicationCacheEntry:
+    # Entries are decoded on every read, so that callers can't modify the cached ones
+    return SarApplicationCacheEntry.from_dict(json.loads(content))
+
+
+def _parse_expiration_time(expiration_time: Any) -> Optional[float]:
+    """
+    Returns the ExpirationTime of a SAR template (ISO 8601) in seconds since the epoch, None if it can't be parsed
+    """
+    if isinstance(expiration_time, datetime):
+        return expiration_time.timestamp()
+    if not isinstance(expiration_time, str):
+        return None
+    try:
+        # fromisoformat() doesn't support the "Z" suffix before Python 3.11
+        parsed = datetime.fromisoformat(expiration_time.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        # SAR returns UTC times
+        return (parsed - datetime(1970, 1, 1)).total_seconds()
+    return parsed.timestamp()
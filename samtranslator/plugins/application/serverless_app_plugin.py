@@ -1,22 +1,24 @@
-from typing import Any, Tuple
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from contextvars import Context, copy_context
+from typing import Any, Callable, Collection, Dict, List, Optional, Sequence, Tuple, cast
 
-import boto3
 import json
-from botocore.config import Config
-from botocore.exceptions import ClientError, EndpointConnectionError
 import logging
-from time import sleep
+import random
+import threading
+import time
 import copy
 
 from samtranslator.metrics.method_decorator import cw_timer
 from samtranslator.model.exceptions import InvalidResourceException
-from samtranslator.plugins import BasePlugin
+from samtranslator.plugins import BasePlugin, LifeCycleEvents
+from samtranslator.plugins.application.sar_application_cache import SarApplicationCache, SarApplicationCacheEntry
 from samtranslator.plugins.exceptions import InvalidPluginException
 from samtranslator.public.sdk.resource import SamResourceType
 from samtranslator.public.sdk.template import SamTemplate
 from samtranslator.intrinsics.resolver import IntrinsicsResolver
 from samtranslator.intrinsics.actions import FindInMapAction
-from samtranslator.region_configuration import RegionConfiguration
+from samtranslator.region_configuration import PartitionTable, RegionConfiguration
 from samtranslator.utils.constants import BOTO3_CONNECT_TIMEOUT
 from samtranslator.validator.value_validator import sam_expect
 
@@ -38,19 +40,32 @@ class ServerlessAppPlugin(BasePlugin):
     reaches ACTIVE status, all assets have been successfully copied and are
     ready to be deployed. This plugin verfies that applications are in an
     ACTIVE state by calling the GetCloudFormation API from SAR.
+
+    The applications are requested, and then waited for, concurrently. The
+    calls back off exponentially when they are throttled or the template is
+    not ACTIVE yet, and share one budget of time spent waiting.
+
+    With a SarApplicationCache, the results of the calls are reused by later
+    translations for the same account and region, until they expire.
     """
 
     SUPPORTED_RESOURCE_TYPE = "AWS::Serverless::Application"
     SLEEP_TIME_SECONDS = 2
+    # Upper bound of the time waited between two calls for the same application when backing off
+    MAX_SLEEP_TIME_SECONDS = 10
     # CloudFormation times out on transforms after 2 minutes, so setting this
     # timeout below that to leave some buffer
     TEMPLATE_WAIT_TIMEOUT_SECONDS = 105
+    # Maximum number of applications requested or waited for at the same time, 1 to call SAR sequentially
+    MAX_CONCURRENT_SAR_CALLS = 8
+    # Error codes of SAR when the application doesn't exist or the account doesn't have access to it
+    ACCESS_DENIED_ERROR_CODES = ("AccessDeniedException", "NotFoundException")
     APPLICATION_ID_KEY = "ApplicationId"
     SEMANTIC_VERSION_KEY = "SemanticVersion"
     LOCATION_KEY = "Location"
     TEMPLATE_URL_KEY = "TemplateUrl"
 
-    def __init__(self, sar_client=None, wait_for_template_active_status=False, validate_only=False, parameters=None):  # type: ignore[no-untyped-def]
+    def __init__(self, sar_client=None, wait_for_template_active_status=False, validate_only=False, parameters=None, cache=None, partition_table=None):  # type: ignore[no-untyped-def]
         """
         Initialize the plugin.
 
@@ -58,6 +73,10 @@ class ServerlessAppPlugin(BasePlugin):
         :param boto3.client sar_client: The boto3 client to use to access the Serverless Application Repository
         :param bool wait_for_template_active_status: Flag to wait for all templates to become active
         :param bool validate_only: Flag to only validate application access (uses get_application API instead)
+        :param SarApplicationCache cache: Optional cache of the results of the calls to SAR, shared across
+            translations. It is only used when the AWS::Region and AWS::AccountId parameters are known.
+        :param PartitionTable partition_table: Optional table of the regions of the services, to check that SAR is
+            available in the region
         """
         super(ServerlessAppPlugin, self).__init__(ServerlessAppPlugin.__name__)
         if parameters is None:
@@ -68,13 +87,26 @@ class ServerlessAppPlugin(BasePlugin):
         self._wait_for_template_active_status = wait_for_template_active_status
         self._validate_only = validate_only
         self._parameters = parameters
-        self._total_wait_time = 0
+        self._cache: Optional[SarApplicationCache] = cache
+        self._partition_table: Optional[PartitionTable] = partition_table
+        # Cache keys of the templates waited for, to mark them ACTIVE in the cache
+        self._template_cache_keys: Dict[Tuple[str, str], str] = {}
+        # Time spent waiting for SAR by the calls that already returned, against TEMPLATE_WAIT_TIMEOUT_SECONDS
+        self._total_wait_time: float = 0
+        # Time the running calls started waiting at, None until one of them backs off
+        self._wait_started_at: Optional[float] = None
+        self._wait_lock = threading.Lock()
+        # Set to stop the calls running concurrently when one of them failed
+        self._stop_waiting = threading.Event()
 
         # make sure the flag combination makes sense
         if self._validate_only is True and self._wait_for_template_active_status is True:
             message = "Cannot set both validate_only and wait_for_template_active_status flags to True."
             raise InvalidPluginException(ServerlessAppPlugin.__name__, message)  # type: ignore[no-untyped-call]
 
+    def get_resource_types(self, event: LifeCycleEvents) -> Optional[Collection[str]]:
+        return {self.SUPPORTED_RESOURCE_TYPE}
+
     @staticmethod
     def _make_app_key(app_id: Any, semver: Any) -> Tuple[str, str]:
         """Generate a key that is always hashable."""
@@ -100,6 +132,9 @@ class ServerlessAppPlugin(BasePlugin):
             service_call = self._handle_get_application_request
         else:
             service_call = self._handle_create_cfn_template_request
+
+        # Applications are validated one at a time, then requested concurrently
+        requests: List[Tuple[Any, Any, Tuple[str, str], str]] = []
         for logical_id, app in template.iterate({SamResourceType.Application.value}):
             if not self._can_process_application(app):  # type: ignore[no-untyped-call]
                 # Handle these cases in the on_before_transform_resource event
@@ -125,38 +160,190 @@ class ServerlessAppPlugin(BasePlugin):
                     # before calling SAR API.
                     sam_expect(app_id, logical_id, "Location.ApplicationId").to_be_a_string()
                     sam_expect(semver, logical_id, "Location.SemanticVersion").to_be_a_string()
-                    if not RegionConfiguration.is_service_supported("serverlessrepo"):  # type: ignore[no-untyped-call]
+                    if not RegionConfiguration.is_service_supported(
+                        "serverlessrepo", partition_table=self._partition_table
+                    ):
                         raise InvalidResourceException(
                             logical_id, "Serverless Application Repository is not available in this region."
                         )
+                    if self._use_cached_application(key, logical_id):
+                        continue
                     # Lazy initialization of the client- create it when it is needed
                     if not self._sar_client:
+                        import boto3
+                        from botocore.config import Config
+
                         # a SAR call could take a while to finish, leaving the read_timeout default (60s).
                         client_config = Config(connect_timeout=BOTO3_CONNECT_TIMEOUT)
                         self._sar_client = boto3.client("serverlessrepo", config=client_config)
-                    self._make_service_call_with_retry(service_call, app_id, semver, key, logical_id)  # type: ignore[no-untyped-call]
+                    # Reserve the key, the result of the request replaces it
+                    self._applications[key] = None
+                    requests.append((app_id, semver, key, logical_id))
                 except InvalidResourceException as e:
                     # Catch all InvalidResourceExceptions, raise those in the before_resource_transform target.
                     self._applications[key] = e
 
+        def request_application(
+            app_id: Any, semver: Any, key: Tuple[str, str], logical_id: str
+        ) -> Optional[Tuple[str, str]]:
+            try:
+                return self._make_service_call_with_retry(service_call, app_id, semver, key, logical_id)  # type: ignore[no-untyped-call, no-any-return]
+            except InvalidResourceException as e:
+                # Catch all InvalidResourceExceptions, raise those in the before_resource_transform target.
+                self._applications[key] = e
+                return None
+
+        # The templates that are not ACTIVE yet are waited for in the order of the applications in the template
+        for template in self._run_concurrently(request_application, requests):
+            if template:
+                self._in_progress_templates.append(template)
+
+    def _get_cache_key(self, key: Tuple[str, str]) -> Optional[str]:
+        """
+        Returns the key of the application in the cache, None if there is no cache or the region or account of the
+        translation are unknown: SAR results are specific to both.
+
+        :param key: The dictionary key consisting of (ApplicationId, SemanticVersion)
+        """
+        region = self._parameters.get("AWS::Region")
+        account_id = self._parameters.get("AWS::AccountId")
+        if self._cache is None or not isinstance(region, str) or not isinstance(account_id, str):
+            return None
+        return self._cache.make_key(key, region, account_id)
+
+    def _use_cached_application(self, key: Tuple[str, str], logical_id: str) -> bool:
+        """
+        Resolves the application from the cache, if an earlier translation resolved it already.
+
+        :param key: The dictionary key consisting of (ApplicationId, SemanticVersion)
+        :param logical_id: the logical_id of this application resource
+        :return: True if the application was resolved from the cache, False if SAR must be called
+        """
+        cache_key = self._get_cache_key(key)
+        if cache_key is None:
+            return False
+        entry = cast(SarApplicationCache, self._cache).get(cache_key)
+        if entry is None:
+            return False
+
+        if entry.kind == SarApplicationCacheEntry.ACCESS_DENIED:
+            self._applications[key] = InvalidResourceException(logical_id, cast(str, entry.message))
+        elif entry.kind == SarApplicationCacheEntry.TEMPLATE:
+            self._applications[key] = entry.template_url
+            if entry.status != "ACTIVE":
+                template = (cast(str, entry.application_id), cast(str, entry.template_id))
+                self._in_progress_templates.append(template)
+                self._template_cache_keys[template] = cache_key
+        elif self._validate_only:
+            self._applications[key] = {"Available"}
+        else:
+            # Only the access to the application was validated, the template is still needed
+            return False
+        LOG.info("Using cached result of serverless application repo for application {}.".format(key[0]))
+        return True
+
     def _make_service_call_with_retry(self, service_call, app_id, semver, key, logical_id):  # type: ignore[no-untyped-def]
-        call_succeeded = False
-        while self._total_wait_time < self.TEMPLATE_WAIT_TIMEOUT_SECONDS:
+        from botocore.exceptions import ClientError
+
+        attempt = 0
+        while self._can_keep_waiting():
             try:
-                service_call(app_id, semver, key, logical_id)
+                result = service_call(app_id, semver, key, logical_id)
             except ClientError as e:
                 error_code = e.response["Error"]["Code"]
                 if error_code == "TooManyRequestsException":
                     LOG.debug("SAR call timed out for application id {}".format(app_id))
-                    sleep_time = self._get_sleep_time_sec()  # type: ignore[no-untyped-call]
-                    sleep(sleep_time)
-                    self._total_wait_time += sleep_time
+                    if not self._back_off(attempt):
+                        break
+                    attempt += 1
                     continue
                 raise e
-            call_succeeded = True
-            break
-        if not call_succeeded:
-            raise InvalidResourceException(logical_id, "Failed to call SAR, timeout limit exceeded.")
+            return result
+        raise InvalidResourceException(logical_id, "Failed to call SAR, timeout limit exceeded.")
+
+    def _start_waiting(self) -> None:
+        """
+        Starts counting the time spent waiting by the running calls to SAR, if it is not counted yet. The time
+        before the first wait, and between two runs of calls, such as the translation, is not counted.
+        """
+        with self._wait_lock:
+            if self._wait_started_at is None:
+                self._wait_started_at = time.monotonic()
+
+    def _stop_waiting_time(self) -> None:
+        """
+        Adds the time spent waiting by the calls to SAR that returned to the total wait time.
+        """
+        with self._wait_lock:
+            if self._wait_started_at is not None:
+                self._total_wait_time += time.monotonic() - self._wait_started_at
+                self._wait_started_at = None
+
+    def _get_remaining_wait_time_sec(self) -> float:
+        waited = self._total_wait_time
+        wait_started_at = self._wait_started_at
+        if wait_started_at is not None:
+            waited += time.monotonic() - wait_started_at
+        return self.TEMPLATE_WAIT_TIMEOUT_SECONDS - waited
+
+    def _can_keep_waiting(self) -> bool:
+        return not self._stop_waiting.is_set() and self._get_remaining_wait_time_sec() > 0
+
+    def _back_off(self, attempt: int) -> bool:
+        """
+        Waits before calling SAR again for the same application: exponentially longer on each attempt, with some
+        jitter so that concurrent calls don't retry all at once, and never past the deadline.
+
+        :param attempt: Number of times the call was retried already
+        :return: False if the wait reached the deadline, so SAR must not be called again
+        """
+        remaining_time = self._get_remaining_wait_time_sec()
+        sleep_time: float = min(
+            self._get_sleep_time_sec() * (2**attempt) * random.uniform(1, 1.5),  # type: ignore[no-untyped-call]
+            self.MAX_SLEEP_TIME_SECONDS,
+            remaining_time,
+        )
+        if sleep_time > 0:
+            self._start_waiting()
+            # Returns early when the other calls are stopped
+            self._stop_waiting.wait(sleep_time)
+        return sleep_time < remaining_time
+
+    def _run_concurrently(self, function: Callable[..., Any], arguments: Sequence[Tuple[Any, ...]]) -> List[Any]:
+        """
+        Calls the function with each of the arguments, concurrently unless MAX_CONCURRENT_SAR_CALLS is 1, and returns
+        the results in the same order. If a call raises an exception, the other calls are stopped and the exception
+        of the first failed call is raised.
+
+        :param function: Function to call
+        :param arguments: Arguments of each call
+        """
+        if len(arguments) <= 1 or self.MAX_CONCURRENT_SAR_CALLS <= 1:
+            try:
+                return [function(*args) for args in arguments]
+            finally:
+                self._stop_waiting_time()
+
+        with ThreadPoolExecutor(max_workers=min(self.MAX_CONCURRENT_SAR_CALLS, len(arguments))) as executor:
+            # Threads don't inherit the context, which holds the profiler and the region of the translation
+            futures = [executor.submit(self._run_in_context, copy_context(), function, args) for args in arguments]
+            _, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+            if not_done:
+                self._stop_waiting.set()
+                for future in not_done:
+                    future.cancel()
+        self._stop_waiting.clear()
+        self._stop_waiting_time()
+
+        for future in futures:
+            exception = None if future.cancelled() else future.exception()
+            if exception:
+                raise exception
+        return [future.result() for future in futures]
+
+    @staticmethod
+    def _run_in_context(context: Context, function: Callable[..., Any], args: Tuple[Any, ...]) -> Any:
+        return context.run(function, *args)
 
     def _replace_value(self, input_dict, key, intrinsic_resolvers):  # type: ignore[no-untyped-def]
         value = self._resolve_location_value(input_dict.get(key), intrinsic_resolvers)  # type: ignore[no-untyped-call]
@@ -202,10 +389,15 @@ class ServerlessAppPlugin(BasePlugin):
         :param string key: The dictionary key consisting of (ApplicationId, SemanticVersion)
         :param string logical_id: the logical_id of this application resource
         """
+        from botocore.exceptions import EndpointConnectionError
+
         LOG.info("Getting application {}/{} from serverless application repo...".format(app_id, semver))
+        cache_key = self._get_cache_key(key)
         try:
-            self._sar_service_call(self._get_application, logical_id, app_id, semver)
+            self._sar_service_call_with_cache(cache_key, self._get_application, logical_id, app_id, semver)
             self._applications[key] = {"Available"}
+            if cache_key:
+                cast(SarApplicationCache, self._cache).put_available(cache_key)
             LOG.info("Finished getting application {}/{}.".format(app_id, semver))
         except EndpointConnectionError as e:
             # No internet connection. Don't break verification, but do show a warning.
@@ -221,14 +413,22 @@ class ServerlessAppPlugin(BasePlugin):
         :param string semver: SemanticVersion
         :param string key: The dictionary key consisting of (ApplicationId, SemanticVersion)
         :param string logical_id: the logical_id of this application resource
+        :return: (ApplicationId, TemplateId) of the template if it is not ACTIVE yet, None otherwise
         """
         LOG.info("Requesting to create CFN template {}/{} in serverless application repo...".format(app_id, semver))
-        response = self._sar_service_call(self._create_cfn_template, logical_id, app_id, semver)
+        cache_key = self._get_cache_key(key)
+        response = self._sar_service_call_with_cache(cache_key, self._create_cfn_template, logical_id, app_id, semver)
 
         LOG.info("Requested to create CFN template {}/{} in serverless application repo.".format(app_id, semver))
         self._applications[key] = response[self.TEMPLATE_URL_KEY]
+        if cache_key:
+            cast(SarApplicationCache, self._cache).put_template(cache_key, response)
         if response["Status"] != "ACTIVE":
-            self._in_progress_templates.append((response[self.APPLICATION_ID_KEY], response["TemplateId"]))
+            template = (response[self.APPLICATION_ID_KEY], response["TemplateId"])
+            if cache_key:
+                self._template_cache_keys[template] = cache_key
+            return template
+        return None
 
     def _sanitize_sar_str_param(self, param):  # type: ignore[no-untyped-def]
         """
@@ -324,7 +524,7 @@ class ServerlessAppPlugin(BasePlugin):
         """
         Hook method that gets called after the template is processed
 
-        Go through all the stored applications and make sure they're all ACTIVE.
+        Go through all the stored applications, concurrently, and make sure they're all ACTIVE.
 
         :param dict template: Dictionary of the SAM template
         :return: Nothing
@@ -332,39 +532,13 @@ class ServerlessAppPlugin(BasePlugin):
         if not self._wait_for_template_active_status or self._validate_only:
             return
 
-        while self._total_wait_time < self.TEMPLATE_WAIT_TIMEOUT_SECONDS:
-            # Check each resource to make sure it's active
-            LOG.info("Checking resources in serverless application repo...")
-            idx = 0
-            while idx < len(self._in_progress_templates):
-                application_id, template_id = self._in_progress_templates[idx]
-
-                try:
-                    response = self._sar_service_call(
-                        self._get_cfn_template, application_id, application_id, template_id
-                    )
-                except ClientError as e:
-                    error_code = e.response["Error"]["Code"]
-                    if error_code == "TooManyRequestsException":
-                        LOG.debug("SAR call timed out for application id {}".format(application_id))
-                        break  # We were throttled by SAR, break out to a sleep
-                    raise e
-
-                if self._is_template_active(response, application_id, template_id):  # type: ignore[no-untyped-call]
-                    self._in_progress_templates.remove((application_id, template_id))
-                else:
-                    idx += 1  # check next template
-
-            LOG.info("Finished checking resources in serverless application repo.")
-
-            # Don't sleep if there are no more templates with PREPARING status
-            if len(self._in_progress_templates) == 0:
-                break
-
-            # Sleep a little so we don't spam service calls
-            sleep_time = self._get_sleep_time_sec()  # type: ignore[no-untyped-call]
-            sleep(sleep_time)
-            self._total_wait_time += sleep_time
+        # Check each resource to make sure it's active
+        LOG.info("Checking resources in serverless application repo...")
+        active = self._run_concurrently(self._wait_for_template_active, self._in_progress_templates)
+        self._in_progress_templates = [
+            template for template, is_active in zip(self._in_progress_templates, active) if not is_active
+        ]
+        LOG.info("Finished checking resources in serverless application repo.")
 
         # Not all templates reached active status
         if len(self._in_progress_templates) != 0:
@@ -373,6 +547,38 @@ class ServerlessAppPlugin(BasePlugin):
                 application_ids, "Timed out waiting for nested stack templates to reach ACTIVE status."
             )
 
+    def _wait_for_template_active(self, application_id: str, template_id: str) -> bool:
+        """
+        Polls the status of a template until it is ACTIVE, backing off between the calls.
+
+        :param application_id: the ApplicationId
+        :param template_id: the unique TemplateId for this application
+        :return: True if the template is active, False if it did not become active before the deadline
+        """
+        from botocore.exceptions import ClientError
+
+        attempt = 0
+        while self._can_keep_waiting():
+            try:
+                response = self._sar_service_call(self._get_cfn_template, application_id, application_id, template_id)
+            except ClientError as e:
+                error_code = e.response["Error"]["Code"]
+                if error_code != "TooManyRequestsException":
+                    raise e
+                LOG.debug("SAR call timed out for application id {}".format(application_id))
+            else:
+                if self._is_template_active(response, application_id, template_id):  # type: ignore[no-untyped-call]
+                    cache_key = self._template_cache_keys.get((application_id, template_id))
+                    if cache_key:
+                        cast(SarApplicationCache, self._cache).set_template_active(cache_key)
+                    return True
+
+            # Sleep a little so we don't spam service calls
+            if not self._back_off(attempt):
+                break
+            attempt += 1
+        return False
+
     def _get_sleep_time_sec(self):  # type: ignore[no-untyped-def]
         return self.SLEEP_TIME_SECONDS
 
@@ -388,6 +594,9 @@ class ServerlessAppPlugin(BasePlugin):
         status = response["Status"]  # options: PREPARING, EXPIRED or ACTIVE
 
         if status == "EXPIRED":
+            cache_key = self._template_cache_keys.get((application_id, template_id))
+            if cache_key:
+                cast(SarApplicationCache, self._cache).invalidate(cache_key)
             message = f"Template for {application_id} with id {template_id} returned status: {status}. Cannot access an expired template."
             raise InvalidResourceException(application_id, message)
 
@@ -403,15 +612,44 @@ class ServerlessAppPlugin(BasePlugin):
         :param string logical_id: Logical ID of the resource being processed
         :param list *args: arguments for the service call lambda
         """
+        from botocore.exceptions import ClientError
+
         try:
             response = service_call_lambda(*args)
             return response
         except ClientError as e:
             error_code = e.response["Error"]["Code"]
-            if error_code in ("AccessDeniedException", "NotFoundException"):
+            if error_code in self.ACCESS_DENIED_ERROR_CODES:
                 raise InvalidResourceException(logical_id, e.response["Error"]["Message"])
             raise e
 
+    def _sar_service_call_with_cache(
+        self, cache_key: Optional[str], service_call_lambda: Callable[..., Any], logical_id: str, *args: Any
+    ) -> Any:
+        """
+        Same as _sar_service_call, caching the access denied results.
+
+        :param cache_key: Key of the application in the cache, None if it is not cached
+        """
+        if not cache_key:
+            return self._sar_service_call(service_call_lambda, logical_id, *args)
+        application_cache_key = cache_key
+
+        def service_call_caching_access_denied(*call_args: Any) -> Any:
+            from botocore.exceptions import ClientError
+
+            try:
+                return service_call_lambda(*call_args)
+            except ClientError as e:
+                # The application doesn't exist or the account doesn't have access to it
+                if e.response["Error"]["Code"] in self.ACCESS_DENIED_ERROR_CODES:
+                    cast(SarApplicationCache, self._cache).put_access_denied(
+                        application_cache_key, e.response["Error"]["Message"]
+                    )
+                raise
+
+        return self._sar_service_call(service_call_caching_access_denied, logical_id, *args)
+
     def _resource_is_supported(self, resource_type):  # type: ignore[no-untyped-def]
         """
         Is this resource supported by this plugin?
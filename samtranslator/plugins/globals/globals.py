@@ -1,7 +1,8 @@
-﻿from typing import Dict, List
+﻿from typing import Any, Dict, List, Optional
 
 from samtranslator.model.exceptions import ExceptionWithMessage
 from samtranslator.public.sdk.resource import SamResourceType
+from samtranslator.public.sdk.template import SamTemplate
 from samtranslator.public.intrinsics import is_intrinsics
 from samtranslator.swagger.swagger import SwaggerEditor
 
@@ -154,10 +155,12 @@ class Globals(object):
         :param dict template: SAM template
         :return: Modified SAM template with corrected swagger doc matching the OpenApiVersion.
         """
-        resources = template.get("Resources", {})
+        if not isinstance(template.get("Resources"), dict):
+            return
 
-        for _, resource in resources.items():
-            if ("Type" in resource) and (resource["Type"] == cls._API_TYPE):
+        for _, sam_resource in SamTemplate(template).iterate({cls._API_TYPE}):
+            resource = sam_resource.resource_dict
+            if "Properties" in resource:
                 properties = resource["Properties"]
                 if (
                     (cls._OPENAPIVERSION in properties)
@@ -348,6 +351,8 @@ class GlobalProperties(object):
 
     def __init__(self, global_properties):  # type: ignore[no-untyped-def]
         self.global_properties = global_properties
+        # Compiled on the first merge, and reused for all the resources of the type
+        self._merge_plan: Optional[_MergePlan] = None
 
     def merge(self, local_properties):  # type: ignore[no-untyped-def]
         """
@@ -355,7 +360,55 @@ class GlobalProperties(object):
 
         :return local_properties: Dictionary of local properties
         """
-        return self._do_merge(self.global_properties, local_properties)  # type: ignore[no-untyped-call]
+        if self._merge_plan is None:
+            self._merge_plan = self._compile_merge_plan(self.global_properties)
+        return self._merge_with_plan(self._merge_plan, local_properties)
+
+    def _compile_merge_plan(self, global_value: Any) -> "_MergePlan":
+        """
+        Compiles the global value into a merge plan: the token of the value, and the plans of the keys of the
+        dictionaries, so that the global value is only inspected once and not for every resource.
+
+        :param global_value: Global value to be merged
+        :return: Merge plan of the value
+        """
+        token = self._token_of(global_value)  # type: ignore[no-untyped-call]
+        children = None
+        if token == self.TOKEN.DICT:
+            children = {key: self._compile_merge_plan(value) for key, value in global_value.items()}
+        return _MergePlan(global_value, token, children)
+
+    def _merge_with_plan(self, plan: "_MergePlan", local_value: Any) -> Any:
+        """
+        Performs the same merge as _do_merge(), following the merge plan of the global value
+
+        :param plan: Merge plan of the global value
+        :param local_value: Local value to be merged
+        :return: Merged result
+        """
+        if plan.token == self.TOKEN.PRIMITIVE:
+            # Global primitives are overridden by local values of any type
+            return local_value
+
+        if plan.token == self.TOKEN.DICT:
+            if not isinstance(local_value, dict) or is_intrinsics(local_value):
+                return local_value
+            merged = plan.value.copy()
+            for key in local_value.keys():
+                key_plan = plan.children.get(key) if plan.children is not None else None
+                if key_plan is None:
+                    # Key is not in globals, just in local. Copy it over
+                    merged[key] = local_value[key]
+                else:
+                    merged[key] = self._merge_with_plan(key_plan, local_value[key])
+            return merged
+
+        if plan.token == self.TOKEN.LIST:
+            if not isinstance(local_value, list):
+                return local_value
+            return self._merge_lists(plan.value, local_value)  # type: ignore[no-untyped-call]
+
+        return self._do_merge(plan.value, local_value)  # type: ignore[no-untyped-call]
 
     def _do_merge(self, global_value, local_value):  # type: ignore[no-untyped-def]
         """
@@ -463,6 +516,24 @@ class GlobalProperties(object):
         LIST = "list"
 
 
+class _MergePlan(object):
+    """
+    Global value compiled for merges with the local values, see GlobalProperties._compile_merge_plan()
+    """
+
+    __slots__ = ("value", "token", "children")
+
+    def __init__(self, value: Any, token: str, children: Optional[Dict[Any, "_MergePlan"]]) -> None:
+        """
+        :param value: Global value
+        :param token: Token type of the global value
+        :param children: Merge plans of the keys of the global value, if it is a dictionary
+        """
+        self.value = value
+        self.token = token
+        self.children = children
+
+
 class InvalidGlobalsSectionException(ExceptionWithMessage):
     """Exception raised when a Globals section is invalid.
 
@@ -1,5 +1,7 @@
+from typing import Collection, Optional
+
 from samtranslator.metrics.method_decorator import cw_timer
-from samtranslator.plugins import BasePlugin
+from samtranslator.plugins import BasePlugin, LifeCycleEvents
 from samtranslator.model.resource_policies import ResourcePolicies, PolicyTypes
 from samtranslator.model.exceptions import InvalidResourceException
 from samtranslator.policy_template_processor.exceptions import InsufficientParameterValues, InvalidParameterValues
@@ -31,6 +33,9 @@ class PolicyTemplatesForResourcePlugin(BasePlugin):
 
         self._policy_template_processor = policy_template_processor
 
+    def get_resource_types(self, event: LifeCycleEvents) -> Optional[Collection[str]]:
+        return self.SUPPORTED_RESOURCE_TYPE
+
     @cw_timer(prefix="Plugin-PolicyTemplates")
     def on_before_transform_resource(self, logical_id, resource_type, resource_properties):  # type: ignore[no-untyped-def]
         """
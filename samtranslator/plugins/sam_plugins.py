@@ -1,10 +1,29 @@
 import logging
-from typing import Optional, Any, List, Union
+from typing import Any, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Union
+from samtranslator.metrics.profiler import profile_span
 from samtranslator.model.exceptions import InvalidResourceException, InvalidDocumentException, InvalidTemplateException
 from samtranslator.plugins import BasePlugin, LifeCycleEvents
+from samtranslator.sdk.template import invalidate_template_index
 
 LOG = logging.getLogger(__name__)
 
+# Position of the resource type in the arguments of the resource level life cycle events
+RESOURCE_TYPE_ARGUMENT_INDEX = {LifeCycleEvents.before_transform_resource: 1}
+
+
+class _PluginHook(NamedTuple):
+    """
+    Hook of a plugin for a life cycle event, as resolved when the plugin was registered
+    """
+
+    plugin: BasePlugin
+    method_name: str
+    # None if the plugin doesn't have the hook method
+    method: Optional[Callable[..., Any]]
+    # Types of the resources the hook is called for, None for all of them
+    resource_types: Optional[FrozenSet[str]]
+    span_name: str
+
 
 class SamPlugins(object):
     """
@@ -40,6 +59,10 @@ class SamPlugins(object):
     Arguments passed to the hook method is different for each life cycle event. Check out the hook methods in the
     `BasePlugin` class for detailed description of the method signature
 
+    ### Filtering resources
+    Plugins that only handle some resource types return them from `get_resource_types`. Their resource level hooks
+    are not called for the other resources.
+
     ### Raising validation errors
     Plugins must raise an `samtranslator.model.exception.InvalidResourceException` when the input SAM template does
     not conform to the expectation
@@ -53,6 +76,9 @@ class SamPlugins(object):
         :param BasePlugin or list initial_plugins: Single plugin or a List of plugins to initialize with
         """
         self._plugins: List[BasePlugin] = []
+        # Hooks to call for each life cycle event, built when plugins are registered. Plugins that don't override the
+        # NoOp hook of BasePlugin are left out.
+        self._dispatch_tables: Dict[LifeCycleEvents, List[_PluginHook]] = {}
 
         if initial_plugins is None:
             initial_plugins = []
@@ -80,6 +106,7 @@ class SamPlugins(object):
             raise ValueError("Plugin with name {} is already registered".format(plugin.name))
 
         self._plugins.append(plugin)
+        self._dispatch_tables = {event: self._build_dispatch_table(event) for event in LifeCycleEvents}
 
     def is_registered(self, plugin_name: str) -> bool:
         """
@@ -120,24 +147,75 @@ class SamPlugins(object):
         if not isinstance(event, LifeCycleEvents):
             raise ValueError("'event' must be an instance of LifeCycleEvents class")
 
-        method_name = "on_" + event.name
+        dispatch_table = self._dispatch_tables.get(event)
+        if dispatch_table is None:
+            dispatch_table = self._dispatch_tables[event] = self._build_dispatch_table(event)
+        if not dispatch_table:
+            return
 
-        for plugin in self._plugins:
+        resource_type = self._get_resource_type(event, args, kwargs)
 
-            if not hasattr(plugin, method_name):
+        for hook in dispatch_table:
+
+            if hook.method is None:
                 raise NameError(
-                    "'{}' method is not found in the plugin with name '{}'".format(method_name, plugin.name)
+                    "'{}' method is not found in the plugin with name '{}'".format(hook.method_name, hook.plugin.name)
                 )
 
+            if hook.resource_types is not None and resource_type not in hook.resource_types:
+                continue
+
             try:
-                getattr(plugin, method_name)(*args, **kwargs)
+                with profile_span(hook.span_name, "Plugin"):
+                    hook.method(*args, **kwargs)
+                # The hook may have added, removed or retyped resources in place
+                invalidate_template_index()
             except (InvalidResourceException, InvalidDocumentException, InvalidTemplateException) as ex:
                 # Don't need to log these because they don't result in crashes
                 raise ex
             except Exception as ex:
-                LOG.exception("Plugin '%s' raised an exception: %s", plugin.name, ex)
+                LOG.exception("Plugin '%s' raised an exception: %s", hook.plugin.name, ex)
                 raise ex
 
+    def _build_dispatch_table(self, event: LifeCycleEvents) -> List[_PluginHook]:
+        """
+        Returns the hooks of the registered plugins for the event, in the order of registration
+
+        :param event: Life cycle event
+        """
+        method_name = "on_" + event.name
+        base_method = getattr(BasePlugin, method_name, None)
+        dispatch_table = []
+
+        for plugin in self._plugins:
+            method = getattr(plugin, method_name, None)
+            if method is not None and base_method is not None and getattr(method, "__func__", None) is base_method:
+                # The hook is the NoOp one of BasePlugin
+                continue
+
+            resource_types = None
+            if event in RESOURCE_TYPE_ARGUMENT_INDEX:
+                plugin_resource_types = plugin.get_resource_types(event)
+                if isinstance(plugin_resource_types, (set, frozenset, list, tuple)):
+                    resource_types = frozenset(plugin_resource_types)
+
+            span_name = "{}.{}".format(plugin.name, method_name)
+            dispatch_table.append(_PluginHook(plugin, method_name, method, resource_types, span_name))
+
+        return dispatch_table
+
+    @staticmethod
+    def _get_resource_type(event: LifeCycleEvents, args: Any, kwargs: Dict[str, Any]) -> Optional[str]:
+        """
+        Returns the type of the resource a resource level event is for, None for the other events
+        """
+        index = RESOURCE_TYPE_ARGUMENT_INDEX.get(event)
+        if index is None:
+            return None
+        if "resource_type" in kwargs:
+            return kwargs["resource_type"]  # type: ignore[no-any-return]
+        return args[index] if len(args) > index else None
+
     def __len__(self) -> int:
         """
         Returns the number of plugins registered with this class
@@ -1,8 +1,7 @@
 import json
-import jsonschema
+import threading
 from samtranslator import policy_templates_data
 from typing import Dict, Any, Optional
-from jsonschema.exceptions import ValidationError
 from samtranslator.policy_template_processor.template import Template
 from samtranslator.policy_template_processor.exceptions import TemplateNotFoundException
 
@@ -48,15 +47,24 @@ class PolicyTemplatesProcessor(object):
     # ./policy_templates.json
     DEFAULT_POLICY_TEMPLATES_FILE = policy_templates_data.POLICY_TEMPLATES_FILE
 
-    def __init__(self, policy_templates_dict: Dict[str, Any], schema: Optional[Dict[str, Any]] = None):
+    # Processor of the default policy templates, shared process-wide. See get_default()
+    _default_processor: Optional["PolicyTemplatesProcessor"] = None
+    _default_processor_lock = threading.Lock()
+
+    def __init__(
+        self, policy_templates_dict: Dict[str, Any], schema: Optional[Dict[str, Any]] = None, validate: bool = True
+    ):
         """
         Initialize the class
 
         :param policy_templates_dict: Dictionary containing the policy templates definition
         :param dict schema: Dictionary containing the JSON Schema of policy templates
+        :param validate: Whether to validate the policy templates against the schema. Only policy templates that were
+            already validated, like the default ones (validated by the tests), can skip it.
         :raises ValueError: If policy templates does not match up with the schema
         """
-        PolicyTemplatesProcessor._is_valid_templates_dict(policy_templates_dict, schema)
+        if validate:
+            PolicyTemplatesProcessor._is_valid_templates_dict(policy_templates_dict, schema)
 
         self.policy_templates = {}
         for template_name, template_value_dict in policy_templates_dict["Templates"].items():
@@ -112,6 +120,9 @@ class PolicyTemplatesProcessor(object):
         :raises ValueError: If the template dictionary doesn't match up with the schema
         """
 
+        import jsonschema
+        from jsonschema.exceptions import ValidationError
+
         if not schema:
             schema = PolicyTemplatesProcessor._read_schema()
 
@@ -123,6 +134,22 @@ class PolicyTemplatesProcessor(object):
 
         return True
 
+    @classmethod
+    def get_default(cls) -> "PolicyTemplatesProcessor":
+        """
+        Returns the processor of the default policy templates. It is loaded once per process and shared by all the
+        translations, so that its templates and the statements they expanded to are reused.
+
+        :return PolicyTemplatesProcessor: Processor of the default policy templates
+        """
+        with cls._default_processor_lock:
+            if cls._default_processor is None:
+                # The default policy templates are validated against the schema by the tests, not at runtime
+                cls._default_processor = PolicyTemplatesProcessor(
+                    PolicyTemplatesProcessor.get_default_policy_templates_json(), validate=False
+                )
+            return cls._default_processor
+
     @staticmethod
     def get_default_policy_templates_json() -> Any:
         """
@@ -1,13 +1,24 @@
-from typing import Any
+from copy import deepcopy
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
 
-from samtranslator.intrinsics.resolver import IntrinsicsResolver
-from samtranslator.intrinsics.actions import RefAction
 from samtranslator.policy_template_processor.exceptions import InsufficientParameterValues, InvalidParameterValues
 
-
 POLICY_PARAMETER_DISAMBIGUATE_PREFIX = "___SAM_POLICY_PARAMETER_"
 
 
+class _ParameterSlot(object):
+    """
+    Place of a `{"Ref": <parameter>}` in the substitution plan of a template, replaced by the parameter value
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
 class Template(object):
     """
     Class representing a single policy template. It includes the name, parameters and template dictionary.
@@ -29,12 +40,24 @@ class Template(object):
         self.name = template_name
         self.parameters = parameters
         self.definition = template_definition
+        # Compiled on first use, see _compile_substitution_plan()
+        self._substitution_plan: Any = None
+        self._is_compiled = False
+        # Statements expanded before, by parameter values. See _make_statement_key()
+        self._statements: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._statements_lock = threading.Lock()
+
+    # Maximum number of expanded statements memoized per template, the least recently used one is evicted first
+    MAX_MEMOIZED_STATEMENTS = 256
 
     def to_statement(self, parameter_values):  # type: ignore[no-untyped-def]
         """
         With the given values for each parameter, this method will return a policy statement that can be used
         directly with IAM.
 
+        Statements are memoized by parameter values, so that functions that use the same policy template with the
+        same parameters don't expand it again. Every call returns a new copy of the statement.
+
         :param dict parameter_values: Dict containing values for each parameter defined in the template
         :return dict: Dictionary containing policy statement
         :raises InvalidParameterValues: If parameter values is not a valid dictionary or does not contain values
@@ -50,29 +73,40 @@ class Template(object):
             )
 
         # Select only necessary parameter_values. this is to prevent malicious or accidental
-        # injection of values for parameters not intended in the template. This is important because "Ref" resolution
-        # will substitute any references for which a value is provided.
+        # injection of values for parameters not intended in the template.
         necessary_parameter_values = {
-            POLICY_PARAMETER_DISAMBIGUATE_PREFIX + name: value
-            for name, value in parameter_values.items()
-            if name in self.parameters
+            name: value for name, value in parameter_values.items() if name in self.parameters
         }
 
-        # Only "Ref" is supported
-        supported_intrinsics = {RefAction.intrinsic_name: RefAction()}
-
-        resolver = IntrinsicsResolver(necessary_parameter_values, supported_intrinsics)
-        definition_copy = self._disambiguate_policy_parameter(self.definition)
-
-        return resolver.resolve_parameter_refs(definition_copy)
-
-    @staticmethod
-    def _disambiguate_policy_parameter(policy_definition: Any) -> Any:
+        key = self._make_statement_key(necessary_parameter_values)
+        if key is not None:
+            with self._statements_lock:
+                statement = self._statements.get(key)
+                if statement is not None:
+                    self._statements.move_to_end(key)
+            if statement is not None:
+                return _copy_statement(statement)
+
+        if not self._is_compiled:
+            self._substitution_plan = self._compile_substitution_plan(self.definition)
+            self._is_compiled = True
+        statement = _substitute(self._substitution_plan, necessary_parameter_values)
+
+        if key is not None:
+            # The statement holds the caller's parameter values, memoize a copy so that it can't change afterwards
+            memoized = _copy_statement(statement)
+            with self._statements_lock:
+                self._statements[key] = memoized
+                while len(self._statements) > self.MAX_MEMOIZED_STATEMENTS:
+                    self._statements.popitem(last=False)
+        return statement
+
+    def _compile_substitution_plan(self, node: Any) -> Any:
         """
-        Return a deepcopy of policy definition where all parameters are
-        renamed to avoid naming collision of normal CFN parameters.
-        This is to avoid IntrinsicResolver.resolve_parameter_refs()
-        will make infinitely recursion on this:
+        Compiles the template definition into a substitution plan: a copy of the definition where every
+        `{"Ref": <parameter>}` is replaced by a _ParameterSlot. The other "Ref"s are renamed, so that they can't be
+        mistaken for CloudFormation parameters. Otherwise IntrinsicResolver.resolve_parameter_refs() would recurse
+        infinitely on a policy parameter whose value refers to a CloudFormation parameter of the same name:
         ```
         - DynamoDBCrudPolicy:
           TableName:  <- this is the policy parameter
@@ -81,24 +115,37 @@ class Template(object):
               - '-'
               - - Ref: TableName <- this is the CFN parameter
                 - hello
-                - Ref: EnvironmentType
         ```
-        Once IntrinsicResolver.resolve_parameter_refs() replace the "Ref: TableName"
-        with "TableName: .... Ref: TableName - hello ---"
-        There are "Ref: TableName" in it again (indefinitely).
+
+        :param node: Template definition, or one of its values
+        :return: Substitution plan of the node
         """
+        if isinstance(node, dict):
+            ref = node.get("Ref")
+            if isinstance(ref, str):
+                if len(node) == 1 and ref in self.parameters:
+                    return _ParameterSlot(ref)
+                plan = {key: self._compile_substitution_plan(value) for key, value in node.items()}
+                plan["Ref"] = POLICY_PARAMETER_DISAMBIGUATE_PREFIX + ref
+                return plan
+            return {key: self._compile_substitution_plan(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [self._compile_substitution_plan(item) for item in node]
+        return node
 
-        def _traverse(node: Any) -> Any:
-            if isinstance(node, dict):
-                copy = {key: _traverse(value) for key, value in node.items()}
-                if "Ref" in copy and isinstance(copy["Ref"], str):
-                    copy["Ref"] = POLICY_PARAMETER_DISAMBIGUATE_PREFIX + copy["Ref"]
-                return copy
-            if isinstance(node, list):
-                return [_traverse(item) for item in node]
-            return node
+    @staticmethod
+    def _make_statement_key(parameter_values: Dict[str, Any]) -> Optional[Hashable]:
+        """
+        Returns the canonical, hashable form of the parameter values used to memoize statements: parameters sorted
+        by name, their values with types and order preserved (ie. `True` is not `1`). None if a value can't be made
+        hashable.
 
-        return _traverse(policy_definition)
+        :param parameter_values: Values of the parameters of the template
+        """
+        try:
+            return tuple((name, _freeze(parameter_values[name])) for name in sorted(parameter_values))
+        except TypeError:
+            return None
 
     def missing_parameter_values(self, parameter_values):  # type: ignore[no-untyped-def]
         """
@@ -152,3 +199,44 @@ class Template(object):
         definition = template_values_dict.get("Definition", {})
 
         return Template(template_name, parameters, definition)  # type: ignore[no-untyped-call]
+
+
+def _substitute(plan: Any, parameter_values: Dict[str, Any]) -> Any:
+    """
+    Returns a new statement from the substitution plan, with the parameter slots replaced by their values
+    """
+    if isinstance(plan, _ParameterSlot):
+        return parameter_values[plan.name]
+    if isinstance(plan, dict):
+        return {key: _substitute(value, parameter_values) for key, value in plan.items()}
+    if isinstance(plan, list):
+        return [_substitute(item, parameter_values) for item in plan]
+    return plan
+
+
+def _copy_statement(statement: Any) -> Any:
+    """
+    Copies the dictionaries and lists of a memoized statement, so that callers can't modify it
+    """
+    if type(statement) is dict:
+        return {key: _copy_statement(value) for key, value in statement.items()}
+    if type(statement) is list:
+        return [_copy_statement(item) for item in statement]
+    if isinstance(statement, (dict, list)):
+        # Parameter values can be subclasses of dict or list, ie. Py27Dict, that need their own copy
+        return deepcopy(statement)
+    return statement
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    Returns a hashable form of the value, keeping its types and the order of its keys
+
+    :raises TypeError: If the value has unhashable values other than dictionaries and lists
+    """
+    if isinstance(value, dict):
+        return (value.__class__, tuple((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return (value.__class__, tuple(_freeze(item) for item in value))
+    hash(value)
+    return (value.__class__, value)
@@ -2,7 +2,31 @@
 # This is essentially our Public API
 #
 
-__all__ = ["Translator", "ManagedPolicyLoader"]
+__all__ = [
+    "Translator",
+    "ManagedPolicyLoader",
+    "InMemoryManagedPolicyCache",
+    "FileManagedPolicyCache",
+    "TransformSession",
+    "InMemoryTranslationCache",
+    "FileTranslationCache",
+    "InMemorySarApplicationCache",
+    "FileSarApplicationCache",
+    "Profiler",
+    "dump_template",
+]
 
 from samtranslator.translator.translator import Translator
-from samtranslator.translator.managed_policy_translator import ManagedPolicyLoader
+from samtranslator.translator.managed_policy_translator import (
+    ManagedPolicyLoader,
+    InMemoryManagedPolicyCache,
+    FileManagedPolicyCache,
+)
+from samtranslator.translator.transform import TransformSession
+from samtranslator.translator.translation_cache import InMemoryTranslationCache, FileTranslationCache
+from samtranslator.plugins.application.sar_application_cache import (
+    InMemorySarApplicationCache,
+    FileSarApplicationCache,
+)
+from samtranslator.metrics.profiler import Profiler
+from samtranslator.utils.py27hash_fix import dump_template
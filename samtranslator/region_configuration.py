@@ -1,7 +1,104 @@
-import boto3
+import re
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Pattern, Tuple
 
 from .translator.arn_generator import ArnGenerator, NoRegionFound
 
+if TYPE_CHECKING:
+    from botocore.loaders import Loader
+
+
+class PartitionTable(object):
+    """
+    Immutable table of the partitions, regions and regional service endpoints of botocore's endpoint data. It is
+    loaded once, so that looking up the partition of a region or the regions of a service does not create a boto3
+    Session and load the endpoint data again.
+    """
+
+    _default: Optional["PartitionTable"] = None
+
+    def __init__(self, endpoint_data: Dict[str, Any], loader: Optional["Loader"] = None) -> None:
+        """
+        :param endpoint_data: Endpoint data, as in botocore's endpoints.json
+        :param loader: Optional botocore loader of the service models, to find the endpoint prefix of services that
+            are not named after it. If not provided, services are looked up by their endpoint prefix.
+        """
+        self._loader = loader
+        # Partitions in the order botocore matches them, with the regex of the names of their regions
+        self._partitions: List[Tuple[str, Optional[Pattern[str]]]] = []
+        self._region_partitions: Dict[str, str] = {}
+        self._service_regions: Dict[Tuple[str, str], FrozenSet[str]] = {}
+        self._endpoint_prefixes: Dict[str, Optional[str]] = {}
+
+        for partition in endpoint_data["partitions"]:
+            partition_name = partition["partition"]
+            region_regex = partition.get("regionRegex")
+            self._partitions.append((partition_name, re.compile(region_regex) if region_regex else None))
+            for region in partition["regions"]:
+                self._region_partitions.setdefault(region, partition_name)
+            for service, service_data in partition["services"].items():
+                # Only regional endpoints, like boto3's Session.get_available_regions()
+                regions = frozenset(
+                    endpoint for endpoint in service_data.get("endpoints", {}) if endpoint in partition["regions"]
+                )
+                self._service_regions.setdefault((partition_name, service), regions)
+
+    @classmethod
+    def from_botocore(cls) -> "PartitionTable":
+        """
+        Loads the table from the endpoint data shipped with botocore.
+        """
+        from botocore.loaders import create_loader
+
+        loader = create_loader()
+        return cls(loader.load_data("endpoints"), loader)
+
+    @classmethod
+    def get_default(cls) -> "PartitionTable":
+        """
+        Returns the table loaded from botocore, loading it on first use.
+        """
+        if cls._default is None:
+            cls._default = cls.from_botocore()
+        return cls._default
+
+    def get_partition_for_region(self, region: str) -> Optional[str]:
+        """
+        Returns the name of the partition of the region, or None if the region is not in any partition.
+        """
+        partition_name = self._region_partitions.get(region)
+        if partition_name is not None:
+            return partition_name
+        for partition_name, region_regex in self._partitions:
+            if region_regex and region_regex.match(region):
+                return partition_name
+        return None
+
+    def is_service_supported(self, service: str, region: str) -> bool:
+        """
+        Returns whether the service has a regional endpoint in the region.
+
+        :param service: service code (string used to obtain a boto3 client for the service)
+        :param region: region identifier (e.g., us-east-1)
+        """
+        partition_name = self.get_partition_for_region(region)
+        endpoint_prefix = self._get_endpoint_prefix(service)
+        if partition_name is None or endpoint_prefix is None:
+            return False
+        return region in self._service_regions.get((partition_name, endpoint_prefix), ())
+
+    def _get_endpoint_prefix(self, service: str) -> Optional[str]:
+        if self._loader is None:
+            return service
+        if service not in self._endpoint_prefixes:
+            from botocore.exceptions import UnknownServiceError
+
+            try:
+                service_model = self._loader.load_service_model(service, "service-2")
+                self._endpoint_prefixes[service] = service_model["metadata"].get("endpointPrefix", service)
+            except UnknownServiceError:
+                self._endpoint_prefixes[service] = None
+        return self._endpoint_prefixes[service]
+
 
 class RegionConfiguration(object):
     """
@@ -26,7 +123,9 @@ class RegionConfiguration(object):
         ]
 
     @classmethod
-    def is_service_supported(cls, service, region=None):  # type: ignore[no-untyped-def]
+    def is_service_supported(
+        cls, service: str, region: Optional[str] = None, partition_table: Optional[PartitionTable] = None
+    ) -> bool:
         """
         Not all services are supported in all regions.  This method returns whether a given
         service is supported in a given region.  If no region is specified, the current region
@@ -35,23 +134,20 @@ class RegionConfiguration(object):
 
         :param service: service code (string used to obtain a boto3 client for the service)
         :param region: region identifier (e.g., us-east-1)
+        :param partition_table: Optional table of the regions of the services. If not provided, the table in use
+            (see ArnGenerator.use_partition_table), or else the table loaded from botocore, is used.
         :return: True, if the service is supported in the region
         """
 
-        session = boto3.Session()
-
         if not region:
-            # get the current region
-            region = session.region_name
+            # get the current region: the one resolved by boto3 comes first, the region in use only stands in
+            # when boto3 can't find one
+            region = ArnGenerator.resolve_region_name() or ArnGenerator.get_region_name_in_use()
 
             # need to handle when region is None so that it won't break
             if region is None:
-                if ArnGenerator.BOTO_SESSION_REGION_NAME is not None:
-                    region = ArnGenerator.BOTO_SESSION_REGION_NAME  # type: ignore[unreachable]
-                else:
-                    raise NoRegionFound("AWS Region cannot be found")
+                raise NoRegionFound("AWS Region cannot be found")
 
         # check if the service is available in region
-        partition = session.get_partition_for_region(region)
-        available_regions = session.get_available_regions(service, partition_name=partition)
-        return region in available_regions
+        table = partition_table or ArnGenerator.get_partition_table() or PartitionTable.get_default()
+        return table.is_service_supported(service, region)
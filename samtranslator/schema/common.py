@@ -2,13 +2,13 @@ import json
 import os
 from pathlib import Path
 from typing import Any, Dict, Optional, Union, TypeVar
-from functools import partial
+from functools import lru_cache, partial
 
 import pydantic
 from pydantic import Extra, Field
 
-# Value passed directly to CloudFormation; not used by SAM
-PassThrough = Any  # TODO: Make it behave like typescript's unknown
+# Re-exported for the schema models; mypy --strict only re-exports names imported with an alias
+from samtranslator.utils.types import PassThrough as PassThrough  # pylint: disable=useless-import-alias,unused-import
 
 # Intrinsic resolvable by the SAM transform
 T = TypeVar("T")
@@ -23,7 +23,15 @@ DictStrAny = Dict[str, Any]
 LenientBaseModel = pydantic.BaseModel
 
 _thisdir = os.path.dirname(os.path.abspath(__file__))
-_DOCS = json.loads(Path(_thisdir, "docs.json").read_bytes())
+
+
+@lru_cache(maxsize=None)
+def _get_docs() -> Dict[str, Any]:
+    """
+    Loads the property docs on first use; docs.json is large and only the schema models need it.
+    """
+    docs: Dict[str, Any] = json.loads(Path(_thisdir, "docs.json").read_bytes())
+    return docs
 
 
 def get_prop(stem: str) -> Any:
@@ -31,7 +39,7 @@ def get_prop(stem: str) -> Any:
 
 
 def _get_prop(stem: str, name: str) -> Any:
-    docs = _DOCS["properties"][stem][name]
+    docs = _get_docs()["properties"][stem][name]
     return Field(
         title=name,
         description=docs,
@@ -1,4 +1,3 @@
-import boto3
 from typing import Dict, Any
 import copy
 
@@ -61,20 +60,24 @@ class SamParameterValues(object):
             if param_name not in self.parameter_values and isinstance(value, dict) and "Default" in value:
                 self.parameter_values[param_name] = value["Default"]
 
-    def add_pseudo_parameter_values(self, session=None):  # type: ignore[no-untyped-def]
+    def add_pseudo_parameter_values(self, session=None, region_name=None):  # type: ignore[no-untyped-def]
         """
         Add pseudo parameter values
+
+        :param session: Optional boto3 session whose region is used
+        :param region_name: Optional name of the region. If neither the region nor a session is given, the region
+            is resolved by ArnGenerator.get_region_name.
         :return: parameter values that have pseudo parameter in it
         """
 
-        if session is None:
-            session = boto3.session.Session()
+        if region_name is None:
+            region_name = session.region_name if session is not None else ArnGenerator.get_region_name()
 
-        if not session.region_name:
+        if not region_name:
             raise NoRegionFound("AWS Region cannot be found")
 
         if "AWS::Region" not in self.parameter_values:
-            self.parameter_values["AWS::Region"] = session.region_name
+            self.parameter_values["AWS::Region"] = region_name
 
         if "AWS::Partition" not in self.parameter_values:
-            self.parameter_values["AWS::Partition"] = ArnGenerator.get_partition_name(session.region_name)
+            self.parameter_values["AWS::Partition"] = ArnGenerator.get_partition_name(region_name)
@@ -1,4 +1,6 @@
-from typing import Any, Dict, Iterator, Optional, Set, Tuple, Union
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Collection, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 from samtranslator.sdk.resource import SamResource
 
@@ -7,6 +9,125 @@ Classes representing SAM template and resources.
 """
 
 
+class SamTemplateIndex(object):
+    """
+    Index of the resources of a template by type, so that finding the resources of some types doesn't scan the whole
+    template. One index is shared by the plugins and the translator for the whole translation (see
+    use_template_index), and it is kept up to date by SamTemplate.set() and SamTemplate.delete().
+
+    Logical IDs are returned in the iteration order of the "Resources" dictionary, which can change when resources
+    are added (ie. Py27Dict), so the index is rebuilt lazily after resources were added or removed. It is also
+    rebuilt after each plugin hook, as plugins can change resources without going through SamTemplate (see
+    invalidate_template_index), and when the "Resources" dictionary was replaced or its size changed.
+    """
+
+    def __init__(self, template_dict: Dict[str, Any]) -> None:
+        """
+        :param dict template_dict: Template dictionary, that contains the "Resources" dictionary
+        """
+        self.template_dict = template_dict
+        self._resources: Optional[Dict[str, Any]] = None
+        self._size = 0
+        self._logical_ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._types: Dict[str, str] = {}
+        self._logical_ids_by_type: Dict[str, List[str]] = {}
+
+    def get_logical_ids(self, resource_types: Optional[Collection[str]] = None) -> List[str]:
+        """
+        Returns the logical IDs of the resources of the given types, in the order of the template
+
+        :param resource_types: Types of the resources, None for all the resources
+        :return: Logical IDs
+        """
+        self._refresh()
+        if resource_types is None:
+            return list(self._logical_ids)
+
+        logical_ids: List[str] = []
+        for resource_type in resource_types:
+            logical_ids.extend(self._logical_ids_by_type.get(resource_type, []))
+        if len(resource_types) > 1:
+            logical_ids.sort(key=self._positions.__getitem__)
+        return logical_ids
+
+    def get_type(self, logical_id: str) -> Optional[str]:
+        """
+        Returns the type of a resource, None if the template doesn't have it or its type is not a string
+
+        :param logical_id: Logical ID of the resource
+        """
+        self._refresh()
+        return self._types.get(logical_id)
+
+    def invalidate(self) -> None:
+        """
+        Marks the index as outdated, so that it is rebuilt when it is next used
+        """
+        self._resources = None
+
+    def _refresh(self) -> None:
+        resources = self.template_dict.get("Resources")
+        if not isinstance(resources, dict):
+            resources = {}
+        if resources is self._resources and len(resources) == self._size:
+            return
+
+        self._resources = resources
+        self._size = len(resources)
+        self._logical_ids = list(resources)
+        self._positions = {logical_id: position for position, logical_id in enumerate(self._logical_ids)}
+        self._types = {}
+        self._logical_ids_by_type = {}
+        for logical_id, resource_dict in resources.items():
+            resource_type = resource_dict.get("Type") if isinstance(resource_dict, dict) else None
+            if isinstance(resource_type, str):
+                self._types[logical_id] = resource_type
+                self._logical_ids_by_type.setdefault(resource_type, []).append(logical_id)
+
+
+_CURRENT_TEMPLATE_INDEX: ContextVar[Optional[SamTemplateIndex]] = ContextVar(
+    "samtranslator_template_index", default=None
+)
+
+
+@contextmanager
+def use_template_index(index: SamTemplateIndex) -> Iterator[None]:
+    """
+    Shares the index with the SamTemplate objects created in the block for the same template dictionary, ie. by the
+    plugins and the translator during a translation
+
+    :param index: Index of the template being translated
+    """
+    token = _CURRENT_TEMPLATE_INDEX.set(index)
+    try:
+        yield
+    finally:
+        _CURRENT_TEMPLATE_INDEX.reset(token)
+
+
+def get_template_index(template_dict: Dict[str, Any]) -> SamTemplateIndex:
+    """
+    Returns the index shared for the template dictionary, or a new one if it isn't shared
+
+    :param dict template_dict: Template dictionary
+    """
+    index = _CURRENT_TEMPLATE_INDEX.get()
+    if index is not None and index.template_dict is template_dict:
+        return index
+    return SamTemplateIndex(template_dict)
+
+
+def invalidate_template_index() -> None:
+    """
+    Marks the shared index as outdated, if any, after code that may have changed the template without going through
+    SamTemplate, ie. plugin hooks
+    """
+    index = _CURRENT_TEMPLATE_INDEX.get()
+    if index is not None:
+        index.invalidate()
+
+
 class SamTemplate(object):
     """
     Class representing the SAM template
@@ -20,24 +141,33 @@ class SamTemplate(object):
         """
         self.template_dict = template_dict
         self.resources = template_dict["Resources"]
+        self.index = get_template_index(template_dict)
 
     def iterate(self, resource_types: Optional[Set[str]] = None) -> Iterator[Tuple[str, SamResource]]:
         """
-        Iterate over all resources within the SAM template, optionally filtering by type
+        Iterate over all resources within the SAM template, optionally filtering by type.
+
+        Without filter, every resource is validated. With a filter, only the resources of the given types are, which
+        are looked up in the index of the template.
 
         :param set resource_types: Optional types to filter the resources by
         :yields (string, SamResource): Tuple containing LogicalId and the resource
         """
-        if resource_types is None:
-            resource_types = set()
-        for logicalId, resource_dict in self.resources.items():
+        if not resource_types:
+            for logicalId, resource_dict in self.resources.items():
+                resource = SamResource(resource_dict)
+                if resource.valid():  # type: ignore[no-untyped-call]
+                    yield logicalId, resource
+            return
+
+        for logicalId in self.index.get_logical_ids(resource_types):
+            resource_dict = self.resources.get(logicalId)
+            # Skip the resources removed, or whose type changed, since the index was built
+            if not isinstance(resource_dict, dict) or resource_dict.get("Type") not in resource_types:
+                continue
 
             resource = SamResource(resource_dict)
-            needs_filter = resource.valid()  # type: ignore[no-untyped-call]
-            if resource_types:
-                needs_filter = needs_filter and resource.type in resource_types
-
-            if needs_filter:
+            if resource.valid():  # type: ignore[no-untyped-call]
                 yield logicalId, resource
 
     def set(self, logical_id: str, resource: Union[SamResource, Dict[str, Any]]) -> None:
@@ -52,6 +182,13 @@ class SamTemplate(object):
         if isinstance(resource, SamResource):
             resource_dict = resource.to_dict()
 
+        # Updating the properties of a resource in place doesn't change the index
+        if (
+            self.resources.get(logical_id) is not resource_dict
+            or not isinstance(resource_dict, dict)
+            or resource_dict.get("Type") != self.index.get_type(logical_id)
+        ):
+            self.index.invalidate()
         self.resources[logical_id] = resource_dict
 
     def get(self, logical_id: str) -> Optional[SamResource]:
@@ -75,6 +212,7 @@ class SamTemplate(object):
 
         if logicalId in self.resources:
             del self.resources[logicalId]
+            self.index.invalidate()
 
     def to_dict(self):  # type: ignore[no-untyped-def]
         """
@@ -1,22 +1,19 @@
 ﻿import copy
 import re
-from typing import Callable, Dict, Any, Optional, TypeVar
+from typing import Callable, Dict, Any, Optional
 
 from samtranslator.metrics.method_decorator import cw_timer
 from samtranslator.model.apigateway import ApiGatewayAuthorizer
 from samtranslator.model.intrinsics import ref, make_conditional, fnSub
 from samtranslator.model.exceptions import InvalidDocumentException, InvalidTemplateException
 from samtranslator.open_api.base_editor import BaseEditor
-from samtranslator.schema.common import PassThrough
 from samtranslator.translator.arn_generator import ArnGenerator
 from samtranslator.utils.py27hash_fix import Py27Dict, Py27UniStr
+from samtranslator.utils.types import PassThrough
 from samtranslator.utils.utils import InvalidValueType, dict_deep_set
 
-T = TypeVar("T")
-
-
 # Wrap around copy.deepcopy to isolate time cost to deepcopy the doc.
-_deepcopy: Callable[[T], T] = cw_timer(prefix="SwaggerEditor")(copy.deepcopy)
+_deepcopy: Callable[..., Any] = cw_timer(prefix="SwaggerEditor")(copy.deepcopy)
 
 
 class SwaggerEditor(BaseEditor):
@@ -51,19 +48,22 @@ class SwaggerEditor(BaseEditor):
     # Attributes:
     _doc: Dict[str, Any]
 
-    def __init__(self, doc: Optional[Dict[str, Any]]) -> None:
+    def __init__(self, doc: Optional[Dict[str, Any]], owns_doc: bool = False) -> None:
         """
         Initialize the class with a swagger dictionary. This class creates a copy of the Swagger and performs all
         modifications on this copy.
 
         :param dict doc: Swagger document as a dictionary
+        :param bool owns_doc: Whether the caller hands the document over to the editor, ie. replaces it with the
+            document the editor returns and never reads or modifies it otherwise. The path items of the document are
+            then only copied when the editor accesses them, and the document it returns shares the other ones.
         :raises InvalidDocumentException: If the input Swagger document does not meet the basic Swagger requirements.
         """
 
         if not doc or not SwaggerEditor.is_valid(doc):
             raise InvalidDocumentException([InvalidTemplateException("Invalid Swagger document")])
 
-        self._doc = _deepcopy(doc)
+        self._doc = self._copy_input_doc(doc, _deepcopy, owns_doc)
         self.paths = self._doc["paths"]
         self.security_definitions = self._doc.get("securityDefinitions", Py27Dict())
         self.gateway_responses = self._doc.get(self._X_APIGW_GATEWAY_RESPONSES, Py27Dict())
@@ -75,8 +75,9 @@ class SwaggerEditor(BaseEditor):
         # each path item object must be a dict (even it is empty).
         # We can do an early path validation on path item objects,
         # so we don't need to validate wherever we use them.
+        # The path items of the input document are validated, to not copy them all (see CopyOnAccessPaths).
         for path in self.iter_on_path():
-            for path_item in self.get_conditional_contents(self.paths.get(path)):
+            for path_item in self.get_conditional_contents(doc["paths"].get(path)):
                 SwaggerEditor.validate_path_item_is_dict(path_item, path)
 
     def add_disable_execute_api_endpoint_extension(self, disable_execute_api_endpoint: PassThrough) -> None:
@@ -1199,6 +1200,8 @@ class SwaggerEditor(BaseEditor):
     def swagger(self) -> Dict[str, Any]:
         """
         Returns a **copy** of the Swagger document as a dictionary.
+        When the editor was handed its document over, the copy shares the path items the editor did not access with
+        that document.
 
         :return dict: Dictionary containing the Swagger document
         """
@@ -1216,7 +1219,7 @@ class SwaggerEditor(BaseEditor):
         if self.definitions:
             self._doc["definitions"] = self.definitions
 
-        return _deepcopy(self._doc)
+        return _deepcopy(self._doc)  # type: ignore[no-any-return]
 
     @staticmethod
     def is_valid(data: Any) -> bool:
@@ -1,14 +1,24 @@
-import boto3
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Iterator, Optional
 
-from typing import Optional
+if TYPE_CHECKING:
+    from samtranslator.region_configuration import PartitionTable
 
 
 class NoRegionFound(Exception):
     pass
 
 
+# Region and partition table of the translation running in the current thread or task
+_REGION_NAME: ContextVar[Optional[str]] = ContextVar("samtranslator_region_name", default=None)
+_PARTITION_TABLE: ContextVar[Optional["PartitionTable"]] = ContextVar("samtranslator_partition_table", default=None)
+
+
 class ArnGenerator(object):
-    BOTO_SESSION_REGION_NAME = None
+    # Region used by all the threads when none is in use (see use_region_name)
+    BOTO_SESSION_REGION_NAME: Optional[str] = None
 
     @classmethod
     def generate_arn(cls, partition, service, resource, include_account_id=True):  # type: ignore[no-untyped-def]
@@ -35,12 +45,96 @@ class ArnGenerator(object):
         """
         return "arn:{}:iam::aws:policy/{}".format(ArnGenerator.get_partition_name(), policy_name)
 
+    @classmethod
+    @contextmanager
+    def use_region_name(cls, region: Optional[str]) -> Iterator[None]:
+        """
+        Uses the given region name instead of resolving it with a new boto3 Session whenever a partition name is
+        needed, until the end of the ``with`` block. The region is only used by the current thread (or asyncio task),
+        so concurrent translations can use different regions.
+
+        :param region: Name of the region, or None to resolve the region with boto3
+        """
+        token = _REGION_NAME.set(region)
+        try:
+            yield
+        finally:
+            _REGION_NAME.reset(token)
+
+    @classmethod
+    @contextmanager
+    def use_partition_table(cls, partition_table: Optional["PartitionTable"]) -> Iterator[None]:
+        """
+        Uses the given partition table to find the partition of a region, and the regions of a service, until the
+        end of the ``with`` block. Like the region, the table is only used by the current thread (or asyncio task).
+
+        :param partition_table: Table of the partitions, or None to use the default ones
+        """
+        token = _PARTITION_TABLE.set(partition_table)
+        try:
+            yield
+        finally:
+            _PARTITION_TABLE.reset(token)
+
+    @classmethod
+    def get_partition_table(cls) -> Optional["PartitionTable"]:
+        """
+        Returns the partition table in use (see use_partition_table), None if there is none.
+        """
+        return _PARTITION_TABLE.get()
+
+    @classmethod
+    def get_region_name(cls) -> str:
+        """
+        Gets the name of the region where this code is running: the region in use (see get_region_name_in_use), or
+        else the region resolved like Boto3 does (see resolve_region_name).
+
+        :return: Region name
+        """
+        region = cls.get_region_name_in_use() or cls.resolve_region_name()
+
+        # If region is still None, then we could not find the region. This will only happen
+        # in the local context. When this is deployed, we will be able to find the region like
+        # we did before.
+        if region is None:
+            raise NoRegionFound("AWS Region cannot be found")
+
+        return region
+
+    @classmethod
+    def get_region_name_in_use(cls) -> Optional[str]:
+        """
+        Returns the region in use by the current thread (see use_region_name), or else the process-wide
+        BOTO_SESSION_REGION_NAME. None if there is neither.
+        """
+        return _REGION_NAME.get() or ArnGenerator.BOTO_SESSION_REGION_NAME
+
+    @classmethod
+    def resolve_region_name(cls) -> Optional[str]:
+        """
+        Resolves the region with Boto's regular region resolution mechanism, which starts from the
+        AWS_DEFAULT_REGION environment variable. That variable is read first, whether boto3 is imported or not, so
+        that boto3 is only imported when it isn't set.
+
+        :return: Region name, None if it can't be found
+        """
+        region = os.environ.get("AWS_DEFAULT_REGION")
+        if region:
+            return region
+
+        import boto3
+
+        return boto3.session.Session().region_name
+
     @classmethod
     def get_partition_name(cls, region: Optional[str] = None) -> str:
         """
         Gets the name of the partition given the region name. If region name is not provided, this method will
         use Boto3 to get name of the region where this code is running.
 
+        The partition is looked up in the partition table in use, if any (see use_partition_table). Regions that are
+        not in the table, or all regions without a table, are matched by the prefix of their name.
+
         This implementation is borrowed from AWS CLI
         https://github.com/aws/aws-cli/blob/1.11.139/awscli/customizations/emr/createdefaultroles.py#L59
 
@@ -49,19 +143,13 @@ class ArnGenerator(object):
         """
 
         if region is None:
-            # Use Boto3 to get the region where code is running. This uses Boto's regular region resolution
-            # mechanism, starting from AWS_DEFAULT_REGION environment variable.
-
-            if ArnGenerator.BOTO_SESSION_REGION_NAME is None:
-                region = boto3.session.Session().region_name
-            else:
-                region = ArnGenerator.BOTO_SESSION_REGION_NAME  # type: ignore[unreachable]
+            region = ArnGenerator.get_region_name()
 
-        # If region is still None, then we could not find the region. This will only happen
-        # in the local context. When this is deployed, we will be able to find the region like
-        # we did before.
-        if region is None:
-            raise NoRegionFound("AWS Region cannot be found")
+        partition_table = _PARTITION_TABLE.get()
+        if partition_table is not None:
+            partition_name = partition_table.get_partition_for_region(region)
+            if partition_name is not None:
+                return partition_name
 
         # setting default partition to aws, this will be overwritten by checking the region below
         partition = "aws"
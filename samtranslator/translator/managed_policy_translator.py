@@ -1,15 +1,111 @@
+import json
 import logging
+import re
+import threading
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Union
 
 from samtranslator.metrics.method_decorator import cw_timer
+from samtranslator.utils.cache import FileStore, LRUStore, TTLCache
 
 LOG = logging.getLogger(__name__)
 
 
+class ManagedPolicyCache:
+    """
+    Base class of the caches of the managed policy map (policy name to ARN) loaded from IAM.
+
+    An entry older than the TTL of the cache is not returned, unless `allow_expired` is set, which is used to serve a
+    stale map when IAM can't be reached.
+    """
+
+    def __init__(self, store: Union[LRUStore[str], FileStore], ttl_seconds: Optional[float] = None) -> None:
+        """
+        :param store: Store of the entries
+        :param ttl_seconds: Time to live of the entries in seconds. None means entries never expire
+        """
+        self._store = store
+        self._cache: TTLCache[Dict[str, str]] = TTLCache(store, json.dumps, _decode_policy_map, ttl_seconds)
+
+    @property
+    def ttl_seconds(self) -> Optional[float]:
+        return self._cache.ttl_seconds
+
+    def get(self, key: str, allow_expired: bool = False) -> Optional[Dict[str, str]]:
+        """
+        Returns the cached managed policy map for the given key, None if there isn't one or it expired
+
+        :param key: Cache key, identifies the partition the policies were loaded for
+        :param allow_expired: Whether to return the map even if it expired
+        """
+        return self._cache.get(key, allow_expired)
+
+    def put(self, key: str, policy_map: Dict[str, str]) -> None:
+        """
+        Stores the managed policy map for the given key
+
+        :param key: Cache key, identifies the partition the policies were loaded for
+        :param policy_map: Map of managed policy names to the ARNs
+        """
+        self._cache.put(key, policy_map)
+
+
+class InMemoryManagedPolicyCache(ManagedPolicyCache):
+    """
+    In-memory cache of managed policy maps, shared by the ManagedPolicyLoader instances of a process.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_size: int = 8) -> None:
+        """
+        :param ttl_seconds: Time to live of the entries in seconds. None means entries never expire
+        :param max_size: Maximum number of entries, the least recently used one is evicted first
+        """
+        super().__init__(LRUStore(max_size), ttl_seconds)
+
+
+class FileManagedPolicyCache(ManagedPolicyCache):
+    """
+    Cache of managed policy maps persisted in a local directory, so that the maps survive the process.
+    """
+
+    def __init__(self, directory: str, ttl_seconds: Optional[float] = None) -> None:
+        """
+        :param directory: Directory of the cache files, created if it doesn't exist
+        :param ttl_seconds: Time to live of the entries in seconds. None means entries never expire
+        """
+        super().__init__(FileStore(directory), ttl_seconds)
+
+
+def _decode_policy_map(content: str) -> Dict[str, str]:
+    policy_map = json.loads(content)
+    if not isinstance(policy_map, dict):
+        raise ValueError("Managed policy map must be a JSON object")
+    return policy_map
+
+
 class ManagedPolicyLoader(object):
-    def __init__(self, iam_client):  # type: ignore[no-untyped-def]
+    def __init__(
+        self,
+        iam_client: Any,
+        cache: Optional[ManagedPolicyCache] = None,
+        cache_key: Optional[str] = None,
+        offline: bool = False,
+        snapshot_file_path: Optional[str] = None,
+    ) -> None:
+        """
+        :param iam_client: IAM client used to list the AWS managed policies
+        :param cache: Optional cache of the managed policy map, shared between loaders and/or processes
+        :param cache_key: Key of the map in the cache, defaults to the partition of the IAM client
+        :param offline: If True, IAM is never called, the map is served from the cache (even expired) or the snapshot
+        :param snapshot_file_path: Optional JSON file with a snapshot of the map (policy name to ARN), served when IAM
+            can't be reached and the cache has no entry
+        """
         self._iam_client = iam_client
-        self._policy_map = None
+        self._policy_map: Optional[Dict[str, str]] = None
         self.max_items = 1000
+        self._cache = cache
+        self._cache_key = cache_key
+        self._offline = offline
+        self._snapshot_file_path = snapshot_file_path
 
     @cw_timer(prefix="External", name="IAM")
     def _load_policies_from_iam(self):  # type: ignore[no-untyped-def]
@@ -22,7 +118,7 @@ class ManagedPolicyLoader(object):
         # Note(jfuss): boto3 PaginationConfig MaxItems does not control the number of items returned from the API
         # call. This is actually controlled by PageSize.
         page_iterator = paginator.paginate(Scope="AWS", PaginationConfig={"PageSize": self.max_items})
-        name_to_arn_map = {}  # type: ignore[var-annotated]
+        name_to_arn_map: Dict[str, str] = {}
 
         for page in page_iterator:
             name_to_arn_map.update(map(lambda x: (x["PolicyName"], x["Arn"]), page["Policies"]))
@@ -30,7 +126,157 @@ class ManagedPolicyLoader(object):
         LOG.info("Finished loading policies from IAM.")
         self._policy_map = name_to_arn_map
 
+    def load_lazy(self) -> "LazyManagedPolicyMap":
+        """
+        Returns a managed policy map that calls IAM only when a policy name is looked up. Names are resolved one by
+        one with iam:GetPolicy, the whole list of AWS managed policies is loaded only when that isn't possible.
+        """
+        return LazyManagedPolicyMap(self.load, self.get_policy_arn)
+
+    def get_policy_arn(self, policy_name: str) -> Optional[str]:
+        """
+        Returns the ARN of the AWS managed policy with the given name, None if there is no such policy.
+
+        Uses the already loaded or cached map when there is one, else calls iam:GetPolicy for the policy name.
+        Falls back to loading all the policies if the call fails, e.g. because the policy has a path
+        (service-role/...) and so a different ARN, or the caller isn't allowed to call iam:GetPolicy.
+
+        :param policy_name: Name of the managed policy
+        """
+        if self._policy_map is None and self._cache is not None:
+            self._policy_map = self._cache.get(self._get_cache_key())
+        if self._policy_map is not None or self._offline:
+            return self.load().get(policy_name)  # type: ignore[no-untyped-call, no-any-return]
+
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        policy_arn = "arn:{}:iam::aws:policy/{}".format(self._get_partition(), policy_name)
+        try:
+            response = self._get_policy_from_iam(policy_arn)
+        except (ClientError, BotoCoreError):
+            LOG.debug("Failed to get policy %s from IAM, loading all policies.", policy_arn, exc_info=True)
+            return self.load().get(policy_name)  # type: ignore[no-untyped-call, no-any-return]
+        return response["Policy"]["Arn"]  # type: ignore[no-any-return]
+
+    @cw_timer(prefix="External", name="IAM-GetPolicy")  # type: ignore[misc]
+    def _get_policy_from_iam(self, policy_arn: str) -> Any:
+        return self._iam_client.get_policy(PolicyArn=policy_arn)
+
     def load(self):  # type: ignore[no-untyped-def]
         if self._policy_map is None:
-            self._load_policies_from_iam()
+            if self._cache is not None:
+                self._policy_map = self._cache.get(self._get_cache_key())
+            if self._policy_map is None:
+                self._load_policies()
+        return self._policy_map
+
+    def _load_policies(self) -> None:
+        """
+        Loads the policies from IAM and stores them in the cache. Falls back to the expired cache entry and then
+        to the snapshot when in offline mode or when IAM can't be reached
+        """
+        if not self._offline:
+            try:
+                self._load_policies_from_iam()
+            except Exception:
+                fallback = self._load_fallback_policies()
+                if fallback is None:
+                    raise
+                LOG.warning("Failed to load policies from IAM, using a cached or snapshot copy.", exc_info=True)
+                self._policy_map = fallback
+                return
+            if self._cache is not None and self._policy_map is not None:
+                self._cache.put(self._get_cache_key(), self._policy_map)
+            return
+
+        fallback = self._load_fallback_policies()
+        if fallback is None:
+            raise ValueError("No cached or snapshot copy of the managed policies is available in offline mode.")
+        self._policy_map = fallback
+
+    def _load_fallback_policies(self) -> Optional[Dict[str, str]]:
+        if self._cache is not None:
+            policy_map = self._cache.get(self._get_cache_key(), allow_expired=True)
+            if policy_map is not None:
+                return policy_map
+        if self._snapshot_file_path:
+            with open(self._snapshot_file_path, encoding="utf-8") as fp:
+                return json.load(fp)  # type: ignore[no-any-return]
+        return None
+
+    def _get_cache_key(self) -> str:
+        return self._cache_key or self._get_partition()
+
+    def _get_partition(self) -> str:
+        partition = getattr(getattr(self._iam_client, "meta", None), "partition", None)
+        return partition if isinstance(partition, str) else "aws"
+
+
+class LazyManagedPolicyMap(Mapping[str, str]):
+    """
+    Read-only map of managed policy names to ARNs that defers loading the policies until they are needed.
+
+    Looking a name up resolves only that name (through `get_policy_arn` when given) and remembers the result.
+    Iterating or taking the length of the map loads the whole map, which must not be empty.
+
+    Checking whether the map is empty never loads it: the map is truthy until it is loaded, and loading an empty map
+    raises on the first lookup instead.
+    """
+
+    # Valid characters of IAM policy names, anything else (ARNs, intrinsics, ...) can't be a key of the map
+    POLICY_NAME_REGEX = re.compile(r"^[\w+=,.@-]+$")
+
+    def __init__(
+        self,
+        load_policies: Callable[[], Dict[str, str]],
+        get_policy_arn: Optional[Callable[[str], Optional[str]]] = None,
+    ) -> None:
+        """
+        :param load_policies: Function returning the whole managed policy map
+        :param get_policy_arn: Optional function returning the ARN of a single policy name, None if it doesn't exist
+        """
+        self._load_policies = load_policies
+        self._get_policy_arn = get_policy_arn
+        self._policy_map: Optional[Dict[str, str]] = None
+        self._resolved: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def _resolve(self, policy_name: Any) -> Optional[str]:
+        if not isinstance(policy_name, str) or not self.POLICY_NAME_REGEX.match(policy_name):
+            return None
+        with self._lock:
+            if self._policy_map is not None or self._get_policy_arn is None:
+                return self._load().get(policy_name)
+            if policy_name not in self._resolved:
+                self._resolved[policy_name] = self._get_policy_arn(policy_name)
+            return self._resolved[policy_name]
+
+    def _materialize(self) -> Dict[str, str]:
+        with self._lock:
+            return self._load()
+
+    def _load(self) -> Dict[str, str]:
+        """Returns the whole map, loading it if it isn't yet. The lock must be held."""
+        if self._policy_map is None:
+            self._policy_map = self._load_policies()
+        if not self._policy_map:
+            raise Exception("Managed policy map is empty, but should not be.")
         return self._policy_map
+
+    def __getitem__(self, policy_name: str) -> str:
+        policy_arn = self._resolve(policy_name)
+        if policy_arn is None:
+            raise KeyError(policy_name)
+        return policy_arn
+
+    def __contains__(self, policy_name: object) -> bool:
+        return self._resolve(policy_name) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._materialize())
+
+    def __len__(self) -> int:
+        return len(self._materialize())
+
+    def __bool__(self) -> bool:
+        return self._policy_map is None or bool(self._policy_map)
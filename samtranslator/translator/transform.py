@@ -1,11 +1,28 @@
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from samtranslator.feature_toggle.feature_toggle import FeatureToggle
+from samtranslator.metrics.metrics import Metrics
+from samtranslator.metrics.profiler import Profiler
 from samtranslator.translator.translator import Translator
+from samtranslator.translator.managed_policy_translator import LazyManagedPolicyMap, ManagedPolicyLoader
+from samtranslator.translator.translation_cache import TranslationCache
+from samtranslator.plugins.application.sar_application_cache import SarApplicationCache
 from samtranslator.parser.parser import Parser
-from samtranslator.utils.py27hash_fix import to_py27_compatible_template, undo_mark_unicode_str_in_template
+from samtranslator.policy_template_processor.processor import PolicyTemplatesProcessor
+from samtranslator.region_configuration import PartitionTable
+from samtranslator.utils.py27hash_fix import (
+    dump_template,
+    to_py27_compatible_template,
+    undo_mark_unicode_str_in_template,
+)
+from samtranslator.validator.validator import SamTemplateValidatorCache
 
 
 def transform(input_fragment, parameter_values, managed_policy_loader, feature_toggle=None, passthrough_metadata=False):  # type: ignore[no-untyped-def]
     """Translates the SAM manifest provided in the and returns the translation to CloudFormation.
 
+    The input fragment and the parameter values are modified in place, see to_py27_compatible_template.
+
     :param dict input_fragment: the SAM template to transform
     :param dict parameter_values: Parameter values provided by the user
     :returns: the transformed CloudFormation template
@@ -14,7 +31,7 @@ def transform(input_fragment, parameter_values, managed_policy_loader, feature_t
 
     sam_parser = Parser()
     to_py27_compatible_template(input_fragment, parameter_values)  # type: ignore[no-untyped-call]
-    translator = Translator(managed_policy_loader.load(), sam_parser)  # type: ignore[no-untyped-call]
+    translator = Translator(make_lazy_managed_policy_map(managed_policy_loader), sam_parser)
     transformed = translator.translate(
         input_fragment,
         parameter_values=parameter_values,
@@ -23,3 +40,142 @@ def transform(input_fragment, parameter_values, managed_policy_loader, feature_t
     )
     transformed = undo_mark_unicode_str_in_template(transformed)  # type: ignore[no-untyped-call]
     return transformed
+
+
+def make_lazy_managed_policy_map(managed_policy_loader: Any) -> LazyManagedPolicyMap:
+    """
+    Returns a managed policy map that loads the policies only when the template looks a policy name up
+
+    :param managed_policy_loader: Loader of the managed policy map
+    """
+    if isinstance(managed_policy_loader, ManagedPolicyLoader):
+        return managed_policy_loader.load_lazy()
+    # Other loaders can only load the whole map, which is still deferred to the first lookup
+    return LazyManagedPolicyMap(managed_policy_loader.load)
+
+
+class TransformSession:
+    """
+    Translates many SAM templates with one warmed up Translator.
+
+    The policy templates, the template validator and the resource type resolver are loaded once when the session is
+    created instead of once per template, and managed policies are resolved at most once for the session. Everything
+    that is specific to a template (plugins, parameter values, intrinsics resolvers, ...) is still created on each
+    translation, so templates don't leak state into each other, and a session can translate templates on several
+    threads at once.
+
+    Custom plugins passed to the session are shared by all translations and must not keep per-template state.
+    """
+
+    def __init__(
+        self,
+        managed_policy_loader: Any,
+        feature_toggle: Optional[FeatureToggle] = None,
+        passthrough_metadata: Optional[bool] = False,
+        plugins: Optional[List[Any]] = None,
+        boto_session: Optional[Any] = None,
+        metrics: Optional[Metrics] = None,
+        translation_cache: Optional[TranslationCache] = None,
+        sar_application_cache: Optional[SarApplicationCache] = None,
+        partition_table: Optional[PartitionTable] = None,
+    ) -> None:
+        """
+        :param managed_policy_loader: Loader of the managed policy map, called only if a template uses a policy name
+        :param feature_toggle: Default FeatureToggle to use for the translations
+        :param passthrough_metadata: Whether to pass through the Metadata of SAM resources to generated resources
+        :param plugins: List of custom plugins to install in addition to the default ones
+        :param boto_session: Optional boto3 session used to resolve the region and partition
+        :param metrics: Optional Metrics instance
+        :param translation_cache: Optional cache of the resources generated for SAM resources, to translate again
+            only the SAM resources that changed since an earlier translation
+        :param sar_application_cache: Optional cache of the results of the calls to the Serverless Application
+            Repository, shared by the translations of the session
+        :param partition_table: Optional table of the partitions, regions and regional service endpoints, shared by
+            the translations of the session
+        """
+        self.feature_toggle = feature_toggle
+        self.passthrough_metadata = passthrough_metadata
+
+        SamTemplateValidatorCache.get_instance().warm()
+        policy_template_processor = PolicyTemplatesProcessor.get_default()
+        self.translator = Translator(
+            make_lazy_managed_policy_map(managed_policy_loader),
+            Parser(),
+            plugins=plugins,
+            boto_session=boto_session,
+            metrics=metrics,
+            policy_template_processor=policy_template_processor,
+            translation_cache=translation_cache,
+            sar_application_cache=sar_application_cache,
+            partition_table=partition_table,
+        )
+
+    def transform(
+        self,
+        input_fragment: Dict[str, Any],
+        parameter_values: Dict[str, Any],
+        feature_toggle: Optional[FeatureToggle] = None,
+        profiler: Optional[Profiler] = None,
+    ) -> Dict[str, Any]:
+        """Translates one SAM template, same as the `transform` function. The template and the parameter values are
+        modified in place.
+
+        :param input_fragment: the SAM template to transform
+        :param parameter_values: Parameter values provided by the user
+        :param feature_toggle: FeatureToggle for this template, defaults to the one of the session
+        :param profiler: Optional profiler recording the time spent in each phase of the translation
+        :returns: the transformed CloudFormation template
+        """
+        to_py27_compatible_template(input_fragment, parameter_values)  # type: ignore[no-untyped-call]
+        transformed = self.translator.translate(
+            input_fragment,
+            parameter_values=parameter_values,
+            feature_toggle=feature_toggle or self.feature_toggle,
+            passthrough_metadata=self.passthrough_metadata,
+            profiler=profiler,
+        )
+        return undo_mark_unicode_str_in_template(transformed)  # type: ignore[no-untyped-call, no-any-return]
+
+    def transform_to_json(
+        self,
+        input_fragment: Dict[str, Any],
+        parameter_values: Dict[str, Any],
+        fp: IO[str],
+        indent: Optional[int] = None,
+        feature_toggle: Optional[FeatureToggle] = None,
+        profiler: Optional[Profiler] = None,
+    ) -> None:
+        """Translates one SAM template and writes the JSON of the transformed CloudFormation template into a file.
+
+        The JSON is the same as the one of the template returned by `transform`, but the template is written as it is
+        serialized, without normalizing it into plain JSON types first. The template and the parameter values are
+        modified in place, as by `transform`.
+
+        :param input_fragment: the SAM template to transform
+        :param parameter_values: Parameter values provided by the user
+        :param fp: Text file to write the JSON to
+        :param indent: Optional indentation, as in json.dump
+        :param feature_toggle: FeatureToggle for this template, defaults to the one of the session
+        :param profiler: Optional profiler recording the time spent in each phase of the translation
+        """
+        to_py27_compatible_template(input_fragment, parameter_values)  # type: ignore[no-untyped-call]
+        transformed = self.translator.translate(
+            input_fragment,
+            parameter_values=parameter_values,
+            feature_toggle=feature_toggle or self.feature_toggle,
+            passthrough_metadata=self.passthrough_metadata,
+            profiler=profiler,
+        )
+        dump_template(transformed, fp, indent=indent)
+
+    def transform_all(self, templates: Iterable[Tuple[Dict[str, Any], Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+        """Translates the given (template, parameter values) pairs, lazily and in order.
+
+        Errors are not caught, so a template failing to translate stops the iteration. Callers that need to carry
+        on after errors should call `transform` for each template instead.
+
+        :param templates: Iterable of (SAM template, parameter values) pairs
+        :returns: Iterator of the transformed CloudFormation templates
+        """
+        for input_fragment, parameter_values in templates:
+            yield self.transform(input_fragment, parameter_values)
@@ -0,0 +1,202 @@
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Optional, Set, Union
+
+from samtranslator import __version__
+from samtranslator.model import SamResourceMacro
+from samtranslator.intrinsics.actions import SubAction
+from samtranslator.translator.arn_generator import ArnGenerator
+from samtranslator.utils.cache import FileStore, LRUStore, TTLCache
+
+LOG = logging.getLogger(__name__)
+
+# SAM resources whose generated resources only depend on their own properties, as long as they are not linked to
+# other resources (see is_cacheable)
+CACHEABLE_RESOURCE_TYPES = {
+    "AWS::Serverless::Function",
+    "AWS::Serverless::StateMachine",
+    "AWS::Serverless::SimpleTable",
+}
+
+
+class CachedResource(object):
+    """
+    CloudFormation resource generated by an earlier translation of the same SAM resource, read from a
+    TranslationCache. Stands in for the Resource objects returned by to_cloudformation().
+    """
+
+    def __init__(self, logical_id: str, resource_type: str, resource_dict: Dict[str, Any]) -> None:
+        self.logical_id = logical_id
+        self.resource_type = resource_type
+        self.resource_dict = resource_dict
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {self.logical_id: self.resource_dict}
+
+
+class TranslationCache:
+    """
+    Base class of the caches of the CloudFormation resources generated for SAM resources, so that unchanged SAM
+    resources are not translated again. Entries are keyed by get_resource_cache_key() and stored as JSON.
+    """
+
+    def __init__(self, store: Union[LRUStore[str], FileStore]) -> None:
+        """
+        :param store: Store of the entries
+        """
+        self._store = store
+        # Entries are already JSON, they are stored as they are and parsed by get()
+        self._cache: TTLCache[str] = TTLCache(store, str, str)
+
+    def get(self, key: str) -> Optional[List[CachedResource]]:
+        """
+        Returns the cached resources for the given key, None if there aren't any
+
+        :param key: Cache key of the SAM resource
+        """
+        content = self._cache.get(key)
+        if content is None:
+            return None
+        try:
+            entries = json.loads(content)
+        except ValueError:
+            LOG.warning("Ignoring corrupted translation cache entry %s", key)
+            return None
+        return [
+            CachedResource(logical_id, resource_type, resource_dict)
+            for logical_id, resource_type, resource_dict in entries
+        ]
+
+    def put(self, key: str, serialized_resources: List[str]) -> None:
+        """
+        Stores the resources generated for a SAM resource
+
+        :param key: Cache key of the SAM resource
+        :param serialized_resources: Generated resources, serialized with serialize_resource()
+        """
+        self._cache.put(key, "[{}]".format(",".join(serialized_resources)))
+
+
+class InMemoryTranslationCache(TranslationCache):
+    """
+    In-memory cache of generated resources, shared by the translations of a process.
+    """
+
+    def __init__(self, max_size: int = 4096) -> None:
+        """
+        :param max_size: Maximum number of SAM resources cached, the least recently used one is evicted first
+        """
+        super().__init__(LRUStore(max_size))
+
+
+class FileTranslationCache(TranslationCache):
+    """
+    Cache of generated resources persisted in a local directory, so that entries survive the process.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """
+        :param directory: Directory of the cache files, created if it doesn't exist
+        """
+        super().__init__(FileStore(directory))
+
+
+def is_cacheable(macro: SamResourceMacro, kwargs: Dict[str, Any]) -> bool:
+    """
+    Returns whether the resources generated for the SAM resource can be cached: resources that modify or read
+    other resources of the template when they are translated are always translated.
+
+    :param macro: SAM resource
+    :param kwargs: Arguments of the to_cloudformation() call of the SAM resource
+    """
+    if macro.resource_type not in CACHEABLE_RESOURCE_TYPES:
+        return False
+    # Deployment preferences are added to the collection shared by all the functions of the template, and event
+    # invoke destinations can add conditions to the template
+    if getattr(macro, "DeploymentPreference", None) or getattr(macro, "EventInvokeConfig", None):
+        return False
+    # Events that are linked to other resources (Api, HttpApi, S3, Cognito) modify or read them
+    return not any(kwargs.get("event_resources", {}).values())
+
+
+def get_resource_cache_key(
+    logical_id: str,
+    resource_dict: Dict[str, Any],
+    template: Dict[str, Any],
+    parameter_values: Dict[str, Any],
+    feature_toggle: Any,
+) -> Optional[str]:
+    """
+    Returns the cache key of a SAM resource: a hash of everything its translation reads. That is the resource with
+    its merged Globals, the parameter values it references, the Mappings and Conditions of the template, the
+    partition, the feature toggle state and the version of the translator.
+
+    Managed policies are keyed by their names, as written in the resource, and the partition their ARNs are in. Their
+    ARNs are only resolved when the resource is translated, on a cache miss.
+
+    :param logical_id: Logical ID of the SAM resource
+    :param resource_dict: SAM resource, after the plugins and Globals were applied to it
+    :param template: Template being translated
+    :param parameter_values: Parameter values of the translation
+    :param feature_toggle: FeatureToggle of the translation
+    :return: Cache key, or None if the resource can't be hashed (e.g. it has values that are not JSON)
+    """
+    key_data = {
+        "Version": __version__,
+        "LogicalId": logical_id,
+        "Resource": resource_dict,
+        "Parameters": {
+            name: parameter_values[name] for name in _get_referenced_names(resource_dict) if name in parameter_values
+        },
+        "Mappings": template.get("Mappings"),
+        "Conditions": template.get("Conditions"),
+        "Partition": ArnGenerator.get_partition_name(),
+        "FeatureToggle": (
+            [feature_toggle.feature_config, feature_toggle.stage, feature_toggle.account_id, feature_toggle.region]
+            if feature_toggle
+            else None
+        ),
+    }
+    try:
+        data = json.dumps(key_data, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def serialize_resource(resource: Any, resource_dict: Dict[str, Any]) -> Optional[str]:
+    """
+    Serializes a generated resource for TranslationCache.put(), None if it has values that are not JSON
+
+    :param resource: Generated Resource
+    :param resource_dict: Dictionary of the resource, as returned by its to_dict()
+    """
+    try:
+        return json.dumps([resource.logical_id, resource.resource_type, resource_dict], separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _get_referenced_names(value: Any) -> Set[str]:
+    """
+    Returns the names referenced with Ref or Fn::Sub in the value, which include the parameters it reads.
+    """
+    names: Set[str] = set()
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            if len(item) == 1:
+                ref = item.get("Ref")
+                if isinstance(ref, str):
+                    names.add(ref)
+                sub = item.get("Fn::Sub")
+                if isinstance(sub, list) and sub:
+                    sub = sub[0]
+                if isinstance(sub, str):
+                    names.update(SubAction.get_variables(sub))
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return names
@@ -2,7 +2,8 @@ import copy
 
 from samtranslator.metrics.method_decorator import MetricsMethodWrapperSingleton
 from samtranslator.metrics.metrics import DummyMetricsPublisher, Metrics
-from typing import Dict, Any, Optional, List, Tuple
+from samtranslator.metrics.profiler import Profiler, profile_span, use_profiler
+from typing import Dict, Any, Optional, List, Tuple, cast
 from samtranslator.feature_toggle.feature_toggle import (
     FeatureToggle,
     FeatureToggleDefaultConfigProvider,
@@ -21,52 +22,89 @@ from samtranslator.model.exceptions import (
 from samtranslator.intrinsics.resolver import IntrinsicsResolver
 from samtranslator.intrinsics.actions import FindInMapAction
 from samtranslator.intrinsics.resource_refs import SupportedResourceReferences
+from samtranslator.intrinsics.reference_index import IntrinsicReferenceIndex
 from samtranslator.plugins.api.default_definition_body_plugin import DefaultDefinitionBodyPlugin
 from samtranslator.plugins.application.serverless_app_plugin import ServerlessAppPlugin
+from samtranslator.plugins.application.sar_application_cache import SarApplicationCache
 from samtranslator.plugins import LifeCycleEvents
 from samtranslator.plugins.sam_plugins import SamPlugins
 from samtranslator.plugins.globals.globals_plugin import GlobalsPlugin
 from samtranslator.plugins.policies.policy_templates_plugin import PolicyTemplatesForResourcePlugin
 from samtranslator.policy_template_processor.processor import PolicyTemplatesProcessor
+from samtranslator.region_configuration import PartitionTable
 from samtranslator.sdk.parameter import SamParameterValues
+from samtranslator.sdk.template import SamTemplateIndex, get_template_index, use_template_index
 from samtranslator.translator.arn_generator import ArnGenerator
+from samtranslator.translator.translation_cache import (
+    TranslationCache,
+    get_resource_cache_key,
+    is_cacheable,
+    serialize_resource,
+)
 from samtranslator.model.eventsources.push import Api
 
 
 class Translator:
     """Translates SAM templates into CloudFormation templates"""
 
-    def __init__(self, managed_policy_map, sam_parser, plugins=None, boto_session=None, metrics=None):  # type: ignore[no-untyped-def]
+    def __init__(
+        self,
+        managed_policy_map: Any,
+        sam_parser: Any,
+        plugins: Optional[List[Any]] = None,
+        boto_session: Optional[Any] = None,
+        metrics: Optional[Metrics] = None,
+        policy_template_processor: Optional[PolicyTemplatesProcessor] = None,
+        translation_cache: Optional[TranslationCache] = None,
+        sar_application_cache: Optional[SarApplicationCache] = None,
+        partition_table: Optional[PartitionTable] = None,
+    ) -> None:
         """
         :param dict managed_policy_map: Map of managed policy names to the ARNs
         :param sam_parser: Instance of a SAM Parser
         :param list of samtranslator.plugins.BasePlugin plugins: List of plugins to be installed in the translator,
             in addition to the default ones.
+        :param policy_template_processor: Optional, already loaded policy templates processor to share between
+            translations. If not provided, the processor of the default policy templates is used.
+        :param translation_cache: Optional cache of the resources generated for SAM resources, so that SAM resources
+            that did not change since an earlier translation are not translated again.
+        :param sar_application_cache: Optional cache of the results of the calls to the Serverless Application
+            Repository, so that nested applications resolved by an earlier translation are not requested again.
+        :param partition_table: Optional table of the partitions, regions and regional service endpoints, to use
+            instead of the endpoint data of botocore and the prefixes of the region names.
         """
         self.managed_policy_map = managed_policy_map
         self.plugins = plugins
+        self.policy_template_processor = policy_template_processor
+        self.translation_cache = translation_cache
+        self.sar_application_cache = sar_application_cache
+        self.partition_table = partition_table
+        self.macro_resolver = ResourceTypeResolver(sam_resources)
         self.sam_parser = sam_parser
-        self.feature_toggle = None
         self.boto_session = boto_session
         self.metrics = metrics if metrics else Metrics("ServerlessTransform", DummyMetricsPublisher())  # type: ignore[no-untyped-call, no-untyped-call]
         MetricsMethodWrapperSingleton.set_instance(self.metrics)  # type: ignore[no-untyped-call]
-        self._translated_resouce_mapping = {}
+        self._translated_resouce_mapping: Dict[str, Any] = {}
 
+        # translate() uses the region of the session for its own thread only (see ArnGenerator.use_region_name).
+        # It is also kept as the process-wide region, for callers using ArnGenerator outside of translate().
         if self.boto_session:
             ArnGenerator.BOTO_SESSION_REGION_NAME = self.boto_session.region_name
 
     def _get_function_names(
-        self, resource_dict: Dict[str, Any], intrinsics_resolver: IntrinsicsResolver
+        self, resource_dict: Dict[str, Any], intrinsics_resolver: IntrinsicsResolver, function_names: Dict[str, str]
     ) -> Dict[str, str]:
         """
         :param resource_dict: AWS::Serverless::Function resource is provided as input
         :param intrinsics_resolver: to resolve intrinsics for function_name
+        :param function_names: function names found so far in the template being translated, updated in place
         :return: a dictionary containing api_logical_id as the key and concatenated String of all function_names
                  associated with this api as the value
         """
         if resource_dict.get("Type", "").strip() == "AWS::Serverless::Function":
             events_properties = resource_dict.get("Properties", {}).get("Events", {})
             events = list(events_properties.values()) if events_properties else []
+            api_names = []
             for item in events:
                 # If the function event type is `Api` then gets the function name and
                 # adds to the function_names dict with key as the api_name and value as the function_name
@@ -74,17 +112,19 @@ class Translator:
                 if item.get("Type") == "Api" and item_properties.get("RestApiId"):
                     rest_api = item_properties.get("RestApiId")
                     api_name = Api.get_rest_api_id_string(rest_api)
-                    if not isinstance(api_name, str):
-                        continue
-                    raw_function_name = resource_dict.get("Properties", {}).get("FunctionName")
-                    resolved_function_name = intrinsics_resolver.resolve_parameter_refs(
-                        copy.deepcopy(raw_function_name)
-                    )
-                    if not resolved_function_name:
-                        continue
-                    self.function_names.setdefault(api_name, "")
-                    self.function_names[api_name] += str(resolved_function_name)
-        return self.function_names
+                    if isinstance(api_name, str):
+                        api_names.append(api_name)
+            if not api_names:
+                return function_names
+
+            # Resolved once for all the Api events of the function
+            raw_function_name = resource_dict.get("Properties", {}).get("FunctionName")
+            resolved_function_name = intrinsics_resolver.resolve_parameter_refs(copy.deepcopy(raw_function_name))
+            if resolved_function_name:
+                for api_name in api_names:
+                    function_names.setdefault(api_name, "")
+                    function_names[api_name] += str(resolved_function_name)
+        return function_names
 
     def translate(
         self,
@@ -92,6 +132,7 @@ class Translator:
         parameter_values: Dict[Any, Any],
         feature_toggle: Optional[FeatureToggle] = None,
         passthrough_metadata: Optional[bool] = False,
+        profiler: Optional[Profiler] = None,
     ) -> Dict[str, Any]:
         """Loads the SAM resources from the given SAM manifest, replaces them with their corresponding
         CloudFormation resources, and returns the resulting CloudFormation template.
@@ -103,28 +144,55 @@ class Translator:
                 that some functionality that relies on resolving parameter references might not work as expected
                 (ex: auto-creating new Lambda Version when CodeUri contains reference to template parameter). This is
                 why this parameter is required
+        :param profiler: Optional profiler recording the time spent in each phase of the translation
 
         :returns: a copy of the template with SAM resources replaced with the corresponding CloudFormation, which may \
                 be dumped into a valid CloudFormation JSON or YAML template
         """
-        self.feature_toggle = (
+        # The state of a translation is kept in local variables, so one translator can translate templates on
+        # several threads at once (see TransformSession)
+        feature_toggle = (
             feature_toggle
             if feature_toggle
             else FeatureToggle(FeatureToggleDefaultConfigProvider(), stage=None, account_id=None, region=None)  # type: ignore[no-untyped-call, no-untyped-call]
         )
-        self.function_names: Dict[Any, Any] = {}
-        self.redeploy_restapi_parameters = {}
         sam_parameter_values = SamParameterValues(parameter_values)
         sam_parameter_values.add_default_parameter_values(sam_template)
-        sam_parameter_values.add_pseudo_parameter_values(self.boto_session)  # type: ignore[no-untyped-call]
+        # Without a boto3 session, the region is usually found in the environment and boto3 is not imported
+        region_name = self.boto_session.region_name if self.boto_session else ArnGenerator.get_region_name()
+        # The partition of the AWS::Partition pseudo parameter is looked up in the partition table of the translator
+        with ArnGenerator.use_partition_table(self.partition_table):
+            sam_parameter_values.add_pseudo_parameter_values(self.boto_session, region_name)  # type: ignore[no-untyped-call]
         parameter_values = sam_parameter_values.parameter_values
+
+        # Resolve the region once for the whole translation, instead of with a new boto3 Session whenever a
+        # partition name is needed. The plugins and the translator share one index of the resources of the template.
+        with ArnGenerator.use_region_name(region_name), ArnGenerator.use_partition_table(
+            self.partition_table
+        ), use_profiler(profiler):
+            with use_template_index(SamTemplateIndex(sam_template)), profile_span("Translate", "Translator"):
+                return self._translate(sam_template, parameter_values, feature_toggle, passthrough_metadata)
+
+    def _translate(
+        self,
+        sam_template: Dict[str, Any],
+        parameter_values: Dict[Any, Any],
+        feature_toggle: FeatureToggle,
+        passthrough_metadata: Optional[bool],
+    ) -> Dict[str, Any]:
         # Create & Install plugins
-        sam_plugins = prepare_plugins(self.plugins, parameter_values)
+        sam_plugins = prepare_plugins(
+            self.plugins,
+            parameter_values,
+            self.policy_template_processor,
+            self.sar_application_cache,
+            self.partition_table,
+        )
 
         self.sam_parser.parse(sam_template=sam_template, parameter_values=parameter_values, sam_plugins=sam_plugins)
 
         template = copy.deepcopy(sam_template)
-        macro_resolver = ResourceTypeResolver(sam_resources)
+        macro_resolver = self.macro_resolver
         intrinsics_resolver = IntrinsicsResolver(parameter_values)
 
         # ResourceResolver is used by connector, its "resources" will be
@@ -140,68 +208,97 @@ class Translator:
         document_errors = []
         changed_logical_ids = {}
         route53_record_set_groups: Dict[Any, Any] = {}
+        function_names: Dict[str, str] = {}
+        redeploy_restapi_parameters: Dict[str, Any] = {}
         for logical_id, resource_dict in self._get_resources_to_iterate(sam_template, macro_resolver):
-            try:
-                macro = macro_resolver.resolve_resource_type(resource_dict).from_dict(
-                    logical_id, resource_dict, sam_plugins=sam_plugins
-                )
+            with profile_span(logical_id, "Resource", {"Type": resource_dict.get("Type")}):
+                try:
+                    macro = macro_resolver.resolve_resource_type(resource_dict).from_dict(
+                        logical_id, resource_dict, sam_plugins=sam_plugins
+                    )
 
-                kwargs = macro.resources_to_link(sam_template["Resources"])
-                kwargs["managed_policy_map"] = self.managed_policy_map
-                kwargs["intrinsics_resolver"] = intrinsics_resolver
-                kwargs["mappings_resolver"] = mappings_resolver
-                kwargs["deployment_preference_collection"] = deployment_preference_collection
-                kwargs["conditions"] = template.get("Conditions")
-                kwargs["resource_resolver"] = resource_resolver
-                kwargs["original_template"] = sam_template
-                # add the value of FunctionName property if the function is referenced with the api resource
-                self.redeploy_restapi_parameters["function_names"] = self._get_function_names(
-                    resource_dict, intrinsics_resolver
-                )
-                kwargs["redeploy_restapi_parameters"] = self.redeploy_restapi_parameters
-                kwargs["shared_api_usage_plan"] = shared_api_usage_plan
-                kwargs["feature_toggle"] = self.feature_toggle
-                kwargs["route53_record_set_groups"] = route53_record_set_groups
-                translated = macro.to_cloudformation(**kwargs)
-                supported_resource_refs = macro.get_resource_references(translated, supported_resource_refs)
-
-                # Some resources mutate their logical ids. Track those to change all references to them:
-                if logical_id != macro.logical_id:
-                    changed_logical_ids[logical_id] = macro.logical_id
-
-                del template["Resources"][logical_id]
-                for resource in translated:
-                    if verify_unique_logical_id(resource, sam_template["Resources"]):  # type: ignore[no-untyped-call]
-                        # For each generated resource, pass through existing metadata that may exist on the original SAM resource.
-                        _r = resource.to_dict()
-                        if resource_dict.get("Metadata") and passthrough_metadata:
-                            if not template["Resources"].get(resource.logical_id):
-                                _r[resource.logical_id]["Metadata"] = resource_dict["Metadata"]
-                        template["Resources"].update(_r)
-                    else:
-                        document_errors.append(
-                            DuplicateLogicalIdException(logical_id, resource.logical_id, resource.resource_type)
+                    kwargs = macro.resources_to_link(sam_template["Resources"])
+                    kwargs["managed_policy_map"] = self.managed_policy_map
+                    kwargs["intrinsics_resolver"] = intrinsics_resolver
+                    kwargs["mappings_resolver"] = mappings_resolver
+                    kwargs["deployment_preference_collection"] = deployment_preference_collection
+                    kwargs["conditions"] = template.get("Conditions")
+                    kwargs["resource_resolver"] = resource_resolver
+                    kwargs["original_template"] = sam_template
+                    # add the value of FunctionName property if the function is referenced with the api resource
+                    redeploy_restapi_parameters["function_names"] = self._get_function_names(
+                        resource_dict, intrinsics_resolver, function_names
+                    )
+                    kwargs["redeploy_restapi_parameters"] = redeploy_restapi_parameters
+                    kwargs["shared_api_usage_plan"] = shared_api_usage_plan
+                    kwargs["feature_toggle"] = feature_toggle
+                    kwargs["route53_record_set_groups"] = route53_record_set_groups
+
+                    cache_key = None
+                    translated = None
+                    if self.translation_cache and is_cacheable(macro, kwargs):
+                        cache_key = get_resource_cache_key(
+                            logical_id,
+                            resource_dict,
+                            template,
+                            parameter_values,
+                            feature_toggle,
                         )
-            except (InvalidResourceException, InvalidEventException, InvalidTemplateException) as e:
-                document_errors.append(e)  # type: ignore[arg-type]
+                        if cache_key:
+                            translated = self.translation_cache.get(cache_key)
+                            if translated is not None:
+                                # Nothing to store again
+                                cache_key = None
+                    if translated is None:
+                        with profile_span("{}.to_cloudformation".format(macro.resource_type), "ResourceMacro"):
+                            translated = macro.to_cloudformation(**kwargs)
+                    supported_resource_refs = macro.get_resource_references(translated, supported_resource_refs)
+
+                    # Some resources mutate their logical ids. Track those to change all references to them:
+                    if logical_id != macro.logical_id:
+                        changed_logical_ids[logical_id] = macro.logical_id
+
+                    del template["Resources"][logical_id]
+                    serialized_resources: List[Optional[str]] = []
+                    for resource in translated:
+                        if verify_unique_logical_id(resource, sam_template["Resources"]):  # type: ignore[no-untyped-call]
+                            # For each generated resource, pass through existing metadata that may exist on the original SAM resource.
+                            _r = resource.to_dict()
+                            if cache_key:
+                                # Serialized before the metadata is added, which is not part of the cache key
+                                serialized_resources.append(serialize_resource(resource, _r[resource.logical_id]))
+                            if resource_dict.get("Metadata") and passthrough_metadata:
+                                if not template["Resources"].get(resource.logical_id):
+                                    _r[resource.logical_id]["Metadata"] = resource_dict["Metadata"]
+                            template["Resources"].update(_r)
+                        else:
+                            cache_key = None
+                            document_errors.append(
+                                DuplicateLogicalIdException(logical_id, resource.logical_id, resource.resource_type)
+                            )
+                    if cache_key and self.translation_cache and all(serialized_resources):
+                        self.translation_cache.put(cache_key, cast(List[str], serialized_resources))
+                except (InvalidResourceException, InvalidEventException, InvalidTemplateException) as e:
+                    document_errors.append(e)  # type: ignore[arg-type]
 
         if deployment_preference_collection.any_enabled():  # type: ignore[no-untyped-call]
-            template["Resources"].update(deployment_preference_collection.get_codedeploy_application().to_dict())  # type: ignore[no-untyped-call]
-            if deployment_preference_collection.needs_resource_condition():
-                new_conditions = deployment_preference_collection.create_aggregate_deployment_condition()
-                if new_conditions:
-                    template.get("Conditions", {}).update(new_conditions)
-
-            if not deployment_preference_collection.can_skip_service_role():  # type: ignore[no-untyped-call]
-                template["Resources"].update(deployment_preference_collection.get_codedeploy_iam_role().to_dict())  # type: ignore[no-untyped-call]
-
-            for logical_id in deployment_preference_collection.enabled_logical_ids():
-                try:
-                    template["Resources"].update(
-                        deployment_preference_collection.deployment_group(logical_id).to_dict()
-                    )
-                except InvalidResourceException as e:
-                    document_errors.append(e)  # type: ignore[arg-type]
+            with profile_span("DeploymentPreferences", "Translator"):
+                template["Resources"].update(deployment_preference_collection.get_codedeploy_application().to_dict())  # type: ignore[no-untyped-call]
+                if deployment_preference_collection.needs_resource_condition():
+                    new_conditions = deployment_preference_collection.create_aggregate_deployment_condition()
+                    if new_conditions:
+                        template.get("Conditions", {}).update(new_conditions)
+
+                if not deployment_preference_collection.can_skip_service_role():  # type: ignore[no-untyped-call]
+                    template["Resources"].update(deployment_preference_collection.get_codedeploy_iam_role().to_dict())  # type: ignore[no-untyped-call]
+
+                for logical_id in deployment_preference_collection.enabled_logical_ids():
+                    try:
+                        template["Resources"].update(
+                            deployment_preference_collection.deployment_group(logical_id).to_dict()
+                        )
+                    except InvalidResourceException as e:
+                        document_errors.append(e)  # type: ignore[arg-type]
 
         # Run the after-transform plugin target
         try:
@@ -214,8 +311,10 @@ class Translator:
             del template["Transform"]
 
         if len(document_errors) == 0:
-            template = intrinsics_resolver.resolve_sam_resource_id_refs(template, changed_logical_ids)
-            template = intrinsics_resolver.resolve_sam_resource_refs(template, supported_resource_refs)
+            if changed_logical_ids or len(supported_resource_refs) > 0:
+                template = intrinsics_resolver.resolve_sam_references(
+                    template, changed_logical_ids, supported_resource_refs, IntrinsicReferenceIndex(template)
+                )
             return template
         raise InvalidDocumentException(document_errors)
 
@@ -247,8 +346,10 @@ class Translator:
         connectors = []
         resources = sam_template["Resources"]
 
-        for logicalId, resource in resources.items():
+        # Only the resources the macro resolver knows are looked up, in the order of the template
+        for logicalId in get_template_index(sam_template).get_logical_ids(macro_resolver.resource_types):
 
+            resource = resources.get(logicalId)
             data = (logicalId, resource)
 
             # Skip over the resource if it is not a SAM defined Resource
@@ -268,13 +369,22 @@ class Translator:
         return functions + statemachines + apis + others + connectors
 
 
-def prepare_plugins(plugins: List[Any], parameters: Optional[Dict[str, Any]] = None) -> SamPlugins:
+def prepare_plugins(
+    plugins: Optional[List[Any]],
+    parameters: Optional[Dict[str, Any]] = None,
+    policy_template_processor: Optional[PolicyTemplatesProcessor] = None,
+    sar_application_cache: Optional[SarApplicationCache] = None,
+    partition_table: Optional[PartitionTable] = None,
+) -> SamPlugins:
     """
     Creates & returns a plugins object with the given list of plugins installed. In addition to the given plugins,
     we will also install a few "required" plugins that are necessary to provide complete support for SAM template spec.
 
     :param plugins: list of samtranslator.plugins.BasePlugin plugins: List of plugins to install
     :param parameters: Dictionary of parameter values
+    :param policy_template_processor: Optional, already loaded policy templates processor
+    :param sar_application_cache: Optional cache of the results of the calls to the Serverless Application Repository
+    :param partition_table: Optional table of the regions of the services, used by the ServerlessAppPlugin
     :return samtranslator.plugins.SamPlugins: Instance of `SamPlugins`
     """
 
@@ -285,14 +395,19 @@ def prepare_plugins(plugins: List[Any], parameters: Optional[Dict[str, Any]] = N
         make_implicit_rest_api_plugin(),  # type: ignore[no-untyped-call]
         make_implicit_http_api_plugin(),  # type: ignore[no-untyped-call]
         GlobalsPlugin(),
-        make_policy_template_for_function_plugin(),
+        make_policy_template_for_function_plugin(policy_template_processor),
     ]
 
     plugins = [] if not plugins else plugins
 
     # If a ServerlessAppPlugin does not yet exist, create one and add to the beginning of the required plugins list.
     if not any(isinstance(plugin, ServerlessAppPlugin) for plugin in plugins):
-        required_plugins.insert(0, ServerlessAppPlugin(parameters=parameters))  # type: ignore[no-untyped-call]
+        required_plugins.insert(
+            0,
+            ServerlessAppPlugin(  # type: ignore[no-untyped-call]
+                parameters=parameters, cache=sar_application_cache, partition_table=partition_table
+            ),
+        )
 
     # Execute customer's plugins first before running SAM plugins. It is very important to retain this order because
     # other plugins will be dependent on this ordering.
@@ -313,13 +428,17 @@ def make_implicit_http_api_plugin():  # type: ignore[no-untyped-def]
     return ImplicitHttpApiPlugin()
 
 
-def make_policy_template_for_function_plugin() -> PolicyTemplatesForResourcePlugin:
+def make_policy_template_for_function_plugin(
+    policy_template_processor: Optional[PolicyTemplatesProcessor] = None,
+) -> PolicyTemplatesForResourcePlugin:
     """
     Constructs an instance of policy templates processing plugin using default policy templates JSON data
 
+    :param policy_template_processor: Optional, already loaded policy templates processor. If not provided, the
+        processor of the default policy templates, shared process-wide, is used
     :return plugins.policies.policy_templates_plugin.PolicyTemplatesForResourcePlugin: Instance of the plugin
     """
 
-    policy_templates = PolicyTemplatesProcessor.get_default_policy_templates_json()
-    processor = PolicyTemplatesProcessor(policy_templates)
-    return PolicyTemplatesForResourcePlugin(processor)  # type: ignore[no-untyped-call]
+    if policy_template_processor is None:
+        policy_template_processor = PolicyTemplatesProcessor.get_default()
+    return PolicyTemplatesForResourcePlugin(policy_template_processor)  # type: ignore[no-untyped-call]
@@ -0,0 +1,170 @@
+"""Stores of the caches shared across translations."""
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Optional, TypeVar, Union
+
+LOG = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+
+class LRUStore(Generic[V]):
+    """
+    Thread-safe, in-memory map that keeps at most `max_size` entries, evicting the least recently used one first.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """
+        :param max_size: Maximum number of entries
+        """
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, V]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[V]:
+        """
+        Returns the value of the key, None if there isn't one. Marks the key as the most recently used one.
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: V) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                del self._entries[key]
+
+
+class FileStore:
+    """
+    Text entries persisted in a local directory, one file per key. A write replaces the file of its key atomically,
+    so that threads and processes sharing the directory never read partial entries or lose each other's entries.
+    """
+
+    def __init__(self, directory: str, extension: str = ".json") -> None:
+        """
+        :param directory: Directory of the files, created when the first entry is written
+        :param extension: Extension of the files
+        """
+        self.directory = directory
+        self.extension = extension
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Returns the content of the key, None if there isn't one
+        """
+        try:
+            with open(self.get_file_path(key), encoding="utf-8") as fp:
+                return fp.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, content: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        file_path = self.get_file_path(key)
+        # Unique to the writer, so that concurrent writes of the same key don't interleave
+        temp_file_path = "{}.{}.{}.tmp".format(file_path, os.getpid(), threading.get_ident())
+        try:
+            with open(temp_file_path, "w", encoding="utf-8") as fp:
+                fp.write(content)
+            os.replace(temp_file_path, file_path)
+        finally:
+            if os.path.exists(temp_file_path):
+                os.remove(temp_file_path)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self.get_file_path(key))
+        except FileNotFoundError:
+            pass
+
+    def get_file_path(self, key: str) -> str:
+        """
+        Returns the path of the file of the key. Keys can contain any character, so files are named by their hash.
+        """
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest() + self.extension)
+
+
+class TTLCache(Generic[V]):
+    """
+    Cache of values that expire, on top of an LRUStore or a FileStore. Values are stored as text, encoded by
+    `encode` and decoded by `decode`, along with the time they expire at.
+
+    Entries that can't be decoded (e.g. files written by another version) are ignored, as if there were none.
+    """
+
+    # Written in place of the expiration time of the entries that never expire
+    NEVER_EXPIRES = "-"
+
+    def __init__(
+        self,
+        store: Union[LRUStore[str], FileStore],
+        encode: Callable[[V], str],
+        decode: Callable[[str], V],
+        ttl_seconds: Optional[float] = None,
+        delete_expired: bool = False,
+    ) -> None:
+        """
+        :param store: Store of the encoded entries
+        :param encode: Function returning the text of a value
+        :param decode: Function returning the value of a text, raises ValueError, TypeError or KeyError if it can't
+        :param ttl_seconds: Default time to live of the entries in seconds. None means entries never expire
+        :param delete_expired: Whether expired entries are deleted when they are read, instead of being kept for
+            `get(key, allow_expired=True)`
+        """
+        self.store = store
+        self.encode = encode
+        self.decode = decode
+        self.ttl_seconds = ttl_seconds
+        self.delete_expired = delete_expired
+
+    def get(self, key: str, allow_expired: bool = False) -> Optional[V]:
+        """
+        Returns the value of the key, None if there isn't one or it expired
+
+        :param key: Key of the entry
+        :param allow_expired: Whether to return the value even if it expired
+        """
+        content = self.store.get(key)
+        if content is None:
+            return None
+        expires_at, _, encoded_value = content.partition("\n")
+        try:
+            expired = expires_at != self.NEVER_EXPIRES and time.time() >= float(expires_at)
+            if expired and not allow_expired:
+                if self.delete_expired:
+                    self.store.delete(key)
+                return None
+            return self.decode(encoded_value)
+        except (ValueError, TypeError, KeyError):
+            LOG.warning("Ignoring corrupted cache entry %s", key)
+            return None
+
+    def put(self, key: str, value: V, expires_at: Optional[float] = None) -> None:
+        """
+        Stores the value of the key
+
+        :param key: Key of the entry
+        :param value: Value of the entry
+        :param expires_at: Time (seconds since the epoch) the entry expires at, defaults to now plus the TTL
+        """
+        if expires_at is None and self.ttl_seconds is not None:
+            expires_at = time.time() + self.ttl_seconds
+        header = self.NEVER_EXPIRES if expires_at is None else repr(expires_at)
+        self.store.put(key, header + "\n" + self.encode(value))
+
+    def delete(self, key: str) -> None:
+        self.store.delete(key)
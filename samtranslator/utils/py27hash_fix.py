@@ -7,12 +7,11 @@ import json
 import sys
 import logging
 
-from typing import Any, Dict, List
+from typing import IO, Any, Dict, List, Optional, Tuple
 
 from samtranslator.parser.parser import Parser
 from samtranslator.third_party.py27hash.hash import Hash
 
-
 LOG = logging.getLogger(__name__)
 # Constants based on Python2.7 dictionary
 # See: https://github.com/python/cpython/blob/v2.7.18/Objects/dictobject.c
@@ -22,6 +21,12 @@ PERTURB_SHIFT = 5
 unicode_string_type = str  # TODO: remove it, python 2 legacy code
 long_int_type = int  # TODO: remove it, python 2 legacy code
 
+# Values of these exact types are left as they are by undo_mark_unicode_str_in_template
+_PLAIN_JSON_TYPES = frozenset([str, int, float, bool, type(None)])
+
+# Keys written by json as constants. Only looked up by identity, as 1 == True
+_JSON_KEY_CONSTANTS = {True: "true", False: "false", None: "null"}
+
 
 def to_py27_compatible_template(template, parameter_values=None):  # type: ignore[no-untyped-def]
     """
@@ -102,7 +107,49 @@ def to_py27_compatible_template(template, parameter_values=None):  # type: ignor
 
 
 def undo_mark_unicode_str_in_template(template_dict):  # type: ignore[no-untyped-def]
-    return json.loads(json.dumps(template_dict))
+    """
+    Normalizes a translated template in place so that it is made of plain JSON types only, the same as
+    json.loads(json.dumps(template_dict)) but without serializing and parsing the whole template again:
+
+    - Py27Dict, and other dict subclasses, are replaced with dicts of their items in their iteration order
+    - Py27UniStr, Py27LongInt and other subclasses of str, int and float are replaced with plain values
+    - tuples are replaced with lists, and dict keys are converted to strings the same way json does
+    - containers referenced more than once are copied, so that no part of the template is shared
+
+    The template is normalized in place, not copied: containers that need no conversion, including the top level
+    dict, are kept and updated in place, and the others are replaced in their parent. Callers must use the returned
+    template, and must not expect the given one to be left as it was.
+
+    This always walks the whole template, even when to_py27_compatible_template converted nothing, since the
+    translator creates Py27Dict itself (e.g. in the OpenAPI editors of HttpApi) and can share containers between
+    resources.
+
+    Parameters
+    ----------
+    template_dict: dict
+        translated template, modified in place
+
+    Returns
+    -------
+    dict
+        normalized template
+    """
+    return _normalize_json_value(template_dict, {})
+
+
+def dump_template(template: Any, fp: IO[str], indent: Optional[int] = None) -> None:
+    """
+    Writes the JSON of a translated template into a file, without normalizing it with
+    undo_mark_unicode_str_in_template first: json iterates Py27Dict in their Python 2.7 key order and writes
+    Py27UniStr and Py27LongInt as plain strings and integers, so the JSON is the same. This is json.dump, which
+    writes the JSON in chunks as it is generated instead of building the whole string in memory. The template is
+    not modified.
+
+    :param template: Translated template
+    :param fp: Text file to write the JSON to
+    :param indent: Optional indentation, as in json.dump
+    """
+    json.dump(template, fp, indent=indent)
 
 
 class Py27UniStr(unicode_string_type):
@@ -169,28 +216,122 @@ class Py27Keys(object):
 
     The order of keys in Python 2.7 is path dependent -- the order of inserts and deletes matters
     in determining the iteration order.
+
+    Inserts, deletes and merges are only recorded when they are made. They are applied to the table of keys, in the
+    same order, when the table or the order of the keys is needed, ie. when the keys are iterated, copied or
+    serialized, so that dicts which are never iterated don't pay for hashing and probing their keys.
     """
 
     DUMMY = ["dummy"]  # marker for deleted keys
 
+    # Operations recorded until they are applied to the table
+    _ADD = 0
+    _REMOVE = 1
+    _MERGE = 2
+
     def __init__(self) -> None:
         super(Py27Keys, self).__init__()
         self.debug = False
-        self.keyorder: Dict[int, List[str]] = {}
-        self.size = 0  # current size of the keys, equivalent to ma_used in dictobject.c
-        self.fill = 0  # increment count when a key is added, equivalent to ma_fill in dictobject.c
-        self.mask = MINSIZE - 1  # Python2 default dict size
+        self._keyorder: Dict[int, Any] = {}
+        self._size = 0  # current size of the keys, equivalent to ma_used in dictobject.c
+        self._fill = 0  # increment count when a key is added, equivalent to ma_fill in dictobject.c
+        self._mask = MINSIZE - 1  # Python2 default dict size
+        # Operations not applied to the table yet, as (operation, argument), in the order they were made
+        self._pending: List[Tuple[int, Any]] = []
+        # Keys in Python 2.7 order. Reset whenever the table changes
+        self._keys: Optional[List[Any]] = None
+        # Cache of is_unchanged_by_deepcopies, by number of copies. Reset whenever the table changes
+        self._unchanged_by_deepcopies: Optional[Dict[int, bool]] = None
+
+    @property
+    def keyorder(self) -> Dict[int, Any]:
+        """Slots of the table, mapped to their key or DUMMY"""
+        self._apply_pending()
+        return self._keyorder
+
+    @keyorder.setter
+    def keyorder(self, keyorder: Dict[int, Any]) -> None:
+        self._apply_pending()
+        self._keyorder = keyorder
+        self._table_changed()
+
+    @property
+    def size(self) -> int:
+        self._apply_pending()
+        return self._size
+
+    @size.setter
+    def size(self, size: int) -> None:
+        self._apply_pending()
+        self._size = size
+
+    @property
+    def fill(self) -> int:
+        self._apply_pending()
+        return self._fill
+
+    @fill.setter
+    def fill(self, fill: int) -> None:
+        self._apply_pending()
+        self._fill = fill
+
+    @property
+    def mask(self) -> int:
+        self._apply_pending()
+        return self._mask
+
+    @mask.setter
+    def mask(self, mask: int) -> None:
+        self._apply_pending()
+        self._mask = mask
+        self._table_changed()
+
+    def _apply_pending(self) -> None:
+        """Applies the recorded operations to the table, in order"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        for operation, argument in pending:
+            if operation == self._ADD:
+                self._add(argument)
+            elif operation == self._REMOVE:
+                self._remove(argument)
+            else:
+                self._merge(argument)
+
+    def _table_changed(self) -> None:
+        self._keys = None
+        self._unchanged_by_deepcopies = None
 
     def __deepcopy__(self, memo):  # type: ignore[no-untyped-def]
         # add keys in the py2 order -- we can't do a straigh-up deep copy of keyorder because
         # in py2 copy.deepcopy of a dict may result in reordering of the keys
         ret = Py27Keys()
-        for k in self.keys():  # type: ignore[no-untyped-call]
-            if k is self.DUMMY:
-                continue
-            ret.add(copy.deepcopy(k, memo))  # type: ignore[no-untyped-call]
+        for k in self._ordered_keys():
+            ret._add(copy.deepcopy(k, memo))
         return ret
 
+    def is_unchanged_by_deepcopies(self, copies: int) -> bool:
+        """
+        Returns whether deep copying the keys `copies` times in a row gives back the same keys in the same slots.
+
+        A deep copy re-adds the keys in iteration order, which can change the iteration order when keys collide. When
+        this returns True, the copies can be skipped without changing the iteration order, now or after more keys
+        are added. The result is cached until the keys change.
+
+        :param copies: Number of successive deep copies
+        """
+        if self._pending:
+            self._apply_pending()
+        if self._unchanged_by_deepcopies is None:
+            self._unchanged_by_deepcopies = {}
+        if copies not in self._unchanged_by_deepcopies:
+            keys = self
+            for _ in range(copies):
+                keys = copy.deepcopy(keys)
+            self._unchanged_by_deepcopies[copies] = keys._mask == self._mask and keys._keyorder == self._keyorder
+        return self._unchanged_by_deepcopies[copies]
+
     def _get_key_idx(self, k):  # type: ignore[no-untyped-def]
         """Gets insert location for k"""
 
@@ -200,28 +341,29 @@ class Py27Keys(object):
         else:
             h = ctypes.c_size_t(Hash.hash(k)).value
 
-        i = h & self.mask
+        keyorder = self._keyorder
+        i = h & self._mask
 
-        if i not in self.keyorder or self.keyorder[i] == k:
+        if i not in keyorder or keyorder[i] == k:
             # empty slot or keys match
             return i
 
         freeslot = None
-        if i in self.keyorder and self.keyorder[i] is self.DUMMY:
+        if i in keyorder and keyorder[i] is self.DUMMY:
             # dummy slot
             freeslot = i
 
         walker = i
         perturb = h
-        while i in self.keyorder and self.keyorder[i] != k:
+        while i in keyorder and keyorder[i] != k:
             walker = (walker << 2) + walker + perturb + 1
-            i = walker & self.mask
+            i = walker & self._mask
 
-            if i not in self.keyorder:
+            if i not in keyorder:
                 return i if freeslot is None else freeslot
-            if self.keyorder[i] == k:
+            if keyorder[i] == k:
                 return i
-            if freeslot is None and self.keyorder[i] is self.DUMMY:
+            if freeslot is None and keyorder[i] is self.DUMMY:
                 freeslot = i
             perturb >>= PERTURB_SHIFT
         return i
@@ -234,56 +376,82 @@ class Py27Keys(object):
         while newsize <= request:
             newsize <<= 1
 
-        self.mask = newsize - 1
+        self._mask = newsize - 1
 
         # Reset key list to simulate the dict resize and copy operation
-        oldkeyorder = copy.copy(self.keyorder)
-        self.keyorder = {}
-        self.fill = self.size = 0
+        oldkeyorder = self._keyorder
+        self._keyorder = {}
+        self._fill = self._size = 0
+        self._table_changed()
         # reinsert all the keys using original order
         for idx in sorted(oldkeyorder.keys()):
             if oldkeyorder[idx] is not self.DUMMY:
-                self.add(oldkeyorder[idx])  # type: ignore[no-untyped-call]
+                self._add(oldkeyorder[idx])
 
     def remove(self, key):  # type: ignore[no-untyped-def]
         """Removes key"""
+        self._pending.append((self._REMOVE, key))
+
+    def _remove(self, key: Any) -> None:
         i = self._get_key_idx(key)  # type: ignore[no-untyped-call]
-        if i in self.keyorder:
-            if self.keyorder[i] is not self.DUMMY:
-                self.keyorder[i] = self.DUMMY
-                self.size -= 1
+        if i in self._keyorder:
+            if self._keyorder[i] is not self.DUMMY:
+                self._keyorder[i] = self.DUMMY
+                self._size -= 1
+                self._keys = self._unchanged_by_deepcopies = None
 
     def add(self, key):  # type: ignore[no-untyped-def]
         """Adds key"""
-        start_size = self.size
+        self._pending.append((self._ADD, key))
+
+    def _add(self, key: Any) -> None:
+        start_size = self._size
         i = self._get_key_idx(key)  # type: ignore[no-untyped-call]
-        if i not in self.keyorder:
+        if i not in self._keyorder:
             # We are not replacing an existing key or a DUMMY key, increment fill
-            self.size += 1
-            self.fill += 1
-            self.keyorder[i] = key
+            self._size += 1
+            self._fill += 1
+            self._keyorder[i] = key
+            self._keys = self._unchanged_by_deepcopies = None
         else:
-            if self.keyorder[i] is self.DUMMY:
-                self.size += 1
-            if self.keyorder[i] != key:
-                self.keyorder[i] = key
+            if self._keyorder[i] is self.DUMMY:
+                self._size += 1
+            if self._keyorder[i] != key:
+                self._keyorder[i] = key
+                self._keys = self._unchanged_by_deepcopies = None
 
         # Resize if 2/3 capacity
-        if self.size > start_size and self.fill * 3 >= ((self.mask + 1) * 2):
+        if self._size > start_size and self._fill * 3 >= ((self._mask + 1) * 2):
             # Python2 dict increases size by a factor of 4 for small dict, and 2 for large dict
-            self._resize(self.size * (2 if self.size > 50000 else 4))  # type: ignore[no-untyped-call]
+            self._resize(self._size * (2 if self._size > 50000 else 4))  # type: ignore[no-untyped-call]
+
+    def _ordered_keys(self) -> List[Any]:
+        """Returns the keys in Python2 order, as a list that must not be modified"""
+        if self._pending:
+            self._apply_pending()
+        if self._keys is None:
+            keyorder = self._keyorder
+            self._keys = [keyorder[i] for i in sorted(keyorder) if keyorder[i] is not self.DUMMY]
+        return self._keys
 
     def keys(self):  # type: ignore[no-untyped-def]
         """Return keys in Python2 order"""
-        return [self.keyorder[key] for key in sorted(self.keyorder.keys()) if self.keyorder[key] is not self.DUMMY]
+        return list(self._ordered_keys())
 
     def __setstate__(self, state):  # type: ignore[no-untyped-def]
         """
         Overrides default pickling object to force re-adding all keys and match Python 2.7 deserialization logic.
 
-        :param state: input state
+        :param state: input state, either the attributes of this version or the keyorder, size, fill and mask of
+            the versions before the operations were recorded
         """
-        self.__dict__ = state
+        self.__init__()  # type: ignore[misc]
+        self.debug = state.get("debug", False)
+        self._keyorder = state["_keyorder"] if "_keyorder" in state else state["keyorder"]
+        self._size = state["_size"] if "_size" in state else state["size"]
+        self._fill = state["_fill"] if "_fill" in state else state["fill"]
+        self._mask = state["_mask"] if "_mask" in state else state["mask"]
+        self._pending = list(state.get("_pending", []))
         keys = self.keys()  # type: ignore[no-untyped-call]
 
         # Clear keys and re-add to match deserialization logic
@@ -298,17 +466,18 @@ class Py27Keys(object):
         """
         Default iterator
         """
-        return iter(self.keys())  # type: ignore[no-untyped-call]
+        # The list of the keys is replaced, not modified, when the keys change
+        return iter(self._ordered_keys())
 
     def __eq__(self, other):  # type: ignore[no-untyped-def]
         if isinstance(other, Py27Keys):
-            return self.keys() == other.keys()  # type: ignore[no-untyped-call]
+            return self._ordered_keys() == other._ordered_keys()
         if isinstance(other, list):
-            return self.keys() == other  # type: ignore[no-untyped-call]
+            return self._ordered_keys() == other
         return False
 
     def __len__(self):  # type: ignore[no-untyped-def]
-        return len(self.keys())  # type: ignore[no-untyped-call]
+        return len(self._ordered_keys())
 
     def merge(self, other):  # type: ignore[no-untyped-def]
         """
@@ -320,14 +489,16 @@ class Py27Keys(object):
         if len(other) == 0 or self is other:
             # nothing to do
             return
+        self._pending.append((self._MERGE, list(other)))
 
+    def _merge(self, other: List[Any]) -> None:
         # PyDict_Merge initial merge size is double the size of current + incoming dict
-        if ((self.fill + len(other)) * 3) >= ((self.mask + 1) * 2):
-            self._resize((self.size + len(other)) * 2)  # type: ignore[no-untyped-call]
+        if ((self._fill + len(other)) * 3) >= ((self._mask + 1) * 2):
+            self._resize((self._size + len(other)) * 2)  # type: ignore[no-untyped-call]
 
         # Copy actual keys
         for k in other:
-            self.add(k)  # type: ignore[no-untyped-call]
+            self._add(k)
 
     def copy(self):  # type: ignore[no-untyped-def]
         """
@@ -393,8 +564,11 @@ class Py27Dict(dict):  # type: ignore[type-arg]
         key: hashable
         value: Any
         """
+        # Replacing the value of a key doesn't move the key
+        is_new_key = key not in self
         super(Py27Dict, self).__setitem__(key, value)
-        self.keylist.add(key)  # type: ignore[no-untyped-call]
+        if is_new_key:
+            self.keylist.add(key)  # type: ignore[no-untyped-call]
 
     def __delitem__(self, key):  # type: ignore[no-untyped-def]
         """
@@ -472,7 +646,9 @@ class Py27Dict(dict):  # type: ignore[type-arg]
         Any
             value of key if found or default
         """
-        value = super(Py27Dict, self).pop(key, default)
+        if key not in self:
+            return default
+        value = super(Py27Dict, self).pop(key)
         self.keylist.remove(key)  # type: ignore[no-untyped-call]
         return value
 
@@ -590,6 +766,112 @@ class Py27Dict(dict):  # type: ignore[type-arg]
         return self[key]
 
 
+def is_unchanged_by_deepcopies(value: Any, copies: int) -> bool:
+    """
+    Returns whether deep copying a template value `copies` times in a row gives a value equal to it, with the same
+    Python 2.7 key order in all its dictionaries (see Py27Keys.is_unchanged_by_deepcopies), so the value can be used
+    in place of its copies.
+
+    :param value: Template value, made of dicts, lists and scalars
+    :param copies: Number of successive deep copies
+    """
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, Py27Dict):
+            if not item.keylist.is_unchanged_by_deepcopies(copies):
+                return False
+            stack.extend(dict.values(item))
+        elif isinstance(item, dict):
+            # A copy of other dicts keeps their order
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+        elif not isinstance(item, (str, int, float)) and item is not None:
+            return False
+    return True
+
+
+def _normalize_json_value(value: Any, containers: Dict[int, bool]) -> Any:
+    """
+    Returns the value made of plain JSON types, see undo_mark_unicode_str_in_template.
+
+    :param value: Value to normalize
+    :param containers: Ids of the containers of the template, mapped to True while their items are being normalized,
+        to detect circular references like json does. Containers found again are copied.
+    """
+    value_type = type(value)
+    if value_type in _PLAIN_JSON_TYPES:
+        return value
+
+    if isinstance(value, dict):
+        value_id = id(value)
+        in_progress = containers.get(value_id)
+        if in_progress:
+            raise ValueError("Circular reference detected")
+        # The original is the one a circular reference refers to, also when it is normalized as a copy
+        containers[value_id] = True
+        if value_type is not dict or in_progress is not None:
+            # Items in the iteration order of the subclass, ie. the Python 2.7 order of Py27Dict, like json
+            value = dict(value.items())
+        has_plain_keys = True
+        for key, item in value.items():
+            if type(key) is not str:
+                has_plain_keys = False
+            if type(item) not in _PLAIN_JSON_TYPES:
+                normalized_item = _normalize_json_value(item, containers)
+                if normalized_item is not item:
+                    value[key] = normalized_item
+        if not has_plain_keys:
+            # Converted keys must keep their position
+            items = [(_normalize_json_key(key), item) for key, item in value.items()]
+            value.clear()
+            value.update(items)
+        containers[value_id] = False
+        return value
+
+    if isinstance(value, (list, tuple)):
+        value_id = id(value)
+        in_progress = containers.get(value_id)
+        if in_progress:
+            raise ValueError("Circular reference detected")
+        containers[value_id] = True
+        if value_type is not list or in_progress is not None:
+            value = list(value)
+        for i, item in enumerate(value):
+            if type(item) not in _PLAIN_JSON_TYPES:
+                normalized_item = _normalize_json_value(item, containers)
+                if normalized_item is not item:
+                    value[i] = normalized_item
+        containers[value_id] = False
+        return value
+
+    if isinstance(value, str):
+        return str.__str__(value)
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float):
+        return float(value)
+    raise TypeError(f"Object of type {value_type.__name__} is not JSON serializable")
+
+
+def _normalize_json_key(key: Any) -> str:
+    """
+    Returns the dict key as json writes it
+    """
+    if type(key) is str:
+        return key
+    if isinstance(key, str):
+        return str.__str__(key)
+    if key is None or type(key) is bool:
+        return _JSON_KEY_CONSTANTS[key]
+    if isinstance(key, int):
+        return int.__repr__(key)
+    if isinstance(key, float):
+        return json.dumps(float(key))
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
 def _convert_to_py27_type(original):  # type: ignore[no-untyped-def]
     if isinstance(original, ("".__class__, bytes)):
         # these are strings, return the Py27UniStr instance of the string
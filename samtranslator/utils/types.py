@@ -4,3 +4,6 @@ from typing import Any, Dict, TypeVar, Union
 T = TypeVar("T")
 
 Intrinsicable = Union[Dict[str, Any], T]
+
+# Value passed directly to CloudFormation; not used by SAM
+PassThrough = Any  # TODO: Make it behave like typescript's unknown
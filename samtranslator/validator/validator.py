@@ -1,8 +1,8 @@
 import json
 import os
 import re
-
-import jsonschema
+import threading
+from typing import Dict, Optional, Tuple
 
 from . import sam_schema
 
@@ -27,6 +27,8 @@ class SamTemplateValidator:
         schema_path : str, optional
             Path to a schema to use for validation, by default None, the default schema.json will be used
         """
+        import jsonschema
+
         if not schema:
             schema = self._read_json(sam_schema.SCHEMA_NEW_FILE)  # type: ignore[no-untyped-call]
 
@@ -77,7 +79,11 @@ class SamTemplateValidator:
         str
             Validation errors separated by commas ","
         """
-        validator = SamTemplateValidator(schema)  # type: ignore[no-untyped-call]
+        validator = (
+            SamTemplateValidator(schema)  # type: ignore[no-untyped-call]
+            if schema
+            else SamTemplateValidatorCache.get_instance().get()
+        )
 
         return ", ".join(validator.get_errors(template_dict))  # type: ignore[no-untyped-call]
 
@@ -191,6 +197,109 @@ class SamTemplateValidator:
             return json.load(fp)
 
 
+class SamTemplateValidatorCache:
+    """
+    Process-wide, thread-safe cache of compiled SamTemplateValidator instances.
+
+    Building a SamTemplateValidator reads and parses the schema and all its sub schemas and creates a new
+    resolver and validator class, which is an expensive fixed cost for long-lived processes translating many
+    templates. Validators are cached by schema file and are rebuilt only when one of the schema files changes
+    on disk.
+    """
+
+    _INSTANCE: Optional["SamTemplateValidatorCache"] = None
+    _INSTANCE_LOCK = threading.Lock()
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._validators: Dict[str, Tuple[Tuple[Tuple[str, int, int], ...], SamTemplateValidator]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_instance() -> "SamTemplateValidatorCache":
+        """
+        Returns the process-wide cache, creating it on first use
+        """
+        if SamTemplateValidatorCache._INSTANCE is None:
+            with SamTemplateValidatorCache._INSTANCE_LOCK:
+                if SamTemplateValidatorCache._INSTANCE is None:
+                    SamTemplateValidatorCache._INSTANCE = SamTemplateValidatorCache()
+        return SamTemplateValidatorCache._INSTANCE
+
+    def get(self, schema_path: Optional[str] = None) -> SamTemplateValidator:
+        """
+        Returns a validator for the given schema file, building it only if it is not cached yet
+        or the schema files have changed since it was built
+
+        Parameters
+        ----------
+        schema_path : str, optional
+            Path to the schema file, by default the integrated schema_new.json
+
+        Returns
+        -------
+        SamTemplateValidator
+            Compiled validator, shared between callers
+        """
+        schema_path = os.path.abspath(schema_path or sam_schema.SCHEMA_NEW_FILE)
+        fingerprint = self._fingerprint(schema_path)
+
+        with self._lock:
+            cached = self._validators.get(schema_path)
+            if cached and cached[0] == fingerprint:
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+            with open(schema_path, encoding="utf-8") as fp:
+                schema = json.load(fp)
+            validator = SamTemplateValidator(schema)  # type: ignore[no-untyped-call]
+            self._validators[schema_path] = (fingerprint, validator)
+            return validator
+
+    def warm(self, schema_path: Optional[str] = None) -> None:
+        """
+        Builds the validator ahead of time, e.g. at import or worker start, so the first
+        translation does not pay for it
+        """
+        self.get(schema_path)
+
+    def clear(self) -> None:
+        """
+        Drops all cached validators and resets the counters
+        """
+        with self._lock:
+            self._validators.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the hit/miss counters and the number of cached validators
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._validators)}
+
+    @staticmethod
+    def _fingerprint(schema_path: str) -> Tuple[Tuple[str, int, int], ...]:
+        """
+        Returns the identity of the schema files (path, modification time, size), used to
+        invalidate a cached validator when any of them changes
+        """
+        definitions_dir = os.path.join(sam_schema.SCHEMA_DIR, "definitions")
+        paths = [schema_path] + sorted(
+            os.path.join(definitions_dir, sub_schema)
+            for sub_schema in os.listdir(definitions_dir)
+            if sub_schema.endswith(".json")
+        )
+        fingerprint = []
+        for path in paths:
+            stat = os.stat(path)
+            fingerprint.append((path, stat.st_mtime_ns, stat.st_size))
+        return tuple(fingerprint)
+
+
 # Type definition redefinitions
 INTRINSIC_ATTR = {
     "Fn::And",
@@ -1,14 +1,43 @@
+import mmap
+from typing import IO, Any, Union
+
 import yaml
 from yaml import ScalarNode, SequenceNode
 
+try:
+    # libyaml bindings, several times faster than the pure Python loader
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[misc]
+
 # This helper copied almost entirely from
 # https://github.com/aws/aws-cli/blob/develop/awscli/customizations/cloudformation/yamlhelper.py
 
+YamlInput = Union[str, bytes, bytearray, memoryview, mmap.mmap, IO[str], IO[bytes]]
 
-def yaml_parse(yamlstr):  # type: ignore[no-untyped-def]
-    """Parse a yaml string"""
-    yaml.SafeLoader.add_multi_constructor("!", intrinsics_multi_constructor)  # type: ignore[no-untyped-call]
-    return yaml.safe_load(yamlstr)
+
+class IntrinsicsSafeLoader(_SafeLoader):  # pylint: disable=too-many-ancestors
+    """
+    Safe loader of CloudFormation templates, which constructs the short form of the intrinsic functions (!Ref,
+    !GetAtt, !Sub...) as their long form. It uses libyaml when PyYAML was built with it.
+
+    The intrinsics constructor is registered on this class only, not on yaml.SafeLoader, which is shared with the
+    other users of PyYAML in the process.
+    """
+
+
+def yaml_parse(yamlstr: YamlInput) -> Any:
+    """
+    Parse a yaml string
+
+    :param yamlstr: YAML document, as a string, bytes, a bytes-like object such as a memory-mapped file, or a file
+        object opened in text or binary mode
+    :return: Parsed document
+    """
+    if isinstance(yamlstr, (bytearray, memoryview, mmap.mmap)):
+        # The loaders read strings, bytes and file objects; libyaml parses bytes without copying them again
+        yamlstr = bytes(yamlstr)
+    return yaml.load(yamlstr, Loader=IntrinsicsSafeLoader)
 
 
 def intrinsics_multi_constructor(loader, tag_prefix, node):  # type: ignore[no-untyped-def]
@@ -46,3 +75,6 @@ def intrinsics_multi_constructor(loader, tag_prefix, node):  # type: ignore[no-u
         value = loader.construct_mapping(node)
 
     return {cfntag: value}
+
+
+IntrinsicsSafeLoader.add_multi_constructor("!", intrinsics_multi_constructor)  # type: ignore[no-untyped-call]
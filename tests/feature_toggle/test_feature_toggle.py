@@ -104,12 +104,12 @@ class TestFeatureToggleAppConfig(TestCase):
             param("feature-1", "beta", None, "123456789123", False),
         ]
     )
-    @patch("samtranslator.feature_toggle.feature_toggle.boto3")
-    @patch("samtranslator.feature_toggle.feature_toggle.Config")
+    @patch("boto3.client")
+    @patch("botocore.config.Config")
     def test_feature_toggle_with_appconfig_provider(
-        self, feature_name, stage, region, account_id, expected, config_mock, boto3_mock
+        self, feature_name, stage, region, account_id, expected, config_mock, client_mock
     ):
-        boto3_mock.client.return_value = self.app_config_mock
+        client_mock.return_value = self.app_config_mock
         config_object_mock = Mock()
         config_mock.return_value = config_object_mock
         feature_toggle_config_provider = FeatureToggleAppConfigConfigProvider(
@@ -118,7 +118,7 @@ class TestFeatureToggleAppConfig(TestCase):
         feature_toggle = FeatureToggle(
             feature_toggle_config_provider, stage=stage, region=region, account_id=account_id
         )
-        boto3_mock.client.assert_called_once_with("appconfig", config=config_object_mock)
+        client_mock.assert_called_once_with("appconfig", config=config_object_mock)
         self.assertEqual(feature_toggle.is_enabled(feature_name), expected)
 
     @parameterized.expand(
@@ -137,9 +137,9 @@ class TestFeatureToggleAppConfig(TestCase):
             param("feature-1", "beta", None, "123456789123", False),
         ]
     )
-    @patch("samtranslator.feature_toggle.feature_toggle.boto3")
+    @patch("boto3.client")
     def test_feature_toggle_with_appconfig_provider_and_app_config_client(
-        self, feature_name, stage, region, account_id, expected, boto3_mock
+        self, feature_name, stage, region, account_id, expected, client_mock
     ):
         feature_toggle_config_provider = FeatureToggleAppConfigConfigProvider(
             "test_app_id", "test_env_id", "test_conf_id", self.app_config_mock
@@ -147,14 +147,14 @@ class TestFeatureToggleAppConfig(TestCase):
         feature_toggle = FeatureToggle(
             feature_toggle_config_provider, stage=stage, region=region, account_id=account_id
         )
-        boto3_mock.client.assert_not_called()
+        client_mock.assert_not_called()
         self.assertEqual(feature_toggle.is_enabled(feature_name), expected)
 
 
 class TestFeatureToggleAppConfigConfigProvider(TestCase):
-    @patch("samtranslator.feature_toggle.feature_toggle.boto3")
-    def test_feature_toggle_with_exception(self, boto3_mock):
-        boto3_mock.client.raiseError.side_effect = Exception()
+    @patch("boto3.client")
+    def test_feature_toggle_with_exception(self, client_mock):
+        client_mock.raiseError.side_effect = Exception()
         feature_toggle_config_provider = FeatureToggleAppConfigConfigProvider(
             "test_app_id", "test_env_id", "test_conf_id"
         )
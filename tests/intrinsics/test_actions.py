@@ -381,6 +381,47 @@ class TestSubInternalMethods(TestCase):
         handler_mock.assert_not_called()
         sub_all_refs_mock.assert_not_called()
 
+    def test_parse_sub_string_must_split_literals_and_variables(self):
+        literals, variables = SubAction._parse_sub_string("a ${key1} b ${!key2} ${AWS::Region}${Res.Arn}")
+
+        self.assertEqual(("a ", " b ${!key2} ", "", ""), literals)
+        self.assertEqual((("${key1}", "key1"), ("${AWS::Region}", "AWS::Region"), ("${Res.Arn}", "Res.Arn")), variables)
+
+    def test_parse_sub_string_must_cache_parsed_strings(self):
+        SubAction._parse_sub_string.cache_clear()
+
+        SubAction._parse_sub_string("${key1}")
+        SubAction._parse_sub_string("${key1}")
+
+        self.assertEqual(1, SubAction._parse_sub_string.cache_info().hits)
+
+    def test_get_variables_must_return_referenced_variables(self):
+        self.assertEqual(("key1", "key1.attr"), SubAction.get_variables("${key1} ${!key2} ${key1.attr}"))
+        self.assertEqual((), SubAction.get_variables("no variables"))
+
+    def test_sub_all_refs_must_return_same_string_when_nothing_is_replaced(self):
+        text = "hello ${key1}"
+
+        result = SubAction()._sub_all_refs(text, lambda full_ref, ref_value: full_ref)
+
+        self.assertIs(text, result)
+
+    def test_sub_all_refs_must_not_replace_inside_replaced_values(self):
+        result = SubAction()._sub_all_refs(
+            "${key1}${key2}", lambda full_ref, ref_value: {"key1": "${key2}"}.get(ref_value, "x")
+        )
+
+        self.assertEqual("${key2}x", result)
+
+    def test_sub_all_refs_must_keep_string_type(self):
+        class CustomStr(str):
+            pass
+
+        result = SubAction()._sub_all_refs(CustomStr("a ${key1}"), lambda full_ref, ref_value: "value")
+
+        self.assertEqual("a value", result)
+        self.assertIsInstance(result, CustomStr)
+
 
 class TestSubCanResolveResourceRefs(TestCase):
     def setUp(self):
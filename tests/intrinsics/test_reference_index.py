@@ -0,0 +1,44 @@
+from unittest import TestCase
+
+from samtranslator.intrinsics.reference_index import IntrinsicReferenceIndex
+
+
+class TestIntrinsicReferenceIndex(TestCase):
+    def setUp(self):
+        self.template = {
+            "AWSTemplateFormatVersion": "2010-09-09",
+            "Resources": {
+                "Function": {
+                    "Properties": {
+                        "Layers": [{"Ref": "MyLayer"}],
+                        "Role": {"Fn::GetAtt": ["MyRole.Alias", "Arn"]},
+                        "Sub": {"Fn::Sub": ["${MyLayer.Arn}-${AWS::Region}", {"Var": {"Ref": "MyRole"}}]},
+                        "Other": {"Fn::Join": ["", ["a", "b"]]},
+                    }
+                },
+                "Table": {"Properties": {"Name": {"Ref": "AWS::StackName"}}},
+            },
+            "Outputs": {"Layer": {"Value": {"Ref": "MyLayer"}}},
+        }
+        self.index = IntrinsicReferenceIndex(self.template)
+
+    def test_must_index_referenced_logical_ids(self):
+        self.assertEqual(set(self.index.get_logical_ids()), {"MyLayer", "MyRole", "AWS::Region", "AWS::StackName"})
+
+    def test_must_return_locations_in_pre_order(self):
+        properties = self.template["Resources"]["Function"]["Properties"]
+        sub_variables = properties["Sub"]["Fn::Sub"][1]
+
+        self.assertEqual(
+            self.index.get_locations(["MyRole", "MyLayer"]),
+            [
+                (properties["Layers"], 0),
+                (properties, "Role"),
+                (properties, "Sub"),
+                (sub_variables, "Var"),
+                (self.template["Outputs"]["Layer"], "Value"),
+            ],
+        )
+
+    def test_must_return_no_locations_for_unknown_logical_id(self):
+        self.assertEqual(self.index.get_locations(["Unknown"]), [])
@@ -2,6 +2,8 @@ from unittest import TestCase
 from unittest.mock import Mock, patch
 from samtranslator.intrinsics.resolver import IntrinsicsResolver
 from samtranslator.intrinsics.actions import Action
+from samtranslator.intrinsics.resource_refs import SupportedResourceReferences
+from samtranslator.intrinsics.reference_index import IntrinsicReferenceIndex
 from samtranslator.model.exceptions import InvalidDocumentException
 
 
@@ -162,6 +164,81 @@ class TestResourceReferenceResolution(TestCase):
         resolver._try_resolve_sam_resource_refs.assert_not_called()
 
 
+class TestSamReferencesResolution(TestCase):
+    def setUp(self):
+        self.resolver = IntrinsicsResolver({})
+        self.supported_resource_id_refs = {"MyLayer": "MyLayerABC123"}
+        self.supported_resource_refs = SupportedResourceReferences()
+        self.supported_resource_refs.add("MyFunction", "Alias", "MyFunctionAliasLive")
+
+    def _get_template(self):
+        return {
+            "Resources": {
+                "Function": {
+                    "Properties": {
+                        "Layers": [{"Ref": "MyLayer"}],
+                        "Alias": {"Ref": "MyFunction.Alias"},
+                        "Arn": {"Fn::GetAtt": ["MyLayer", "Arn"]},
+                        "Sub": {"Fn::Sub": ["${MyLayer.Arn}-${MyFunction.Alias}", {"Var": {"Ref": "MyLayer"}}]},
+                    }
+                }
+            },
+            "Outputs": {"Alias": {"Value": {"Fn::GetAtt": ["MyFunction.Alias", "Arn"]}}},
+        }
+
+    def test_must_resolve_like_both_resolutions_in_sequence(self):
+        expected = self.resolver.resolve_sam_resource_refs(
+            self.resolver.resolve_sam_resource_id_refs(self._get_template(), self.supported_resource_id_refs),
+            self.supported_resource_refs,
+        )
+
+        actual = self.resolver.resolve_sam_references(
+            self._get_template(), self.supported_resource_id_refs, self.supported_resource_refs
+        )
+
+        self.assertEqual(actual, expected)
+        self.assertEqual(
+            actual["Resources"]["Function"]["Properties"]["Sub"],
+            {"Fn::Sub": ["${MyLayerABC123.Arn}-${MyFunctionAliasLive}", {"Var": {"Ref": "MyLayerABC123"}}]},
+        )
+
+    def test_must_resolve_with_reference_index_like_without(self):
+        expected = self.resolver.resolve_sam_references(
+            self._get_template(), self.supported_resource_id_refs, self.supported_resource_refs
+        )
+
+        template = self._get_template()
+        actual = self.resolver.resolve_sam_references(
+            template,
+            self.supported_resource_id_refs,
+            self.supported_resource_refs,
+            IntrinsicReferenceIndex(template),
+        )
+
+        self.assertEqual(actual, expected)
+
+    def test_must_skip_resolutions_without_data(self):
+        self.resolver._try_resolve_sam_resource_id_refs = Mock()
+        template = self._get_template()
+
+        self.resolver.resolve_sam_references(template, {}, self.supported_resource_refs)
+
+        self.resolver._try_resolve_sam_resource_id_refs.assert_not_called()
+        self.assertEqual(template["Resources"]["Function"]["Properties"]["Alias"], {"Ref": "MyFunctionAliasLive"})
+
+    def test_must_resolve_deeply_nested_input_without_recursion(self):
+        depth = 5000
+        template = {"Ref": "param"}
+        for _ in range(depth):
+            template = {"Nested": [template]}
+
+        output = IntrinsicsResolver({"param": "value"}).resolve_parameter_refs(template)
+
+        for _ in range(depth):
+            output = output["Nested"][0]
+        self.assertEqual(output, "value")
+
+
 class TestSupportedIntrinsics(TestCase):
     def test_by_default_all_intrinsics_must_be_supported(self):
         # Just make sure we never remove support for some intrinsic
@@ -1,3 +1,7 @@
+import io
+import json
+import threading
+
 from parameterized import parameterized, param
 from datetime import datetime
 from unittest import TestCase
@@ -6,9 +10,12 @@ from samtranslator.metrics.metrics import (
     Metrics,
     MetricsPublisher,
     CWMetricsPublisher,
+    AsyncMetricsPublisher,
+    EMFMetricsPublisher,
     DummyMetricsPublisher,
     Unit,
     MetricDatum,
+    AggregatedMetricDatum,
 )
 
 
@@ -181,6 +188,240 @@ class TestMetrics(TestCase):
         self.assertListEqual(m3, [])
 
 
+class TestAggregatedMetrics(TestCase):
+    def test_samples_are_aggregated_by_name_unit_and_dimensions(self):
+        mock_metrics_publisher = MetricPublisherTestHelper()
+        metrics = Metrics("DummyNamespace", mock_metrics_publisher, aggregate=True)
+        dimensions = [{"Name": "SAM", "Value": "Dim1"}]
+        for value in [3, 1, 2]:
+            metrics.record_latency("Latency", value, dimensions)
+        metrics.record_latency("Latency", 10, [{"Name": "SAM", "Value": "Dim2"}])
+        metrics.record_count("Count", 1)
+
+        self.assertEqual(len(metrics.get_metric("Latency")), 2)
+        metrics.publish()
+
+        published_metrics = [metric.get_metric_data() for metric in mock_metrics_publisher.metrics_cache]
+        self.assertEqual(
+            published_metrics,
+            [
+                {
+                    "MetricName": "Latency",
+                    "StatisticValues": {"SampleCount": 3, "Sum": 6, "Minimum": 1, "Maximum": 3},
+                    "Unit": Unit.Milliseconds,
+                    "Dimensions": dimensions,
+                    "Timestamp": ANY,
+                },
+                {
+                    "MetricName": "Latency",
+                    "StatisticValues": {"SampleCount": 1, "Sum": 10, "Minimum": 10, "Maximum": 10},
+                    "Unit": Unit.Milliseconds,
+                    "Dimensions": [{"Name": "SAM", "Value": "Dim2"}],
+                    "Timestamp": ANY,
+                },
+                {
+                    "MetricName": "Count",
+                    "StatisticValues": {"SampleCount": 1, "Sum": 1, "Minimum": 1, "Maximum": 1},
+                    "Unit": Unit.Count,
+                    "Dimensions": [],
+                    "Timestamp": ANY,
+                },
+            ],
+        )
+
+    def test_aggregation_restarts_after_publish(self):
+        mock_metrics_publisher = MetricPublisherTestHelper()
+        metrics = Metrics("DummyNamespace", mock_metrics_publisher, aggregate=True)
+        metrics.record_count("Count", 1)
+        metrics.publish()
+        metrics.record_count("Count", 2)
+        metrics.publish()
+
+        self.assertEqual(len(mock_metrics_publisher.metrics_cache), 1)
+        self.assertEqual(mock_metrics_publisher.metrics_cache[0].get_values(), [2])
+
+    def test_histogram_is_bounded(self):
+        metric = AggregatedMetricDatum("Latency", Unit.Milliseconds, [])
+        for value in range(1000):
+            metric.add(value)
+        metric.add(999)
+
+        self.assertEqual(len(metric.histogram), AggregatedMetricDatum.MAX_HISTOGRAM_VALUES)
+        self.assertEqual(metric.histogram[99], 902)
+        self.assertEqual(len(metric.get_values()), 1001)
+        self.assertEqual(
+            metric.get_metric_data()["StatisticValues"],
+            {"SampleCount": 1001, "Sum": 500499, "Minimum": 0, "Maximum": 999},
+        )
+
+    def test_cw_publisher_publishes_statistic_sets(self):
+        mock_cw_client = MagicMock()
+        metric = AggregatedMetricDatum("Latency", Unit.Milliseconds, [])
+        metric.add(1)
+        metric.add(5)
+
+        CWMetricsPublisher(mock_cw_client).publish("DummyNamespace", [metric])
+
+        mock_cw_client.put_metric_data.assert_called_once_with(
+            Namespace="DummyNamespace",
+            MetricData=[
+                {
+                    "MetricName": "Latency",
+                    "StatisticValues": {"SampleCount": 2, "Sum": 6, "Minimum": 1, "Maximum": 5},
+                    "Unit": Unit.Milliseconds,
+                    "Dimensions": [],
+                    "Timestamp": ANY,
+                }
+            ],
+        )
+
+
+class TestAsyncMetricsPublisher(TestCase):
+    def test_metrics_are_published_on_background_thread(self):
+        class ThreadRecordingPublisher(MetricPublisherTestHelper):
+            def publish(self, namespace, metrics):
+                self.thread = threading.current_thread()
+                MetricPublisherTestHelper.publish(self, namespace, metrics)
+
+        mock_metrics_publisher = ThreadRecordingPublisher()
+        metric = MetricDatum("Count", 1, Unit.Count)
+
+        async_publisher = AsyncMetricsPublisher(mock_metrics_publisher)
+        async_publisher.publish("DummyNamespace", [metric])
+
+        self.assertTrue(async_publisher.flush(timeout=5))
+        self.assertEqual(mock_metrics_publisher.namespace, "DummyNamespace")
+        self.assertEqual(mock_metrics_publisher.metrics_cache, [metric])
+        self.assertIsNot(mock_metrics_publisher.thread, threading.current_thread())
+
+    def test_metrics_are_dropped_when_queue_is_full(self):
+        mock_metrics_publisher = MagicMock()
+        blocked = threading.Event()
+        mock_metrics_publisher.publish.side_effect = lambda *args: blocked.wait(5)
+
+        async_publisher = AsyncMetricsPublisher(mock_metrics_publisher, max_queue_size=1)
+        for i in range(5):
+            async_publisher.publish("DummyNamespace", [MetricDatum("Count", i, Unit.Count)])
+        self.assertFalse(async_publisher.flush(timeout=0.01))
+        blocked.set()
+
+        self.assertTrue(async_publisher.flush(timeout=5))
+        # One batch is being published when the others are queued, only one of them fits in the queue
+        self.assertLessEqual(mock_metrics_publisher.publish.call_count, 2)
+
+    def test_flush_timeout_does_not_leave_threads_behind(self):
+        mock_metrics_publisher = MagicMock()
+        blocked = threading.Event()
+        mock_metrics_publisher.publish.side_effect = lambda *args: blocked.wait(5)
+
+        async_publisher = AsyncMetricsPublisher(mock_metrics_publisher)
+        async_publisher.publish("DummyNamespace", [MetricDatum("Count", 1, Unit.Count)])
+        thread_count = threading.active_count()
+        for _ in range(3):
+            self.assertFalse(async_publisher.flush(timeout=0.01))
+        self.assertEqual(thread_count, threading.active_count())
+        blocked.set()
+
+        self.assertTrue(async_publisher.flush(timeout=5))
+
+    def test_publisher_errors_are_not_raised(self):
+        mock_metrics_publisher = MagicMock()
+        mock_metrics_publisher.publish.side_effect = [Exception("BOOM FAILED!!"), None]
+
+        async_publisher = AsyncMetricsPublisher(mock_metrics_publisher)
+        async_publisher.publish("DummyNamespace", [MetricDatum("Count", 1, Unit.Count)])
+        async_publisher.publish("DummyNamespace", [MetricDatum("Count", 2, Unit.Count)])
+
+        self.assertTrue(async_publisher.flush(timeout=5))
+        self.assertEqual(mock_metrics_publisher.publish.call_count, 2)
+
+    def test_empty_metrics_are_not_queued(self):
+        mock_metrics_publisher = MagicMock()
+        async_publisher = AsyncMetricsPublisher(mock_metrics_publisher)
+        async_publisher.publish("DummyNamespace", [])
+
+        self.assertTrue(async_publisher.flush())
+        mock_metrics_publisher.publish.assert_not_called()
+
+
+class TestEMFMetricsPublisher(TestCase):
+    def _publish(self, metrics):
+        stream = io.StringIO()
+        EMFMetricsPublisher(stream).publish("DummyNamespace", metrics)
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    def test_metrics_are_written_in_embedded_metric_format(self):
+        timestamp = datetime(2022, 8, 11, 0, 0, 0)
+        dimensions = [{"Name": "Stage", "Value": "beta"}]
+        aggregated = AggregatedMetricDatum("Latency", Unit.Milliseconds, dimensions, timestamp)
+        aggregated.add(1)
+        aggregated.add(2)
+
+        documents = self._publish(
+            [
+                aggregated,
+                MetricDatum("Count", 3, Unit.Count, dimensions, timestamp),
+                MetricDatum("Count", 4, Unit.Count, [], timestamp),
+            ]
+        )
+
+        self.assertEqual(
+            documents,
+            [
+                {
+                    "Stage": "beta",
+                    "Latency": [1, 2],
+                    "Count": [3],
+                    "_aws": {
+                        "Timestamp": 1660176000000,
+                        "CloudWatchMetrics": [
+                            {
+                                "Namespace": "DummyNamespace",
+                                "Dimensions": [["Stage"]],
+                                "Metrics": [
+                                    {"Name": "Latency", "Unit": Unit.Milliseconds},
+                                    {"Name": "Count", "Unit": Unit.Count},
+                                ],
+                            }
+                        ],
+                    },
+                },
+                {
+                    "Count": [4],
+                    "_aws": {
+                        "Timestamp": 1660176000000,
+                        "CloudWatchMetrics": [
+                            {
+                                "Namespace": "DummyNamespace",
+                                "Dimensions": [[]],
+                                "Metrics": [{"Name": "Count", "Unit": Unit.Count}],
+                            }
+                        ],
+                    },
+                },
+            ],
+        )
+
+    def test_documents_respect_embedded_metric_format_limits(self):
+        metrics = [MetricDatum("Count", i, Unit.Count) for i in range(150)]
+        metrics += [MetricDatum("Metric{}".format(i), i, Unit.Count) for i in range(150)]
+
+        documents = self._publish(metrics)
+
+        for document in documents:
+            definitions = document["_aws"]["CloudWatchMetrics"][0]["Metrics"]
+            self.assertLessEqual(len(definitions), EMFMetricsPublisher.MAX_METRICS)
+            for definition in definitions:
+                self.assertLessEqual(len(document[definition["Name"]]), EMFMetricsPublisher.MAX_VALUES)
+        self.assertEqual(sum((document.get("Count", []) for document in documents), []), list(range(150)))
+        self.assertEqual(
+            sum(len(document["_aws"]["CloudWatchMetrics"][0]["Metrics"]) for document in documents), 150 + 2
+        )
+
+    def test_nothing_is_written_without_metrics(self):
+        self.assertEqual(self._publish([]), [])
+
+
 class TestCWMetricPublisher(TestCase):
     @parameterized.expand(
         [
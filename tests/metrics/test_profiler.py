@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+import threading
+from unittest import TestCase
+
+from samtranslator.metrics.method_decorator import cw_timer
+from samtranslator.metrics.profiler import Profiler, get_current_profiler, profile_span, use_profiler
+
+
+class TestProfiler(TestCase):
+    def _profile(self):
+        profiler = Profiler()
+        with use_profiler(profiler):
+            with profile_span("Translate", "Translator"):
+                with profile_span("MyFunction", "Resource", {"Type": "AWS::Serverless::Function"}):
+                    with profile_span("resolve_parameter_refs", "Intrinsics"):
+                        pass
+                with profile_span("MyApi", "Resource"):
+                    with profile_span("resolve_parameter_refs", "Intrinsics"):
+                        pass
+        return profiler
+
+    def test_spans_are_nested(self):
+        report = self._profile().get_report()
+
+        (translate,) = report["Spans"]
+        self.assertEqual(translate["Name"], "Translate")
+        self.assertEqual([span["Name"] for span in translate["Children"]], ["MyFunction", "MyApi"])
+        self.assertEqual(translate["Children"][0]["Args"], {"Type": "AWS::Serverless::Function"})
+        self.assertEqual(translate["Children"][0]["Children"][0]["Name"], "resolve_parameter_refs")
+        self.assertEqual(report["TotalTimeMs"], translate["DurationMs"])
+        self.assertGreaterEqual(translate["DurationMs"], translate["SelfTimeMs"])
+
+    def test_report_summarizes_spans(self):
+        summary = self._profile().get_report()["Summary"]
+
+        self.assertEqual(summary[0]["Name"], "Translate")
+        intrinsics = [entry for entry in summary if entry["Category"] == "Intrinsics"]
+        self.assertEqual(len(intrinsics), 1)
+        self.assertEqual(intrinsics[0]["Count"], 2)
+
+    def test_chrome_trace_has_complete_events(self):
+        events = self._profile().get_chrome_trace()["traceEvents"]
+
+        self.assertEqual(
+            [event["name"] for event in events],
+            ["Translate", "MyFunction", "resolve_parameter_refs", "MyApi", "resolve_parameter_refs"],
+        )
+        for event in events:
+            self.assertEqual(event["ph"], "X")
+            self.assertGreaterEqual(event["dur"], 0)
+        self.assertLessEqual(events[0]["ts"], events[1]["ts"])
+
+    def test_report_and_trace_are_written_as_json(self):
+        profiler = self._profile()
+        directory = tempfile.mkdtemp()
+        profiler.write_report(os.path.join(directory, "report.json"))
+        profiler.write_chrome_trace(os.path.join(directory, "trace.json"))
+
+        with open(os.path.join(directory, "report.json")) as fp:
+            self.assertEqual(json.load(fp)["Spans"][0]["Name"], "Translate")
+        with open(os.path.join(directory, "trace.json")) as fp:
+            self.assertEqual(len(json.load(fp)["traceEvents"]), 5)
+
+    def test_spans_are_not_recorded_without_profiler(self):
+        self.assertIsNone(get_current_profiler())
+        with profile_span("Translate", "Translator"):
+            pass
+
+        profiler = Profiler()
+        with use_profiler(profiler):
+            self.assertIs(get_current_profiler(), profiler)
+        self.assertIsNone(get_current_profiler())
+        self.assertEqual(profiler.spans, [])
+
+    def test_spans_of_other_threads_are_not_nested(self):
+        profiler = Profiler()
+
+        def record():
+            with profiler.span("Thread", "Test"):
+                pass
+
+        with profiler.span("Main", "Test"):
+            thread = threading.Thread(target=record)
+            thread.start()
+            thread.join()
+
+        self.assertEqual(sorted(span.name for span in profiler.spans), ["Main", "Thread"])
+
+    def test_cw_timer_records_span(self):
+        @cw_timer(prefix="Prefix")
+        def timed_function():
+            return 42
+
+        profiler = Profiler()
+        with use_profiler(profiler):
+            self.assertEqual(timed_function(), 42)
+
+        self.assertEqual([(span.name, span.category) for span in profiler.spans], [("Prefix-timed_function", "Timer")])
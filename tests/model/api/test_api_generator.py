@@ -1,3 +1,4 @@
+import copy
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
@@ -5,6 +6,8 @@ from parameterized import parameterized
 
 from samtranslator.model import InvalidResourceException
 from samtranslator.model.api.api_generator import ApiGenerator
+from samtranslator.swagger.swagger import SwaggerEditor
+from samtranslator.utils.py27hash_fix import Py27Dict
 
 
 class TestApiGenerator(TestCase):
@@ -50,3 +53,40 @@ class TestApiGenerator(TestCase):
         with self.assertRaises(InvalidResourceException) as cm:
             api_generator._construct_usage_plan()
             self.assertIn("Invalid property for", str(cm.exception))
+
+    @parameterized.expand(
+        [
+            ({"cors": "'*'"},),
+            ({"models": {"User": {"type": "object"}}},),
+        ]
+    )
+    def test_construct_rest_api_does_not_modify_definition_body(self, generator_kwargs):
+        swagger = Py27Dict({"openapi": "3.0.1", "paths": Py27Dict()})
+        editor = SwaggerEditor(swagger)
+        editor.add_path("/foo", "get")
+        editor.add_cors("/foo", "'*'")
+        # The definition body of an API is returned by the editors of its events
+        definition_body = editor.swagger
+        expected = copy.deepcopy(definition_body)
+        api_generator = ApiGenerator(
+            "Api",
+            None,
+            None,
+            None,
+            None,
+            definition_body,
+            None,
+            None,
+            "Prod",
+            Mock(),
+            Mock(),
+            endpoint_configuration="REGIONAL",
+            open_api_version="3.0.1",
+            **generator_kwargs,
+        )
+
+        rest_api = api_generator._construct_rest_api()
+
+        self.assertNotIn("produces", rest_api.Body["paths"]["/foo"]["options"])
+        self.assertNotIn("consumes", rest_api.Body["paths"]["/foo"]["options"])
+        self.assertEqual(definition_body, expected)
@@ -1,3 +1,4 @@
+import os
 from unittest.mock import Mock, patch
 from unittest import TestCase
 
@@ -22,7 +23,7 @@ class ApiEventSource(TestCase):
         self.stage = "Prod"
         self.suffix = "123"
 
-    @patch("boto3.session.Session.region_name", "eu-west-2")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "eu-west-2"})
     def test_get_permission_without_trailing_slash(self):
         cfn = self.api_event_source.to_cloudformation(function=self.func, explicit_api={}, api_id="RestApi")
 
@@ -36,7 +37,7 @@ class ApiEventSource(TestCase):
 
         self.assertEqual(arn, "arn:aws:execute-api:${AWS::Region}:${AWS::AccountId}:${__ApiId__}/${__Stage__}/GET/foo")
 
-    @patch("boto3.session.Session.region_name", "eu-west-2")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "eu-west-2"})
     def test_get_permission_with_trailing_slash(self):
         self.api_event_source.Path = "/foo/"
         cfn = self.api_event_source.to_cloudformation(function=self.func, explicit_api={}, api_id="RestApi")
@@ -51,7 +52,7 @@ class ApiEventSource(TestCase):
 
         self.assertEqual(arn, "arn:aws:execute-api:${AWS::Region}:${AWS::AccountId}:${__ApiId__}/${__Stage__}/GET/foo")
 
-    @patch("boto3.session.Session.region_name", "eu-west-2")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "eu-west-2"})
     def test_get_permission_with_path_parameter_to_any_path(self):
         self.api_event_source.Path = "/foo/{userId+}"
         cfn = self.api_event_source.to_cloudformation(function=self.func, explicit_api={}, api_id="RestApi")
@@ -68,7 +69,7 @@ class ApiEventSource(TestCase):
             arn, "arn:aws:execute-api:${AWS::Region}:${AWS::AccountId}:${__ApiId__}/${__Stage__}/GET/foo/*"
         )
 
-    @patch("boto3.session.Session.region_name", "eu-west-2")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "eu-west-2"})
     def test_get_permission_with_path_parameter(self):
         self.api_event_source.Path = "/foo/{userId}/bar"
         cfn = self.api_event_source.to_cloudformation(function=self.func, explicit_api={}, api_id="RestApi")
@@ -85,7 +86,7 @@ class ApiEventSource(TestCase):
             arn, "arn:aws:execute-api:${AWS::Region}:${AWS::AccountId}:${__ApiId__}/${__Stage__}/GET/foo/*/bar"
         )
 
-    @patch("boto3.session.Session.region_name", "eu-west-2")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "eu-west-2"})
     def test_get_permission_with_proxy_resource(self):
         self.api_event_source.Path = "/foo/{proxy+}"
         cfn = self.api_event_source.to_cloudformation(function=self.func, explicit_api={}, api_id="RestApi")
@@ -102,7 +103,7 @@ class ApiEventSource(TestCase):
             arn, "arn:aws:execute-api:${AWS::Region}:${AWS::AccountId}:${__ApiId__}/${__Stage__}/GET/foo/*"
         )
 
-    @patch("boto3.session.Session.region_name", "eu-west-2")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "eu-west-2"})
     def test_get_permission_with_just_slash(self):
         self.api_event_source.Path = "/"
         cfn = self.api_event_source.to_cloudformation(function=self.func, explicit_api={}, api_id="RestApi")
@@ -1,3 +1,4 @@
+import os
 from unittest import TestCase
 from unittest.mock import patch
 import pytest
@@ -26,7 +27,7 @@ class TestArchitecture(TestCase):
         "managed_policy_map": {"foo": "bar"},
     }
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_unknown_architectures(self):
         function = SamFunction("foo")
         function.CodeUri = "s3://foobar/foo.zip"
@@ -42,7 +43,7 @@ class TestArchitecture(TestCase):
                 "Resource with id [foo] is invalid. Architectures needs to be a list with one string, either `x86_64` or `arm64`.",
             )
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_multiple_architectures(self):
         function = SamFunction("foo")
         function.CodeUri = "s3://foobar/foo.zip"
@@ -57,7 +58,7 @@ class TestArchitecture(TestCase):
             "Resource with id [foo] is invalid. Architectures needs to be a list with one string, either `x86_64` or `arm64`.",
         )
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_validate_architecture_with_intrinsic(self):
         function = SamFunction("foo")
         function.CodeUri = "s3://foobar/foo.zip"
@@ -70,7 +71,7 @@ class TestArchitecture(TestCase):
         self.assertEqual(generatedFunctionList.__len__(), 1)
         self.assertEqual(generatedFunctionList[0].Architectures, {"Ref": "MyRef"})
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_valid_architectures(self):
         function = SamFunction("foo")
         function.CodeUri = "s3://foobar/foo.zip"
@@ -93,7 +94,7 @@ class TestCodeUriandImageUri(TestCase):
         "managed_policy_map": {"foo": "bar"},
     }
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_code_uri(self):
         function = SamFunction("foo")
         function.CodeUri = "s3://foobar/foo.zip"
@@ -105,7 +106,7 @@ class TestCodeUriandImageUri(TestCase):
         self.assertEqual(generatedFunctionList.__len__(), 1)
         self.assertEqual(generatedFunctionList[0].Code, {"S3Key": "foo.zip", "S3Bucket": "foobar"})
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_zip_file(self):
         function = SamFunction("foo")
         function.InlineCode = "hello world"
@@ -117,13 +118,13 @@ class TestCodeUriandImageUri(TestCase):
         self.assertEqual(generatedFunctionList.__len__(), 1)
         self.assertEqual(generatedFunctionList[0].Code, {"ZipFile": "hello world"})
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_no_code_uri_or_zipfile_or_no_image_uri(self):
         function = SamFunction("foo")
         with pytest.raises(InvalidResourceException):
             function.to_cloudformation(**self.kwargs)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_image_uri(self):
         function = SamFunction("foo")
         function.ImageUri = "123456789.dkr.ecr.us-east-1.amazonaws.com/myimage:latest"
@@ -133,7 +134,7 @@ class TestCodeUriandImageUri(TestCase):
         self.assertEqual(generatedFunctionList.__len__(), 1)
         self.assertEqual(generatedFunctionList[0].Code, {"ImageUri": function.ImageUri})
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_image_uri_layers_runtime_handler(self):
         function = SamFunction("foo")
         function.ImageUri = "123456789.dkr.ecr.us-east-1.amazonaws.com/myimage:latest"
@@ -144,7 +145,7 @@ class TestCodeUriandImageUri(TestCase):
         with pytest.raises(InvalidResourceException):
             function.to_cloudformation(**self.kwargs)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_image_uri_package_type_zip(self):
         function = SamFunction("foo")
         function.ImageUri = "123456789.dkr.ecr.us-east-1.amazonaws.com/myimage:latest"
@@ -152,7 +153,7 @@ class TestCodeUriandImageUri(TestCase):
         with pytest.raises(InvalidResourceException):
             function.to_cloudformation(**self.kwargs)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_image_uri_invalid_package_type(self):
         function = SamFunction("foo")
         function.ImageUri = "123456789.dkr.ecr.us-east-1.amazonaws.com/myimage:latest"
@@ -160,7 +161,7 @@ class TestCodeUriandImageUri(TestCase):
         with pytest.raises(InvalidResourceException):
             function.to_cloudformation(**self.kwargs)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_image_uri_and_code_uri(self):
         function = SamFunction("foo")
         function.ImageUri = "123456789.dkr.ecr.us-east-1.amazonaws.com/myimage:latest"
@@ -176,7 +177,7 @@ class TestAssumeRolePolicyDocument(TestCase):
         "managed_policy_map": {"foo": "bar"},
     }
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_assume_role_policy_document(self):
         function = SamFunction("foo")
         function.CodeUri = "s3://foobar/foo.zip"
@@ -200,7 +201,7 @@ class TestAssumeRolePolicyDocument(TestCase):
         generateFunctionVersion = [x for x in cfnResources if isinstance(x, IAMRole)]
         self.assertEqual(generateFunctionVersion[0].AssumeRolePolicyDocument, assume_role_policy_document)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_without_assume_role_policy_document(self):
         function = SamFunction("foo")
         function.CodeUri = "s3://foobar/foo.zip"
@@ -226,7 +227,7 @@ class TestVersionDescription(TestCase):
         "managed_policy_map": {"foo": "bar"},
     }
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_version_description(self):
         function = SamFunction("foo")
         test_description = "foobar"
@@ -241,7 +242,7 @@ class TestVersionDescription(TestCase):
         generateFunctionVersion = [x for x in cfnResources if isinstance(x, LambdaVersion)]
         self.assertEqual(generateFunctionVersion[0].Description, test_description)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_autopublish_bad_hash(self):
         function = SamFunction("foo")
         test_description = "foobar"
@@ -255,7 +256,7 @@ class TestVersionDescription(TestCase):
         with pytest.raises(InvalidResourceException):
             function.to_cloudformation(**self.kwargs)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_autopublish_good_hash(self):
         function = SamFunction("foo")
         test_description = "foobar"
@@ -277,7 +278,7 @@ class TestOpenApi(TestCase):
         "managed_policy_map": {"foo": "bar"},
     }
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_open_api_3_no_stage(self):
         api = SamApi("foo")
         api.OpenApiVersion = "3.0"
@@ -288,7 +289,7 @@ class TestOpenApi(TestCase):
         self.assertEqual(deployment.__len__(), 1)
         self.assertEqual(deployment[0].StageName, None)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_open_api_2_no_stage(self):
         api = SamApi("foo")
         api.OpenApiVersion = "3.0"
@@ -299,14 +300,14 @@ class TestOpenApi(TestCase):
         self.assertEqual(deployment.__len__(), 1)
         self.assertEqual(deployment[0].StageName, None)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_open_api_bad_value(self):
         api = SamApi("foo")
         api.OpenApiVersion = "5.0"
         with pytest.raises(InvalidResourceException):
             api.to_cloudformation(**self.kwargs)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_swagger_no_stage(self):
         api = SamApi("foo")
 
@@ -324,7 +325,7 @@ class TestApiTags(TestCase):
         "managed_policy_map": {"foo": "bar"},
     }
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_no_tags(self):
         api = SamApi("foo")
         api.Tags = {}
@@ -335,7 +336,7 @@ class TestApiTags(TestCase):
         self.assertEqual(deployment.__len__(), 1)
         self.assertEqual(deployment[0].Tags, [])
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_tags(self):
         api = SamApi("foo")
         api.Tags = {"MyKey": "MyValue"}
@@ -354,7 +355,7 @@ class TestApiDescription(TestCase):
         "managed_policy_map": {"foo": "bar"},
     }
 
-    @patch("boto3.session.Session.region_name", "eu-central-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "eu-central-1"})
     def test_with_no_description(self):
         sam_api = SamApi("foo")
 
@@ -362,7 +363,7 @@ class TestApiDescription(TestCase):
         rest_api = [x for x in resources if isinstance(x, ApiGatewayRestApi)]
         self.assertEqual(rest_api[0].Description, None)
 
-    @patch("boto3.session.Session.region_name", "eu-central-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "eu-central-1"})
     def test_with_description(self):
         sam_api = SamApi("foo")
         sam_api.Description = "my description"
@@ -379,7 +380,7 @@ class TestHttpApiDescription(TestCase):
         "managed_policy_map": {"foo": "bar"},
     }
 
-    @patch("boto3.session.Session.region_name", "eu-central-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "eu-central-1"})
     def test_with_no_description(self):
         sam_http_api = SamHttpApi("foo")
         sam_http_api.DefinitionBody = {
@@ -392,7 +393,7 @@ class TestHttpApiDescription(TestCase):
         http_api = [x for x in resources if isinstance(x, ApiGatewayV2HttpApi)]
         self.assertEqual(http_api[0].Body.get("info", {}).get("description"), "existing description")
 
-    @patch("boto3.session.Session.region_name", "eu-central-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "eu-central-1"})
     def test_with_no_definition_body(self):
         sam_http_api = SamHttpApi("foo")
         sam_http_api.Description = "my description"
@@ -405,7 +406,7 @@ class TestHttpApiDescription(TestCase):
             "Description works only with inline OpenApi specified in the 'DefinitionBody' property.",
         )
 
-    @patch("boto3.session.Session.region_name", "eu-central-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "eu-central-1"})
     def test_with_description_defined_in_definition_body(self):
         sam_http_api = SamHttpApi("foo")
         sam_http_api.DefinitionBody = {
@@ -424,7 +425,7 @@ class TestHttpApiDescription(TestCase):
             "'DefinitionBody' property.",
         )
 
-    @patch("boto3.session.Session.region_name", "eu-central-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "eu-central-1"})
     def test_with_description_not_defined_in_definition_body(self):
         sam_http_api = SamHttpApi("foo")
         sam_http_api.DefinitionBody = {"openapi": "3.0.1", "paths": {"/foo": {}}, "info": {}}
@@ -476,7 +477,7 @@ class TestFunctionUrlConfig(TestCase):
         "managed_policy_map": {"foo": "bar"},
     }
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_function_url_config_with_no_authorization_type(self):
         function = SamFunction("foo")
         function.CodeUri = "s3://foobar/foo.zip"
@@ -491,7 +492,7 @@ class TestFunctionUrlConfig(TestCase):
             + " function property `FunctionUrlConfig`. Please provide either AWS_IAM or NONE.",
         )
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_function_url_config_with_no_cors_config(self):
         function = SamFunction("foo")
         function.CodeUri = "s3://foobar/foo.zip"
@@ -503,7 +504,7 @@ class TestFunctionUrlConfig(TestCase):
         self.assertEqual(generatedUrlList.__len__(), 1)
         self.assertEqual(generatedUrlList[0].AuthType, "AWS_IAM")
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_validate_function_url_config_properties_with_intrinsic(self):
         function = SamFunction("foo")
         function.CodeUri = "s3://foobar/foo.zip"
@@ -519,7 +520,7 @@ class TestFunctionUrlConfig(TestCase):
         self.assertEqual(generatedUrlList[0].AuthType, {"Ref": "AWS_IAM"})
         self.assertEqual(generatedUrlList[0].Cors, {"Ref": "MyCorConfigRef"})
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_valid_function_url_config(self):
         cors = {
             "AllowOrigins": ["example1.com", "example2.com", "example2.com"],
@@ -542,7 +543,7 @@ class TestFunctionUrlConfig(TestCase):
         self.assertEqual(generatedUrlList[0].AuthType, "NONE")
         self.assertEqual(generatedUrlList[0].Cors, cors)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_valid_function_url_config_with_Intrinsics(self):
         function = SamFunction("foo")
         function.CodeUri = "s3://foobar/foo.zip"
@@ -554,7 +555,7 @@ class TestFunctionUrlConfig(TestCase):
         generatedUrlList = [x for x in cfnResources if isinstance(x, LambdaUrl)]
         self.assertEqual(generatedUrlList.__len__(), 1)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_function_url_config_with_invalid_cors_parameter(self):
         function = SamFunction("foo")
         function.CodeUri = "s3://foobar/foo.zip"
@@ -568,7 +569,7 @@ class TestFunctionUrlConfig(TestCase):
             "Resource with id [foo] is invalid. AllowOrigin is not a valid property for configuring Cors.",
         )
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_function_url_config_with_invalid_cors_parameter_data_type(self):
         function = SamFunction("foo")
         function.CodeUri = "s3://foobar/foo.zip"
@@ -582,7 +583,7 @@ class TestFunctionUrlConfig(TestCase):
             "Resource with id [foo] is invalid. AllowOrigins must be of type list.",
         )
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_valid_function_url_config_with(self):
         function = SamFunction("foo")
         function.CodeUri = "s3://foobar/foo.zip"
@@ -596,7 +597,7 @@ class TestFunctionUrlConfig(TestCase):
         expected_url_logicalid = {"Ref": "foo"}
         self.assertEqual(generatedUrlList[0].TargetFunctionArn, expected_url_logicalid)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_valid_function_url_config_with_lambda_permission(self):
         function = SamFunction("foo")
         function.CodeUri = "s3://foobar/foo.zip"
@@ -612,7 +613,7 @@ class TestFunctionUrlConfig(TestCase):
         self.assertEqual(generatedUrlList[0].Principal, "*")
         self.assertEqual(generatedUrlList[0].FunctionUrlAuthType, "NONE")
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_with_invalid_function_url_config_with_authorization_type_value_as_None(self):
 
         function = SamFunction("foo")
@@ -19,11 +19,11 @@ class TestParser(TestCase):
         parser._validate.assert_has_calls([call(sam_template, parameter_values)])
         sam_plugins_mock.act.assert_has_calls([call(LifeCycleEvents.before_transform_template, sam_template)])
 
-    @patch("samtranslator.parser.parser.SamTemplateValidator")
+    @patch("samtranslator.parser.parser.SamTemplateValidatorCache")
     @patch("samtranslator.parser.parser.LOG")
-    def test_validate_validator_failure(self, log_mock, sam_template_validator_class_mock):
+    def test_validate_validator_failure(self, log_mock, sam_template_validator_cache_class_mock):
         exception = Exception()
-        sam_template_validator_class_mock.side_effect = exception
+        sam_template_validator_cache_class_mock.get_instance.return_value.get.side_effect = exception
         log_mock.exception = Mock()
 
         sam_template = {
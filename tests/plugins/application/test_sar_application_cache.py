@@ -0,0 +1,169 @@
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+
+from samtranslator.plugins.application.sar_application_cache import (
+    FileSarApplicationCache,
+    InMemorySarApplicationCache,
+    SarApplicationCache,
+    SarApplicationCacheEntry,
+)
+
+KEY = SarApplicationCache.make_key(('"app_id"', '"1.0.0"'), "us-east-1", "123456789012")
+
+
+def make_response(status="ACTIVE", expiration_time=None):
+    response = {
+        "ApplicationId": "app_id",
+        "Status": status,
+        "TemplateId": "template_id",
+        "TemplateUrl": "https://example.com/pre-signed-url",
+    }
+    if expiration_time is not None:
+        response["ExpirationTime"] = expiration_time
+    return response
+
+
+class TestSarApplicationCaches(TestCase):
+    def _get_caches(self, **kwargs):
+        return [
+            InMemorySarApplicationCache(**kwargs),
+            FileSarApplicationCache(os.path.join(tempfile.mkdtemp(), "sar"), **kwargs),
+        ]
+
+    def test_get_returns_put_template(self):
+        for cache in self._get_caches():
+            self.assertIsNone(cache.get(KEY))
+
+            cache.put_template(KEY, make_response(status="PREPARING"))
+            entry = cache.get(KEY)
+
+            self.assertEqual(entry.kind, SarApplicationCacheEntry.TEMPLATE)
+            self.assertEqual(entry.template_url, "https://example.com/pre-signed-url")
+            self.assertEqual(entry.application_id, "app_id")
+            self.assertEqual(entry.template_id, "template_id")
+            self.assertEqual(entry.status, "PREPARING")
+
+    def test_set_template_active(self):
+        for cache in self._get_caches():
+            cache.put_template(KEY, make_response(status="PREPARING"))
+            cache.set_template_active(KEY)
+
+            self.assertEqual(cache.get(KEY).status, "ACTIVE")
+
+    def test_get_returns_put_available_and_access_denied(self):
+        for cache in self._get_caches():
+            cache.put_available(KEY)
+            self.assertEqual(cache.get(KEY).kind, SarApplicationCacheEntry.AVAILABLE)
+
+            cache.put_access_denied(KEY, "Access denied")
+            entry = cache.get(KEY)
+            self.assertEqual(entry.kind, SarApplicationCacheEntry.ACCESS_DENIED)
+            self.assertEqual(entry.message, "Access denied")
+
+    def test_invalidate_removes_entry(self):
+        for cache in self._get_caches():
+            cache.put_template(KEY, make_response())
+            cache.invalidate(KEY)
+
+            self.assertIsNone(cache.get(KEY))
+
+    def test_entries_expire(self):
+        for cache in self._get_caches(template_ttl_seconds=0, access_denied_ttl_seconds=0):
+            cache.put_template(KEY, make_response())
+            self.assertIsNone(cache.get(KEY))
+
+            cache.put_access_denied(KEY, "Access denied")
+            self.assertIsNone(cache.get(KEY))
+
+    def test_template_expires_before_its_pre_signed_url(self):
+        in_20_minutes = datetime.now(timezone.utc) + timedelta(minutes=20)
+        for expiration_time in [
+            in_20_minutes.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            in_20_minutes.isoformat(),
+            in_20_minutes.replace(tzinfo=None).isoformat(),
+            in_20_minutes,
+        ]:
+            cache = InMemorySarApplicationCache()
+            cache.put_template(KEY, make_response(expiration_time=expiration_time))
+
+            expires_in = cache.get(KEY).expires_at - time.time()
+            self.assertAlmostEqual(expires_in, 5 * 60, delta=5)
+
+    def test_template_expires_with_ttl_if_expiration_time_is_unknown(self):
+        for expiration_time in ["not a date", 42]:
+            cache = InMemorySarApplicationCache(template_ttl_seconds=100)
+            cache.put_template(KEY, make_response(expiration_time=expiration_time))
+
+            expires_in = cache.get(KEY).expires_at - time.time()
+            self.assertAlmostEqual(expires_in, 100, delta=5)
+
+    def test_in_memory_cache_evicts_least_recently_used(self):
+        cache = InMemorySarApplicationCache(max_size=2)
+        cache.put_available("a")
+        cache.put_available("b")
+        cache.get("a")
+        cache.put_available("c")
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_in_memory_cache_returns_copies(self):
+        cache = InMemorySarApplicationCache()
+        cache.put_template(KEY, make_response(status="PREPARING"))
+        cache.get(KEY).status = "ACTIVE"
+
+        self.assertEqual(cache.get(KEY).status, "PREPARING")
+
+    def test_file_cache_is_shared_between_instances(self):
+        directory = os.path.join(tempfile.mkdtemp(), "sar")
+        FileSarApplicationCache(directory).put_template(KEY, make_response())
+
+        self.assertEqual(FileSarApplicationCache(directory).get(KEY).template_id, "template_id")
+
+    def test_file_cache_instances_keep_each_others_entries(self):
+        directory = os.path.join(tempfile.mkdtemp(), "sar")
+        caches = [FileSarApplicationCache(directory) for _ in range(2)]
+        keys = [
+            SarApplicationCache.make_key(('"app_id"', '"{}"'.format(i)), "us-east-1", "123456789012") for i in range(2)
+        ]
+
+        for cache, key in zip(caches, keys):
+            cache.put_available(key)
+
+        for cache in caches:
+            self.assertIsNotNone(cache.get(keys[0]))
+            self.assertIsNotNone(cache.get(keys[1]))
+
+    def test_file_cache_ignores_corrupted_entries(self):
+        cache = FileSarApplicationCache(os.path.join(tempfile.mkdtemp(), "sar"))
+        cache.put_available(KEY)
+        for content in ["{not json", '{"unknown": 1}']:
+            with open(cache._store.get_file_path(KEY), "w") as fp:
+                fp.write(content)
+
+            self.assertIsNone(cache.get(KEY))
+
+        cache.put_available(KEY)
+        self.assertIsNotNone(cache.get(KEY))
+
+    def test_file_cache_removes_expired_entries(self):
+        directory = os.path.join(tempfile.mkdtemp(), "sar")
+        cache = FileSarApplicationCache(directory, template_ttl_seconds=0)
+        cache.put_available(KEY)
+
+        self.assertIsNone(cache.get(KEY))
+        self.assertEqual(os.listdir(directory), [])
+
+    def test_make_key_depends_on_region_and_account(self):
+        app_key = ('"app_id"', '"1.0.0"')
+        keys = {
+            SarApplicationCache.make_key(app_key, "us-east-1", "123456789012"),
+            SarApplicationCache.make_key(app_key, "us-west-2", "123456789012"),
+            SarApplicationCache.make_key(app_key, "us-east-1", "210987654321"),
+            SarApplicationCache.make_key(('"app_id"', '"1.0.1"'), "us-east-1", "123456789012"),
+        }
+        self.assertEqual(len(keys), 4)
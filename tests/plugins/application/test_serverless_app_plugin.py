@@ -1,14 +1,21 @@
 import boto3
 import itertools
+import os
+import threading
+import time
 from botocore.exceptions import ClientError
 
 from unittest.mock import Mock, patch
 from unittest import TestCase
 from parameterized import parameterized, param
 
+from samtranslator.metrics.profiler import Profiler, use_profiler
+from samtranslator.plugins.application.sar_application_cache import InMemorySarApplicationCache
 from samtranslator.plugins.application.serverless_app_plugin import ServerlessAppPlugin
 from samtranslator.plugins.exceptions import InvalidPluginException
 from samtranslator.model.exceptions import InvalidResourceException
+from samtranslator.region_configuration import PartitionTable
+from samtranslator.translator.arn_generator import ArnGenerator
 
 # TODO: run tests when AWS CLI is not configured (so they can run in brazil)
 
@@ -178,6 +185,23 @@ class TestServerlessAppPlugin_on_before_transform_template_translate(TestCase):
         # Make sure this is called only for Apis
         sam_template.iterate.assert_called_with({"AWS::Serverless::Application"})
 
+    @patch("samtranslator.plugins.application.serverless_app_plugin.SamTemplate")
+    def test_must_check_sar_region_in_partition_table(self, SamTemplateMock):
+        partition_table = PartitionTable(
+            {"partitions": [{"partition": "aws", "regions": {"us-east-1": {}}, "services": {"serverlessrepo": {}}}]}
+        )
+        self.plugin = ServerlessAppPlugin(sar_client=Mock(), partition_table=partition_table)
+        sam_template = Mock()
+        SamTemplateMock.return_value = sam_template
+        sam_template.iterate.return_value = [("id1", ApplicationResource(location=True))]
+
+        with ArnGenerator.use_region_name("us-east-1"):
+            self.plugin.on_before_transform_template({})
+
+        (result,) = self.plugin._applications.values()
+        self.assertIsInstance(result, InvalidResourceException)
+        self.assertIn("Serverless Application Repository is not available in this region", result.message)
+
     @patch("samtranslator.plugins.application.serverless_app_plugin.SamTemplate")
     @patch("botocore.client.BaseClient._make_api_call", mock_get_application)
     @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
@@ -420,10 +444,12 @@ class TestServerlessAppPlugin_on_after_transform_template(TestCase):
         client.get_cloud_formation_template = Mock()
         client.get_cloud_formation_template.return_value = {"Status": STATUS_EXPIRED}
         plugin = ServerlessAppPlugin(sar_client=client, wait_for_template_active_status=True, validate_only=False)
+        # the applications are waited for one at a time, so the second one is never checked
+        plugin.MAX_CONCURRENT_SAR_CALLS = 1
         plugin._in_progress_templates = [("appid1", "template1"), ("appid2", "template2")]
         with self.assertRaises(InvalidResourceException):
             plugin.on_after_transform_template("template")
-        # should have exactly one call to SAR since the first app will be expired
+        # should have exactly one call to SAR, waiting stops once an app is expired
         self.assertEqual(client.get_cloud_formation_template.call_count, 1)
 
     def test_sleep_between_sar_checks(self):
@@ -441,8 +467,14 @@ class TestServerlessAppPlugin_on_after_transform_template(TestCase):
 
 
 class TestServerlessAppPlugin_on_before_and_on_after_transform_template(TestCase):
+    @patch("samtranslator.plugins.application.serverless_app_plugin.random.uniform", Mock(return_value=1))
+    @patch("samtranslator.plugins.application.serverless_app_plugin.time.monotonic")
     @patch("samtranslator.plugins.application.serverless_app_plugin.SamTemplate")
-    def test_time_limit_exceeds_between_combined_sar_calls(self, SamTemplateMock):
+    def test_time_limit_exceeds_between_combined_sar_calls(self, SamTemplateMock, monotonic_mock):
+        # the clock only advances when the plugin sleeps
+        clock = [0.0]
+        monotonic_mock.side_effect = lambda: clock[0]
+
         template_dict = {"a": "b"}
         app_resources = [
             ("id1", ApplicationResource(app_id="id1", semver="1.0.0", location=True)),
@@ -469,11 +501,349 @@ class TestServerlessAppPlugin_on_before_and_on_after_transform_template(TestCase
         plugin._get_sleep_time_sec.return_value = 0.04
         plugin._in_progress_templates = [("appid", "template"), ("appid2", "template2")]
         plugin.TEMPLATE_WAIT_TIMEOUT_SECONDS = 0.08
+        plugin.MAX_CONCURRENT_SAR_CALLS = 1
+
+        def sleep(seconds):
+            clock[0] += seconds
+
+        plugin._stop_waiting.wait = sleep
 
         plugin.on_before_transform_template(template_dict)
         with self.assertRaises(InvalidResourceException):
             plugin.on_after_transform_template(template_dict)
         # confirm we had at least two attempts to call SAR and that we executed a sleep
+        # the throttled template runs out of time before it is checked again, as the time spent creating the
+        # templates counts against the same limit, so the other template is never checked
         self.assertEqual(client.get_cloud_formation_template.call_count, 1)
         self.assertEqual(client.create_cloud_formation_template.call_count, 2)
         self.assertGreaterEqual(plugin._get_sleep_time_sec.call_count, 2)
+
+
+class TestServerlessAppPlugin_concurrency(TestCase):
+    @patch("samtranslator.plugins.application.serverless_app_plugin.SamTemplate")
+    @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
+    def test_must_request_applications_concurrently(self, SamTemplateMock):
+        app_ids = ["id1", "id2", "id3", "id4"]
+        sam_template = Mock()
+        SamTemplateMock.return_value = sam_template
+        sam_template.iterate.return_value = [
+            (app_id, ApplicationResource(app_id=app_id, semver="1.0.0", location=True)) for app_id in app_ids
+        ]
+        # Each call only returns once all of them were made
+        barrier = threading.Barrier(len(app_ids), timeout=5)
+
+        def create_cloud_formation_template(ApplicationId=None, SemanticVersion=None):
+            barrier.wait()
+            return {"TemplateUrl": "/URL/" + ApplicationId, "Status": STATUS_ACTIVE}
+
+        client = Mock()
+        client.create_cloud_formation_template.side_effect = create_cloud_formation_template
+        plugin = ServerlessAppPlugin(sar_client=client)
+        plugin.on_before_transform_template({})
+
+        for app_id in app_ids:
+            self.assertEqual(plugin._applications[ServerlessAppPlugin._make_app_key(app_id, "1.0.0")], "/URL/" + app_id)
+
+    def test_must_wait_for_templates_concurrently(self):
+        templates = [("appid1", "template1"), ("appid2", "template2"), ("appid3", "template3")]
+        barrier = threading.Barrier(len(templates), timeout=5)
+
+        def get_cloud_formation_template(ApplicationId=None, TemplateId=None):
+            barrier.wait()
+            return {"Status": STATUS_ACTIVE}
+
+        client = Mock()
+        client.get_cloud_formation_template.side_effect = get_cloud_formation_template
+        plugin = ServerlessAppPlugin(sar_client=client, wait_for_template_active_status=True, validate_only=False)
+        plugin._in_progress_templates = list(templates)
+        plugin.on_after_transform_template("template")
+
+        self.assertEqual(client.get_cloud_formation_template.call_count, 3)
+        self.assertEqual(plugin._in_progress_templates, [])
+
+    def test_must_record_the_concurrent_calls_in_the_profiler(self):
+        templates = [("appid1", "template1"), ("appid2", "template2")]
+        barrier = threading.Barrier(len(templates), timeout=5)
+
+        def get_cloud_formation_template(ApplicationId=None, TemplateId=None):
+            barrier.wait()
+            return {"Status": STATUS_ACTIVE}
+
+        client = Mock()
+        client.get_cloud_formation_template.side_effect = get_cloud_formation_template
+        plugin = ServerlessAppPlugin(sar_client=client, wait_for_template_active_status=True, validate_only=False)
+        plugin._in_progress_templates = list(templates)
+        profiler = Profiler()
+        with use_profiler(profiler):
+            plugin.on_after_transform_template("template")
+
+        span_names = [span.name for span in profiler._iterate_spans()]
+        self.assertEqual(span_names.count("External-SAR"), 2)
+
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "us-east-1"})
+    def test_must_run_the_concurrent_calls_in_the_region_of_the_translation(self):
+        plugin = ServerlessAppPlugin(sar_client=Mock())
+        barrier = threading.Barrier(2, timeout=5)
+
+        def get_region_name():
+            barrier.wait()
+            return ArnGenerator.get_region_name()
+
+        with ArnGenerator.use_region_name("cn-north-1"):
+            region_names = plugin._run_concurrently(get_region_name, [(), ()])
+
+        self.assertEqual(region_names, ["cn-north-1", "cn-north-1"])
+
+    def test_must_stop_waiting_when_a_template_expired(self):
+        def get_cloud_formation_template(ApplicationId=None, TemplateId=None):
+            return {"Status": STATUS_EXPIRED if ApplicationId == "expired" else STATUS_PREPARING}
+
+        client = Mock()
+        client.get_cloud_formation_template.side_effect = get_cloud_formation_template
+        plugin = ServerlessAppPlugin(sar_client=client, wait_for_template_active_status=True, validate_only=False)
+        plugin._in_progress_templates = [("preparing", "template1"), ("expired", "template2")]
+        plugin.SLEEP_TIME_SECONDS = 5
+
+        start = time.monotonic()
+        with self.assertRaises(InvalidResourceException) as error:
+            plugin.on_after_transform_template("template")
+
+        self.assertIn("expired", error.exception.message)
+        # The template still preparing is not waited for
+        self.assertLess(time.monotonic() - start, 4)
+
+    def test_must_share_the_deadline_between_requests_and_waits(self):
+        client = Mock()
+        client.get_cloud_formation_template.return_value = {"Status": STATUS_PREPARING}
+        plugin = ServerlessAppPlugin(sar_client=client, wait_for_template_active_status=True, validate_only=False)
+        plugin._in_progress_templates = [("appid1", "template1"), ("appid2", "template2")]
+        # The requests already used all of the time
+        plugin._total_wait_time = plugin.TEMPLATE_WAIT_TIMEOUT_SECONDS
+
+        with self.assertRaises(InvalidResourceException):
+            plugin.on_after_transform_template("template")
+        client.get_cloud_formation_template.assert_not_called()
+
+    @patch("samtranslator.plugins.application.serverless_app_plugin.random.uniform", Mock(return_value=1))
+    @patch("samtranslator.plugins.application.serverless_app_plugin.time.monotonic")
+    def test_must_not_count_the_time_between_requests_and_waits(self, monotonic_mock):
+        clock = [0.0]
+        monotonic_mock.side_effect = lambda: clock[0]
+        client = Mock()
+        client.get_cloud_formation_template.side_effect = [{"Status": STATUS_PREPARING}, {"Status": STATUS_ACTIVE}]
+        plugin = ServerlessAppPlugin(sar_client=client, wait_for_template_active_status=True, validate_only=False)
+        plugin._in_progress_templates = [("appid1", "template1")]
+
+        def sleep(seconds):
+            clock[0] += seconds
+
+        plugin._stop_waiting.wait = sleep
+        plugin.on_before_transform_template({"Resources": {}})
+        # The translation takes longer than the wait budget
+        clock[0] += plugin.TEMPLATE_WAIT_TIMEOUT_SECONDS + 1
+        plugin.on_after_transform_template("template")
+
+        self.assertEqual(client.get_cloud_formation_template.call_count, 2)
+        self.assertEqual(plugin._total_wait_time, plugin.SLEEP_TIME_SECONDS)
+
+    @patch("samtranslator.plugins.application.serverless_app_plugin.random.uniform", Mock(return_value=1))
+    @patch("samtranslator.plugins.application.serverless_app_plugin.SamTemplate")
+    def test_must_count_the_calls_of_concurrent_requests_and_waits(self, SamTemplateMock):
+        app_ids = ["id1", "id2", "id3"]
+        sam_template = Mock()
+        SamTemplateMock.return_value = sam_template
+        sam_template.iterate.return_value = [
+            (app_id, ApplicationResource(app_id=app_id, semver="1.0.0", location=True)) for app_id in app_ids
+        ]
+        throttled = set()
+        polled = set()
+        lock = threading.Lock()
+
+        def create_cloud_formation_template(ApplicationId=None, SemanticVersion=None):
+            with lock:
+                # id2 is throttled once
+                if ApplicationId == "id2" and ApplicationId not in throttled:
+                    throttled.add(ApplicationId)
+                    raise ClientError({"Error": {"Code": "TooManyRequestsException"}}, "CreateCloudFormationTemplate")
+            status = STATUS_ACTIVE if ApplicationId == "id1" else STATUS_PREPARING
+            return {
+                "ApplicationId": ApplicationId,
+                "TemplateId": "t-" + ApplicationId,
+                "TemplateUrl": "/URL",
+                "Status": status,
+            }
+
+        def get_cloud_formation_template(ApplicationId=None, TemplateId=None):
+            with lock:
+                # id3 is still preparing the first time it is polled
+                if ApplicationId == "id3" and ApplicationId not in polled:
+                    polled.add(ApplicationId)
+                    return {"Status": STATUS_PREPARING}
+            return {"Status": STATUS_ACTIVE}
+
+        client = Mock()
+        client.create_cloud_formation_template.side_effect = create_cloud_formation_template
+        client.get_cloud_formation_template.side_effect = get_cloud_formation_template
+        plugin = ServerlessAppPlugin(sar_client=client, wait_for_template_active_status=True, validate_only=False)
+        plugin.SLEEP_TIME_SECONDS = 0.001
+
+        plugin.on_before_transform_template({})
+        self.assertEqual(client.create_cloud_formation_template.call_count, 4)
+        self.assertEqual(plugin._in_progress_templates, [("id2", "t-id2"), ("id3", "t-id3")])
+
+        plugin.on_after_transform_template("template")
+        self.assertEqual(client.get_cloud_formation_template.call_count, 3)
+        self.assertEqual(plugin._in_progress_templates, [])
+
+    @patch("samtranslator.plugins.application.serverless_app_plugin.SamTemplate")
+    def test_must_keep_the_order_of_the_applications_waited_for(self, SamTemplateMock):
+        app_ids = ["id1", "id2", "id3"]
+        sam_template = Mock()
+        SamTemplateMock.return_value = sam_template
+        sam_template.iterate.return_value = [
+            (app_id, ApplicationResource(app_id=app_id, semver="1.0.0", location=True)) for app_id in app_ids
+        ]
+        # The requests return in the reverse order of the applications
+        returned = {app_id: threading.Event() for app_id in app_ids}
+
+        def create_cloud_formation_template(ApplicationId=None, SemanticVersion=None):
+            index = app_ids.index(ApplicationId)
+            if index + 1 < len(app_ids):
+                self.assertTrue(returned[app_ids[index + 1]].wait(5))
+            returned[ApplicationId].set()
+            return {
+                "ApplicationId": ApplicationId,
+                "TemplateId": "t",
+                "TemplateUrl": "/URL",
+                "Status": STATUS_PREPARING,
+            }
+
+        client = Mock()
+        client.create_cloud_formation_template.side_effect = create_cloud_formation_template
+        client.get_cloud_formation_template.return_value = {"Status": STATUS_PREPARING}
+        plugin = ServerlessAppPlugin(sar_client=client, wait_for_template_active_status=True, validate_only=False)
+        plugin.on_before_transform_template({})
+        plugin._total_wait_time = plugin.TEMPLATE_WAIT_TIMEOUT_SECONDS
+
+        with self.assertRaises(InvalidResourceException) as error:
+            plugin.on_after_transform_template("template")
+
+        self.assertIn("[{}]".format(app_ids), error.exception.message)
+
+    @patch("samtranslator.plugins.application.serverless_app_plugin.random.uniform", Mock(return_value=1))
+    def test_back_off_is_exponential_and_bounded(self):
+        plugin = ServerlessAppPlugin(sar_client=Mock())
+        plugin._stop_waiting = Mock()
+
+        for attempt in range(5):
+            self.assertTrue(plugin._back_off(attempt))
+
+        sleep_times = [call_args[0][0] for call_args in plugin._stop_waiting.wait.call_args_list]
+        self.assertEqual(sleep_times, [2, 4, 8, 10, 10])
+
+    def test_back_off_does_not_wait_past_the_deadline(self):
+        plugin = ServerlessAppPlugin(sar_client=Mock())
+        plugin._stop_waiting = Mock()
+        plugin._total_wait_time = plugin.TEMPLATE_WAIT_TIMEOUT_SECONDS - 1
+
+        self.assertFalse(plugin._back_off(3))
+        self.assertLessEqual(plugin._stop_waiting.wait.call_args[0][0], 1)
+
+
+class TestServerlessAppPlugin_cache(TestCase):
+    PARAMETERS = {"AWS::Region": "us-east-1", "AWS::AccountId": "123456789012"}
+
+    def setUp(self):
+        self.cache = InMemorySarApplicationCache()
+        self.client = Mock()
+        self.client.create_cloud_formation_template = Mock(side_effect=mock_create_cloud_formation_template)
+        self.client.get_application = Mock(side_effect=mock_get_application)
+        self.client.get_cloud_formation_template = Mock(side_effect=mock_get_cloud_formation_template)
+
+    def _transform(self, parameters=PARAMETERS, app_id="id1", **kwargs):
+        plugin = ServerlessAppPlugin(sar_client=self.client, parameters=dict(parameters), cache=self.cache, **kwargs)
+        with patch("samtranslator.plugins.application.serverless_app_plugin.SamTemplate") as SamTemplateMock:
+            SamTemplateMock.return_value.iterate.return_value = [
+                ("Application", ApplicationResource(app_id=app_id, semver="1.0.0", location=True))
+            ]
+            plugin.on_before_transform_template({})
+        properties = {"Location": {"ApplicationId": app_id, "SemanticVersion": "1.0.0"}}
+        try:
+            plugin.on_before_transform_resource("Application", "AWS::Serverless::Application", properties)
+        finally:
+            plugin.on_after_transform_template({})
+        return properties
+
+    def test_template_is_requested_once(self):
+        first = self._transform()
+        second = self._transform()
+
+        self.assertEqual(first, second)
+        self.assertEqual(second["TemplateUrl"], MOCK_TEMPLATE_URL)
+        self.assertEqual(self.client.create_cloud_formation_template.call_count, 1)
+
+    def test_template_is_requested_again_for_other_account_or_region(self):
+        self._transform()
+        self._transform(parameters=dict(self.PARAMETERS, **{"AWS::AccountId": "210987654321"}))
+        self._transform(parameters=dict(self.PARAMETERS, **{"AWS::Region": "us-west-2"}))
+
+        self.assertEqual(self.client.create_cloud_formation_template.call_count, 3)
+
+    def test_nothing_is_cached_without_account(self):
+        self._transform(parameters={"AWS::Region": "us-east-1"})
+        self._transform(parameters={"AWS::Region": "us-east-1"})
+
+        self.assertEqual(self.client.create_cloud_formation_template.call_count, 2)
+
+    def test_template_that_became_active_is_not_waited_for_again(self):
+        self.client.create_cloud_formation_template.side_effect = lambda **kwargs: dict(
+            mock_create_cloud_formation_template(**kwargs), Status=STATUS_PREPARING
+        )
+
+        self._transform(wait_for_template_active_status=True)
+        self._transform(wait_for_template_active_status=True)
+
+        self.assertEqual(self.client.create_cloud_formation_template.call_count, 1)
+        self.assertEqual(self.client.get_cloud_formation_template.call_count, 1)
+
+    def test_expired_template_is_not_reused(self):
+        self.client.create_cloud_formation_template.side_effect = lambda **kwargs: dict(
+            mock_create_cloud_formation_template(**kwargs), Status=STATUS_PREPARING
+        )
+        self.client.get_cloud_formation_template.side_effect = lambda **kwargs: dict(
+            mock_get_cloud_formation_template(**kwargs), Status=STATUS_EXPIRED
+        )
+
+        for _ in range(2):
+            with self.assertRaises(InvalidResourceException):
+                self._transform(wait_for_template_active_status=True)
+
+        self.assertEqual(self.client.create_cloud_formation_template.call_count, 2)
+
+    def test_access_denied_is_cached(self):
+        self.client.create_cloud_formation_template.side_effect = ClientError(
+            {"Error": {"Code": "AccessDeniedException", "Message": "Access denied"}}, "CreateCloudFormationTemplate"
+        )
+
+        for _ in range(2):
+            with self.assertRaises(InvalidResourceException) as context:
+                self._transform()
+            self.assertEqual(context.exception.message, "Resource with id [Application] is invalid. Access denied")
+
+        self.assertEqual(self.client.create_cloud_formation_template.call_count, 1)
+
+    def test_validation_uses_cached_template(self):
+        self._transform()
+        self._transform(validate_only=True)
+        self._transform(validate_only=True, app_id="id2")
+        self._transform(validate_only=True, app_id="id2")
+
+        self.assertEqual(self.client.create_cloud_formation_template.call_count, 1)
+        self.assertEqual(self.client.get_application.call_count, 1)
+
+    def test_template_is_requested_when_only_access_was_validated(self):
+        self._transform(validate_only=True)
+        properties = self._transform()
+
+        self.assertEqual(properties["TemplateUrl"], MOCK_TEMPLATE_URL)
+        self.assertEqual(self.client.create_cloud_formation_template.call_count, 1)
@@ -189,6 +189,55 @@ class TestGlobalPropertiesMerge(TestCase):
         self.assertEqual(actual, configuration["expected_output"])
 
 
+class TestGlobalPropertiesMergePlan(TestCase):
+    def setUp(self):
+        self.global_value = {
+            "Runtime": "python3.9",
+            "Layers": ["layer1"],
+            "Environment": {"Variables": {"A": "a", "B": {"Ref": "B"}}},
+            "CodeUri": {"Fn::Sub": "s3://${Bucket}/key"},
+            "Tags": {"tag": "value"},
+        }
+
+    @parameterized.expand(
+        [
+            ({},),
+            ({"Runtime": "nodejs16.x", "Layers": ["layer2"], "Other": 1},),
+            ({"Environment": {"Variables": {"B": "b", "C": "c"}}},),
+            ({"Environment": {"Ref": "Environment"}, "Layers": {"Fn::If": ["c", ["l"], ["m"]]}},),
+            ({"CodeUri": {"Bucket": "bucket", "Key": "key"}, "Tags": ["not", "a", "dict"]},),
+            (["not", "a", "dict"],),
+        ]
+    )
+    def test_merge_must_match_the_recursive_merge(self, local_value):
+        global_properties = GlobalProperties(self.global_value)
+
+        expected = global_properties._do_merge(self.global_value, local_value)
+        actual = global_properties.merge(local_value)
+
+        self.assertEqual(expected, actual)
+        if isinstance(expected, dict):
+            self.assertEqual(list(expected), list(actual))
+
+    def test_merge_must_compile_the_plan_once(self):
+        global_properties = GlobalProperties(self.global_value)
+
+        with patch.object(global_properties, "_compile_merge_plan", wraps=global_properties._compile_merge_plan) as m:
+            global_properties.merge({"Runtime": "nodejs16.x"})
+            global_properties.merge({"Layers": ["layer2"]})
+
+        # Called once for the properties, and recursively for their values
+        self.assertEqual(1, len([c for c in m.call_args_list if c.args[0] is self.global_value]))
+
+    def test_merge_must_not_modify_the_global_value(self):
+        global_properties = GlobalProperties(self.global_value)
+
+        global_properties.merge({"Layers": ["layer2"], "Environment": {"Variables": {"C": "c"}}})
+
+        self.assertEqual(["layer1"], self.global_value["Layers"])
+        self.assertEqual({"A": "a", "B": {"Ref": "B"}}, self.global_value["Environment"]["Variables"])
+
+
 class TestGlobalsPropertiesEdgeCases(TestCase):
     @patch.object(GlobalProperties, "_token_of")
     def test_merge_with_objects_of_unsupported_token_type(self, token_of_mock):
@@ -243,3 +243,24 @@ class TestPolicyTemplateProcessor(TestCase):
         result = PolicyTemplatesProcessor.get_default_policy_templates_json()
         self.assertEqual(result, expected)
         _read_file_mock.assert_called_once_with(PolicyTemplatesProcessor.DEFAULT_POLICY_TEMPLATES_FILE)
+
+    @patch.object(PolicyTemplatesProcessor, "_is_valid_templates_dict")
+    def test_init_must_skip_validation_when_asked(self, is_valid_templates_dict_mock):
+        PolicyTemplatesProcessor({"Templates": {}}, validate=False)
+
+        is_valid_templates_dict_mock.assert_not_called()
+
+    def test_default_policy_templates_must_match_the_schema(self):
+        # The default processor doesn't validate the default policy templates at runtime
+        policy_templates = PolicyTemplatesProcessor.get_default_policy_templates_json()
+
+        self.assertTrue(PolicyTemplatesProcessor._is_valid_templates_dict(policy_templates))
+
+    @patch.object(PolicyTemplatesProcessor, "_default_processor", None)
+    @patch.object(PolicyTemplatesProcessor, "_is_valid_templates_dict")
+    def test_get_default_must_load_default_policy_templates_once(self, is_valid_templates_dict_mock):
+        processor = PolicyTemplatesProcessor.get_default()
+
+        self.assertIs(processor, PolicyTemplatesProcessor.get_default())
+        self.assertTrue(processor.has("DynamoDBCrudPolicy"))
+        is_valid_templates_dict_mock.assert_not_called()
@@ -1,5 +1,5 @@
 from unittest import TestCase
-from unittest.mock import Mock, patch, ANY
+from unittest.mock import patch
 
 from samtranslator.policy_template_processor.template import Template
 from samtranslator.policy_template_processor.exceptions import InvalidParameterValues, InsufficientParameterValues
@@ -113,43 +113,82 @@ class TestTemplateObject(TestCase):
         parameter_values = [1, 2, 3]
         self.assertFalse(Template._is_valid_parameter_values(parameter_values))
 
-    @patch("samtranslator.policy_template_processor.template.IntrinsicsResolver")
-    def test_to_statement_must_work_with_valid_inputs(self, intrinsics_resolver_mock):
+    def test_to_statement_must_work_with_valid_inputs(self):
         parameter_values = {"param1": "b"}
         template_parameters = {"param1": {"Description": "something"}}
-        template_definition = {"Statement": {"key": "value"}}
-        expected = "some result"
-
-        resolver_instance_mock = Mock()
-        intrinsics_resolver_mock.return_value = resolver_instance_mock
-        resolver_instance_mock.resolve_parameter_refs.return_value = expected
+        template_definition = {"Statement": {"key": "value", "Resource": {"Ref": "param1"}}}
 
         template = Template("name", template_parameters, template_definition)
         result = template.to_statement(parameter_values)
 
-        self.assertEqual(expected, result)
-        intrinsics_resolver_mock.assert_called_once_with({"___SAM_POLICY_PARAMETER_param1": "b"}, {"Ref": ANY})
-        resolver_instance_mock.resolve_parameter_refs.assert_called_once_with({"Statement": {"key": "value"}})
+        self.assertEqual({"Statement": {"key": "value", "Resource": "b"}}, result)
+        # The definition is not modified
+        self.assertEqual({"Statement": {"key": "value", "Resource": {"Ref": "param1"}}}, template.definition)
 
-    @patch("samtranslator.policy_template_processor.template.IntrinsicsResolver")
-    def test_to_statement_must_exclude_extra_parameter_values(self, intrinsics_resolver_mock):
+    def test_to_statement_must_exclude_extra_parameter_values(self):
         parameter_values = {"param1": "b", "key1": "value1", "key2": "value2"}
         template_parameters = {"param1": {"Description": "something"}}
-        template_definition = {"Statement": {"key": "value"}}
+        template_definition = {"Statement": {"Ref": "param1"}, "Other": {"Ref": "key1"}}
+
+        template = Template("name", template_parameters, template_definition)
+        result = template.to_statement(parameter_values)
+
+        # Only the parameters declared in the template are substituted, other references are disambiguated
+        self.assertEqual({"Statement": "b", "Other": {"Ref": "___SAM_POLICY_PARAMETER_key1"}}, result)
 
-        resolver_instance_mock = Mock()
-        intrinsics_resolver_mock.return_value = resolver_instance_mock
-        resolver_instance_mock.resolve_parameter_refs.return_value = "some result"
+    def test_to_statement_must_not_resolve_references_in_parameter_values(self):
+        parameter_values = {"TableName": {"Fn::Join": ["-", [{"Ref": "TableName"}, "hello"]]}}
+        template_parameters = {"TableName": {"Description": "something"}}
+        template_definition = {"Resource": {"Fn::Sub": ["table/${T}", {"T": {"Ref": "TableName"}}]}}
 
         template = Template("name", template_parameters, template_definition)
-        template.to_statement(parameter_values)
+        result = template.to_statement(parameter_values)
+
+        expected = {
+            "Resource": {"Fn::Sub": ["table/${T}", {"T": {"Fn::Join": ["-", [{"Ref": "TableName"}, "hello"]]}}]}
+        }
+        self.assertEqual(expected, result)
+
+    def test_to_statement_must_memoize_statements(self):
+        template = Template("name", {"param1": {"Description": "something"}}, {"Statement": [{"Ref": "param1"}]})
+
+        with patch.object(template, "_compile_substitution_plan", wraps=template._compile_substitution_plan) as m:
+            first = template.to_statement({"param1": "b", "extra": "ignored"})
+            first["Statement"].append("modified")
+            second = template.to_statement({"param1": "b"})
+            compile_calls = m.call_count
+
+            self.assertEqual({"Statement": ["b"]}, second)
+            self.assertEqual(compile_calls, m.call_count)
+            self.assertEqual(1, len(template._statements))
+
+    def test_to_statement_must_not_memoize_parameter_values_of_the_caller(self):
+        template = Template("name", {"param1": {"Description": "something"}}, {"Statement": {"Ref": "param1"}})
+        value = {"Ref": "T"}
+
+        first = template.to_statement({"param1": value})
+        value["Ref"] = "MUTATED"
+        first["Statement"]["Ref"] = "MODIFIED"
+        second = template.to_statement({"param1": {"Ref": "T"}})
+
+        self.assertEqual({"Statement": {"Ref": "T"}}, second)
+
+    def test_to_statement_must_memoize_statements_by_value_types_and_order(self):
+        template = Template("name", {"param1": {"Description": "something"}}, {"Statement": {"Ref": "param1"}})
+
+        self.assertEqual({"Statement": True}, template.to_statement({"param1": True}))
+        self.assertEqual({"Statement": 1}, template.to_statement({"param1": 1}))
+        self.assertEqual(["a", "b"], list(template.to_statement({"param1": {"a": 1, "b": 2}})["Statement"]))
+        self.assertEqual(["b", "a"], list(template.to_statement({"param1": {"b": 2, "a": 1}})["Statement"]))
+        self.assertEqual(4, len(template._statements))
+
+    def test_to_statement_must_work_with_unhashable_parameter_values(self):
+        template = Template("name", {"param1": {"Description": "something"}}, {"Statement": {"Ref": "param1"}})
 
-        # Intrinsics resolver must be called only with the parameters declared in the template
-        expected_parameter_values = {"___SAM_POLICY_PARAMETER_param1": "b"}
-        intrinsics_resolver_mock.assert_called_once_with(expected_parameter_values, ANY)
+        self.assertEqual({"Statement": {1, 2}}, template.to_statement({"param1": {1, 2}}))
+        self.assertEqual(0, len(template._statements))
 
-    @patch("samtranslator.policy_template_processor.template.IntrinsicsResolver")
-    def test_to_statement_must_raise_with_missing_parameters(self, intrinsics_resolver_mock):
+    def test_to_statement_must_raise_with_missing_parameters(self):
         parameter_values = {"key1": "value1", "key2": "value2"}
         template_parameters = {"param1": {"Description": "something"}}
         template_definition = {"Statement": {"key": "value"}}
@@ -158,8 +197,7 @@ class TestTemplateObject(TestCase):
         with self.assertRaises(InsufficientParameterValues):
             template.to_statement(parameter_values)
 
-    @patch("samtranslator.policy_template_processor.template.IntrinsicsResolver")
-    def test_to_statement_must_fail_for_invalid_parameter_values(self, intrinsics_resolver_mock):
+    def test_to_statement_must_fail_for_invalid_parameter_values(self):
         parameter_values = None
 
         template = Template("name", {}, {})
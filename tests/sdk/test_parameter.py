@@ -1,3 +1,4 @@
+import os
 from parameterized import parameterized, param
 
 from unittest import TestCase
@@ -63,7 +64,7 @@ class TestSAMParameterValues(TestCase):
         sam_parameter_values.add_default_parameter_values(sam_template)
         self.assertEqual(expected, sam_parameter_values.parameter_values)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_add_pseudo_parameter_values_aws_region(self):
         parameter_values = {"Param1": "value1"}
 
@@ -73,7 +74,7 @@ class TestSAMParameterValues(TestCase):
         sam_parameter_values.add_pseudo_parameter_values()
         self.assertEqual(expected, sam_parameter_values.parameter_values)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_add_pseudo_parameter_values_aws_region_not_override(self):
         parameter_values = {"AWS::Region": "value1"}
 
@@ -83,7 +84,7 @@ class TestSAMParameterValues(TestCase):
         sam_parameter_values.add_pseudo_parameter_values()
         self.assertEqual(expected, sam_parameter_values.parameter_values)
 
-    @patch("boto3.session.Session.region_name", "us-gov-west-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "us-gov-west-1"})
     def test_add_pseudo_parameter_values_aws_partition(self):
         parameter_values = {"Param1": "value1"}
 
@@ -93,7 +94,7 @@ class TestSAMParameterValues(TestCase):
         sam_parameter_values.add_pseudo_parameter_values()
         self.assertEqual(expected, sam_parameter_values.parameter_values)
 
-    @patch("boto3.session.Session.region_name", "us-gov-west-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "us-gov-west-1"})
     def test_add_pseudo_parameter_values_aws_partition_not_override(self):
         parameter_values = {"AWS::Partition": "aws"}
 
@@ -109,3 +110,14 @@ class TestSAMParameterValues(TestCase):
         sam_parameter_values = SamParameterValues({})
         with self.assertRaises(NoRegionFound):
             sam_parameter_values.add_pseudo_parameter_values(session=boto_session_mock)
+
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "us-east-1"})
+    def test_add_pseudo_parameter_values_with_region_name(self):
+        boto_session_mock = Mock()
+        boto_session_mock.region_name = "us-east-1"
+
+        expected = {"AWS::Region": "cn-north-1", "AWS::Partition": "aws-cn"}
+
+        sam_parameter_values = SamParameterValues({})
+        sam_parameter_values.add_pseudo_parameter_values(session=boto_session_mock, region_name="cn-north-1")
+        self.assertEqual(expected, sam_parameter_values.parameter_values)
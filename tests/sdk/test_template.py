@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from samtranslator.sdk.template import SamTemplate
+from samtranslator.sdk.template import SamTemplate, SamTemplateIndex, use_template_index
 from samtranslator.sdk.resource import SamResource
 
 
@@ -127,3 +127,65 @@ class TestSamTemplate(TestCase):
         # Verify that actual references match - Input should be untouched
         self.assertTrue(template.to_dict()["Properties"] is self.template_dict["Properties"])
         self.assertTrue(template.to_dict()["Metadata"] is self.template_dict["Metadata"])
+
+    def test_iterate_must_keep_template_order_for_several_types(self):
+        template = SamTemplate(self.template_dict)
+
+        actual = [id for id, _ in template.iterate({"AWS::Serverless::LayerVersion", "AWS::Serverless::Function"})]
+        self.assertEqual(["Function1", "Function2", "Layer"], actual)
+
+    def test_iterate_must_see_resources_set_and_deleted(self):
+        template = SamTemplate(self.template_dict)
+        self.assertEqual(["Api"], [id for id, _ in template.iterate({"AWS::Serverless::Api"})])
+
+        template.set("NewApi", {"Type": "AWS::Serverless::Api"})
+        template.delete("Api")
+        template.set("Function1", {"Type": "AWS::Serverless::Api"})
+
+        actual = [id for id, _ in template.iterate({"AWS::Serverless::Api"})]
+        self.assertEqual(["Function1", "NewApi"], actual)
+
+    def test_iterate_must_see_resources_added_directly(self):
+        template = SamTemplate(self.template_dict)
+        self.assertEqual([], [id for id, _ in template.iterate({"AWS::Serverless::SimpleTable"})])
+
+        self.template_dict["Resources"]["Table"] = {"Type": "AWS::Serverless::SimpleTable"}
+
+        self.assertEqual(["Table"], [id for id, _ in template.iterate({"AWS::Serverless::SimpleTable"})])
+
+
+class TestSamTemplateIndex(TestCase):
+    def setUp(self):
+        self.template_dict = {
+            "Resources": {
+                "Function": {"Type": "AWS::Serverless::Function"},
+                "Bucket": {"Type": "AWS::S3::Bucket"},
+                "Invalid": {"Type": {"Ref": "Type"}},
+            }
+        }
+
+    def test_must_index_resources_by_type(self):
+        index = SamTemplateIndex(self.template_dict)
+
+        self.assertEqual(["Function", "Bucket", "Invalid"], index.get_logical_ids())
+        self.assertEqual(["Bucket"], index.get_logical_ids({"AWS::S3::Bucket"}))
+        self.assertEqual("AWS::Serverless::Function", index.get_type("Function"))
+        self.assertIsNone(index.get_type("Invalid"))
+        self.assertIsNone(index.get_type("Unknown"))
+
+    def test_must_rebuild_when_resources_are_replaced(self):
+        index = SamTemplateIndex(self.template_dict)
+        self.assertEqual(["Function"], index.get_logical_ids({"AWS::Serverless::Function"}))
+
+        self.template_dict["Resources"] = {"Other": {"Type": "AWS::Serverless::Function"}}
+
+        self.assertEqual(["Other"], index.get_logical_ids({"AWS::Serverless::Function"}))
+
+    def test_must_share_index_with_templates_of_the_same_dict(self):
+        index = SamTemplateIndex(self.template_dict)
+
+        with use_template_index(index):
+            self.assertIs(index, SamTemplate(self.template_dict).index)
+            self.assertIsNot(index, SamTemplate({"Resources": {}}).index)
+
+        self.assertIsNot(index, SamTemplate(self.template_dict).index)
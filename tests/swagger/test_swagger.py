@@ -58,6 +58,98 @@ class TestSwaggerEditor_init(TestCase):
             SwaggerEditor(invalid_swagger)
 
 
+class TestSwaggerEditor_copy_on_access(TestCase):
+    def setUp(self):
+        doc = Py27Dict()
+        doc["swagger"] = "2.0"
+        doc["paths"] = Py27Dict()
+        for path in ["/foo", "/bar"]:
+            doc["paths"][path] = Py27Dict()
+            doc["paths"][path]["get"] = Py27Dict()
+        self.doc = SwaggerEditor(doc).swagger
+
+    def test_must_share_path_items_until_accessed(self):
+        editor = SwaggerEditor(self.doc, owns_doc=True)
+
+        self.assertIs(dict.get(editor.paths, "/foo"), self.doc["paths"]["/foo"])
+        self.assertIsNot(editor.paths["/foo"], self.doc["paths"]["/foo"])
+        self.assertIs(dict.get(editor.paths, "/bar"), self.doc["paths"]["/bar"])
+
+    def test_must_not_modify_input_document(self):
+        expected = copy.deepcopy(self.doc)
+        editor = SwaggerEditor(self.doc, owns_doc=True)
+
+        editor.add_path("/foo", "post")
+        editor.add_path("/baz", "post")
+        editor.make_path_conditional("/bar", "Condition")
+
+        self.assertEqual(expected, self.doc)
+        self.assertEqual(["/bar", "/baz", "/foo"], sorted(editor.swagger["paths"]))
+
+    @parameterized.expand(
+        [
+            param("copy", copy.copy),
+            param("dict", dict),
+            param("copy_method", lambda paths: paths.copy()),
+            param("items", lambda paths: dict(paths.items())),
+            param("values", lambda paths: dict(zip(paths.keys(), paths.values()))),
+        ]
+    )
+    def test_must_not_share_path_items_through_copies(self, _, copy_paths):
+        editor = SwaggerEditor(self.doc, owns_doc=True)
+
+        paths = copy_paths(editor.paths)
+
+        self.assertIsNot(dict.get(paths, "/foo"), self.doc["paths"]["/foo"])
+        self.assertIsNot(dict.get(paths, "/bar"), self.doc["paths"]["/bar"])
+
+    @parameterized.expand(
+        [
+            param("items", lambda paths: [value for _, value in paths.items()]),
+            param("values", lambda paths: paths.values()),
+            param("unpack", lambda paths: list({**paths}.values())),
+        ]
+    )
+    def test_must_not_modify_input_document_through_path_items_read_in_bulk(self, _, read_path_items):
+        expected = copy.deepcopy(self.doc)
+        editor = SwaggerEditor(self.doc, owns_doc=True)
+
+        for path_item in read_path_items(editor.paths):
+            path_item["post"] = Py27Dict()
+
+        self.assertEqual(expected, self.doc)
+        self.assertEqual(set(), editor.paths._shared_keys)
+
+    def test_must_return_copies_of_accessed_path_items(self):
+        editor = SwaggerEditor(self.doc, owns_doc=True)
+        editor.add_path("/foo", "post")
+
+        result = editor.swagger
+
+        self.assertIs(result["paths"]["/bar"], self.doc["paths"]["/bar"])
+        self.assertIsNot(result["paths"]["/foo"], dict.get(editor.paths, "/foo"))
+        self.assertEqual(editor.paths["/foo"], result["paths"]["/foo"])
+
+    def test_must_copy_path_items_when_copies_change_key_order(self):
+        # Colliding keys, whose order changes on each copy
+        for method in ["post", "delete", "patch"]:
+            self.doc["paths"]["/bar"][method] = Py27Dict()
+        self.doc["paths"]["/bar"] = copy.deepcopy(self.doc["paths"]["/bar"])
+        path_item = self.doc["paths"]["/bar"]
+
+        result = SwaggerEditor(self.doc, owns_doc=True).swagger
+
+        self.assertIs(result["paths"]["/foo"], self.doc["paths"]["/foo"])
+        self.assertIsNot(result["paths"]["/bar"], path_item)
+        self.assertEqual(copy.deepcopy(copy.deepcopy(path_item)).keys(), result["paths"]["/bar"].keys())
+
+    def test_must_copy_whole_document_not_handed_over(self):
+        editor = SwaggerEditor(self.doc)
+
+        self.assertIsNot(dict.get(editor.paths, "/foo"), self.doc["paths"]["/foo"])
+        self.assertIsNot(editor.swagger["paths"]["/bar"], self.doc["paths"]["/bar"])
+
+
 class TestSwaggerEditor_has_path(TestCase):
     def setUp(self):
         self.swagger = {
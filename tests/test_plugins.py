@@ -1,6 +1,7 @@
 from enum import Enum
 from samtranslator.plugins import BasePlugin, LifeCycleEvents
 from samtranslator.plugins.sam_plugins import SamPlugins
+from samtranslator.sdk.template import SamTemplate, SamTemplateIndex, use_template_index
 
 from unittest import TestCase
 from unittest.mock import Mock, patch, call
@@ -286,6 +287,81 @@ class TestSamPluginsAct(TestCase):
         parent_mock.assert_has_calls([call.plugin1_hook(), call.plugin2_hook()])
 
 
+class TestSamPluginsDispatch(TestCase):
+    def test_act_must_skip_plugins_without_overridden_hooks(self):
+        class TemplatePlugin(BasePlugin):
+            def on_before_transform_template(self, template_dict):
+                pass
+
+        sam_plugins = SamPlugins([BasePlugin("noop"), TemplatePlugin("template")])
+
+        self.assertEqual([], sam_plugins._dispatch_tables[LifeCycleEvents.before_transform_resource])
+        self.assertEqual([], sam_plugins._dispatch_tables[LifeCycleEvents.after_transform_template])
+        self.assertEqual(
+            ["template"],
+            [hook.plugin.name for hook in sam_plugins._dispatch_tables[LifeCycleEvents.before_transform_template]],
+        )
+
+    def test_act_must_only_dispatch_resources_of_the_declared_types(self):
+        hook_method = Mock()
+
+        class FunctionPlugin(BasePlugin):
+            def get_resource_types(self, event):
+                return {"AWS::Serverless::Function"}
+
+            def on_before_transform_resource(self, logical_id, resource_type, resource_properties):
+                hook_method(logical_id, resource_type, resource_properties)
+
+        sam_plugins = SamPlugins(FunctionPlugin("function"))
+        sam_plugins.act(LifeCycleEvents.before_transform_resource, "Api", "AWS::Serverless::Api", {})
+        sam_plugins.act(LifeCycleEvents.before_transform_resource, "Function", "AWS::Serverless::Function", {})
+        sam_plugins.act(
+            LifeCycleEvents.before_transform_resource,
+            logical_id="Table",
+            resource_type="AWS::Serverless::SimpleTable",
+            resource_properties={},
+        )
+
+        hook_method.assert_called_once_with("Function", "AWS::Serverless::Function", {})
+
+    def test_act_must_dispatch_all_resources_without_declared_types(self):
+        plugin = _make_mock_plugin("plugin")
+        plugin.get_resource_types.return_value = None
+        sam_plugins = SamPlugins(plugin)
+
+        sam_plugins.act(LifeCycleEvents.before_transform_resource, "Api", "AWS::Serverless::Api", {})
+        sam_plugins.act(LifeCycleEvents.before_transform_resource, "Function", "AWS::Serverless::Function", {})
+
+        self.assertEqual(2, plugin.on_before_transform_resource.call_count)
+
+    def test_act_must_refresh_the_template_index_after_hooks(self):
+        template_dict = {"Resources": {"A": {"Type": "AWS::SNS::Topic"}}}
+
+        class RetypePlugin(BasePlugin):
+            def on_before_transform_template(self, template_dict):
+                list(SamTemplate(template_dict).iterate({"AWS::Serverless::Function"}))
+                # Replaces the resource in place, so the number of resources doesn't change
+                template_dict["Resources"]["A"] = {"Type": "AWS::Serverless::Function", "Properties": {}}
+
+        sam_plugins = SamPlugins(RetypePlugin("retype"))
+        with use_template_index(SamTemplateIndex(template_dict)):
+            sam_plugins.act(LifeCycleEvents.before_transform_template, template_dict)
+
+            logical_ids = [
+                logical_id for logical_id, _ in SamTemplate(template_dict).iterate({"AWS::Serverless::Function"})
+            ]
+        self.assertEqual(["A"], logical_ids)
+
+    def test_register_must_update_dispatch_tables(self):
+        sam_plugins = SamPlugins(_make_mock_plugin("plugin1"))
+        plugin2 = _make_mock_plugin("plugin2")
+        sam_plugins.register(plugin2)
+
+        sam_plugins.act(LifeCycleEvents.after_transform_template, {})
+
+        plugin2.on_after_transform_template.assert_called_once_with({})
+
+
 class TestBasePlugin(TestCase):
     def test_initialization_should_set_name(self):
 
@@ -0,0 +1,85 @@
+import io
+import mmap
+import os
+import tempfile
+from unittest import TestCase
+
+import yaml
+from parameterized import parameterized
+
+from samtranslator.yaml_helper import IntrinsicsSafeLoader, yaml_parse
+
+TEMPLATE = """
+Resources:
+  Function:
+    Type: AWS::Serverless::Function
+    Properties:
+      Role: !GetAtt Role.Arn
+      Policies: !Ref PolicyArn
+      Environment:
+        Variables:
+          Url: !Sub "https://${Api}.execute-api.${AWS::Region}.amazonaws.com"
+          Zones: !Join [",", !GetAZs ""]
+      Condition: !Condition IsProd
+"""
+
+EXPECTED = {
+    "Resources": {
+        "Function": {
+            "Type": "AWS::Serverless::Function",
+            "Properties": {
+                "Role": {"Fn::GetAtt": ["Role", "Arn"]},
+                "Policies": {"Ref": "PolicyArn"},
+                "Environment": {
+                    "Variables": {
+                        "Url": {"Fn::Sub": "https://${Api}.execute-api.${AWS::Region}.amazonaws.com"},
+                        "Zones": {"Fn::Join": [",", {"Fn::GetAZs": ""}]},
+                    }
+                },
+                "Condition": {"Condition": "IsProd"},
+            },
+        }
+    }
+}
+
+
+class TestYamlParse(TestCase):
+    @parameterized.expand(
+        [
+            ("str", lambda: TEMPLATE),
+            ("bytes", lambda: TEMPLATE.encode("utf-8")),
+            ("bytearray", lambda: bytearray(TEMPLATE.encode("utf-8"))),
+            ("memoryview", lambda: memoryview(TEMPLATE.encode("utf-8"))),
+            ("text_file", lambda: io.StringIO(TEMPLATE)),
+            ("binary_file", lambda: io.BytesIO(TEMPLATE.encode("utf-8"))),
+        ]
+    )
+    def test_must_parse_intrinsics(self, _, make_input):
+        self.assertEqual(yaml_parse(make_input()), EXPECTED)
+
+    def test_must_parse_memory_mapped_file(self):
+        with tempfile.NamedTemporaryFile(suffix=".yaml", delete=False) as f:
+            f.write(TEMPLATE.encode("utf-8"))
+        try:
+            with open(f.name, "rb") as template_file, mmap.mmap(
+                template_file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mapped:
+                self.assertEqual(yaml_parse(mapped), EXPECTED)
+        finally:
+            os.remove(f.name)
+
+    def test_must_use_libyaml_when_available(self):
+        if yaml.__with_libyaml__:
+            self.assertTrue(issubclass(IntrinsicsSafeLoader, yaml.CSafeLoader))
+        else:
+            self.assertTrue(issubclass(IntrinsicsSafeLoader, yaml.SafeLoader))
+
+    def test_must_not_register_intrinsics_on_global_loader(self):
+        yaml_parse(TEMPLATE)
+
+        with self.assertRaises(yaml.constructor.ConstructorError):
+            yaml.safe_load("Value: !Ref Parameter")
+
+    def test_must_raise_yaml_errors(self):
+        with self.assertRaises(yaml.YAMLError):
+            yaml_parse("Resources: [")
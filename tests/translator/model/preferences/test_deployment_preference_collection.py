@@ -1,3 +1,4 @@
+import os
 from unittest.mock import patch
 from unittest import TestCase
 
@@ -20,19 +21,19 @@ class TestDeploymentPreferenceCollection(TestCase):
         self.function_logical_id = "FunctionLogicalId"
         self.condition = "CodeDeployCondition"
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_when_no_global_dict_each_local_deployment_preference_requires_parameters(self):
         with self.assertRaises(InvalidResourceException):
             DeploymentPreferenceCollection().add("", dict())
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_add_when_logical_id_previously_added_raises_value_error(self):
         with self.assertRaises(ValueError):
             deployment_preference_collection = DeploymentPreferenceCollection()
             deployment_preference_collection.add("1", {"Type": "Canary"})
             deployment_preference_collection.add("1", {"Type": "Linear"})
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_codedeploy_application(self):
         expected_codedeploy_application_resource = CodeDeployApplication(CODEDEPLOY_APPLICATION_LOGICAL_ID)
         expected_codedeploy_application_resource.ComputePlatform = "Lambda"
@@ -42,7 +43,7 @@ class TestDeploymentPreferenceCollection(TestCase):
             expected_codedeploy_application_resource.to_dict(),
         )
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_codedeploy_iam_role(self):
         expected_codedeploy_iam_role = IAMRole("CodeDeployServiceRole")
         expected_codedeploy_iam_role.AssumeRolePolicyDocument = {
@@ -63,7 +64,7 @@ class TestDeploymentPreferenceCollection(TestCase):
             DeploymentPreferenceCollection().get_codedeploy_iam_role().to_dict(), expected_codedeploy_iam_role.to_dict()
         )
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_deployment_group_with_minimal_parameters(self):
         expected_deployment_group = CodeDeployDeploymentGroup(self.function_logical_id + "DeploymentGroup")
         expected_deployment_group.ApplicationName = {"Ref": CODEDEPLOY_APPLICATION_LOGICAL_ID}
@@ -86,7 +87,7 @@ class TestDeploymentPreferenceCollection(TestCase):
 
         self.assertEqual(deployment_group.to_dict(), expected_deployment_group.to_dict())
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_deployment_preference_with_codedeploy_custom_configuration(self):
         deployment_type = "TestDeploymentConfiguration"
         deployment_preference_collection = DeploymentPreferenceCollection()
@@ -95,7 +96,7 @@ class TestDeploymentPreferenceCollection(TestCase):
 
         self.assertEqual(deployment_type, deployment_group.DeploymentConfigName)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_deployment_preference_with_codedeploy_predifined_configuration(self):
         deployment_type = "Canary10Percent5Minutes"
         expected_deployment_config_name = {
@@ -108,7 +109,7 @@ class TestDeploymentPreferenceCollection(TestCase):
         print(deployment_group.DeploymentConfigName)
         self.assertEqual(expected_deployment_config_name, deployment_group.DeploymentConfigName)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_deployment_preference_with_conditional_custom_configuration(self):
         deployment_type = {
             "Fn::If": [
@@ -137,7 +138,7 @@ class TestDeploymentPreferenceCollection(TestCase):
         print(deployment_group.DeploymentConfigName)
         self.assertEqual(expected_deployment_config_name, deployment_group.DeploymentConfigName)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_deployment_group_with_all_parameters(self):
         expected_deployment_group = CodeDeployDeploymentGroup(self.function_logical_id + "DeploymentGroup")
         expected_deployment_group.AlarmConfiguration = {
@@ -164,7 +165,7 @@ class TestDeploymentPreferenceCollection(TestCase):
 
         self.assertEqual(deployment_group.to_dict(), expected_deployment_group.to_dict())
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_deployment_preference_with_alarms(self):
         deployment_preference = {
             "Type": "TestDeploymentConfiguration",
@@ -180,7 +181,7 @@ class TestDeploymentPreferenceCollection(TestCase):
 
         self.assertEqual(expected_alarm_configuration, deployment_group.AlarmConfiguration)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_deployment_preference_with_alarms_intrinsic_if(self):
         deployment_preference = {
             "Type": "TestDeploymentConfiguration",
@@ -199,7 +200,7 @@ class TestDeploymentPreferenceCollection(TestCase):
 
         self.assertEqual(expected_alarm_configuration, deployment_group.AlarmConfiguration)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_deployment_preference_with_alarms_intrinsic_if_empty_then(self):
         deployment_preference = {
             "Type": "TestDeploymentConfiguration",
@@ -214,7 +215,7 @@ class TestDeploymentPreferenceCollection(TestCase):
 
         self.assertEqual(expected_alarm_configuration, deployment_group.AlarmConfiguration)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_deployment_preference_with_alarms_intrinsic_if_noref_then(self):
         deployment_preference = {
             "Type": "TestDeploymentConfiguration",
@@ -229,7 +230,7 @@ class TestDeploymentPreferenceCollection(TestCase):
 
         self.assertEqual(expected_alarm_configuration, deployment_group.AlarmConfiguration)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_deployment_preference_with_alarms_intrinsic_if_empty_else(self):
         deployment_preference = {
             "Type": "TestDeploymentConfiguration",
@@ -244,7 +245,7 @@ class TestDeploymentPreferenceCollection(TestCase):
 
         self.assertEqual(expected_alarm_configuration, deployment_group.AlarmConfiguration)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_deployment_preference_with_alarms_intrinsic_if_noref_else(self):
         deployment_preference = {
             "Type": "TestDeploymentConfiguration",
@@ -259,7 +260,7 @@ class TestDeploymentPreferenceCollection(TestCase):
 
         self.assertEqual(expected_alarm_configuration, deployment_group.AlarmConfiguration)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_deployment_preference_with_alarms_ref_novalue(self):
         deployment_preference = {
             "Type": "TestDeploymentConfiguration",
@@ -271,7 +272,7 @@ class TestDeploymentPreferenceCollection(TestCase):
 
         self.assertIsNone(deployment_group.AlarmConfiguration)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_deployment_preference_with_alarms_empty(self):
         deployment_preference = {
             "Type": "TestDeploymentConfiguration",
@@ -283,7 +284,7 @@ class TestDeploymentPreferenceCollection(TestCase):
 
         self.assertIsNone(deployment_group.AlarmConfiguration)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_deployment_preference_with_alarms_not_list(self):
         deployment_preference = {
             "Type": "TestDeploymentConfiguration",
@@ -298,7 +299,7 @@ class TestDeploymentPreferenceCollection(TestCase):
             "Resource with id [{}] is invalid. Alarms must be a list".format(self.function_logical_id),
         )
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_deployment_preference_with_alarms_intrinsic_if_missing_arg(self):
         deployment_preference = {
             "Type": "TestDeploymentConfiguration",
@@ -313,7 +314,7 @@ class TestDeploymentPreferenceCollection(TestCase):
             "Resource with id [{}] is invalid. Fn::If requires 3 arguments".format(self.function_logical_id),
         )
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_deployment_preference_with_alarms_intrinsic_if_not_list(self):
         deployment_preference = {
             "Type": "TestDeploymentConfiguration",
@@ -328,7 +329,7 @@ class TestDeploymentPreferenceCollection(TestCase):
             "Resource with id [{}] is invalid. Fn::If requires 3 arguments".format(self.function_logical_id),
         )
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_update_policy_with_minimal_parameters(self):
         expected_update_policy = {
             "CodeDeployLambdaAliasUpdate": {
@@ -343,7 +344,7 @@ class TestDeploymentPreferenceCollection(TestCase):
 
         self.assertEqual(expected_update_policy, update_policy.to_dict())
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_update_policy_with_all_parameters(self):
         expected_update_polcy = {
             "CodeDeployLambdaAliasUpdate": {
@@ -360,7 +361,7 @@ class TestDeploymentPreferenceCollection(TestCase):
 
         self.assertEqual(expected_update_polcy, update_policy.to_dict())
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_any_enabled_true_if_one_of_three_enabled(self):
         deployment_preference_collection = DeploymentPreferenceCollection()
         deployment_preference_collection.add("1", {"Type": "LINEAR"})
@@ -369,7 +370,7 @@ class TestDeploymentPreferenceCollection(TestCase):
 
         self.assertTrue(deployment_preference_collection.any_enabled())
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_any_enabled_true_if_all_of_three_enabled(self):
         deployment_preference_collection = DeploymentPreferenceCollection()
         deployment_preference_collection.add("1", {"Type": "LINEAR"})
@@ -378,7 +379,7 @@ class TestDeploymentPreferenceCollection(TestCase):
 
         self.assertTrue(deployment_preference_collection.any_enabled())
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_any_enabled_false_if_all_of_three_disabled(self):
         deployment_preference_collection = DeploymentPreferenceCollection()
         deployment_preference_collection.add("1", {"Type": "Linear", "Enabled": False})
@@ -387,7 +388,7 @@ class TestDeploymentPreferenceCollection(TestCase):
 
         self.assertFalse(deployment_preference_collection.any_enabled())
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_enabled_logical_ids_returns_one_if_one_of_three_enabled(self):
         deployment_preference_collection = DeploymentPreferenceCollection()
         enabled_logical_id = "1"
@@ -92,7 +92,7 @@ def test_redeploy_implicit_api():
     assert fourth_updated_deployment_ids != second_updated_deployment_ids
 
 
-@patch("boto3.session.Session.region_name", "ap-southeast-1")
+@patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
 def translate_and_find_deployment_ids(manifest):
     parameter_values = get_template_parameter_values()
     output_fragment = transform(manifest, parameter_values, mock_policy_loader)
@@ -1,7 +1,11 @@
+import os
+import sys
+import threading
 from unittest import TestCase
 from parameterized import parameterized
 from unittest.mock import patch
 
+from samtranslator.region_configuration import PartitionTable
 from samtranslator.translator.arn_generator import ArnGenerator, NoRegionFound
 
 
@@ -17,6 +21,7 @@ class TestArnGenerator(TestCase):
 
         self.assertEqual(actual, expected)
 
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": ""})
     @patch("boto3.session.Session.region_name", None)
     def test_get_partition_name_raise_NoRegionFound(self):
         with self.assertRaises(NoRegionFound):
@@ -30,3 +35,93 @@ class TestArnGenerator(TestCase):
         self.assertEqual(actual, "aws")
 
         ArnGenerator.BOTO_SESSION_REGION_NAME = None
+
+    def test_use_region_name(self):
+        with ArnGenerator.use_region_name("cn-north-1"):
+            self.assertEqual(ArnGenerator.get_region_name(), "cn-north-1")
+            self.assertEqual(ArnGenerator.get_partition_name(), "aws-cn")
+
+        self.assertIsNone(ArnGenerator.BOTO_SESSION_REGION_NAME)
+
+    def test_use_region_name_restores_region_on_error(self):
+        with ArnGenerator.use_region_name("us-east-1"):
+            with self.assertRaises(ValueError):
+                with ArnGenerator.use_region_name("us-gov-west-1"):
+                    raise ValueError()
+
+            self.assertEqual(ArnGenerator.get_region_name(), "us-east-1")
+
+    def test_use_region_name_only_in_current_thread(self):
+        regions = {}
+        started = threading.Barrier(2)
+
+        def get_region_name(region):
+            with ArnGenerator.use_region_name(region):
+                # Both threads use their region at the same time
+                started.wait()
+                regions[region] = ArnGenerator.get_region_name()
+                started.wait()
+
+        threads = [threading.Thread(target=get_region_name, args=(region,)) for region in ["us-east-1", "cn-north-1"]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(regions, {"us-east-1": "us-east-1", "cn-north-1": "cn-north-1"})
+        self.assertIsNone(ArnGenerator.BOTO_SESSION_REGION_NAME)
+
+    def test_use_partition_table(self):
+        partition_table = PartitionTable(
+            {"partitions": [{"partition": "aws-eusc", "regions": {"eusc-de-east-1": {}}, "services": {}}]}
+        )
+
+        with ArnGenerator.use_partition_table(partition_table):
+            self.assertIs(ArnGenerator.get_partition_table(), partition_table)
+            self.assertEqual(ArnGenerator.get_partition_name("eusc-de-east-1"), "aws-eusc")
+            # Regions that are not in the table are matched by their prefix
+            self.assertEqual(ArnGenerator.get_partition_name("cn-north-1"), "aws-cn")
+
+        self.assertIsNone(ArnGenerator.get_partition_table())
+        self.assertEqual(ArnGenerator.get_partition_name("eusc-de-east-1"), "aws")
+
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": ""})
+    @patch("boto3.session.Session.region_name", "eu-west-1")
+    def test_get_region_name_from_boto(self):
+        self.assertEqual(ArnGenerator.get_region_name(), "eu-west-1")
+
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "", "AWS_REGION": "ap-south-1"})
+    @patch("boto3.session.Session.region_name", "eu-west-1")
+    def test_get_region_name_ignores_aws_region(self):
+        self.assertEqual(ArnGenerator.get_region_name(), "eu-west-1")
+
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "eu-west-1"})
+    @patch("boto3.session.Session.region_name", "ap-south-1")
+    def test_get_region_name_from_environment_when_boto_is_imported(self):
+        self.assertIn("boto3", sys.modules)
+        self.assertEqual(ArnGenerator.get_region_name(), "eu-west-1")
+
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "eu-west-1"})
+    def test_get_region_name_prefers_region_in_use(self):
+        ArnGenerator.BOTO_SESSION_REGION_NAME = "us-west-2"
+
+        self.assertEqual(ArnGenerator.get_region_name(), "us-west-2")
+        with ArnGenerator.use_region_name("cn-north-1"):
+            self.assertEqual(ArnGenerator.get_region_name(), "cn-north-1")
+
+        ArnGenerator.BOTO_SESSION_REGION_NAME = None
+
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "eu-west-1"})
+    @patch.dict(sys.modules)
+    def test_get_region_name_from_environment_without_importing_boto(self):
+        for name in [name for name in sys.modules if name.split(".")[0] in ("boto3", "botocore")]:
+            del sys.modules[name]
+
+        self.assertEqual(ArnGenerator.get_region_name(), "eu-west-1")
+        self.assertNotIn("boto3", sys.modules)
+
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": ""})
+    @patch("boto3.session.Session.region_name", None)
+    def test_get_region_name_raise_NoRegionFound(self):
+        with self.assertRaises(NoRegionFound):
+            ArnGenerator.get_region_name()
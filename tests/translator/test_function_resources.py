@@ -27,7 +27,7 @@ class TestVersionsAndAliases(TestCase):
         self.lambda_func = self._make_lambda_function(self.sam_func.logical_id)
         self.lambda_version = self._make_lambda_version("VersionLogicalId", self.sam_func)
 
-    @patch("boto3.session.Session.region_name", "us-west-2")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "us-west-2"})
     def test_sam_function_with_code_signer(self):
         code_signing_config_arn = "code_signing_config_arn"
         func = {
@@ -58,7 +58,7 @@ class TestVersionsAndAliases(TestCase):
         expected_code_signing_config_arn = lambda_functions[0]["foo"]["Properties"]["CodeSigningConfigArn"]
         self.assertEqual(expected_code_signing_config_arn, code_signing_config_arn)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     @patch.object(SamFunction, "_get_resolved_alias_name")
     def test_sam_function_with_alias(self, get_resolved_alias_name_mock):
         alias_name = "AliasName"
@@ -111,7 +111,7 @@ class TestVersionsAndAliases(TestCase):
             self.func_dict["Properties"]["AutoPublishAlias"] = ["a", "b"]
             SamFunction.from_dict(logical_id="foo", resource_dict=self.func_dict)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     @patch.object(SamFunction, "_get_resolved_alias_name")
     def test_sam_function_with_deployment_preference(self, get_resolved_alias_name_mock):
         deploy_preference_dict = {"Type": "LINEAR"}
@@ -189,7 +189,7 @@ class TestVersionsAndAliases(TestCase):
         with self.assertRaises(ValueError):
             sam_func.to_cloudformation(**kwargs)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     @patch.object(SamFunction, "_get_resolved_alias_name")
     def test_sam_function_with_disabled_deployment_preference_does_not_add_update_policy(
         self, get_resolved_alias_name_mock
@@ -253,7 +253,7 @@ class TestVersionsAndAliases(TestCase):
             kwargs["deployment_preference_collection"] = self._make_deployment_preference_collection()
             sam_func.to_cloudformation(**kwargs)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_sam_function_without_alias_allows_disabled_deployment_preference(self):
         enabled = False
         deploy_preference_dict = {"Enabled": enabled}
@@ -288,7 +288,7 @@ class TestVersionsAndAliases(TestCase):
         # Function, IAM Role
         self.assertEqual(len(resources), 2)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     @patch.object(SamFunction, "_get_resolved_alias_name")
     def test_sam_function_with_deployment_preference_intrinsic_ref_enabled_boolean_parameter(
         self, get_resolved_alias_name_mock
@@ -332,7 +332,7 @@ class TestVersionsAndAliases(TestCase):
         self.assertTrue("UpdatePolicy" in list(aliases[0].values())[0])
         self.assertEqual(list(aliases[0].values())[0]["UpdatePolicy"], self.update_policy().to_dict())
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     @patch.object(SamFunction, "_get_resolved_alias_name")
     def test_sam_function_with_deployment_preference_intrinsic_ref_enabled_dict_parameter(
         self, get_resolved_alias_name_mock
@@ -366,7 +366,7 @@ class TestVersionsAndAliases(TestCase):
         sam_func.to_cloudformation(**kwargs)
         self.assertTrue(sam_func.DeploymentPreference["Enabled"])
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     @patch.object(SamFunction, "_get_resolved_alias_name")
     def test_sam_function_with_deployment_preference_intrinsic_findinmap_enabled_dict_parameter(
         self, get_resolved_alias_name_mock
@@ -401,7 +401,7 @@ class TestVersionsAndAliases(TestCase):
         sam_func.to_cloudformation(**kwargs)
         self.assertTrue(sam_func.DeploymentPreference["Enabled"])
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     @patch.object(SamFunction, "_get_resolved_alias_name")
     def test_sam_function_with_deployment_preference_passthrough_condition_through_property(
         self, get_resolved_alias_name_mock
@@ -449,7 +449,7 @@ class TestVersionsAndAliases(TestCase):
         self.assertTrue("UpdatePolicy" in list(aliases[0].values())[0])
         self.assertEqual(list(aliases[0].values())[0]["UpdatePolicy"], self.update_policy().to_dict())
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     @patch.object(SamFunction, "_get_resolved_alias_name")
     def test_sam_function_with_deployment_preference_passthrough_condition_through_feature_flag(
         self, get_resolved_alias_name_mock
@@ -508,7 +508,7 @@ class TestVersionsAndAliases(TestCase):
             ("my_string", "Resource with id [foo] is invalid. Invalid value for property PassthroughCondition."),
         ]
     )
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     @patch.object(SamFunction, "_get_resolved_alias_name")
     def test_sam_function_with_deployment_preference_passthrough_condition_invalid_input(
         self, invalid_passthrough_condition, expected_exception_message, get_resolved_alias_name_mock
@@ -1,5 +1,18 @@
-from unittest.mock import MagicMock
-from samtranslator.translator.managed_policy_translator import ManagedPolicyLoader
+import json
+import os
+import tempfile
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from samtranslator.translator.managed_policy_translator import (
+    ManagedPolicyLoader,
+    InMemoryManagedPolicyCache,
+    FileManagedPolicyCache,
+    LazyManagedPolicyMap,
+)
 
 
 def create_page(policies):
@@ -33,3 +46,193 @@ def test_load():
 
     iam.get_paginator.assert_called_once_with("list_policies")
     paginator.paginate.assert_called_once_with(Scope="AWS", PaginationConfig={"PageSize": 1000})
+
+
+def create_iam_client(policies):
+    paginator = MagicMock()
+    paginator.paginate.return_value = [create_page(policies)]
+    iam = MagicMock()
+    iam.get_paginator.return_value = paginator
+    return iam
+
+
+def create_failing_iam_client():
+    iam = MagicMock()
+    iam.get_paginator.side_effect = Exception("Could not connect to the endpoint URL")
+    return iam
+
+
+def test_load_must_use_cache_across_loaders():
+    cache = InMemoryManagedPolicyCache(ttl_seconds=60)
+    iam = create_iam_client([("Policy-1", "Arn-1")])
+
+    assert ManagedPolicyLoader(iam, cache=cache).load() == {"Policy-1": "Arn-1"}
+    assert ManagedPolicyLoader(iam, cache=cache).load() == {"Policy-1": "Arn-1"}
+
+    iam.get_paginator.assert_called_once_with("list_policies")
+
+
+def test_load_must_reload_expired_cache_entry():
+    cache = InMemoryManagedPolicyCache(ttl_seconds=60)
+    cache.put("aws", {"Policy-old": "Arn-old"})
+    iam = create_iam_client([("Policy-1", "Arn-1")])
+
+    with patch("samtranslator.utils.cache.time.time", return_value=time.time() + 120):
+        actual = ManagedPolicyLoader(iam, cache=cache).load()
+
+    assert actual == {"Policy-1": "Arn-1"}
+    iam.get_paginator.assert_called_once_with("list_policies")
+
+
+def test_in_memory_cache_must_evict_least_recently_used_entry():
+    cache = InMemoryManagedPolicyCache(max_size=2)
+    cache.put("aws", {"Policy-1": "Arn-1"})
+    cache.put("aws-cn", {"Policy-2": "Arn-2"})
+    cache.get("aws")
+    cache.put("aws-us-gov", {"Policy-3": "Arn-3"})
+
+    assert cache.get("aws") == {"Policy-1": "Arn-1"}
+    assert cache.get("aws-cn") is None
+    assert cache.get("aws-us-gov") == {"Policy-3": "Arn-3"}
+
+
+def test_file_cache_must_persist_policies():
+    with tempfile.TemporaryDirectory() as directory:
+        cache_directory = os.path.join(directory, "cache")
+        iam = create_iam_client([("Policy-1", "Arn-1")])
+
+        ManagedPolicyLoader(iam, cache=FileManagedPolicyCache(cache_directory, ttl_seconds=60)).load()
+        actual = ManagedPolicyLoader(MagicMock(), cache=FileManagedPolicyCache(cache_directory, ttl_seconds=60)).load()
+
+    assert actual == {"Policy-1": "Arn-1"}
+    iam.get_paginator.assert_called_once_with("list_policies")
+
+
+def test_file_cache_must_ignore_corrupted_and_incomplete_entries():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = FileManagedPolicyCache(directory)
+        for content in ["{not json", json.dumps({"Policies": {"Policy-1": "Arn-1"}}), json.dumps(["aws"])]:
+            with open(cache._store.get_file_path("aws"), "w") as f:
+                f.write(content)
+
+            assert cache.get("aws") is None
+
+        iam = create_iam_client([("Policy-1", "Arn-1")])
+        assert ManagedPolicyLoader(iam, cache=cache).load() == {"Policy-1": "Arn-1"}
+        assert cache.get("aws") == {"Policy-1": "Arn-1"}
+
+
+def test_load_must_serve_expired_cache_entry_when_iam_is_unreachable():
+    cache = InMemoryManagedPolicyCache(ttl_seconds=60)
+    cache.put("aws", {"Policy-old": "Arn-old"})
+
+    with patch("samtranslator.utils.cache.time.time", return_value=time.time() + 120):
+        actual = ManagedPolicyLoader(create_failing_iam_client(), cache=cache).load()
+
+    assert actual == {"Policy-old": "Arn-old"}
+
+
+def test_load_must_serve_snapshot_in_offline_mode():
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_file_path = os.path.join(directory, "snapshot.json")
+        with open(snapshot_file_path, "w") as f:
+            json.dump({"Policy-1": "Arn-1"}, f)
+        iam = MagicMock()
+
+        actual = ManagedPolicyLoader(iam, offline=True, snapshot_file_path=snapshot_file_path).load()
+
+    assert actual == {"Policy-1": "Arn-1"}
+    iam.get_paginator.assert_not_called()
+
+
+def test_load_must_raise_when_iam_is_unreachable_without_fallback():
+    with pytest.raises(Exception):
+        ManagedPolicyLoader(create_failing_iam_client()).load()
+
+    with pytest.raises(ValueError):
+        ManagedPolicyLoader(MagicMock(), offline=True).load()
+
+
+def test_load_lazy_must_not_call_iam_until_lookup():
+    iam = create_iam_client([("Policy-1", "Arn-1")])
+
+    policy_map = ManagedPolicyLoader(iam).load_lazy()
+
+    assert policy_map
+    assert "arn:aws:iam::aws:policy/Policy-1" not in policy_map
+    iam.get_policy.assert_not_called()
+    iam.get_paginator.assert_not_called()
+
+
+def test_load_lazy_must_resolve_single_names_with_get_policy():
+    iam = create_iam_client([("Policy-1", "Arn-1")])
+    iam.meta.partition = "aws-cn"
+    iam.get_policy.return_value = {"Policy": {"PolicyName": "Policy-2", "Arn": "Arn-2"}}
+
+    policy_map = ManagedPolicyLoader(iam).load_lazy()
+
+    assert policy_map["Policy-2"] == "Arn-2"
+    assert "Policy-2" in policy_map
+    iam.get_policy.assert_called_once_with(PolicyArn="arn:aws-cn:iam::aws:policy/Policy-2")
+    iam.get_paginator.assert_not_called()
+
+
+def test_load_lazy_must_load_all_policies_when_get_policy_fails():
+    iam = create_iam_client([("Policy-1", "service-role/Arn-1")])
+    iam.get_policy.side_effect = ClientError({"Error": {"Code": "NoSuchEntity"}}, "GetPolicy")
+
+    policy_map = ManagedPolicyLoader(iam).load_lazy()
+
+    assert policy_map["Policy-1"] == "service-role/Arn-1"
+    assert "Policy-2" not in policy_map
+    iam.get_policy.assert_called_once()
+    iam.get_paginator.assert_called_once_with("list_policies")
+
+
+def test_load_lazy_must_not_hide_unexpected_errors_of_get_policy():
+    iam = create_iam_client([("Policy-1", "Arn-1")])
+    iam.get_policy.side_effect = TypeError("unexpected")
+
+    policy_map = ManagedPolicyLoader(iam).load_lazy()
+
+    with pytest.raises(TypeError):
+        policy_map["Policy-1"]
+    iam.get_paginator.assert_not_called()
+
+
+def test_lazy_managed_policy_map_must_load_whole_map_on_iteration():
+    load_policies = MagicMock(return_value={"Policy-1": "Arn-1"})
+
+    policy_map = LazyManagedPolicyMap(load_policies)
+
+    assert dict(policy_map) == {"Policy-1": "Arn-1"}
+    assert len(policy_map) == 1
+    load_policies.assert_called_once_with()
+
+
+def test_lazy_managed_policy_map_must_raise_when_loaded_map_is_empty():
+    policy_map = LazyManagedPolicyMap(MagicMock(return_value={}))
+
+    with pytest.raises(Exception, match="Managed policy map is empty"):
+        "Policy-1" in policy_map
+
+
+def test_lazy_managed_policy_map_must_be_truthy_without_loading_policies():
+    load_policies = MagicMock(return_value={})
+
+    policy_map = LazyManagedPolicyMap(load_policies)
+
+    assert policy_map
+    load_policies.assert_not_called()
+    with pytest.raises(Exception, match="Managed policy map is empty"):
+        policy_map["Policy-1"]
+
+
+def test_lazy_managed_policy_map_without_single_lookups_must_be_truthy_when_not_empty():
+    load_policies = MagicMock(return_value={"Policy-1": "Arn-1"})
+
+    policy_map = LazyManagedPolicyMap(load_policies)
+
+    assert policy_map
+    assert policy_map["Policy-1"] == "Arn-1"
+    load_policies.assert_called_once_with()
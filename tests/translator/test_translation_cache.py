@@ -0,0 +1,151 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock
+
+from parameterized import parameterized
+
+from samtranslator.translator.arn_generator import ArnGenerator
+from samtranslator.translator.translation_cache import (
+    FileTranslationCache,
+    InMemoryTranslationCache,
+    get_resource_cache_key,
+    is_cacheable,
+    serialize_resource,
+)
+
+FUNCTION = {
+    "Type": "AWS::Serverless::Function",
+    "Properties": {
+        "CodeUri": {"Fn::Sub": "s3://${Bucket}/key"},
+        "Handler": "index.handler",
+        "Runtime": {"Ref": "Runtime"},
+        "Policies": ["AWSLambdaRole", {"Statement": []}],
+    },
+}
+
+PARAMETER_VALUES = {"Bucket": "bucket", "Runtime": "python3.9", "Unused": "value", "AWS::Region": "us-east-1"}
+
+
+class TestTranslationCaches(TestCase):
+    def _get_caches(self):
+        return [InMemoryTranslationCache(), FileTranslationCache(os.path.join(tempfile.mkdtemp(), "cache"))]
+
+    def test_get_returns_put_resources(self):
+        resource = Mock(logical_id="Function", resource_type="AWS::Lambda::Function")
+        resource_dict = {"Type": "AWS::Lambda::Function", "Properties": {"Handler": "index.handler"}}
+
+        for cache in self._get_caches():
+            self.assertIsNone(cache.get("key"))
+
+            cache.put("key", [serialize_resource(resource, resource_dict)])
+            cached_resources = cache.get("key")
+
+            self.assertEqual(len(cached_resources), 1)
+            self.assertEqual(cached_resources[0].logical_id, "Function")
+            self.assertEqual(cached_resources[0].resource_type, "AWS::Lambda::Function")
+            self.assertEqual(cached_resources[0].to_dict(), {"Function": resource_dict})
+            # Every get returns new dictionaries, which the translation can modify
+            self.assertIsNot(cache.get("key")[0].resource_dict, cached_resources[0].resource_dict)
+
+    def test_in_memory_cache_evicts_least_recently_used(self):
+        cache = InMemoryTranslationCache(max_size=2)
+        cache.put("a", [])
+        cache.put("b", [])
+        cache.get("a")
+        cache.put("c", [])
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_file_cache_ignores_corrupted_entries(self):
+        directory = tempfile.mkdtemp()
+        cache = FileTranslationCache(directory)
+        with open(cache._store.get_file_path("key"), "w") as fp:
+            fp.write("{not json")
+
+        self.assertIsNone(cache.get("key"))
+
+    def test_serialize_resource_returns_none_for_values_that_are_not_json(self):
+        resource = Mock(logical_id="Function", resource_type="AWS::Lambda::Function")
+
+        self.assertIsNone(serialize_resource(resource, {"Properties": {"Value": object()}}))
+
+
+class TestIsCacheable(TestCase):
+    @parameterized.expand(
+        [
+            ["AWS::Serverless::Function", {}, {"event_resources": {}}, True],
+            ["AWS::Serverless::StateMachine", {}, {"event_resources": {"Schedule": {}}}, True],
+            ["AWS::Serverless::SimpleTable", {}, {}, True],
+            ["AWS::Serverless::Api", {}, {}, False],
+            ["AWS::Serverless::Connector", {}, {}, False],
+            ["AWS::Serverless::Function", {}, {"event_resources": {"Api": {"explicit_api": {}}}}, False],
+            ["AWS::Serverless::Function", {"DeploymentPreference": {"Type": "Linear"}}, {"event_resources": {}}, False],
+            ["AWS::Serverless::Function", {"EventInvokeConfig": {}}, {"event_resources": {}}, True],
+            ["AWS::Serverless::Function", {"EventInvokeConfig": {"MaximumRetryAttempts": 1}}, {}, False],
+        ]
+    )
+    def test_is_cacheable(self, resource_type, properties, kwargs, expected):
+        macro = Mock(resource_type=resource_type, DeploymentPreference=None, EventInvokeConfig=None)
+        for name, value in properties.items():
+            setattr(macro, name, value)
+
+        self.assertEqual(is_cacheable(macro, kwargs), expected)
+
+
+class TestGetResourceCacheKey(TestCase):
+    def setUp(self):
+        ArnGenerator.BOTO_SESSION_REGION_NAME = "us-east-1"
+
+    def tearDown(self):
+        ArnGenerator.BOTO_SESSION_REGION_NAME = None
+
+    def _get_key(self, **overrides):
+        arguments = {
+            "logical_id": "Function",
+            "resource_dict": FUNCTION,
+            "template": {"Resources": {"Function": FUNCTION}},
+            "parameter_values": PARAMETER_VALUES,
+            "feature_toggle": None,
+        }
+        arguments.update(overrides)
+        return get_resource_cache_key(**arguments)
+
+    def test_key_is_stable(self):
+        self.assertEqual(self._get_key(), self._get_key(parameter_values=dict(reversed(PARAMETER_VALUES.items()))))
+
+    @parameterized.expand(
+        [
+            ["logical_id", "OtherFunction"],
+            ["resource_dict", {"Type": "AWS::Serverless::Function", "Properties": {"Handler": "other.handler"}}],
+            ["parameter_values", dict(PARAMETER_VALUES, Bucket="other")],
+            ["parameter_values", dict(PARAMETER_VALUES, Runtime="python3.10")],
+            ["template", {"Resources": {}, "Mappings": {"Map": {"Key": {"Name": "Value"}}}}],
+            ["template", {"Resources": {}, "Conditions": {"Condition": {"Fn::Equals": ["a", "b"]}}}],
+            ["resource_dict", dict(FUNCTION, Properties=dict(FUNCTION["Properties"], Policies=["AWSLambdaExecute"]))],
+            ["feature_toggle", Mock(feature_config={}, stage="beta", account_id="123", region="us-east-1")],
+        ]
+    )
+    def test_key_changes_with_what_translation_reads(self, name, value):
+        self.assertNotEqual(self._get_key(), self._get_key(**{name: value}))
+
+    @parameterized.expand(
+        [
+            ["parameter_values", dict(PARAMETER_VALUES, Unused="other")],
+        ]
+    )
+    def test_key_does_not_change_with_what_translation_does_not_read(self, name, value):
+        self.assertEqual(self._get_key(), self._get_key(**{name: value}))
+
+    def test_key_changes_with_partition(self):
+        key = self._get_key()
+        ArnGenerator.BOTO_SESSION_REGION_NAME = "cn-north-1"
+
+        self.assertNotEqual(key, self._get_key())
+
+    def test_key_is_none_for_values_that_are_not_json(self):
+        resource_dict = {"Type": "AWS::Serverless::Function", "Properties": {"Handler": object()}}
+
+        self.assertIsNone(self._get_key(resource_dict=resource_dict))
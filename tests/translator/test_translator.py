@@ -1,13 +1,19 @@
+import os
+import copy
+import io
 import json
 import itertools
 import os.path
 import hashlib
 import sys
 import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from functools import reduce, cmp_to_key
 
 from samtranslator.translator.translator import Translator, prepare_plugins, make_policy_template_for_function_plugin
 from samtranslator.parser.parser import Parser
+from samtranslator.intrinsics.resolver import IntrinsicsResolver
 from samtranslator.model.exceptions import InvalidDocumentException, InvalidResourceException
 from samtranslator.model import Resource
 from samtranslator.model.sam_resources import SamSimpleTable
@@ -21,7 +27,13 @@ from parameterized import parameterized, param
 import pytest
 import yaml
 from unittest import TestCase
-from samtranslator.translator.transform import transform
+from samtranslator.translator.transform import transform, TransformSession
+from samtranslator.translator.translation_cache import FileTranslationCache, InMemoryTranslationCache
+from samtranslator.metrics.profiler import Profiler
+from samtranslator.plugins.application.sar_application_cache import InMemorySarApplicationCache
+from samtranslator.plugins.application.serverless_app_plugin import ServerlessAppPlugin
+from samtranslator.region_configuration import PartitionTable
+from samtranslator.translator.arn_generator import ArnGenerator
 from unittest.mock import Mock, MagicMock, patch
 
 BASE_PATH = os.path.dirname(__file__)
@@ -159,7 +171,7 @@ class AbstractTestTranslator(TestCase):
         return json.load(open(expected_filepath, "r"))
 
     def _compare_transform(self, manifest, expected, partition, region):
-        with patch("boto3.session.Session.region_name", region):
+        with patch.dict(os.environ, {"AWS_DEFAULT_REGION": region}):
             parameter_values = get_template_parameter_values()
             mock_policy_loader = MagicMock()
             mock_policy_loader.load.return_value = {
@@ -354,7 +366,7 @@ class TestTranslatorEndToEnd(AbstractTestTranslator):
         expected_filepath = os.path.join(OUTPUT_FOLDER, partition_folder, testcase + ".json")
         expected = json.load(open(expected_filepath, "r"))
 
-        with patch("boto3.session.Session.region_name", region):
+        with patch.dict(os.environ, {"AWS_DEFAULT_REGION": region}):
             parameter_values = get_template_parameter_values()
             mock_policy_loader = MagicMock()
             mock_policy_loader.load.return_value = {
@@ -409,7 +421,7 @@ class TestTranslatorEndToEnd(AbstractTestTranslator):
         expected_filepath = os.path.join(OUTPUT_FOLDER, partition_folder, testcase + ".json")
         expected = json.load(open(expected_filepath, "r"))
 
-        with patch("boto3.session.Session.region_name", region):
+        with patch.dict(os.environ, {"AWS_DEFAULT_REGION": region}):
             parameter_values = get_template_parameter_values()
             mock_policy_loader = MagicMock()
             mock_policy_loader.load.return_value = {
@@ -474,7 +486,7 @@ class TestTranslatorEndToEnd(AbstractTestTranslator):
     "testcase",
     ERROR_FILES_NAMES_FOR_TESTING,
 )
-@patch("boto3.session.Session.region_name", "ap-southeast-1")
+@patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
 @patch(
     "samtranslator.plugins.application.serverless_app_plugin.ServerlessAppPlugin._sar_service_call",
     mock_sar_service_call,
@@ -496,7 +508,7 @@ def test_transform_invalid_document(testcase):
     assert error_message == expected.get("errorMessage")
 
 
-@patch("boto3.session.Session.region_name", "ap-southeast-1")
+@patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
 @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
 def test_transform_unhandled_failure_empty_managed_policy_map():
     document = {
@@ -526,6 +538,30 @@ def test_transform_unhandled_failure_empty_managed_policy_map():
     assert error_message == "Managed policy map is empty, but should not be."
 
 
+@patch("boto3.session.Session.region_name", "ap-southeast-1")
+@patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
+def test_transform_must_not_load_empty_managed_policy_map_without_policy_names():
+    document = {
+        "Transform": "AWS::Serverless-2016-10-31",
+        "Resources": {
+            "Resource": {
+                "Type": "AWS::Serverless::Function",
+                "Properties": {"CodeUri": "s3://bucket/key", "Handler": "index.handler", "Runtime": "nodejs12.x"},
+            }
+        },
+    }
+
+    parameter_values = get_template_parameter_values()
+    mock_policy_loader = MagicMock()
+    mock_policy_loader.load.return_value = {}
+
+    output = transform(document, parameter_values, mock_policy_loader)
+
+    # The map is only loaded, and found to be empty, when a policy name is looked up
+    assert "ResourceRole" in output["Resources"]
+    mock_policy_loader.load.assert_not_called()
+
+
 def assert_metric_call(mock, transform, transform_failure=0, invalid_document=0):
     metric_dimensions = [{"Name": "Transform", "Value": transform}]
 
@@ -548,7 +584,7 @@ def assert_metric_call(mock, transform, transform_failure=0, invalid_document=0)
     )
 
 
-@patch("boto3.session.Session.region_name", "ap-southeast-1")
+@patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
 @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
 def test_swagger_body_sha_gets_recomputed():
 
@@ -590,7 +626,7 @@ def test_swagger_body_sha_gets_recomputed():
     assert get_deployment_key(output_fragment) == deployment_key_changed
 
 
-@patch("boto3.session.Session.region_name", "ap-southeast-1")
+@patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
 @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
 def test_swagger_definitionuri_sha_gets_recomputed():
 
@@ -647,7 +683,7 @@ class TestFunctionVersionWithParameterReferences(TestCase):
             },
         }
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
     def test_logical_id_change_with_parameters(self):
         parameter_values = {"CodeKeyParam": "value1"}
@@ -661,7 +697,7 @@ class TestFunctionVersionWithParameterReferences(TestCase):
 
         assert first_version_id != second_version_id
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
     def test_logical_id_remains_same_without_parameter_change(self):
         parameter_values = {"CodeKeyParam": "value1"}
@@ -674,7 +710,7 @@ class TestFunctionVersionWithParameterReferences(TestCase):
 
         assert first_version_id == second_version_id
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
     def test_logical_id_without_resolving_reference(self):
         # Now value of `CodeKeyParam` is not present in document
@@ -696,8 +732,37 @@ class TestFunctionVersionWithParameterReferences(TestCase):
         return output_fragment
 
 
+class TestGetFunctionNames(TestCase):
+    def test_function_name_is_resolved_once_for_all_api_events(self):
+        translator = Translator({}, Parser())
+        resolver = IntrinsicsResolver({"NameParam": "name"})
+        function_name = {"Fn::Join": ["-", [{"Ref": "NameParam"}, "suffix"]]}
+        function = {
+            "Type": "AWS::Serverless::Function",
+            "Properties": {
+                "FunctionName": copy.deepcopy(function_name),
+                "Events": {
+                    "Get": {"Type": "Api", "Properties": {"RestApiId": {"Ref": "Api1"}}},
+                    "Post": {"Type": "Api", "Properties": {"RestApiId": {"Ref": "Api1"}}},
+                    "Other": {"Type": "Api", "Properties": {"RestApiId": {"Ref": "Api2"}}},
+                    "Implicit": {"Type": "Api", "Properties": {}},
+                    "Queue": {"Type": "SQS", "Properties": {"Queue": "arn"}},
+                },
+            },
+        }
+
+        with patch.object(resolver, "resolve_parameter_refs", wraps=resolver.resolve_parameter_refs) as resolve:
+            function_names = translator._get_function_names(function, resolver, {})
+
+        resolve.assert_called_once()
+        resolved_name = str({"Fn::Join": ["-", ["name", "suffix"]]})
+        self.assertEqual(function_names, {"Api1": resolved_name * 2, "Api2": resolved_name})
+        # The template is not modified
+        self.assertEqual(function["Properties"]["FunctionName"], function_name)
+
+
 class TestTemplateValidation(TestCase):
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
     def test_throws_when_resource_not_found(self):
         template = {"foo": "bar"}
@@ -707,7 +772,7 @@ class TestTemplateValidation(TestCase):
             translator = Translator({}, sam_parser)
             translator.translate(template, {})
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
     def test_throws_when_resource_is_empty(self):
         template = {"Resources": {}}
@@ -717,7 +782,7 @@ class TestTemplateValidation(TestCase):
             translator = Translator({}, sam_parser)
             translator.translate(template, {})
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
     def test_throws_when_resource_is_not_dict(self):
         template = {"Resources": [1, 2, 3]}
@@ -727,7 +792,7 @@ class TestTemplateValidation(TestCase):
             translator = Translator({}, sam_parser)
             translator.translate(template, {})
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
     def test_throws_when_resources_not_all_dicts(self):
         template = {"Resources": {"notadict": None, "MyResource": {}}}
@@ -737,7 +802,7 @@ class TestTemplateValidation(TestCase):
             translator = Translator({}, sam_parser)
             translator.translate(template, {})
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
     def test_validate_translated_no_metadata(self):
         with open(os.path.join(INPUT_FOLDER, "translate_convert_metadata.yaml"), "r") as f:
@@ -752,7 +817,7 @@ class TestTemplateValidation(TestCase):
         actual = translator.translate(template, {})
         self.assertEqual(expected, actual)
 
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
     def test_validate_translated_metadata(self):
         self.maxDiff = None
@@ -800,18 +865,31 @@ class TestPluginsUsage(TestCase):
         sam_plugins = prepare_plugins(None)
         self.assertEqual(6, len(sam_plugins))
 
+    @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
+    def test_prepare_plugins_must_pass_sar_application_cache(self):
+        cache = InMemorySarApplicationCache()
+
+        sam_plugins = prepare_plugins(None, sar_application_cache=cache)
+        serverless_app_plugins = [plugin for plugin in sam_plugins._plugins if isinstance(plugin, ServerlessAppPlugin)]
+        self.assertIs(serverless_app_plugins[0]._cache, cache)
+
+    @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
+    def test_prepare_plugins_must_pass_partition_table(self):
+        partition_table = PartitionTable({"partitions": []})
+
+        sam_plugins = prepare_plugins(None, partition_table=partition_table)
+        serverless_app_plugins = [plugin for plugin in sam_plugins._plugins if isinstance(plugin, ServerlessAppPlugin)]
+        self.assertIs(serverless_app_plugins[0]._partition_table, partition_table)
+
     @patch("samtranslator.translator.translator.PolicyTemplatesProcessor")
     @patch("samtranslator.translator.translator.PolicyTemplatesForResourcePlugin")
     def test_make_policy_template_for_function_plugin_must_work(
         self, policy_templates_for_function_plugin_mock, policy_templates_processor_mock
     ):
 
-        default_templates = {"some": "value"}
-        policy_templates_processor_mock.get_default_policy_templates_json.return_value = default_templates
-
         # mock to return instance of the processor
         processor_instance = Mock()
-        policy_templates_processor_mock.return_value = processor_instance
+        policy_templates_processor_mock.get_default.return_value = processor_instance
 
         # mock for plugin instance
         plugin_instance = Mock()
@@ -821,14 +899,13 @@ class TestPluginsUsage(TestCase):
 
         self.assertEqual(plugin_instance, result)
 
-        policy_templates_processor_mock.get_default_policy_templates_json.assert_called_once_with()
-        policy_templates_processor_mock.assert_called_once_with(default_templates)
+        policy_templates_processor_mock.get_default.assert_called_once_with()
         policy_templates_for_function_plugin_mock.assert_called_once_with(processor_instance)
 
     @patch.object(Resource, "from_dict")
     @patch("samtranslator.translator.translator.SamPlugins")
     @patch("samtranslator.translator.translator.prepare_plugins")
-    @patch("boto3.session.Session.region_name", "ap-southeast-1")
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "ap-southeast-1"})
     def test_transform_method_must_inject_plugins_when_creating_resources(
         self, prepare_plugins_mock, sam_plugins_class_mock, resource_from_dict_mock
     ):
@@ -848,8 +925,255 @@ class TestPluginsUsage(TestCase):
             "MyTable", manifest["Resources"]["MyTable"], sam_plugins=sam_plugins_object_mock
         )
         prepare_plugins_mock.assert_called_once_with(
-            initial_plugins, {"AWS::Region": "ap-southeast-1", "AWS::Partition": "aws"}
+            initial_plugins, {"AWS::Region": "ap-southeast-1", "AWS::Partition": "aws"}, None, None, None
+        )
+
+    @patch("samtranslator.translator.translator.PolicyTemplatesForResourcePlugin")
+    def test_make_policy_template_for_function_plugin_must_reuse_given_processor(
+        self, policy_templates_for_function_plugin_mock
+    ):
+        processor_instance = Mock()
+
+        make_policy_template_for_function_plugin(processor_instance)
+
+        policy_templates_for_function_plugin_mock.assert_called_once_with(processor_instance)
+
+
+class TestTranslatorBotoSession(TestCase):
+    def tearDown(self):
+        ArnGenerator.BOTO_SESSION_REGION_NAME = None
+
+    @patch("boto3.session.Session.region_name", "us-east-1")
+    def test_must_use_the_region_of_the_session_outside_of_translate(self):
+        Translator({}, Parser(), boto_session=Mock(region_name="cn-north-1"))
+
+        self.assertEqual(ArnGenerator.get_region_name(), "cn-north-1")
+        self.assertEqual(ArnGenerator.get_partition_name(), "aws-cn")
+
+
+class TestTransformSession(TestCase):
+    def tearDown(self):
+        # A boto3 session sets the region of the whole process
+        ArnGenerator.BOTO_SESSION_REGION_NAME = None
+
+    @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
+    def test_must_translate_many_templates_like_transform(self):
+        names = ["basic_function", "api_with_cors", "state_machine_with_api"]
+        manifests = []
+        for name in names:
+            with open(os.path.join(INPUT_FOLDER, name + ".yaml"), "r") as f:
+                manifests.append(yaml_parse(f.read()))
+        parameter_values = get_template_parameter_values()
+        mock_policy_loader = get_policy_mock()
+
+        expected = [transform(copy.deepcopy(m), dict(parameter_values), mock_policy_loader) for m in manifests]
+        mock_policy_loader.load.reset_mock()
+
+        session = TransformSession(mock_policy_loader)
+        actual = list(session.transform_all((copy.deepcopy(m), dict(parameter_values)) for m in manifests))
+
+        self.assertEqual(expected, actual)
+        self.assertLessEqual(mock_policy_loader.load.call_count, 1)
+
+    @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
+    def test_must_translate_templates_on_several_threads(self):
+        names = ["basic_function", "api_with_cors", "function_with_deployment_preference"]
+        manifests = []
+        for name in names:
+            with open(os.path.join(INPUT_FOLDER, name + ".yaml"), "r") as f:
+                manifests.append(yaml_parse(f.read()))
+        parameter_values = get_template_parameter_values()
+        session = TransformSession(get_policy_mock())
+        expected = [session.transform(copy.deepcopy(m), dict(parameter_values)) for m in manifests]
+        translator_state = dict(vars(session.translator))
+
+        with ThreadPoolExecutor(max_workers=len(manifests)) as executor:
+            actual = list(
+                executor.map(lambda m: session.transform(copy.deepcopy(m), dict(parameter_values)), manifests * 4)
+            )
+
+        self.assertEqual(expected * 4, actual)
+        # No state of a translation is kept on the shared translator
+        self.assertEqual(translator_state, vars(session.translator))
+
+    @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
+    def test_must_write_json_like_transform(self):
+        with open(os.path.join(INPUT_FOLDER, "api_with_auth_all_maximum.yaml"), "r") as f:
+            manifest = yaml_parse(f.read())
+        session = TransformSession(get_policy_mock())
+        expected = json.dumps(session.transform(copy.deepcopy(manifest), get_template_parameter_values()), indent=1)
+
+        fp = io.StringIO()
+        session.transform_to_json(copy.deepcopy(manifest), get_template_parameter_values(), fp, indent=1)
+
+        self.assertEqual(fp.getvalue(), expected)
+
+    @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
+    def test_must_normalize_templates_that_needed_no_py27_conversion(self):
+        # to_py27_compatible_template converts nothing in this template, but the HttpApi editor creates Py27Dict
+        with open(os.path.join(INPUT_FOLDER, "explicit_http_api_minimum.yaml"), "r") as f:
+            manifest = yaml_parse(f.read())
+
+        output = TransformSession(get_policy_mock()).transform(manifest, get_template_parameter_values())
+
+        self.assertIs(type(output["Resources"]["Api"]["Properties"]["Body"]), dict)
+        self.assertEqual(output, json.loads(json.dumps(output)))
+
+    @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
+    def test_must_profile_translation(self):
+        with open(os.path.join(INPUT_FOLDER, "function_with_deployment_preference.yaml"), "r") as f:
+            manifest = yaml_parse(f.read())
+        session = TransformSession(get_policy_mock())
+        expected = session.transform(copy.deepcopy(manifest), get_template_parameter_values())
+
+        profiler = Profiler()
+        actual = session.transform(copy.deepcopy(manifest), get_template_parameter_values(), profiler=profiler)
+
+        self.assertEqual(expected, actual)
+        (translate,) = profiler.get_report()["Spans"]
+        self.assertEqual(translate["Name"], "Translate")
+        spans = {(event["cat"], event["name"]) for event in profiler.get_chrome_trace()["traceEvents"]}
+        for span in [
+            ("Validation", "SchemaValidation"),
+            ("Plugin", "GlobalsPlugin.on_before_transform_template"),
+            ("Plugin", "ServerlessAppPlugin.on_after_transform_template"),
+            ("Resource", "MinimalFunction"),
+            ("ResourceMacro", "AWS::Serverless::Function.to_cloudformation"),
+            ("Translator", "DeploymentPreferences"),
+            ("Intrinsics", "resolve_parameter_refs"),
+        ]:
+            self.assertIn(span, spans)
+
+    @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
+    def test_must_profile_event_sources(self):
+        with open(os.path.join(INPUT_FOLDER, "function_with_alias_and_event_sources.yaml"), "r") as f:
+            manifest = yaml_parse(f.read())
+
+        profiler = Profiler()
+        TransformSession(get_policy_mock()).transform(manifest, get_template_parameter_values(), profiler=profiler)
+
+        event_sources = [
+            event
+            for event in profiler.get_chrome_trace()["traceEvents"]
+            if event["cat"] == "Timer" and event["name"].startswith("FunctionEventSource-")
+        ]
+        self.assertTrue(event_sources)
+        self.assertTrue(all(event["args"]["LogicalId"] for event in event_sources))
+
+    @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
+    def test_must_isolate_errors_between_templates(self):
+        session = TransformSession(get_policy_mock())
+        invalid = {"Resources": {"Function": {"Type": "AWS::Serverless::Function", "Properties": {}}}}
+        valid = {
+            "Resources": {
+                "Function": {
+                    "Type": "AWS::Serverless::Function",
+                    "Properties": {"CodeUri": "s3://bucket/key", "Handler": "index.handler", "Runtime": "python3.9"},
+                }
+            }
+        }
+
+        with self.assertRaises(InvalidDocumentException):
+            session.transform(invalid, {})
+        output = session.transform(valid, {})
+
+        self.assertIn("FunctionRole", output["Resources"])
+
+    def test_must_use_partition_table(self):
+        partition_table = PartitionTable(
+            {"partitions": [{"partition": "aws-eusc", "regions": {"eusc-de-east-1": {}}, "services": {}}]}
         )
+        boto_session = Mock(region_name="eusc-de-east-1")
+        session = TransformSession(get_policy_mock(), boto_session=boto_session, partition_table=partition_table)
+        manifest = {
+            "Resources": {
+                "Function": {
+                    "Type": "AWS::Serverless::Function",
+                    "Properties": {"CodeUri": "s3://bucket/key", "Handler": "index.handler", "Runtime": "python3.9"},
+                }
+            }
+        }
+
+        output = session.transform(manifest, {})
+
+        self.assertEqual(
+            output["Resources"]["FunctionRole"]["Properties"]["ManagedPolicyArns"],
+            ["arn:aws-eusc:iam::aws:policy/service-role/AWSLambdaBasicExecutionRole"],
+        )
+
+    @parameterized.expand(
+        [
+            "basic_function",
+            "function_with_alias_and_code_sha256",
+            "function_with_event_dest_conditional",
+            "function_with_deployment_preference",
+            "api_with_cors",
+            "state_machine_with_api",
+            "state_machine_with_schedule",
+            "simple_table_with_extra_tags",
+            "connector_function_to_table",
+        ]
+    )
+    @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
+    def test_must_translate_like_transform_with_translation_cache(self, name):
+        with open(os.path.join(INPUT_FOLDER, name + ".yaml"), "r") as f:
+            manifest = yaml_parse(f.read())
+        parameter_values = get_template_parameter_values()
+        expected = transform(copy.deepcopy(manifest), dict(parameter_values), get_policy_mock())
+
+        for cache in [InMemoryTranslationCache(), FileTranslationCache(tempfile.mkdtemp())]:
+            session = TransformSession(get_policy_mock(), translation_cache=cache)
+            for _ in range(2):
+                self.assertEqual(session.transform(copy.deepcopy(manifest), dict(parameter_values)), expected)
+
+    @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
+    def test_must_not_translate_unchanged_resources_again_with_translation_cache(self):
+        manifest = {
+            "Resources": {
+                "Function": {
+                    "Type": "AWS::Serverless::Function",
+                    "Properties": {"CodeUri": "s3://bucket/key", "Handler": "index.handler", "Runtime": "python3.9"},
+                },
+                "Table": {"Type": "AWS::Serverless::SimpleTable"},
+            }
+        }
+        session = TransformSession(get_policy_mock(), translation_cache=InMemoryTranslationCache())
+        expected = session.transform(copy.deepcopy(manifest), {})
+
+        with patch.object(SamSimpleTable, "to_cloudformation") as to_cloudformation_mock:
+            self.assertEqual(session.transform(copy.deepcopy(manifest), {}), expected)
+        to_cloudformation_mock.assert_not_called()
+
+        changed_manifest = copy.deepcopy(manifest)
+        changed_manifest["Resources"]["Table"]["Properties"] = {"TableName": "table"}
+        output = session.transform(changed_manifest, {})
+
+        self.assertEqual(output["Resources"]["Table"]["Properties"]["TableName"], "table")
+        self.assertEqual(output["Resources"]["Function"], expected["Resources"]["Function"])
+
+    @patch("botocore.client.ClientEndpointBridge._check_default_region", mock_get_region)
+    def test_must_not_load_managed_policies_of_cached_resources(self):
+        manifest = {
+            "Resources": {
+                "Function": {
+                    "Type": "AWS::Serverless::Function",
+                    "Properties": {
+                        "CodeUri": "s3://bucket/key",
+                        "Handler": "index.handler",
+                        "Runtime": "python3.9",
+                        "Policies": ["AWSLambdaRole"],
+                    },
+                },
+            }
+        }
+        cache = InMemoryTranslationCache()
+        expected = TransformSession(get_policy_mock(), translation_cache=cache).transform(copy.deepcopy(manifest), {})
+
+        policy_mock = get_policy_mock()
+        output = TransformSession(policy_mock, translation_cache=cache).transform(copy.deepcopy(manifest), {})
+
+        self.assertEqual(output, expected)
+        policy_mock.load.assert_not_called()
 
 
 def get_policy_mock():
@@ -0,0 +1,78 @@
+import json
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+from parameterized import parameterized
+
+REPO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+
+with open(os.path.join(REPO_PATH, "bin", "import-budget.json"), encoding="utf-8") as f:
+    IMPORT_BUDGET = json.load(f)
+
+
+class TestImportBudget(TestCase):
+    """
+    Checks the forbidden imports of bin/import-budget.json. The import times are only checked by
+    bin/import_benchmark.py, as they depend on the machine.
+    """
+
+    @parameterized.expand([(module, budget["forbidden"]) for module, budget in IMPORT_BUDGET.items()])
+    def test_module_does_not_import_forbidden_packages(self, module, forbidden):
+        code = "import sys; import {}; print('\\n'.join(sys.modules))".format(module)
+        result = subprocess.run([sys.executable, "-c", code], cwd=REPO_PATH, capture_output=True, text=True, check=True)
+        imported = result.stdout.split()
+
+        forbidden_imports = [
+            name for name in imported if any(name == package or name.startswith(package + ".") for package in forbidden)
+        ]
+        self.assertEqual(forbidden_imports, [])
+
+    def test_forbidden_packages_are_imported_when_needed(self):
+        code = (
+            "import sys\n"
+            "from samtranslator.model.connector_profiles.profile import get_profile\n"
+            "from samtranslator.translator.arn_generator import ArnGenerator, NoRegionFound\n"
+            "from samtranslator.validator.validator import SamTemplateValidator\n"
+            "assert get_profile('AWS::Lambda::Function', 'AWS::SQS::Queue')\n"
+            "SamTemplateValidator()\n"
+            "try:\n"
+            "    ArnGenerator.get_region_name()\n"
+            "except NoRegionFound:\n"
+            "    pass\n"
+            "print(' '.join(sorted(m for m in ('boto3', 'jsonschema') if m in sys.modules)))\n"
+        )
+        # Boto3 is only needed for the region when the environment has none
+        env = {name: value for name, value in os.environ.items() if name not in ("AWS_DEFAULT_REGION", "AWS_REGION")}
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=REPO_PATH, env=env, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.split(), ["boto3", "jsonschema"])
+
+    @parameterized.expand(
+        [(module, budget["first_transform"]) for module, budget in IMPORT_BUDGET.items() if "first_transform" in budget]
+    )
+    def test_first_transform_does_not_import_forbidden_packages(self, module, first_transform):
+        code = (
+            "import sys\n"
+            "from samtranslator.yaml_helper import yaml_parse\n"
+            "from {} import transform\n"
+            "class PolicyLoader:\n"
+            "    def load(self):\n"
+            "        return {{'AWSLambdaRole': 'arn:aws:iam::aws:policy/service-role/AWSLambdaRole'}}\n"
+            "with open({!r}) as f:\n"
+            "    transform(yaml_parse(f.read()), {{}}, PolicyLoader())\n"
+            "print('\\n'.join(sys.modules))\n"
+        ).format(module, first_transform["template"])
+        env = dict(os.environ, AWS_DEFAULT_REGION="us-east-1")
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=REPO_PATH, env=env, capture_output=True, text=True, check=True
+        )
+        imported = result.stdout.split()
+
+        forbidden = first_transform["forbidden"]
+        forbidden_imports = [
+            name for name in imported if any(name == package or name.startswith(package + ".") for package in forbidden)
+        ]
+        self.assertEqual(forbidden_imports, [])
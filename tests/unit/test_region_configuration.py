@@ -1,9 +1,13 @@
+import os
 from unittest import TestCase
 
+import boto3
+
 from unittest.mock import patch
 from parameterized import parameterized
 
-from samtranslator.region_configuration import RegionConfiguration
+from samtranslator.region_configuration import PartitionTable, RegionConfiguration
+from samtranslator.translator.arn_generator import ArnGenerator, NoRegionFound
 
 
 class TestRegionConfiguration(TestCase):
@@ -60,3 +64,97 @@ class TestRegionConfiguration(TestCase):
         self.assertFalse(RegionConfiguration.is_service_supported("ec2", "us-east-0"))
         # hard to test with a real service, since the test may start failing once that
         # service is rolled out to more regions...
+
+    def test_is_service_supported_uses_partition_table(self):
+        partition_table = PartitionTable(ENDPOINT_DATA)
+
+        self.assertTrue(RegionConfiguration.is_service_supported("svc", "us-east-1", partition_table))
+        self.assertFalse(RegionConfiguration.is_service_supported("svc", "us-west-2", partition_table))
+
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": "us-east-1"})
+    def test_is_service_supported_prefers_resolved_region_over_region_in_use(self):
+        partition_table = PartitionTable(ENDPOINT_DATA)
+
+        with ArnGenerator.use_region_name("us-west-2"):
+            self.assertTrue(RegionConfiguration.is_service_supported("svc", partition_table=partition_table))
+
+    @patch.dict(os.environ, {"AWS_DEFAULT_REGION": ""})
+    @patch("boto3.session.Session.region_name", None)
+    def test_is_service_supported_uses_region_in_use_without_resolved_region(self):
+        partition_table = PartitionTable(ENDPOINT_DATA)
+
+        with ArnGenerator.use_region_name("us-east-1"):
+            self.assertTrue(RegionConfiguration.is_service_supported("svc", partition_table=partition_table))
+        with self.assertRaises(NoRegionFound):
+            RegionConfiguration.is_service_supported("svc", partition_table=partition_table)
+
+
+ENDPOINT_DATA = {
+    "partitions": [
+        {
+            "partition": "aws",
+            "regionRegex": "^(us|eu)\\-\\w+\\-\\d+$",
+            "regions": {"us-east-1": {}, "us-west-2": {}},
+            "services": {"svc": {"endpoints": {"us-east-1": {}, "fips-us-east-1": {}}}},
+        },
+        {
+            "partition": "aws-cn",
+            "regionRegex": "^cn\\-\\w+\\-\\d+$",
+            "regions": {"cn-north-1": {}},
+            "services": {"svc": {"endpoints": {"cn-north-1": {}}}},
+        },
+    ]
+}
+
+
+class TestPartitionTable(TestCase):
+    def setUp(self):
+        self.partition_table = PartitionTable(ENDPOINT_DATA)
+
+    @parameterized.expand(
+        [
+            ["us-east-1", "aws"],
+            ["eu-west-9", "aws"],
+            ["cn-north-1", "aws-cn"],
+            ["cn-northwest-2", "aws-cn"],
+            ["mars-east-1", None],
+        ]
+    )
+    def test_get_partition_for_region(self, region, expected):
+        self.assertEqual(self.partition_table.get_partition_for_region(region), expected)
+
+    @parameterized.expand(
+        [
+            ["svc", "us-east-1", True],
+            ["svc", "cn-north-1", True],
+            ["svc", "us-west-2", False],
+            # Non regional endpoints are not regions
+            ["svc", "fips-us-east-1", False],
+            ["svc", "mars-east-1", False],
+            ["other", "us-east-1", False],
+        ]
+    )
+    def test_is_service_supported(self, service, region, expected):
+        self.assertEqual(self.partition_table.is_service_supported(service, region), expected)
+
+    def test_get_default_is_loaded_once(self):
+        self.assertIs(PartitionTable.get_default(), PartitionTable.get_default())
+
+    @parameterized.expand(
+        [
+            ["ec2", "us-west-2"],
+            ["ec2", "cn-north-1"],
+            ["ec2", "us-gov-east-1"],
+            ["serverlessrepo", "us-east-1"],
+            ["serverlessrepo", "eu-west-1"],
+            ["ec1", "us-east-1"],
+            ["ec2", "us-east-0"],
+            ["cloudwatch", "us-east-1"],
+        ]
+    )
+    def test_from_botocore_matches_boto3(self, service, region):
+        session = boto3.session.Session()
+        partition = session.get_partition_for_region(region)
+        expected = region in session.get_available_regions(service, partition_name=partition)
+
+        self.assertEqual(PartitionTable.get_default().is_service_supported(service, region), expected)
@@ -0,0 +1,141 @@
+import importlib.util
+import json
+import os
+import shutil
+import sys
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+REPO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+
+FUNCTION_TEMPLATE = """
+Resources:
+  Function:
+    Type: AWS::Serverless::Function
+    Properties:
+      Runtime: python3.9
+      Handler: index.handler
+      InlineCode: "def handler(event, context): pass"
+"""
+
+# Valid YAML, but not a valid SAM template
+INVALID_TEMPLATE = """
+Resources:
+  Function:
+    Type: AWS::Serverless::Function
+    Properties:
+      Runtime: python3.9
+"""
+
+MALFORMED_YAML = "Resources: [\n"
+
+
+def load_sam_translate():
+    spec = importlib.util.spec_from_file_location("sam_translate", os.path.join(REPO_PATH, "bin", "sam-translate.py"))
+    module = importlib.util.module_from_spec(spec)
+    with patch.object(sys, "argv", ["sam-translate.py", "batch", "--templates=."]):
+        spec.loader.exec_module(module)
+    # Worker processes look the batch functions up by module name
+    sys.modules["sam_translate"] = module
+    return module
+
+
+sam_translate = load_sam_translate()
+
+
+class TestBatch(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.templates_dir = os.path.join(self.directory, "templates")
+        self.output_dir = os.path.join(self.directory, "output")
+        self.report_file_path = os.path.join(self.directory, "report.json")
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def _write_template(self, relative_path, content):
+        path = os.path.join(self.templates_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def _transform_batch(self, templates_option=None):
+        loader = Mock()
+        loader.load.return_value = {
+            "AWSLambdaBasicExecutionRole": "arn:aws:iam::aws:policy/AWSLambdaBasicExecutionRole"
+        }
+        with patch.object(sam_translate, "get_iam_client"), patch.object(
+            sam_translate, "ManagedPolicyLoader", return_value=loader
+        ):
+            exit_code = sam_translate.transform_batch(
+                templates_option or self.templates_dir, self.output_dir, self.report_file_path, 2
+            )
+        with open(self.report_file_path) as f:
+            return exit_code, json.load(f)
+
+    def test_must_transform_templates_and_write_report(self):
+        self._write_template("a.yaml", FUNCTION_TEMPLATE)
+        self._write_template(os.path.join("nested", "b.yml"), FUNCTION_TEMPLATE)
+
+        exit_code, report = self._transform_batch(os.path.join(self.templates_dir, "**", "*.y*ml"))
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual((report["total"], report["succeeded"], report["failed"]), (2, 2, 0))
+        expected_outputs = [
+            os.path.join(self.output_dir, "a.json"),
+            os.path.join(self.output_dir, "nested", "b.json"),
+        ]
+        self.assertEqual([result["output"] for result in report["templates"]], expected_outputs)
+        for output in expected_outputs:
+            with open(output) as f:
+                self.assertIn("Function", json.load(f)["Resources"])
+
+    def test_must_record_failing_templates_without_aborting_the_batch(self):
+        self._write_template("a_valid.yaml", FUNCTION_TEMPLATE)
+        self._write_template("b_invalid.yaml", INVALID_TEMPLATE)
+        self._write_template("c_malformed.yaml", MALFORMED_YAML)
+
+        exit_code, report = self._transform_batch()
+
+        self.assertEqual(exit_code, 1)
+        self.assertEqual((report["total"], report["succeeded"], report["failed"]), (3, 1, 2))
+        valid, invalid, malformed = report["templates"]
+        self.assertEqual(valid["errors"], [])
+        self.assertIsNone(invalid["output"])
+        self.assertIn("Function", invalid["errors"][0])
+        self.assertIsNone(malformed["output"])
+        self.assertEqual(len(malformed["errors"]), 1)
+        self.assertTrue(malformed["errors"][0].startswith("ParserError"))
+        # No partial output is left for the failed templates
+        self.assertEqual(os.listdir(self.output_dir), ["a_valid.json"])
+
+    def test_must_not_load_managed_policies_before_a_template_names_one(self):
+        loader_class = sam_translate.ManagedPolicyLoader
+        with patch.object(sam_translate, "get_iam_client") as get_iam_client_mock, patch.object(
+            sam_translate, "ManagedPolicyLoader", wraps=loader_class
+        ) as loader_class_mock, patch.object(sam_translate, "worker_session", None):
+            iam_client = get_iam_client_mock.return_value
+            sam_translate.init_batch_worker(self.directory)
+            sam_translate.worker_session.transform(sam_translate.yaml_parse(FUNCTION_TEMPLATE), {})
+
+        self.assertEqual(loader_class_mock.call_args.kwargs["cache"]._store.directory, self.directory)
+        iam_client.get_paginator.assert_not_called()
+        iam_client.get_policy.assert_not_called()
+
+    def test_must_keep_the_extension_of_templates_with_the_same_output(self):
+        self._write_template("a.yaml", FUNCTION_TEMPLATE)
+        self._write_template("a.json", json.dumps({"Resources": {}}))
+        self._write_template("b.yaml", FUNCTION_TEMPLATE)
+
+        output_file_paths = sam_translate.get_batch_output_file_paths(
+            sam_translate.find_templates(self.templates_dir), self.output_dir
+        )
+
+        self.assertEqual(
+            output_file_paths,
+            [
+                os.path.join(self.output_dir, "a.json.json"),
+                os.path.join(self.output_dir, "a.yaml.json"),
+                os.path.join(self.output_dir, "b.json"),
+            ],
+        )
@@ -1,3 +1,4 @@
+import os
 from unittest import TestCase
 
 from unittest.mock import patch
@@ -31,5 +32,5 @@ class TestArnGenerator(TestCase):
         ]
     )
     def test_get_partition_name_when_region_not_provided(self, region, expected_partition):
-        with patch("boto3.session.Session.region_name", region):
+        with patch.dict(os.environ, {"AWS_DEFAULT_REGION": region}):
             self.assertEqual(expected_partition, ArnGenerator.get_partition_name())
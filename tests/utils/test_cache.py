@@ -0,0 +1,144 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from samtranslator.utils.cache import FileStore, LRUStore, TTLCache
+
+
+class TestLRUStore(TestCase):
+    def test_get_returns_put_value(self):
+        store = LRUStore(max_size=2)
+        self.assertIsNone(store.get("a"))
+
+        store.put("a", 1)
+
+        self.assertEqual(store.get("a"), 1)
+
+    def test_evicts_least_recently_used(self):
+        store = LRUStore(max_size=2)
+        store.put("a", 1)
+        store.put("b", 2)
+        store.get("a")
+        store.put("c", 3)
+
+        self.assertEqual(store.get("a"), 1)
+        self.assertIsNone(store.get("b"))
+        self.assertEqual(store.get("c"), 3)
+
+    def test_delete(self):
+        store = LRUStore(max_size=2)
+        store.put("a", 1)
+
+        store.delete("a")
+        store.delete("missing")
+
+        self.assertIsNone(store.get("a"))
+
+
+class TestFileStore(TestCase):
+    def setUp(self):
+        self.directory = os.path.join(tempfile.mkdtemp(), "store")
+
+    def test_get_returns_put_content(self):
+        store = FileStore(self.directory)
+        self.assertIsNone(store.get("a"))
+
+        store.put("a", "content")
+
+        self.assertEqual(FileStore(self.directory).get("a"), "content")
+
+    def test_keys_can_contain_any_character(self):
+        store = FileStore(self.directory)
+        keys = ['["us-east-1", "app"]', "../a", "a/b", "a"]
+        for key in keys:
+            store.put(key, key)
+
+        self.assertEqual([store.get(key) for key in keys], keys)
+        self.assertEqual(len(os.listdir(self.directory)), len(keys))
+
+    def test_delete(self):
+        store = FileStore(self.directory)
+        store.put("a", "content")
+
+        store.delete("a")
+        store.delete("missing")
+
+        self.assertIsNone(store.get("a"))
+
+    def test_concurrent_writers_keep_all_entries(self):
+        store = FileStore(self.directory)
+
+        def write(index):
+            for i in range(20):
+                store.put("key-{}-{}".format(index, i), str(i))
+                store.put("shared", str(index))
+
+        threads = [threading.Thread(target=write, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for index in range(4):
+            for i in range(20):
+                self.assertEqual(store.get("key-{}-{}".format(index, i)), str(i))
+        self.assertIn(store.get("shared"), ["0", "1", "2", "3"])
+        # No temporary file is left
+        self.assertEqual(len(os.listdir(self.directory)), 4 * 20 + 1)
+
+
+class TestTTLCache(TestCase):
+    def _get_caches(self, **kwargs):
+        return [
+            TTLCache(LRUStore(max_size=2), json.dumps, json.loads, **kwargs),
+            TTLCache(FileStore(os.path.join(tempfile.mkdtemp(), "store")), json.dumps, json.loads, **kwargs),
+        ]
+
+    def test_get_returns_put_value(self):
+        for cache in self._get_caches():
+            self.assertIsNone(cache.get("a"))
+
+            cache.put("a", {"b": [1]})
+
+            self.assertEqual(cache.get("a"), {"b": [1]})
+
+    def test_entries_expire_after_ttl(self):
+        for cache in self._get_caches(ttl_seconds=60):
+            cache.put("a", 1)
+
+            with patch("samtranslator.utils.cache.time.time", return_value=time.time() + 120):
+                self.assertIsNone(cache.get("a"))
+                self.assertEqual(cache.get("a", allow_expired=True), 1)
+
+    def test_entries_expire_at_given_time(self):
+        for cache in self._get_caches(ttl_seconds=60):
+            cache.put("a", 1, expires_at=time.time() - 1)
+            cache.put("b", 2, expires_at=time.time() + 3600)
+
+            self.assertIsNone(cache.get("a"))
+            self.assertEqual(cache.get("b"), 2)
+
+    def test_entries_never_expire_without_ttl(self):
+        for cache in self._get_caches():
+            cache.put("a", 1)
+
+            with patch("samtranslator.utils.cache.time.time", return_value=time.time() + 10**9):
+                self.assertEqual(cache.get("a"), 1)
+
+    def test_delete_expired_entries_when_read(self):
+        for cache in self._get_caches(ttl_seconds=0, delete_expired=True):
+            cache.put("a", 1)
+
+            self.assertIsNone(cache.get("a"))
+            self.assertIsNone(cache.store.get("a"))
+
+    def test_ignores_corrupted_entries(self):
+        for cache in self._get_caches():
+            for content in ["", "{not json", "-\n{not json", "not a time\n1"]:
+                cache.store.put("a", content)
+
+                self.assertIsNone(cache.get("a"))
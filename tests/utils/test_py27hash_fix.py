@@ -1,4 +1,7 @@
 import copy
+import io
+import json
+import pickle
 
 from unittest import TestCase
 from unittest.mock import patch
@@ -10,6 +13,9 @@ from samtranslator.utils.py27hash_fix import (
     _convert_to_py27_type,
     to_py27_compatible_template,
     _template_has_api_resource,
+    is_unchanged_by_deepcopies,
+    undo_mark_unicode_str_in_template,
+    dump_template,
 )
 from samtranslator.model.exceptions import InvalidDocumentException
 
@@ -154,6 +160,227 @@ class TestPy27Keys(TestCase):
 
         self.assertEqual(py27_keys.pop(), "a")
 
+    def test_keys_are_applied_when_needed(self):
+        operations = [("add", "get"), ("add", "post"), ("add", "delete"), ("remove", "post"), ("add", "patch")]
+        operations += [("add", "key{}".format(i)) for i in range(10)] + [("merge", ["options", "head", "get"])]
+        py27_keys = Py27Keys()
+        expected = Py27Keys()
+        for operation, key in operations:
+            getattr(py27_keys, operation)(key)
+            # Apply each operation to the table straight away
+            getattr(expected, "_" + operation)(key)
+
+        self.assertEqual(len(py27_keys._pending), len(operations))
+        self.assertEqual(py27_keys.keys(), expected.keys())
+        self.assertEqual(py27_keys._pending, [])
+        self.assertEqual(py27_keys.keyorder, expected.keyorder)
+        self.assertEqual(py27_keys.mask, expected.mask)
+        self.assertEqual((py27_keys.size, py27_keys.fill), (expected.size, expected.fill))
+
+    def test_keys_are_updated_after_iteration(self):
+        py27_keys = Py27Keys()
+        for key in ["a", "b", "c"]:
+            py27_keys.add(key)
+        keys = py27_keys.keys()
+        self.assertEqual(list(py27_keys), ["a", "c", "b"])
+
+        py27_keys.add("d")
+        py27_keys.remove("c")
+
+        self.assertEqual(list(py27_keys), ["a", "b", "d"])
+        self.assertEqual(keys, ["a", "c", "b"])
+
+    def test_pickle_adds_keys_again(self):
+        py27_keys = Py27Keys()
+        for key in ["get", "post", "delete", "patch"]:
+            py27_keys.add(key)
+
+        unpickled = pickle.loads(pickle.dumps(py27_keys))
+
+        # Like Python 2.7, unpickling adds the keys again in their order
+        self.assertEqual(unpickled.keys(), copy.deepcopy(py27_keys).keys())
+        self.assertEqual(unpickled._pending, [])
+
+    def test_unpickle_state_of_earlier_versions(self):
+        py27_keys = Py27Keys()
+        for key in ["get", "post", "delete", "patch"]:
+            py27_keys.add(key)
+        # Attributes pickled before the operations were recorded
+        state = {
+            "debug": False,
+            "keyorder": dict(py27_keys.keyorder),
+            "size": py27_keys.size,
+            "fill": py27_keys.fill,
+            "mask": py27_keys.mask,
+        }
+
+        unpickled = Py27Keys.__new__(Py27Keys)
+        unpickled.__setstate__(state)
+
+        self.assertEqual(unpickled.keys(), pickle.loads(pickle.dumps(py27_keys)).keys())
+        unpickled.add("put")
+        self.assertIn("put", unpickled.keys())
+
+    def _copied_keys(self, input_keys):
+        py27_keys = Py27Keys()
+        for key in input_keys:
+            py27_keys.add(key)
+        return copy.deepcopy(py27_keys)
+
+    def test_is_unchanged_by_deepcopies(self):
+        py27_keys = self._copied_keys(["a", "b", "c", "d"])
+
+        self.assertTrue(py27_keys.is_unchanged_by_deepcopies(1))
+        self.assertTrue(py27_keys.is_unchanged_by_deepcopies(2))
+
+    def test_is_unchanged_by_deepcopies_when_copies_reorder_keys(self):
+        # Colliding keys: each copy changes the iteration order
+        py27_keys = self._copied_keys(["get", "post", "delete", "patch"])
+        self.assertNotEqual(copy.deepcopy(copy.deepcopy(py27_keys)).keys(), py27_keys.keys())
+
+        self.assertFalse(py27_keys.is_unchanged_by_deepcopies(2))
+
+    def test_is_unchanged_by_deepcopies_is_reset_when_keys_change(self):
+        py27_keys = self._copied_keys(["a", "b", "c", "d"])
+        self.assertTrue(py27_keys.is_unchanged_by_deepcopies(2))
+
+        # Removed keys leave dummy slots, which copies drop
+        py27_keys.remove("b")
+
+        self.assertFalse(py27_keys.is_unchanged_by_deepcopies(2))
+
+    def test_deepcopy_matches_adding_keys_again(self):
+        for input_keys in (["a", "b", "c", "d"], ["get", "post", "delete", "patch"]):
+            py27_keys = self._copied_keys(input_keys)
+            for _ in range(3):
+                expected = Py27Keys()
+                for key in py27_keys.keys():
+                    expected.add(key)
+
+                py27_keys = copy.deepcopy(py27_keys)
+
+                self.assertEqual(py27_keys.keyorder, expected.keyorder)
+                self.assertEqual(py27_keys.mask, expected.mask)
+                self.assertEqual(py27_keys.fill, expected.fill)
+                self.assertEqual(py27_keys.size, expected.size)
+
+    def test_deepcopy_of_unchanged_keys_can_still_change(self):
+        py27_keys = copy.deepcopy(self._copied_keys(["a", "b", "c", "d"]))
+        py27_keys.add("e")
+
+        self.assertEqual(copy.deepcopy(py27_keys).keys(), ["a", "c", "b", "e", "d"])
+
+
+class TestIsUnchangedByDeepcopies(TestCase):
+    def test_must_check_nested_dicts(self):
+        value = Py27Dict()
+        value["a"] = [{"b": Py27Dict()}, "c", 1, None]
+        value["a"][0]["b"]["get"] = "d"
+
+        self.assertTrue(is_unchanged_by_deepcopies(value, 2))
+
+        for key in ["post", "delete", "patch"]:
+            value["a"][0]["b"][key] = "d"
+        value["a"][0]["b"] = copy.deepcopy(value["a"][0]["b"])
+
+        self.assertFalse(is_unchanged_by_deepcopies(value, 2))
+
+    def test_must_return_false_for_other_objects(self):
+        self.assertFalse(is_unchanged_by_deepcopies({"a": object()}, 1))
+
+
+class TestUndoMarkUnicodeStrInTemplate(TestCase):
+    def _make_template(self):
+        py27_dict = Py27Dict()
+        for key in ["b", "a", "c", "x", "y", "z", "aa"]:
+            py27_dict[Py27UniStr(key)] = Py27UniStr(key.upper())
+        return {
+            "Resources": py27_dict,
+            "Outputs": {"Long": Py27LongInt(2**70), "Tuple": (Py27UniStr("a"), 1.5, True, None)},
+        }
+
+    def _assert_plain(self, value):
+        if isinstance(value, dict):
+            self.assertIs(type(value), dict)
+            for key, item in value.items():
+                self.assertIs(type(key), str)
+                self._assert_plain(item)
+        elif isinstance(value, list):
+            self.assertIs(type(value), list)
+            for item in value:
+                self._assert_plain(item)
+        else:
+            self.assertIn(type(value), (str, int, float, bool, type(None)))
+
+    def test_must_match_json_round_trip(self):
+        template = self._make_template()
+        expected = json.dumps(json.loads(json.dumps(template)))
+
+        normalized = undo_mark_unicode_str_in_template(template)
+
+        self.assertEqual(json.dumps(normalized), expected)
+        self._assert_plain(normalized)
+
+    def test_must_normalize_in_place(self):
+        template = self._make_template()
+        outputs = template["Outputs"]
+
+        normalized = undo_mark_unicode_str_in_template(template)
+
+        self.assertIs(normalized, template)
+        self.assertIs(normalized["Outputs"], outputs)
+        self.assertEqual(list(normalized["Resources"]), ["a", "aa", "c", "b", "y", "x", "z"])
+        self.assertEqual(outputs["Tuple"], ["a", 1.5, True, None])
+
+    def test_must_convert_keys_like_json(self):
+        template = {"a": 1, 2: 2, 1.5: 3, True: 4, None: 5, Py27LongInt(2**70): 6}
+
+        normalized = undo_mark_unicode_str_in_template(template)
+
+        self.assertEqual(list(normalized.items()), list(json.loads(json.dumps(template)).items()))
+
+    def test_must_copy_shared_containers(self):
+        shared = {"Statement": [{"Effect": "Allow"}]}
+        template = {"A": shared, "B": shared, "C": [shared["Statement"], shared["Statement"]]}
+
+        normalized = undo_mark_unicode_str_in_template(template)
+
+        self.assertEqual(normalized, json.loads(json.dumps(template)))
+        self.assertIsNot(normalized["A"], normalized["B"])
+        self.assertIsNot(normalized["A"]["Statement"], normalized["B"]["Statement"])
+        self.assertIsNot(normalized["C"][0], normalized["C"][1])
+        self.assertIsNot(normalized["C"][0], normalized["A"]["Statement"])
+
+    def test_must_raise_like_json(self):
+        circular = {"a": []}
+        circular["a"].append(circular)
+        with self.assertRaisesRegex(ValueError, "Circular reference detected"):
+            undo_mark_unicode_str_in_template(circular)
+
+        circular_py27 = Py27Dict()
+        circular_py27["a"] = circular_py27
+        with self.assertRaisesRegex(ValueError, "Circular reference detected"):
+            undo_mark_unicode_str_in_template({"x": circular_py27})
+
+        circular_tuple = ([],)
+        circular_tuple[0].append(circular_tuple)
+        with self.assertRaisesRegex(ValueError, "Circular reference detected"):
+            undo_mark_unicode_str_in_template({"x": circular_tuple})
+
+        with self.assertRaisesRegex(TypeError, "Object of type set is not JSON serializable"):
+            undo_mark_unicode_str_in_template({"a": {1}})
+
+        with self.assertRaisesRegex(TypeError, "keys must be str, int, float, bool or None, not tuple"):
+            undo_mark_unicode_str_in_template({(1, 2): 1})
+
+    def test_dump_template_must_write_normalized_json(self):
+        template = self._make_template()
+        fp = io.StringIO()
+
+        dump_template(template, fp, indent=1)
+
+        self.assertEqual(fp.getvalue(), json.dumps(undo_mark_unicode_str_in_template(template), indent=1))
+
 
 class TestPy27Dict(TestCase):
     def test_py27_iteration_order_01(self):
@@ -446,6 +673,17 @@ class TestPy27Dict(TestCase):
         self.assertEqual(py27_dict.pop("a"), "b")
         self.assertEqual(py27_dict.pop("c", "some_default_val"), "some_default_val")
 
+    def test_setting_existing_key_keeps_order(self):
+        py27_dict = Py27Dict({"get": 1, "post": 2, "delete": 3})
+        keys = list(py27_dict)
+
+        py27_dict["get"] = 4
+        py27_dict.pop("patch", None)
+
+        self.assertEqual(py27_dict.keylist._pending, [])
+        self.assertEqual(list(py27_dict), keys)
+        self.assertEqual(py27_dict["get"], 4)
+
     def test_popitem(self):
         py27_dict = Py27Dict({"a": "b"})
         self.assertEqual(py27_dict.popitem(), ("a", "b"))
@@ -1,9 +1,10 @@
 import os.path
 from unittest import TestCase
+from unittest.mock import patch
 import pytest
 from parameterized import parameterized
 from samtranslator.yaml_helper import yaml_parse
-from samtranslator.validator.validator import SamTemplateValidator, sam_schema
+from samtranslator.validator.validator import SamTemplateValidator, SamTemplateValidatorCache, sam_schema
 
 BASE_PATH = os.path.dirname(__file__)
 TRANSLATOR_INPUT_FOLDER = os.path.join(BASE_PATH, os.pardir, "translator", "input")
@@ -180,3 +181,41 @@ class TestValidatorLegacy(TestValidatorBase):
         new_validation_errors = TestValidatorProvider.get().get_errors(manifest)
 
         self.assertEqual(old_validation_errors, ", ".join(new_validation_errors))
+
+
+class TestSamTemplateValidatorCache(TestCase):
+    def test_get_returns_same_validator_and_counts_hits(self):
+        cache = SamTemplateValidatorCache()
+
+        first = cache.get()
+        second = cache.get(sam_schema.SCHEMA_NEW_FILE)
+
+        self.assertIs(first, second)
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "size": 1})
+
+    def test_warm_builds_validator_once(self):
+        cache = SamTemplateValidatorCache()
+        cache.warm()
+        cache.get()
+
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "size": 1})
+
+    def test_get_rebuilds_validator_when_schema_files_change(self):
+        cache = SamTemplateValidatorCache()
+        first = cache.get()
+
+        with patch.object(SamTemplateValidatorCache, "_fingerprint", return_value=(("changed", 0, 0),)):
+            second = cache.get()
+
+        self.assertIsNot(first, second)
+        self.assertEqual(cache.stats(), {"hits": 0, "misses": 2, "size": 1})
+
+    def test_clear_resets_cache(self):
+        cache = SamTemplateValidatorCache()
+        cache.get()
+        cache.clear()
+
+        self.assertEqual(cache.stats(), {"hits": 0, "misses": 0, "size": 0})
+
+    def test_get_instance_is_shared(self):
+        self.assertIs(SamTemplateValidatorCache.get_instance(), SamTemplateValidatorCache.get_instance())